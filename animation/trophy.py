@@ -4,6 +4,7 @@
 import pygame
 import random
 import math
+from particle_system import particle_system, emit_trophy_sparks, emit_trophy_glow
 
 
 class Trophy:
@@ -15,7 +16,7 @@ class Trophy:
         self.width = 60
         self.height = 80
         self.collected = False
-        self.particles = []
+        self.explosion_particle_life = 0  # 爆炸粒子剩余帧数
         self.explosion_started = False
         self.explosion_complete = False
         self.fade_timer = 0
@@ -41,40 +42,11 @@ class Trophy:
         # 脉冲发光效果
         self.pulse_timer = 0
         self.pulse_speed = 0.08
-        self.glow_particles = []
 
         # 环形光晕效果
         self.halo_timer = 0
         self.halo_speed = 0.06
 
-    def create_glow_particles(self):
-        """创建环绕奖杯的发光粒子"""
-        if random.random() < 0.3:  # 30%概率生成新粒子
-            angle = random.uniform(0, math.pi * 2)
-            distance = random.uniform(35, 60)  # 距离奖杯中心的距离
-            self.glow_particles.append({
-                'angle': angle,
-                'distance': distance,
-                'life': random.randint(60, 120),
-                'max_life': random.randint(60, 120),
-                'size': random.randint(2, 5),
-                'color': random.choice([
-                    (255, 255, 100),  # 金黄色
-                    (255, 200, 50),  # 橙黄色
-                    (255, 255, 255),  # 白色
-                    (255, 150, 0)  # 橙色
-                ])
-            })
-
-    def update_glow_particles(self):
-        """更新发光粒子"""
-        for particle in self.glow_particles[:]:
-            particle['angle'] += 0.03  # 粒子绕奖杯旋转
-            particle['life'] -= 1
-
-            if particle['life'] <= 0:
-                self.glow_particles.remove(particle)
-
     def draw_enhanced_glow(self, surface):
         """绘制增强的发光效果"""
         center_x = self.x + self.width // 2
@@ -120,22 +92,7 @@ class Trophy:
             surface.blit(halo_surface, (halo_x - halo_radius, halo_y - halo_radius))
 
         # 3. 绘制发光粒子
-        for particle in self.glow_particles:
-            particle_x = center_x + math.cos(particle['angle']) * particle['distance']
-            particle_y = center_y + math.sin(particle['angle']) * particle['distance']
-
-            alpha = int(255 * (particle['life'] / particle['max_life']))
-
-            particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            # 分别绘制颜色和透明度
-            color_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(color_surface, particle['color'],
-                               (particle['size'], particle['size']), particle['size'])
-            color_surface.set_alpha(alpha)
-            particle_surface.blit(color_surface, (0, 0))
-
-            surface.blit(particle_surface,
-                         (particle_x - particle['size'], particle_y - particle['size']))
+        particle_system.draw(surface, ("trophy_glow",))
 
     def draw(self, surface):
         """绘制奖杯主体"""
@@ -151,8 +108,8 @@ class Trophy:
                 self.rotation_angle -= 360
 
             # 生成和更新发光粒子
-            self.create_glow_particles()
-            self.update_glow_particles()
+            emit_trophy_glow(self.x + self.width // 2, self.y + self.height // 2)
+            particle_system.update_pool("trophy_glow")
 
             # 绘制增强发光效果
             self.draw_enhanced_glow(surface)
@@ -295,54 +252,23 @@ class Trophy:
                 current_y <= y <= current_y + self.height):
             self.collected = True
             self.explosion_started = True
+            particle_system.clear("trophy_glow")
             self.create_explosion_particles()
             return True
         return False
 
     def create_explosion_particles(self):
         """创建更壮观的爆炸粒子"""
-        for _ in range(150):  # 增加粒子数量
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(3, 12)  # 增加速度范围
-            size = random.randint(2, 8)  # 增加大小范围
-            life = random.randint(40, 120)  # 增加生命周期
-
-            # 更丰富的颜色选择
-            color_choice = random.choice([
-                (255, 215, 0),  # 金色
-                (255, 255, 0),  # 黄色
-                (255, 165, 0),  # 橙色
-                (255, 255, 255),  # 白色
-                (255, 100, 100),  # 粉红色
-                (100, 255, 100),  # 绿色
-            ])
-
-            self.particles.append({
-                'x': self.x + self.width // 2,
-                'y': self.y + self.height // 2,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'size': size,
-                'color': color_choice,
-                'life': life,
-                'max_life': life
-            })
+        self.explosion_particle_life = emit_trophy_sparks(self.x + self.width // 2, self.y + self.height // 2)
 
     def update(self):
         """更新奖杯状态"""
         if self.explosion_started:
-            # 更新粒子
-            for particle in self.particles[:]:
-                particle['x'] += particle['vx']
-                particle['y'] += particle['vy']
-                particle['vy'] += 0.15  # 稍微增加重力
-                particle['life'] -= 1
-
-                if particle['life'] <= 0:
-                    self.particles.remove(particle)
+            # 爆炸粒子倒计时（粒子本身由全局粒子系统推进）
+            self.explosion_particle_life -= 1
 
             # 检查爆炸是否完成
-            if not self.particles:
+            if self.explosion_particle_life <= 0:
                 self.explosion_complete = True
 
             # 更新淡出计时器
@@ -351,28 +277,7 @@ class Trophy:
 
     def draw_particles(self, surface):
         """绘制爆炸粒子"""
-        for particle in self.particles:
-            alpha = int(255 * (particle['life'] / particle['max_life']))
-
-            # 绘制带尾迹的粒子
-            particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-
-            # 主粒子 - 使用分离的颜色和透明度处理
-            main_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(main_surface, particle['color'],
-                               (particle['size'], particle['size']), particle['size'])
-            main_surface.set_alpha(alpha)
-            particle_surface.blit(main_surface, (0, 0))
-
-            # 尾迹效果
-            if particle['size'] > 3:
-                tail_surface = pygame.Surface((particle['size'] * 2 + 4, particle['size'] * 2 + 4), pygame.SRCALPHA)
-                pygame.draw.circle(tail_surface, particle['color'],
-                                   (particle['size'] + 2, particle['size'] + 2), particle['size'] + 2, 2)
-                tail_surface.set_alpha(alpha // 3)
-                surface.blit(tail_surface, (particle['x'] - particle['size'] - 2, particle['y'] - particle['size'] - 2))
-
-            surface.blit(particle_surface, (particle['x'] - particle['size'], particle['y'] - particle['size']))
+        particle_system.draw(surface, ("trophy_sparks",))
 
     def is_fade_complete(self):
         """检查淡出是否完成"""
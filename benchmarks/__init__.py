@@ -0,0 +1,9 @@
+"""
+基准测试包 - 无头运行固定场景，测量游戏循环的性能
+
+用法: python -m benchmarks [场景...] [--mode=sim|render] [--zombie-store] [--scopes]
+"""
+from .scenarios import SCENARIOS
+from .runner import run_scenario, run_suite, setup_scenario, BENCHMARK_MODES
+
+__all__ = ["SCENARIOS", "run_scenario", "run_suite", "setup_scenario", "BENCHMARK_MODES"]
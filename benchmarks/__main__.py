@@ -0,0 +1,9 @@
+"""python -m benchmarks 入口：无头模式运行，不弹出窗口也不输出声音"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from .runner import main
+
+main()
@@ -0,0 +1,292 @@
+"""
+基准测试运行器 - 无头构建场景，测量帧率、单帧耗时百分位和内存块增长
+
+两种模式：
+    sim: 只推进 _update_main_game_logic
+    render: 每帧逻辑更新后再用 RendererManager 渲染到虚拟显示（SDL dummy 驱动）
+
+render 模式可以指定全屏输出方式（--present），虚拟显示无法真正切换全屏，
+画面输出到一块 --screen 大小的离屏表面上，用于比较各输出方式的单帧耗时。
+scaled 方式的缩放由 SDL 渲染器在显卡上完成，这里只能测到原始分辨率的 blit。
+--dirty-rects 让窗口模式的 render 使用脏矩形输出，用于和整屏输出比较。
+
+每个 (场景, 模式) 的结果写成一行JSON，追加到结果文件中，便于对比不同版本。
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+import pygame
+
+from core.constants import GRID_WIDTH, BASE_WIDTH, BASE_HEIGHT
+from core.game_logic import create_zombie_for_level, add_zombie_to_game
+from performance import percentile
+from sim_clock import get_rng
+from ui.presentation import FullscreenPresenter, PRESENTATION_MODES
+from .scenarios import SCENARIOS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+BENCHMARK_MODES = ("sim", "render")
+
+# 默认结果文件（追加写入）
+DEFAULT_RESULTS_PATH = "benchmark_results.jsonl"
+
+# 默认随机数种子
+DEFAULT_SEED = 1
+
+# 模拟全屏输出时的默认屏幕尺寸
+DEFAULT_SCREEN_SIZE = (1920, 1080)
+
+
+def setup_scenario(game_manager, scenario, seed=DEFAULT_SEED):
+    """按场景构建棋盘：种植植物并在战场右侧放置额外的僵尸"""
+    game = game_manager.setup_headless_level(scenario["level"], scenario["plants"], seed)
+    level_manager = game["level_manager"]
+    spawn_rng = get_rng("spawn")
+    for _ in range(scenario["zombies"]):
+        zombie = create_zombie_for_level(spawn_rng.randint(0, 4), level_manager, False,
+                                         game_manager.level_settings)
+        zombie.col = GRID_WIDTH + spawn_rng.random() * scenario["zombie_spread"]
+        add_zombie_to_game(game, zombie)
+    game_manager._set_object_references()
+    return game
+
+
+def simulate_fullscreen(game_manager, presentation, screen_size=DEFAULT_SCREEN_SIZE):
+    """
+    让渲染器按指定方式输出到离屏的全屏表面，返回恢复窗口模式的函数
+
+    scaled 方式下屏幕就是原始分辨率（缩放由 SDL 完成），其余方式使用 screen_size 大小的表面。
+    """
+    previous = (game_manager.screen, game_manager.presenter, game_manager.fullscreen)
+    presenter = FullscreenPresenter(presentation)
+    screen = pygame.Surface((BASE_WIDTH, BASE_HEIGHT) if presentation == "scaled" else screen_size)
+    presenter.configure(screen)
+    game_manager.screen = screen
+    game_manager.presenter = presenter
+    game_manager.fullscreen = True
+
+    def restore():
+        game_manager.screen, game_manager.presenter, game_manager.fullscreen = previous
+    return restore
+
+
+def run_scenario(game_manager, name, mode="sim", ticks=None, seed=DEFAULT_SEED, scopes=False,
+                 presentation=None, screen_size=DEFAULT_SCREEN_SIZE):
+    """
+    运行一个场景并返回测量结果
+
+    Args:
+        game_manager: 无头模式的 GameManager
+        name: SCENARIOS 中的场景名称
+        mode: "sim" 只跑逻辑，"render" 逻辑加离屏渲染
+        ticks: 运行帧数，默认使用场景的 ticks
+        seed: 随机数种子
+        scopes: 是否附带各阶段计时统计（PerformanceMonitor 计时作用域）
+        presentation: render 模式下的全屏输出方式，None 表示窗口模式输出
+        screen_size: 模拟全屏时的屏幕尺寸
+
+    Returns:
+        dict: 测量结果
+    """
+    scenario = SCENARIOS[name]
+    ticks = ticks or scenario["ticks"]
+    monitor = game_manager.performance_monitor
+    monitor.scopes_enabled = scopes
+    monitor.reset_scopes()
+
+    game = setup_scenario(game_manager, scenario, seed)
+    render = mode == "render"
+    renderer = game_manager.renderer_manager
+    restore_window = None
+    if render and presentation:
+        restore_window = simulate_fullscreen(game_manager, presentation, screen_size)
+
+    tick_times = []
+    peak_zombies = len(game["zombies"])
+    start_blocks = sys.getallocatedblocks()
+    start_time = time.perf_counter()
+    for _ in range(ticks):
+        if game["game_over"] or game.get("level_completed", False):
+            break
+        tick_start = time.perf_counter()
+        if render:
+            game_manager._set_object_references()
+        game_manager._update_main_game_logic()
+        if render:
+            renderer.render_game()
+        tick_times.append(time.perf_counter() - tick_start)
+        peak_zombies = max(peak_zombies, len(game["zombies"]))
+    elapsed = time.perf_counter() - start_time
+    allocated_blocks = sys.getallocatedblocks() - start_blocks
+    if restore_window:
+        restore_window()
+
+    ticks_run = len(tick_times)
+    tick_times.sort()
+    result = {
+        "scenario": name,
+        "mode": mode,
+        "presentation": presentation if render else None,
+        "dirty_rects": render and not presentation and renderer.dirty_rect_tracker is not None,
+        "screen_size": list(screen_size) if render and presentation else None,
+        "zombie_store": game["zombie_store"] is not None,
+        "seed": game["rng_seed"],
+        "ticks": ticks_run,
+        "elapsed_seconds": elapsed,
+        "ticks_per_second": ticks_run / elapsed if elapsed > 0 else 0.0,
+        "mean_tick_ms": elapsed / ticks_run * 1000 if ticks_run else 0.0,
+        "p50_tick_ms": percentile(tick_times, 50) * 1000 if ticks_run else 0.0,
+        "p99_tick_ms": percentile(tick_times, 99) * 1000 if ticks_run else 0.0,
+        "max_tick_ms": tick_times[-1] * 1000 if ticks_run else 0.0,
+        # 运行期间存活内存块的净增长，持续为正说明每帧都在积累对象
+        "allocated_blocks_per_tick": allocated_blocks / ticks_run if ticks_run else 0.0,
+        "peak_zombies": peak_zombies,
+        "zombies_alive": len(game["zombies"]),
+        "zombies_killed": game["zombies_killed"],
+        "game_over": game["game_over"],
+    }
+    if scopes:
+        result["scopes"] = monitor.get_scope_stats()
+    monitor.scopes_enabled = False
+    return result
+
+
+def get_environment_info(label=None):
+    """运行环境信息，写入每条结果便于跨版本对比"""
+    return {
+        "label": label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__ if np is not None else None,
+        "platform": platform.platform(),
+    }
+
+
+def run_suite(names=None, modes=BENCHMARK_MODES, ticks=None, seed=DEFAULT_SEED, zombie_store=False,
+              scopes=False, results_path=DEFAULT_RESULTS_PATH, label=None, presentations=(None,),
+              screen_size=DEFAULT_SCREEN_SIZE, dirty_rects=False):
+    """
+    运行一组场景，每个结果打印一行摘要并追加到结果文件
+
+    presentations 中的每种全屏输出方式都单独运行一遍 render 模式（None 为窗口模式），
+    dirty_rects 为 True 时窗口模式使用脏矩形输出
+
+    Returns:
+        list: 测量结果列表
+    """
+    # 延迟导入：main 在导入时会初始化大量游戏模块
+    from main import GameManager
+
+    game_manager = GameManager(headless=True, zombie_store=zombie_store, dirty_rects=dirty_rects)
+    environment = get_environment_info(label)
+    results = []
+    try:
+        for name in names or SCENARIOS:
+            for mode in modes:
+                for presentation in (presentations if mode == "render" else (None,)):
+                    result = run_scenario(game_manager, name, mode, ticks, seed, scopes,
+                                          presentation, screen_size)
+                    result.update(environment)
+                    results.append(result)
+                    output = presentation or ("dirty" if result["dirty_rects"] else "")
+                    print(f"{name:<20} {mode:<6} {output:<9} {result['ticks']:>5} 帧  "
+                          f"{result['ticks_per_second']:>8.1f} 帧/秒  "
+                          f"p99 {result['p99_tick_ms']:>7.2f} ms  "
+                          f"内存块 {result['allocated_blocks_per_tick']:>+8.1f}/帧")
+    finally:
+        pygame.quit()
+
+    if results_path:
+        with open(results_path, "a", encoding="utf-8") as results_file:
+            for result in results:
+                results_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        print(f"结果已追加到: {results_path}")
+    return results
+
+
+def _parse_screen_size(value):
+    """解析 --screen 的 宽x高"""
+    width, _, height = value.lower().partition("x")
+    try:
+        size = (int(width), int(height))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"屏幕尺寸应为 宽x高，例如 1920x1080: {value}")
+    if size[0] <= 0 or size[1] <= 0:
+        raise argparse.ArgumentTypeError(f"屏幕尺寸必须为正数: {value}")
+    return size
+
+
+def _parse_presentations(value):
+    """解析 --present 的逗号分隔输出方式列表"""
+    presentations = tuple(mode for mode in value.split(",") if mode)
+    unknown = [mode for mode in presentations if mode not in PRESENTATION_MODES]
+    if unknown or not presentations:
+        raise argparse.ArgumentTypeError(
+            f"未知输出方式: {', '.join(unknown) or value}（可选: {', '.join(PRESENTATION_MODES)}）")
+    return presentations
+
+
+def build_parser():
+    """命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="无头运行基准场景")
+    parser.add_argument("names", nargs="*", metavar="场景", help="要运行的场景，默认全部")
+    parser.add_argument("--list", action="store_true", help="列出场景")
+    parser.add_argument("--mode", choices=BENCHMARK_MODES, help="只运行一种模式，默认两种都运行")
+    parser.add_argument("--ticks", type=int, help="每个场景运行的帧数，默认使用场景设置")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="随机数种子")
+    parser.add_argument("--zombie-store", action="store_true", help="使用 NumPy 僵尸数组存储")
+    parser.add_argument("--scopes", action="store_true", help="记录各阶段耗时百分位")
+    parser.add_argument("--output", default=DEFAULT_RESULTS_PATH,
+                        help="结果文件（追加写入），--output= 表示不写入")
+    parser.add_argument("--label", help="写入结果的版本标签")
+    parser.add_argument("--present", type=_parse_presentations, default=(None,),
+                        help=f"render 模式的全屏输出方式，逗号分隔（{','.join(PRESENTATION_MODES)}）")
+    parser.add_argument("--screen", type=_parse_screen_size, default=DEFAULT_SCREEN_SIZE,
+                        help="全屏输出的离屏表面尺寸，宽x高")
+    parser.add_argument("--dirty-rects", action="store_true", help="窗口模式的 render 使用脏矩形输出")
+    return parser
+
+
+def main(argv=None):
+    """
+    命令行入口
+
+    用法: python -m benchmarks [场景...] [--mode=sim|render] [--ticks=N] [--seed=N]
+                              [--zombie-store] [--scopes] [--output=路径] [--label=版本]
+                              [--present=letterbox,scaled,transform] [--screen=宽x高] [--dirty-rects]
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, scenario in SCENARIOS.items():
+            print(f"{name:<20} {scenario['description']}")
+        return
+    unknown = [name for name in args.names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"未知场景: {', '.join(unknown)}（--list 列出全部场景）")
+    if args.dirty_rects and (args.mode == "sim" or args.present != (None,)):
+        parser.error("--dirty-rects 只用于窗口模式的 render，不能与 --mode=sim 或 --present 一起使用")
+
+    run_suite(
+        args.names or None,
+        modes=(args.mode,) if args.mode else BENCHMARK_MODES,
+        ticks=args.ticks,
+        seed=args.seed,
+        zombie_store=args.zombie_store,
+        scopes=args.scopes,
+        results_path=args.output or None,
+        label=args.label or None,
+        presentations=args.present,
+        screen_size=args.screen,
+        dirty_rects=args.dirty_rects,
+    )
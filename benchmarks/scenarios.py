@@ -0,0 +1,71 @@
+"""
+基准测试场景 - 固定的棋盘布局和僵尸数量
+
+每个场景是一个字典：
+    level: 关卡编号（决定僵尸类型、特性和传送门等关卡系统）
+    plants: 预先种植的 (row, col, plant_type) 列表
+    zombies: 开局额外放置的僵尸数量
+    zombie_spread: 额外僵尸的列坐标在 [GRID_WIDTH, GRID_WIDTH + zombie_spread) 内随机分布
+    ticks: 默认运行帧数
+    description: 场景说明
+
+所有随机数都来自 sim_clock 的随机数流，相同种子下每次运行的棋盘完全一致。
+"""
+from core.constants import GRID_WIDTH, GRID_HEIGHT
+
+
+def _fill_columns(plant_type, columns):
+    """在指定的列上每行种满同一种植物"""
+    return [(row, col, plant_type) for col in columns for row in range(GRID_HEIGHT)]
+
+
+SCENARIOS = {
+    "peashooter_horde": {
+        "level": 20,
+        "plants": _fill_columns("shooter", range(GRID_WIDTH)),
+        "zombies": 300,
+        "zombie_spread": 4.0,
+        "ticks": 1200,
+        "description": "45个豌豆射手对抗300个僵尸",
+    },
+    "melon_splash": {
+        "level": 20,
+        "plants": _fill_columns("melon_pult", range(4)),
+        "zombies": 150,
+        "zombie_spread": 3.0,
+        "ticks": 1200,
+        "description": "20个西瓜投手的溅射伤害",
+    },
+    "lightning_chain": {
+        "level": 16,
+        "plants": _fill_columns("lightning_flower", range(2)),
+        "zombies": 150,
+        "zombie_spread": 3.0,
+        "ticks": 1200,
+        "description": "10个闪电花的连锁闪电",
+    },
+    "cucumber_explosion": {
+        "level": 14,
+        "plants": [(GRID_HEIGHT // 2, 0, "cucumber")],
+        "zombies": 200,
+        "zombie_spread": 3.0,
+        "ticks": 600,
+        "description": "200个僵尸下的黄瓜全屏爆炸（第60帧爆炸）",
+    },
+    "portal_level": {
+        "level": 18,
+        "plants": _fill_columns("shooter", range(3)),
+        "zombies": 100,
+        "zombie_spread": 3.0,
+        "ticks": 1200,
+        "description": "传送门关卡：僵尸穿越传送门",
+    },
+    "light_board": {
+        "level": 14,
+        "plants": _fill_columns("shooter", range(2)),
+        "zombies": 10,
+        "zombie_spread": 3.0,
+        "ticks": 1200,
+        "description": "10个豌豆射手对抗10个僵尸（普通对局的画面负载，用于比较脏矩形输出）",
+    },
+}
@@ -0,0 +1,269 @@
+"""
+启动时间基准
+
+默认测量加载全部图片（load_all_images + preload_scaled_images）的耗时，依次在三种状态下加载：
+    none: 不使用磁盘缓存，解码全部 PNG 并缩放
+    cold: 磁盘缓存目录为空，解码、缩放并写入缓存
+    warm: 使用上一步写好的缓存，直接映射读取像素
+
+--profile 在子进程中以 python -X importtime main.py --profile-startup 启动游戏，报告每个项目模块的
+导入耗时和到主菜单第一帧的时间。startup_budget.json 中的 deferred_modules 是主菜单不应加载的模块，
+出现在导入记录中时返回值非零。耗时与机器有关，只和本机的 startup_budget.local.json（不纳入版本库，
+由 --update-budget 生成）比较，超出时仅提示。
+
+用法: python -m benchmarks.startup [--repeat=N] [--output=路径] [--label=版本]
+      python -m benchmarks.startup --profile [--repeat=N] [--top=N] [--update-budget]
+--output= 表示不写入结果文件。
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from core.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from rsc_mng.asset_registry import asset_registry
+from rsc_mng.resource_loader import load_all_images, preload_scaled_images
+from .runner import DEFAULT_RESULTS_PATH, get_environment_info
+
+
+STARTUP_CACHE_STATES = ("none", "cold", "warm")
+
+# 项目根目录（子进程在这里运行 main.py）
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 启动预算文件（主菜单不应加载的模块）
+DEFAULT_BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+
+# 本机的耗时预算（毫秒，--update-budget 写入，不纳入版本库）
+DEFAULT_LOCAL_BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.local.json")
+
+# --update-budget 时在实测值上留出的余量（不同机器和多次运行之间的波动）
+BUDGET_HEADROOM = 1.5
+
+# 与本机预算比较的启动指标
+BUDGET_METRICS = ("import_ms", "project_import_ms", "time_to_first_frame_ms")
+
+# main.py --profile-startup 输出的报告行前缀（与 main.STARTUP_PROFILE_PREFIX 一致）
+STARTUP_PROFILE_PREFIX = "startup_profile: "
+
+
+def measure_image_load(cache_dir=None):
+    """清空注册表后加载全部图片，返回耗时和注册表/磁盘缓存统计"""
+    asset_registry.clear()
+    asset_registry.enable_disk_cache(cache_dir)
+    start = time.perf_counter()
+    load_all_images()
+    preload_scaled_images()
+    elapsed = time.perf_counter() - start
+    disk_cache = asset_registry.disk_cache
+    return {
+        "load_ms": elapsed * 1000,
+        "registry": asset_registry.get_stats(),
+        "disk_cache": disk_cache.get_stats() if disk_cache is not None else None,
+    }
+
+
+def run_startup(repeat=3, results_path=DEFAULT_RESULTS_PATH, label=None):
+    """每种缓存状态各测 repeat 次，取最快的一次，打印并追加到结果文件"""
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    environment = get_environment_info(label)
+    results = []
+    try:
+        for state in STARTUP_CACHE_STATES:
+            samples = []
+            for _ in range(repeat):
+                if state == "none":
+                    samples.append(measure_image_load(None))
+                    continue
+                cache_dir = tempfile.mkdtemp(prefix="asset_cache_")
+                try:
+                    if state == "warm":
+                        measure_image_load(cache_dir)
+                    samples.append(measure_image_load(cache_dir))
+                finally:
+                    shutil.rmtree(cache_dir, ignore_errors=True)
+            best = min(samples, key=lambda sample: sample["load_ms"])
+            result = dict(best, benchmark="startup", cache=state, repeat=repeat)
+            result.update(environment)
+            results.append(result)
+            print(f"图片加载 {state:<5} {best['load_ms']:>8.1f} ms  "
+                  f"解码 {best['registry']['sources']:>3} 个PNG  "
+                  f"缓存命中 {best['registry']['cache_hits']:>3}")
+    finally:
+        asset_registry.clear()
+        asset_registry.enable_disk_cache(None)
+        pygame.quit()
+
+    if results_path:
+        with open(results_path, "a", encoding="utf-8") as results_file:
+            for result in results:
+                results_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        print(f"结果已追加到: {results_path}")
+    return results
+
+
+def parse_importtime(stderr):
+    """
+    解析 -X importtime 的输出
+
+    Returns:
+        list: [(模块名, 自身耗时毫秒, 累计耗时毫秒, 嵌套深度)]，按导入完成的顺序
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, depth))
+    return modules
+
+
+def is_project_module(name):
+    """模块是否属于本项目（顶层包或模块在项目根目录下）"""
+    top = name.split(".")[0]
+    return (os.path.isdir(os.path.join(PROJECT_DIR, top))
+            or os.path.isfile(os.path.join(PROJECT_DIR, top + ".py")))
+
+
+def profile_startup_once():
+    """在子进程中启动游戏到第一帧，返回 (阶段耗时, 导入记录)"""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    process = subprocess.run([sys.executable, "-X", "importtime", "main.py", "--profile-startup"],
+                             cwd=PROJECT_DIR, env=env, capture_output=True, text=True, encoding="utf-8")
+    for line in process.stdout.splitlines():
+        if line.startswith(STARTUP_PROFILE_PREFIX):
+            return json.loads(line[len(STARTUP_PROFILE_PREFIX):]), parse_importtime(process.stderr)
+    raise RuntimeError(f"启动失败（返回值 {process.returncode}）:\n{process.stderr[-2000:]}")
+
+
+def load_budget(budget_path=DEFAULT_BUDGET_PATH):
+    try:
+        with open(budget_path, "r", encoding="utf-8") as budget_file:
+            return json.load(budget_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def check_budget(result, budget):
+    """返回主菜单启动时加载了的、应延迟导入的模块名列表"""
+    loaded = set(result["project_modules"])
+    return [name for name in budget.get("deferred_modules", ()) if name in loaded]
+
+
+def check_timing(result, limits):
+    """返回超出本机耗时预算的指标名列表（仅提示）"""
+    return [metric for metric in BUDGET_METRICS
+            if metric in limits and result[metric] > limits[metric]]
+
+
+def run_startup_profile(repeat=3, top=15, budget_path=DEFAULT_BUDGET_PATH, update_budget=False,
+                        results_path=DEFAULT_RESULTS_PATH, label=None, local_budget_path=DEFAULT_LOCAL_BUDGET_PATH):
+    """
+    启动 repeat 次，每个指标取最快的一次，打印项目模块导入耗时并与预算比较
+
+    Returns:
+        dict: 测量结果，over_budget 列出主菜单加载了的延迟导入模块，
+              over_timing 列出超出本机耗时预算的指标（仅提示）
+    """
+    runs = [profile_startup_once() for _ in range(repeat)]
+    result = {metric: min(phases[metric] for phases, _ in runs)
+              for metric in ("import_ms", "init_ms", "first_frame_ms", "time_to_first_frame_ms")}
+
+    # 每个项目模块取各次运行中最快的自身/累计耗时
+    project_modules = {}
+    for _, modules in runs:
+        for name, self_ms, cumulative_ms, _ in modules:
+            if not is_project_module(name):
+                continue
+            best = project_modules.get(name)
+            if best is None or self_ms < best[0]:
+                project_modules[name] = (self_ms, cumulative_ms)
+    result["project_import_ms"] = sum(self_ms for self_ms, _ in project_modules.values())
+    result["project_modules"] = {name: {"self_ms": self_ms, "cumulative_ms": cumulative_ms}
+                                 for name, (self_ms, cumulative_ms) in project_modules.items()}
+
+    budget = load_budget(budget_path)
+    limits = load_budget(local_budget_path)
+    if update_budget:
+        limits = {metric: round(result[metric] * BUDGET_HEADROOM, 1) for metric in BUDGET_METRICS}
+        with open(local_budget_path, "w", encoding="utf-8") as budget_file:
+            json.dump(limits, budget_file, ensure_ascii=False, indent=2)
+            budget_file.write("\n")
+        print(f"本机耗时预算已更新: {local_budget_path}")
+    result["over_budget"] = check_budget(result, budget)
+    result["over_timing"] = check_timing(result, limits)
+
+    print(f"{'模块':<36} {'自身 ms':>9} {'累计 ms':>9}")
+    slowest = sorted(project_modules.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (self_ms, cumulative_ms) in slowest[:top]:
+        print(f"{name:<36} {self_ms:>9.2f} {cumulative_ms:>9.2f}")
+    for metric in BUDGET_METRICS + ("init_ms", "first_frame_ms"):
+        limit = limits.get(metric)
+        status = "" if limit is None else f"  本机预算 {limit:.1f}" + ("  超出（仅提示）" if result[metric] > limit else "")
+        print(f"{metric:<24} {result[metric]:>9.1f} ms{status}")
+    for name in budget.get("deferred_modules", ()):
+        if name in project_modules:
+            print(f"主菜单启动时加载了应延迟导入的模块: {name}")
+
+    if results_path:
+        record = dict(result, benchmark="startup_profile", repeat=repeat)
+        record.update(get_environment_info(label))
+        with open(results_path, "a", encoding="utf-8") as results_file:
+            results_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"结果已追加到: {results_path}")
+    return result
+
+
+def build_parser():
+    """命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description="测量启动耗时")
+    parser.add_argument("--profile", action="store_true",
+                        help="在子进程中启动游戏，报告模块导入耗时和到第一帧的时间并与预算比较")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数，取最快的一次")
+    parser.add_argument("--top", type=int, help="--profile 时列出最慢的模块数，默认 15")
+    parser.add_argument("--update-budget", action="store_true",
+                        help="--profile 时以本次结果更新本机耗时预算（startup_budget.local.json）")
+    parser.add_argument("--output", default=DEFAULT_RESULTS_PATH,
+                        help="结果文件（追加写入），--output= 表示不写入")
+    parser.add_argument("--label", help="写入结果的版本标签")
+    return parser
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat 必须至少为 1")
+    if not args.profile and (args.update_budget or args.top is not None):
+        parser.error("--top 和 --update-budget 只能与 --profile 一起使用")
+    if args.profile:
+        result = run_startup_profile(
+            repeat=args.repeat,
+            top=15 if args.top is None else args.top,
+            update_budget=args.update_budget,
+            results_path=args.output or None,
+            label=args.label or None,
+        )
+        if result["over_budget"]:
+            sys.exit(1)
+        return
+    run_startup(
+        repeat=args.repeat,
+        results_path=args.output or None,
+        label=args.label or None,
+    )
+
+if __name__ == "__main__":
+    main()
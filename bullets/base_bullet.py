@@ -4,12 +4,19 @@
 """
 import pygame
 import math
-import random
+from sim_clock import get_rng
+from render_queue import LAYER_BULLETS
 
 
 class BaseBullet:
     """所有子弹的基础类 - 支持传送门穿越"""
 
+    # 只绘制一张居中图片的子弹在子类中设置图片键，渲染队列直接批量提交该图片；
+    # 为None时 queue_sprites 退回到 draw(surface)
+    sprite_image_key = None
+    # draw 以子弹中心为圆心可能绘制到的最大半径（传送门光晕7像素，默认圆点和子弹图片都在其内）
+    draw_radius = 16
+
     def __init__(self, row, col, bullet_type="base", constants=None, images=None, **kwargs):
         self.row = row
         self.col = col
@@ -135,13 +142,13 @@ class BaseBullet:
             return 0
 
         # 对于穿透子弹，检查是否已经击中过这个僵尸
-        zombie_id = id(zombie)
+        zombie_id = zombie.entity_id
         if self.can_penetrate and zombie_id in self.hit_zombies:
             return 0
 
         # 检查僵尸是否触发免疫
         if (hasattr(zombie, 'immunity_chance') and
-                random.random() < zombie.immunity_chance):
+                get_rng("immunity").random() < zombie.immunity_chance):
             self.hit_zombies.add(zombie_id)
             return 2  # 免疫
 
@@ -194,6 +201,34 @@ class BaseBullet:
         # 子类应该重写这个方法来绘制特定的子弹外观
         self._draw_bullet(surface, x, y)
 
+    def get_screen_center(self):
+        """子弹中心的像素坐标（含抛物线的垂直偏移），与 draw 中的计算相同"""
+        constants = self.constants
+        display_col, display_row, vertical_offset = self.get_display_position()
+        x = constants['BATTLEFIELD_LEFT'] + int(display_col * (constants['GRID_SIZE'] + constants['GRID_GAP']))
+        y = (constants['BATTLEFIELD_TOP'] + display_row * (constants['GRID_SIZE'] + constants['GRID_GAP']) +
+             constants['GRID_SIZE'] // 2)
+        y -= int(vertical_offset * constants['GRID_SIZE'])
+        return x, y
+
+    def get_draw_bounds(self):
+        """draw 可能绘制到的区域：以子弹中心为圆心、draw_radius 为半径的正方形"""
+        if not self.constants:
+            return pygame.Rect(0, 0, 0, 0)
+        x, y = self.get_screen_center()
+        radius = self.draw_radius
+        return pygame.Rect(x - radius, y - radius, radius * 2 + 1, radius * 2 + 1)
+
+    def queue_sprites(self, render_queue):
+        """把子弹提交到渲染队列"""
+        image = self.images.get(self.sprite_image_key) if self.sprite_image_key and self.images else None
+        if image is None or not self.constants or self.has_traveled_through_portal:
+            render_queue.submit_draw(LAYER_BULLETS, self.draw, self.get_draw_bounds())
+            return
+
+        x, y = self.get_screen_center()
+        render_queue.submit(LAYER_BULLETS, image, (x - 10, y - 10))
+
     def _draw_portal_effect(self, surface, x, y):
         """绘制传送门穿越效果"""
         # 添加青色光晕效果表示子弹穿越了传送门
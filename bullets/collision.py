@@ -0,0 +1,139 @@
+"""
+子弹碰撞批处理 - 豌豆和寒冰子弹与僵尸的重叠检测
+
+每帧先把直线飞行的子弹按行分组，把每行僵尸的列坐标收集成数组排序一次，
+再对该行所有子弹的列坐标做一次二分查找，得到每颗子弹重叠的僵尸。
+结算时只对这些候选僵尸调用 attack_zombie，穿透记录（hit_zombies）和
+免疫判定（immunity_chance）仍由子弹对象处理，随机数的消耗顺序与逐个检测时一致。
+命中音效在所有子弹结算完成后根据命中列表统一播放。
+
+NumPy 是可选依赖，未安装时用 bisect 完成同样的查找。
+"""
+from bisect import bisect_left, bisect_right
+
+from sim_clock import get_rng
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 走批量碰撞检测的直线子弹类型（同行、列差小于 HIT_RANGE 即命中）
+LINEAR_BULLET_TYPES = ("pea", "ice")
+
+# 子弹与僵尸的命中距离（列）
+HIT_RANGE = 0.5
+
+# 二分查找时放宽的边界，最终仍按 abs(列差) < HIT_RANGE 精确判断
+SEARCH_EPSILON = 1e-9
+
+
+def find_overlapping_zombies(bullet_list, zombie_grid):
+    """
+    批量查找每颗直线子弹重叠的僵尸
+
+    Args:
+        bullet_list: 子弹列表，只处理 LINEAR_BULLET_TYPES 中的子弹
+        zombie_grid: 常驻僵尸空间索引
+
+    Returns:
+        dict: 子弹 -> 重叠僵尸列表（按空间索引中的行内顺序，与逐个遍历一致）
+    """
+    bullets_by_row = {}
+    for bullet in bullet_list:
+        if bullet.bullet_type in LINEAR_BULLET_TYPES:
+            bullets_by_row.setdefault(bullet.row, []).append(bullet)
+
+    overlaps = {}
+    for row, row_bullets in bullets_by_row.items():
+        zombies = zombie_grid.get_zombies_in_row(row)
+        if zombies:
+            _find_row_overlaps(zombies, row_bullets, overlaps)
+    return overlaps
+
+
+def _find_row_overlaps(zombies, row_bullets, overlaps):
+    """在一行内用排序后的僵尸列坐标为所有子弹查找重叠区间"""
+    zombie_count = len(zombies)
+    bullet_cols = [bullet.col for bullet in row_bullets]
+
+    if np is not None:
+        cols_array = np.fromiter((zombie.col for zombie in zombies), dtype="float64", count=zombie_count)
+        order = np.argsort(cols_array, kind="stable")
+        sorted_cols = cols_array[order]
+        search_cols = np.array(bullet_cols)
+        starts = np.searchsorted(sorted_cols, search_cols - (HIT_RANGE + SEARCH_EPSILON), side="left").tolist()
+        ends = np.searchsorted(sorted_cols, search_cols + (HIT_RANGE + SEARCH_EPSILON), side="right").tolist()
+        cols = cols_array.tolist()
+        order = order.tolist()
+    else:
+        cols = [zombie.col for zombie in zombies]
+        order = sorted(range(zombie_count), key=cols.__getitem__)
+        sorted_cols = [cols[index] for index in order]
+        starts = [bisect_left(sorted_cols, col - (HIT_RANGE + SEARCH_EPSILON)) for col in bullet_cols]
+        ends = [bisect_right(sorted_cols, col + (HIT_RANGE + SEARCH_EPSILON)) for col in bullet_cols]
+
+    for bullet, bullet_col, start, end in zip(row_bullets, bullet_cols, starts, ends):
+        if start == end:
+            continue
+        # 恢复行内顺序，保证与逐个遍历时的命中顺序相同
+        hits = sorted(index for index in order[start:end]
+                      if abs(cols[index] - bullet_col) < HIT_RANGE)
+        if hits:
+            overlaps[bullet] = [zombies[index] for index in hits]
+
+
+def resolve_bullet_hits(bullet, zombies, level_settings, hit_events):
+    """
+    按顺序结算一颗直线子弹对重叠僵尸的攻击
+
+    豌豆子弹命中或被免疫后停止；寒冰子弹命中后继续冻结后面的僵尸，被免疫时停止。
+    击杀的僵尸立即开始死亡动画，后面的子弹不会再打中它。
+
+    Args:
+        bullet: 豌豆或寒冰子弹
+        zombies: find_overlapping_zombies 得到的重叠僵尸
+        level_settings: 关卡设置
+        hit_events: 命中列表，追加 (子弹, 僵尸, 攻击结果, 是否打在防具上)
+
+    Returns:
+        bool: 子弹是否应该被移除
+    """
+    for zombie in zombies:
+        attack_result = bullet.attack_zombie(zombie, level_settings)
+        if attack_result == 0:
+            continue
+
+        hit_events.append((bullet, zombie, attack_result,
+                           zombie.has_armor and zombie.armor_health > 0))
+
+        if attack_result == 1:
+            if zombie.health <= 0 and not zombie.is_dying:
+                zombie.start_death_animation()
+            if bullet.bullet_type == "ice":
+                continue
+
+        return not bullet.can_penetrate
+
+    return False
+
+
+def play_hit_sounds(hit_events, sounds):
+    """根据命中列表播放音效，每颗子弹只播放第一次命中的音效"""
+    if not sounds:
+        return
+
+    sounded_bullets = set()
+    for bullet, zombie, attack_result, armor_hit in hit_events:
+        if bullet in sounded_bullets:
+            continue
+        sounded_bullets.add(bullet)
+
+        hit_sound = sounds.get("armor_hit" if armor_hit else "zombie_hit")
+        if hit_sound:
+            hit_sound.play()
+
+        if bullet.bullet_type == "ice" and get_rng("effects").random() < 0.1:
+            if sounds.get("冻结"):
+                sounds["冻结"].play()
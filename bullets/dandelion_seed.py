@@ -3,7 +3,8 @@
 """
 import pygame
 import math
-import random
+from sim_clock import get_rng
+from rsc_mng.transform_cache import get_rotated, blit_with_alpha
 
 
 class DandelionSeed:
@@ -26,14 +27,14 @@ class DandelionSeed:
         self.max_life_time = 250  # 4秒生命周期
 
         # 风吹效果参数
-        self.wind_amplitude = random.uniform(0.3, 0.5)  # 摆动幅度
-        self.wind_frequency = random.uniform(0.02, 0.05)  # 摆动频率
-        self.drift_speed_x = random.uniform(0.8, 1.2)  # 水平漂移速度倍数
-        self.drift_speed_y = random.uniform(0.6, 1.0)  # 垂直漂移速度倍数
+        self.wind_amplitude = get_rng("particles").uniform(0.3, 0.5)  # 摆动幅度
+        self.wind_frequency = get_rng("particles").uniform(0.02, 0.05)  # 摆动频率
+        self.drift_speed_x = get_rng("particles").uniform(0.8, 1.2)  # 水平漂移速度倍数
+        self.drift_speed_y = get_rng("particles").uniform(0.6, 1.0)  # 垂直漂移速度倍数
 
         # 旋转效果
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-3, 3)
+        self.rotation = get_rng("particles").uniform(0, 360)
+        self.rotation_speed = get_rng("particles").uniform(-3, 3)
 
         # 状态
         self.has_hit = False
@@ -236,6 +237,19 @@ class DandelionSeed:
             fade_alpha = base_alpha * (1.0 - fade_progress)
             return int(max(0, fade_alpha))
 
+    def get_draw_bounds(self):
+        """draw 可能绘制到的区域：以种子为中心，包含旋转后的种子图片和向左的飘散尾迹"""
+        if not self.constants:
+            return pygame.Rect(0, 0, 0, 0)
+        x = int(self.constants['BATTLEFIELD_LEFT'] +
+                self.current_x * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']))
+        y = int(self.constants['BATTLEFIELD_TOP'] +
+                self.current_y * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
+                self.constants['GRID_SIZE'] // 2)
+        # 24x24 的图片旋转后最大约 34x34；尾迹最远在左侧 wind_amplitude * 10 像素处，半径3像素
+        radius = max(18, int(abs(self.wind_amplitude) * 10) + 5)
+        return pygame.Rect(x - radius, y - radius, radius * 2 + 1, radius * 2 + 1)
+
     def draw(self, surface):
         """绘制蒲公英种子，支持渐隐效果"""
         if not self.constants:
@@ -259,19 +273,12 @@ class DandelionSeed:
             # 使用种子图片
             seed_img = self.images['dandelion_seed_img']
 
-            # 旋转图片
-            if abs(self.rotation) > 0.1:
-                rotated_img = pygame.transform.rotate(seed_img, self.rotation)
-            else:
-                rotated_img = seed_img
-
-            # 应用透明度
-            rotated_img = rotated_img.copy()
-            rotated_img.set_alpha(alpha)
+            # 从旋转图集取图片（角度量化，所有种子共享）
+            rotated_img = get_rotated(seed_img, self.rotation)
 
-            # 绘制种子
+            # 以当前透明度绘制种子
             rect = rotated_img.get_rect(center=(int(x), int(y)))
-            surface.blit(rotated_img, rect)
+            blit_with_alpha(surface, rotated_img, rect, alpha)
         else:
             # 默认绘制：白色小圆点带尾迹
             # 主体种子
@@ -1,7 +1,7 @@
 """
 冰子弹类 - 具有冰冻效果的特殊子弹
 """
-import random
+from sim_clock import get_rng, get_ticks
 
 import pygame
 import math
@@ -11,6 +11,8 @@ from .base_bullet import BaseBullet
 class IceBullet(BaseBullet):
     """冰子弹类 - 造成伤害并冰冻敌人的特殊子弹"""
 
+    sprite_image_key = 'ice_bullet_img'
+
     def __init__(self, row, col, constants=None, images=None, **kwargs):
         super().__init__(row, col, bullet_type="ice", constants=constants, images=images, **kwargs)
 
@@ -32,7 +34,7 @@ class IceBullet(BaseBullet):
         if zombie.is_dying or not self.can_hit_zombie(zombie):
             return 0
 
-        zombie_id = id(zombie)
+        zombie_id = zombie.entity_id
 
         # 对于寒冰子弹，检查是否已经冻结过这个僵尸
         if zombie_id in self.freeze_applied_zombies:
@@ -40,7 +42,7 @@ class IceBullet(BaseBullet):
 
         # 检查免疫
         if (hasattr(zombie, 'immunity_chance') and
-                random.random() < zombie.immunity_chance):
+                get_rng("immunity").random() < zombie.immunity_chance):
             self.freeze_applied_zombies.add(zombie_id)
             return 2
 
@@ -61,7 +63,7 @@ class IceBullet(BaseBullet):
 
         # 应用冰冻效果（如果僵尸还活着）
         if zombie.health > 0:
-            current_time = pygame.time.get_ticks()
+            current_time = get_ticks()
 
             # 如果僵尸已经被冰冻，重置冰冻计时器
             if getattr(zombie, 'is_frozen', False):
@@ -2,14 +2,18 @@
 西瓜子弹类 - 具有抛物线轨迹和溅射伤害的强力子弹
 """
 import pygame
-import math
-import random
+from sim_clock import get_rng
+from rsc_mng.transform_cache import get_scaled
+from particle_system import emit_melon_splash
 from .base_bullet import BaseBullet
 
 
 class MelonBullet(BaseBullet):
     """西瓜子弹类 - 抛物线飞行，着陆爆炸造成溅射伤害"""
 
+    # 40x40 的西瓜图片绘制在中心左上方12像素处，右下角离中心28像素
+    draw_radius = 30
+
     def __init__(self, row, col, target_col=None, constants=None, images=None, **kwargs):
         super().__init__(row, col, bullet_type="melon", constants=constants, images=images, **kwargs)
 
@@ -33,29 +37,10 @@ class MelonBullet(BaseBullet):
         self.splash_effect_duration = 30  # 30帧显示溅射效果
 
         # 西瓜爆炸烟花效果
-        self.explosion_particles = []
+        self.explosion_particle_life = 0  # 爆炸粒子剩余帧数
         self.show_explosion = False
         self.explosion_triggered = False
 
-    def update(self, zombies_list=None):
-        """更新西瓜子弹的抛物线飞行"""
-        # 增加飞行进度
-        self.flight_progress += self.flight_speed
-
-        # 如果飞行进度超过1，表示已经到达目标位置
-        if self.flight_progress >= 1.0:
-            self.flight_progress = 1.0
-            self.has_landed = True
-            self.col = self.target_col
-            return False  # 不移除，等待碰撞检测
-
-        # 计算当前水平位置（线性插值）
-        self.col = self.start_col + (self.target_col - self.start_col) * self.flight_progress
-
-        # 检查是否超出屏幕右边缘
-        grid_width = self.constants['GRID_WIDTH'] if self.constants else 9
-        return self.col > grid_width
-
     def can_hit_zombie(self, zombie):
         """西瓜子弹的碰撞检测（仅在落地后）"""
         if zombie.is_dying:
@@ -72,7 +57,7 @@ class MelonBullet(BaseBullet):
         vertical_distance = abs(zombie.row - self.row)
 
         # 修复：只排除已经受到直接伤害的僵尸，而不是排除所有接近的僵尸
-        if id(zombie) in self.hit_zombies:
+        if zombie.entity_id in self.hit_zombies:
             return False  # 已经受到直接伤害，不再给予溅射伤害
 
         # 椭圆公式: (x/a)² + (y/b)² <= 1, 其中a=1.0, b=1.5
@@ -86,9 +71,9 @@ class MelonBullet(BaseBullet):
 
         splash_count = 0
         for zombie in zombies:
-            if self.can_splash_hit_zombie(zombie) and id(zombie) not in self.splash_hit_zombies:
+            if self.can_splash_hit_zombie(zombie) and zombie.entity_id not in self.splash_hit_zombies:
                 # 记录已溅射击中的僵尸
-                self.splash_hit_zombies.add(id(zombie))
+                self.splash_hit_zombies.add(zombie.entity_id)
 
                 # 溅射伤害直接作用于僵尸本体，无视护甲
                 zombie.health -= self.splash_dmg
@@ -107,13 +92,13 @@ class MelonBullet(BaseBullet):
         if zombie.is_dying or not self.can_hit_zombie(zombie):
             return 0
 
-        zombie_id = id(zombie)
+        zombie_id = zombie.entity_id
         if zombie_id in self.hit_zombies:
             return 0
 
         # 检查免疫
         if (hasattr(zombie, 'immunity_chance') and
-                random.random() < zombie.immunity_chance):
+                get_rng("immunity").random() < zombie.immunity_chance):
             self.hit_zombies.add(zombie_id)
             return 2
 
@@ -155,65 +140,15 @@ class MelonBullet(BaseBullet):
                        self.constants['GRID_SIZE'] // 2)
         explosion_y -= int(vertical_offset * self.constants['GRID_SIZE'])
 
-        # 创建粒子
-        for _ in range(max_particles):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(1, 2)
-            size = random.randint(2, 6)
-            life = random.randint(20, 60)
-
-            color_choice = random.choice([
-                (255, 100, 100),  # 红色果肉
-                (255, 150, 150),  # 浅红色果肉
-                (30, 30, 30),  # 黑色西瓜籽
-                (100, 200, 100),  # 绿色西瓜皮
-                (255, 200, 200),  # 粉红色果肉
-            ])
-
-            gravity_factor = random.uniform(0.15, 0.25)
-            air_resistance = random.uniform(0.92, 0.98)
-
-            self.explosion_particles.append({
-                'x': explosion_x,
-                'y': explosion_y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed - random.uniform(0.5, 1.5),
-                'size': size,
-                'color': color_choice,
-                'life': life,
-                'max_life': life,
-                'gravity': gravity_factor,
-                'resistance': air_resistance,
-                'rotation': random.uniform(0, 360),
-                'rotation_speed': random.uniform(-10, 10)
-            })
+        # 创建粒子（粒子本身由全局粒子系统更新和绘制，这里只记录剩余帧数）
+        self.explosion_particle_life = emit_melon_splash(explosion_x, explosion_y, max_particles)
 
     def update_explosion_particles(self):
-        """更新爆炸粒子"""
-        for particle in self.explosion_particles[:]:
-            # 更新位置
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-
-            # 应用重力
-            particle['vy'] += particle['gravity']
-
-            # 应用空气阻力
-            particle['vx'] *= particle['resistance']
-            particle['vy'] *= particle['resistance']
-
-            # 更新旋转
-            particle['rotation'] += particle['rotation_speed']
-
-            # 减少生命值
-            particle['life'] -= 1
-
-            # 移除生命结束的粒子
-            if particle['life'] <= 0:
-                self.explosion_particles.remove(particle)
+        """更新爆炸粒子倒计时"""
+        self.explosion_particle_life -= 1
 
         # 如果所有粒子都消失了，停止显示爆炸效果
-        if not self.explosion_particles:
+        if self.explosion_particle_life <= 0:
             self.show_explosion = False
 
     def get_display_position(self):
@@ -231,41 +166,11 @@ class MelonBullet(BaseBullet):
         # 西瓜子弹绘制逻辑
         if not self.explosion_triggered:
             if self.images and self.images.get('watermelon_bullet_img'):
-                melon_bullet_img = pygame.transform.scale(self.images['watermelon_bullet_img'], (40, 40))
+                melon_bullet_img = get_scaled(self.images['watermelon_bullet_img'], (40, 40))
                 surface.blit(melon_bullet_img, (x - 12, y - 12))
             else:
                 pygame.draw.circle(surface, (255, 100, 100), (x, y), 8)
 
-        if self.show_explosion:
-            self.draw_explosion_particles(surface)
-
-    def draw_explosion_particles(self, surface):
-        """绘制爆炸粒子"""
-        for particle in self.explosion_particles:
-            # 计算透明度基于生命值
-            alpha = int(255 * (particle['life'] / particle['max_life']))
-            color = (*particle['color'], alpha)
-
-            # 根据粒子大小选择绘制方式
-            if particle['size'] <= 3:
-                # 小粒子绘制为圆点
-                particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-                pygame.draw.circle(particle_surface, color,
-                                   (particle['size'], particle['size']), particle['size'])
-            else:
-                # 大粒子绘制为旋转的小方块，模拟西瓜块
-                particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-                # 创建旋转的矩形
-                rect_surface = pygame.Surface((particle['size'], particle['size']), pygame.SRCALPHA)
-                rect_surface.fill(color)
-                rotated_surface = pygame.transform.rotate(rect_surface, particle['rotation'])
-                rect_rect = rotated_surface.get_rect(center=(particle['size'], particle['size']))
-                particle_surface.blit(rotated_surface, rect_rect)
-
-            # 绘制粒子到屏幕
-            surface.blit(particle_surface, (int(particle['x'] - particle['size']),
-                                            int(particle['y'] - particle['size'])))
-
     def update(self, zombies_list=None):
         """重写update方法，包含爆炸粒子更新"""
         # 更新爆炸粒子
@@ -292,4 +197,5 @@ class MelonBullet(BaseBullet):
 
         # 检查是否超出屏幕右边缘
         grid_width = self.constants['GRID_WIDTH'] if self.constants else 9
-        return self.col > grid_width
\ No newline at end of file
+        return self.col > grid_width
+
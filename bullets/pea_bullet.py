@@ -8,6 +8,8 @@ from .base_bullet import BaseBullet
 class PeaBullet(BaseBullet):
     """豌豆子弹类 - 植物大战僵尸的基础子弹"""
 
+    sprite_image_key = 'pea_img'
+
     def __init__(self, row, col, can_penetrate=False, constants=None, images=None, **kwargs):
         super().__init__(row, col, bullet_type="pea", constants=constants, images=images, **kwargs)
 
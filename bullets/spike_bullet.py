@@ -3,6 +3,7 @@
 """
 import pygame
 import math
+from rsc_mng.transform_cache import get_rotated
 from .base_bullet import BaseBullet
 
 
@@ -210,7 +211,7 @@ class SpikeBullet(BaseBullet):
         if spike_img:
             # 根据飞行方向旋转尖刺图片
             angle = math.degrees(math.atan2(self.direction_y, self.direction_x))
-            rotated_img = pygame.transform.rotate(spike_img, -angle)
+            rotated_img = get_rotated(spike_img, -angle)
             rect = rotated_img.get_rect(center=(x, y))
             surface.blit(rotated_img, rect)
         else:
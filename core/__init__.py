@@ -2,16 +2,35 @@
 """
 游戏核心模块包
 包含游戏的核心逻辑、管理器和基础组件
+
+除常量外，导出的管理器和工厂函数在第一次访问时才导入所在的子模块，
+导入 core.constants 不会连带加载事件处理、游戏逻辑以及它们依赖的植物、僵尸和子弹模块。
 """
+import importlib
 
-# 导出主要的管理器和工厂函数，方便外部导入
-from .cards_manager import cards_manager, get_available_cards_new, get_plant_select_grid_new
-from .features_manager import features_manager
-from .game_state_manager import GameStateManager
-from .level_manager import LevelManager
-from .event_handler import EventHandler
 from .constants import *
 
+# 导出名 -> 所在子模块（第一次访问时导入）
+_LAZY_EXPORTS = {
+    'cards_manager': '.cards_manager',
+    'get_available_cards_new': '.cards_manager',
+    'get_plant_select_grid_new': '.cards_manager',
+    'features_manager': '.features_manager',
+    'GameStateManager': '.game_state_manager',
+    'LevelManager': '.level_manager',
+    'EventHandler': '.event_handler',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     'cards_manager',
     'get_available_cards_new',
@@ -2,10 +2,12 @@
 事件处理模块 - 负责处理用户输入、鼠标点击等事件（已修复开始战斗按钮和滑块拖拽，添加小推车点击检测，新增图鉴功能）
 """
 import pygame
-from ui import *
-from .game_logic import *
+from .constants import *
+from ui.ui_manager import (
+    draw_main_menu, draw_level_select, draw_continue_dialog, show_game_over,
+    show_settings_menu_with_hotreload, draw_shop_page
+)
 from rsc_mng.audio_manager import play_sound_with_music_pause, set_sounds_volume
-from database import *
 
 
 
@@ -1001,7 +1003,8 @@ class EventHandler:
         if level_num >= 9 and self.game_manager.plant_selection_manager.has_selected_plants():
             self.game_manager.plant_selection_manager.mark_returning_to_plant_select()
 
-        # 检查该关卡是否有保存的进度
+        # 检查该关卡是否有保存的进度（存档模块依赖游戏逻辑，进入关卡前才导入）
+        from database import check_level_has_save
         if check_level_has_save(self.game_manager.game_db, level_num):
             # 有保存进度，显示继续游戏对话框
             self.game_manager.state_manager.show_continue_dialog_for_level(level_num)
@@ -1157,6 +1160,7 @@ class EventHandler:
         selected_before = self.game_manager.game["selected"]
 
         # 处理植物种植（保持原有逻辑不变）
+        from .game_logic import handle_plant_placement
         plant_placed = handle_plant_placement(
             self.game_manager.game, cards, x, y,
             self.game_manager.game["level_manager"],
@@ -1,16 +1,17 @@
 """
 游戏逻辑处理模块
 """
-import pygame
-import random
 
 
 
 from .constants import *
-from performance import SpatialGrid
+from sim_clock import get_rng, get_ticks
+from entity_list import EntityList
 from plants import Plant
 from zombies import *
 import bullets
+from bullets.collision import (LINEAR_BULLET_TYPES, find_overlapping_zombies,
+                               resolve_bullet_hits, play_hit_sounds)
 from .cards_manager import get_available_cards_new, cards_manager
 from zombies import create_zombie
 import bullets
@@ -30,7 +31,7 @@ def create_zombie_for_level(row, level_manager, is_fast=False, level_settings=No
     zombie_type = "normal"
     if level_manager.current_level >= 13:
         # 10%概率生成巨人僵尸
-        if random.random() < 0.1:
+        if get_rng("spawn").random() < 0.1:
             zombie_type = "giant"
 
     # 使用工厂方法创建僵尸
@@ -50,19 +51,66 @@ def create_zombie_for_level(row, level_manager, is_fast=False, level_settings=No
     return zombie
 
 
+def add_zombie_to_game(game, zombie, entity_id=None):
+    """
+    把僵尸加入游戏：分配实体ID，并登记到数组存储（如果启用）和空间索引
+
+    entity_id: 读档时沿用存档中的实体ID，为None时分配新ID
+    """
+    game["entities"].register(zombie, entity_id)
+    game["zombies"].append(zombie)
+    if game.get("zombie_store") is not None:
+        game["zombie_store"].add(zombie)
+    game["zombie_grid"].add_zombie(zombie)
+
+
+def remove_zombie_from_game(game, zombie):
+    """把僵尸移出游戏，同时从空间索引、数组存储和实体注册表中移除"""
+    game["zombies"].remove(zombie)
+    game["zombie_grid"].remove_zombie(zombie)
+    if game.get("zombie_store") is not None:
+        game["zombie_store"].remove(zombie)
+    game["entities"].unregister(zombie)
+
+
+def add_plant_to_game(game, plant):
+    """把植物加入游戏：分配实体ID，并登记到植物占用网格"""
+    game["entities"].register(plant)
+    game["plants"].append(plant)
+    game["plant_grid"].add_plant(plant)
+
+
+def remove_plant_from_game(game, plant):
+    """把植物移出游戏，同时释放占用网格中的格子"""
+    game["plants"].remove(plant)
+    game["plant_grid"].remove_plant(plant)
+    game["entities"].unregister(plant)
+
+
 def update_bullets(game, level_manager, level_settings=None, sounds=None):
     """优化后的子弹更新逻辑，使用 bullets 模块"""
 
     # 更新冰冻效果
     update_freeze_effects(game)
 
-    # 创建空间分区并添加僵尸
-    spatial_grid = SpatialGrid(GRID_WIDTH, GRID_HEIGHT)
-    for zombie in game["zombies"]:
-        spatial_grid.add_zombie(zombie)
+    # 常驻空间索引，僵尸移动时已经增量更新
+    spatial_grid = game["zombie_grid"]
+
+    # 1. 直线子弹（豌豆、寒冰）先移动，再批量查找与僵尸的重叠
+    for bullet in game["bullets"].iterate():
+        if bullet.bullet_type in LINEAR_BULLET_TYPES and bullet.update(game["zombies"]):
+            game["bullets"].remove(bullet)
+    overlaps = find_overlapping_zombies(game["bullets"], spatial_grid)
+
+    # 2. 按子弹顺序结算命中，免疫判定的随机数顺序与逐个检测时一致
+    hit_events = []
+    for bullet in game["bullets"].iterate():
+        if bullet.bullet_type in LINEAR_BULLET_TYPES:
+            if resolve_bullet_hits(bullet, overlaps.get(bullet, ()), level_settings, hit_events):
+                game["bullets"].remove(bullet)
+            continue
 
-    for bullet in game["bullets"][:]:
-        # 更新子弹位置
+        # 西瓜、尖刺子弹逐个更新位置（尖刺子弹会追踪僵尸）
         if bullet.update(game["zombies"]):
             game["bullets"].remove(bullet)
             continue
@@ -104,7 +152,7 @@ def update_bullets(game, level_manager, level_settings=None, sounds=None):
 
                         for zombie in game["zombies"]:
                             if (zombie.health <= 0 and not zombie.is_dying and
-                                    id(zombie) in bullet.splash_hit_zombies):
+                                    zombie.entity_id in bullet.splash_hit_zombies):
                                 zombie.start_death_animation()
                 elif bullet.has_landed:
                     bullet.has_hit_target = True
@@ -149,88 +197,6 @@ def update_bullets(game, level_manager, level_settings=None, sounds=None):
                     bullet_removed = True
                     break
 
-        elif bullet.bullet_type == "ice":
-            # 寒冰子弹的处理逻辑
-            zombies_to_check = spatial_grid.get_zombies_in_row(bullet.row)
-            for zombie in zombies_to_check:
-                attack_result = bullet.attack_zombie(zombie, level_settings)
-                if attack_result == 1:
-                    hit_any_zombie = True
-                    if not hit_sound_played and sounds:
-                        if zombie.has_armor and zombie.armor_health > 0:
-                            if sounds.get("armor_hit"):
-                                sounds["armor_hit"].play()
-                        else:
-                            if sounds.get("zombie_hit"):
-                                sounds["zombie_hit"].play()
-                        hit_sound_played = True
-                        if random.random() < 0.1:
-                            if sounds.get("冻结"):
-                                sounds["冻结"].play()
-
-                    if zombie.health <= 0 and not zombie.is_dying:
-                        zombie.start_death_animation()
-
-                elif attack_result == 2:  # 免疫
-                    if not hit_sound_played and sounds:
-                        if zombie.has_armor and zombie.armor_health > 0:
-                            if sounds.get("armor_hit"):
-                                sounds["armor_hit"].play()
-                        else:
-                            if sounds.get("zombie_hit"):
-                                sounds["zombie_hit"].play()
-                        hit_sound_played = True
-                        if random.random() < 0.1:
-                            if sounds.get("冻结"):
-                                sounds["冻结"].play()
-
-                    if not bullet.can_penetrate:
-                        game["bullets"].remove(bullet)
-                        bullet_removed = True
-                    break
-
-        else:
-            # 普通子弹的处理逻辑（豌豆射手）
-            zombies_to_check = spatial_grid.get_zombies_in_row(bullet.row)
-
-            for zombie in zombies_to_check:
-                attack_result = bullet.attack_zombie(zombie, level_settings)
-                if attack_result == 1:
-                    hit_any_zombie = True
-
-                    if not hit_sound_played and sounds:
-                        if zombie.has_armor and zombie.armor_health > 0:
-                            if sounds.get("armor_hit"):
-                                sounds["armor_hit"].play()
-                        else:
-                            if sounds.get("zombie_hit"):
-                                sounds["zombie_hit"].play()
-                        hit_sound_played = True
-
-                    if zombie.health <= 0 and not zombie.is_dying:
-                        zombie.start_death_animation()
-
-                    if not bullet.can_penetrate:
-                        game["bullets"].remove(bullet)
-                        bullet_removed = True
-                        break
-                    break
-
-                elif attack_result == 2:  # 免疫
-                    if not hit_sound_played and sounds:
-                        if zombie.has_armor and zombie.armor_health > 0:
-                            if sounds.get("armor_hit"):
-                                sounds["armor_hit"].play()
-                        else:
-                            if sounds.get("zombie_hit"):
-                                sounds["zombie_hit"].play()
-                        hit_sound_played = True
-
-                    if not bullet.can_penetrate:
-                        game["bullets"].remove(bullet)
-                        bullet_removed = True
-                    break
-
         if bullet_removed:
             continue
 
@@ -243,24 +209,24 @@ def update_bullets(game, level_manager, level_settings=None, sounds=None):
                 not bullet.show_explosion and bullet in game["bullets"]):
             game["bullets"].remove(bullet)
 
+    # 3. 直线子弹的命中音效统一根据命中列表播放
+    play_hit_sounds(hit_events, sounds)
+
 
 def update_plant_shooting(game, level_manager, sounds=None):
     """更新植物射击逻辑 - 支持传送门穿越"""
 
-    # 获取传送门管理器
+    # 获取传送门管理器和僵尸空间索引
     portal_manager = game.get("portal_manager")
+    zombie_grid = game["zombie_grid"]
 
-    def has_zombie_in_row_ahead(plant, zombies):
+    def has_zombie_in_row_ahead(plant):
         """检测植物前方是否有僵尸，考虑传送门逻辑"""
-        return has_zombie_in_row_ahead_with_portal(plant, zombies, portal_manager)
+        return has_zombie_in_row_ahead_with_portal(plant, zombie_grid, portal_manager)
 
     def has_any_zombie_on_map(zombies):
         return len(zombies) > 0
 
-    def find_nearest_zombie_in_row(plant, zombies):
-        """寻找行内最近的僵尸，考虑传送门逻辑"""
-        return find_nearest_zombie_with_portal(plant, zombies, portal_manager)
-
     for plant in game["plants"]:
         update_result = plant.update()
 
@@ -275,9 +241,9 @@ def update_plant_shooting(game, level_manager, sounds=None):
             elif plant.plant_type in ["dandelion", "lightning_flower"]:
                 has_target = has_any_zombie_on_map(game["zombies"])
             elif plant.plant_type == "ice_cactus":
-                has_target = has_zombie_in_row_ahead(plant, game["zombies"])
+                has_target = has_zombie_in_row_ahead(plant)
             else:
-                has_target = has_zombie_in_row_ahead(plant, game["zombies"])
+                has_target = has_zombie_in_row_ahead(plant)
             plant.check_for_new_wave(has_target)
 
         # 射击逻辑
@@ -293,9 +259,9 @@ def update_plant_shooting(game, level_manager, sounds=None):
                 if has_any_zombie_on_map(game["zombies"]):
                     should_shoot = True
             elif plant.plant_type in ["shooter", "melon_pult"]:
-                should_shoot = has_zombie_in_row_ahead(plant, game["zombies"])
+                should_shoot = has_zombie_in_row_ahead(plant)
             elif plant.plant_type == "ice_cactus":
-                should_shoot = has_zombie_in_row_ahead(plant, game["zombies"])
+                should_shoot = has_zombie_in_row_ahead(plant)
 
             if should_shoot:
                 bullet = None
@@ -303,7 +269,7 @@ def update_plant_shooting(game, level_manager, sounds=None):
                 # 使用 bullets.create_bullet 工厂函数，修复：直接传递传送门参数
                 if plant.plant_type == "melon_pult":
                     # 西瓜投手：创建西瓜子弹，考虑传送门目标
-                    target_col = get_bullet_target_col_with_portal(plant, game["zombies"], portal_manager)
+                    target_col = get_bullet_target_col_with_portal(plant, zombie_grid, portal_manager)
 
                     bullet = bullets.create_bullet(
                         bullet_type="melon",
@@ -329,7 +295,7 @@ def update_plant_shooting(game, level_manager, sounds=None):
                     # 蒲公英：创建飘散种子（特殊处理）
                     seeds = plant.create_dandelion_seeds(game["zombies"])
                     if "dandelion_seeds" not in game:
-                        game["dandelion_seeds"] = []
+                        game["dandelion_seeds"] = EntityList()
                     game["dandelion_seeds"].extend(seeds)
 
                     if sounds and sounds.get("dandelion_shoot"):
@@ -363,7 +329,7 @@ def update_plant_shooting(game, level_manager, sounds=None):
                     # 豌豆射手：创建普通子弹，支持传送门穿越
                     can_penetrate = level_manager.has_bullet_penetration()
                     random_penetration_prob = level_manager.get_random_penetration_prob()
-                    if random_penetration_prob > 0 and random.random() < random_penetration_prob:
+                    if random_penetration_prob > 0 and get_rng("penetration").random() < random_penetration_prob:
                         can_penetrate = True
 
                     bullet = bullets.create_bullet(
@@ -387,10 +353,10 @@ def update_plant_shooting(game, level_manager, sounds=None):
 def update_dandelion_seeds(game, level_manager, level_settings=None, sounds=None):
     """更新蒲公英种子状态和碰撞检测 - 使用 bullets 模块"""
     if "dandelion_seeds" not in game:
-        game["dandelion_seeds"] = []
+        game["dandelion_seeds"] = EntityList()
         return
 
-    for seed in game["dandelion_seeds"][:]:
+    for seed in game["dandelion_seeds"].iterate():
         # 更新种子位置
         if seed.update(game["zombies"]):
             game["dandelion_seeds"].remove(seed)
@@ -398,7 +364,7 @@ def update_dandelion_seeds(game, level_manager, level_settings=None, sounds=None
 
         # 检测种子击中僵尸
         hit_any_zombie = False
-        for zombie in game["zombies"][:]:
+        for zombie in game["zombies"]:
             if seed.attack_zombie(zombie):
                 hit_any_zombie = True
 
@@ -450,17 +416,13 @@ def handle_plant_placement(game, cards, x, y, level_manager, level_settings=None
                 return False
 
         # 找到该位置的植物（如有）
-        target_plant = None
-        for p in game["plants"]:
-            if p.row == row and p.col == col:
-                target_plant = p
-                break
+        target_plant = game["plant_grid"].get_plant(row, col)
 
         # 铲子模式：移除植物
         if game["selected"] == "shovel" and target_plant:
             if target_plant.plant_type == "sunflower":
                 level_manager.remove_sunflower()
-            game["plants"].remove(target_plant)
+            remove_plant_from_game(game, target_plant)
 
             # 立即清除植物预览
             if state_manager:
@@ -476,7 +438,7 @@ def handle_plant_placement(game, cards, x, y, level_manager, level_settings=None
 
             # 杀死指定格子内的所有僵尸（改进的碰撞检测）
             zombies_killed = 0
-            for zombie in game["zombies"][:]:  # 使用切片复制避免迭代时修改列表
+            for zombie in game["zombies"].iterate():  # 遍历中移除的僵尸在遍历结束后统一压缩
                 # 检查僵尸是否在目标格子内（改进的检测逻辑）
                 zombie_row = int(zombie.row)
 
@@ -505,7 +467,7 @@ def handle_plant_placement(game, cards, x, y, level_manager, level_settings=None
                     # 如果满足任一条件，则杀死僵尸
                     if is_quarter_inside or is_center_inside:
                         # 杀死僵尸
-                        game["zombies"].remove(zombie)
+                        remove_zombie_from_game(game, zombie)
                         zombies_killed += 1
 
                         # 更新击杀计数器（只在非波次模式下计算）
@@ -523,7 +485,7 @@ def handle_plant_placement(game, cards, x, y, level_manager, level_settings=None
                             level_mgr = game.get("level_manager")
                             if level_mgr and level_mgr.has_special_feature("random_sun_drop"):
                                 # 随机掉落5或10阳光
-                                sun_amount = random.choice([5, 10])
+                                sun_amount = get_rng("loot").choice([5, 10])
                                 game["sun"] = add_sun_safely(game["sun"], sun_amount)
                             else:
                                 # 默认掉落20阳光
@@ -534,7 +496,7 @@ def handle_plant_placement(game, cards, x, y, level_manager, level_settings=None
                             game['_game_manager']._handle_coin_drop()
                         else:
                             # 如果无法访问game_manager，直接在这里实现金币掉落逻辑
-                            coin_drop_chance = random.random()
+                            coin_drop_chance = get_rng("loot").random()
                             coins_to_add = 0
                             if coin_drop_chance < 0.01:  # 1%概率掉落10￥
                                 coins_to_add = 10
@@ -649,7 +611,7 @@ def handle_plant_placement(game, cards, x, y, level_manager, level_settings=None
                     plant_type = "cucumber"
 
                 plant = Plant(row, col, plant_type, get_constants(), None, game["level_manager"])
-                game["plants"].append(plant)
+                add_plant_to_game(game, plant)
                 game["sun"] -= selected_card["cost"]
 
                 # 使用统一的卡牌管理器设置冷却时间 - 使用特性管理系统
@@ -733,15 +695,16 @@ def update_zombie_portal_interaction(game):
     portal_manager = game["portal_manager"]
 
     # 检查每个僵尸是否经过传送门
-    for zombie in game["zombies"][:]:
+    for zombie in game["zombies"]:
         # 检查僵尸当前位置是否有传送门
         portal = portal_manager.get_portal_at_position(int(zombie.row), int(zombie.col))
         if portal and portal.is_active:
             # 30%概率传送僵尸
-            if random.random() < 0.3:  # 可以从特性配置中读取这个概率传送门系统已激活
+            if get_rng("portal").random() < 0.3:  # 可以从特性配置中读取这个概率传送门系统已激活
                 success = portal_manager.teleport_zombie(zombie)
                 if success:
-                    pass
+                    # 传送改变了行和列，同步空间索引
+                    game["zombie_grid"].update_zombie(zombie)
 
 def spawn_zombie_wave_fixed(game_state, first_wave=False, zombies_per_row=None, sounds=None):
     """修复后的生成僵尸波次函数，准确计算僵尸数量并使用关卡配置 - 更新：使用特性管理系统"""
@@ -750,7 +713,7 @@ def spawn_zombie_wave_fixed(game_state, first_wave=False, zombies_per_row=None,
         sounds["wave_warning"].play()  # 普通播放，不暂停背景音乐
 
     if zombies_per_row is None:
-        zombies_per_row = [random.randint(3, 4) for _ in range(GRID_HEIGHT)]
+        zombies_per_row = [get_rng("spawn").randint(3, 4) for _ in range(GRID_HEIGHT)]
 
     # 获取关卡管理器
     level_manager = game_state.get("level_manager")
@@ -772,14 +735,14 @@ def spawn_zombie_wave_fixed(game_state, first_wave=False, zombies_per_row=None,
         if all_fast:
             fast_zombie_indices = list(range(zombie_count))  # 所有僵尸都快速
         else:
-            fast_zombie_indices = [random.randint(0, zombie_count - 1)] if zombie_count > 0 else []
+            fast_zombie_indices = [get_rng("spawn").randint(0, zombie_count - 1)] if zombie_count > 0 else []
 
         for i in range(zombie_count):
             # 每个僵尸之间有间隔，避免重叠
             spawn_delay = i * 30  # 每个僵尸间隔30帧生成
 
             # 使用关卡配置的铁甲概率（而不是硬编码50%）
-            has_armor = random.random() < armor_prob
+            has_armor = get_rng("spawn").random() < armor_prob
 
             # 当前是否为快速僵尸
             is_fast = (i in fast_zombie_indices)
@@ -788,7 +751,7 @@ def spawn_zombie_wave_fixed(game_state, first_wave=False, zombies_per_row=None,
             zombie_type = "normal"
             if level_manager and level_manager.current_level >= 13:
                 # 10%概率生成巨人僵尸
-                if random.random() < 0.1:
+                if get_rng("spawn").random() < 0.1:
                     zombie_type = "giant"
 
             # 创建僵尸，传入波次模式和是否为快速僵尸参数
@@ -807,7 +770,7 @@ def spawn_zombie_wave_fixed(game_state, first_wave=False, zombies_per_row=None,
 
             # 稍微错开一点位置，避免完全重叠
             zombie.col += i * 0.3
-            game_state["zombies"].append(zombie)
+            add_zombie_to_game(game_state, zombie)
 
 
 def update_card_cooldowns(game):
@@ -846,7 +809,7 @@ def handle_cucumber_fullscreen_explosion(game, cucumber_explosion_data, sounds=N
 
     # 第一步：对所有僵尸应用眩晕和喷射效果
     for zombie in game["zombies"]:
-        zombie_id = id(zombie)
+        zombie_id = zombie.entity_id
 
         # 检查僵尸是否已经冰冻，如果是则保存冰冻状态
         was_frozen = hasattr(zombie, 'is_frozen') and zombie.is_frozen
@@ -860,7 +823,7 @@ def handle_cucumber_fullscreen_explosion(game, cucumber_explosion_data, sounds=N
         game["cucumber_spray_timers"][zombie_id] = spray_duration
 
         # 3. 50%概率在喷射后死亡（延迟执行）
-        if random.random() < death_probability:
+        if get_rng("effects").random() < death_probability:
             if not hasattr(zombie, 'cucumber_marked_for_death'):
                 zombie.cucumber_marked_for_death = True
 
@@ -919,19 +882,12 @@ def update_cucumber_effects(game, sounds=None):
             row_str, col_str = plant_key.split('_')
             row, col = int(row_str), int(col_str)
 
-            # 查找并治疗植物
-            for plant in game["plants"]:
-                if plant.row == row and plant.col == col:
-                    if plant.health < plant.max_health:
-                        old_health = plant.health
-                        # 每次治疗50点血量
-                        heal_amount = min(50, plant.max_health - plant.health)
-                        plant.health = min(plant.max_health, plant.health + heal_amount)
-
-                        # 计算治疗进度
-                        health_percentage = (plant.health / plant.max_health) * 100
-
-                    break
+            # 直接从占用网格取出并治疗植物
+            plant = game["plant_grid"].get_plant(row, col)
+            if plant is not None and plant.health < plant.max_health:
+                # 每次治疗50点血量
+                heal_amount = min(50, plant.max_health - plant.health)
+                plant.health = min(plant.max_health, plant.health + heal_amount)
 
         if game["cucumber_plant_healing"][plant_key] <= 0:
             healing_to_remove.append(plant_key)
@@ -951,12 +907,10 @@ def update_cucumber_effects(game, sounds=None):
         if game["cucumber_spray_timers"][zombie_id] <= 0:
             spray_timers_to_remove.append(zombie_id)
 
-            # 查找对应的僵尸对象
-            for zombie in game["zombies"]:
-                if id(zombie) == zombie_id:
-                    if hasattr(zombie, 'cucumber_marked_for_death') and zombie.cucumber_marked_for_death:
-                        zombies_to_remove.append(zombie)
-                    break
+            # 通过实体注册表直接查找对应的僵尸对象
+            zombie = game["entities"].get(zombie_id)
+            if zombie is not None and getattr(zombie, 'cucumber_marked_for_death', False):
+                zombies_to_remove.append(zombie)
 
     # 移除已经结束的喷射效果
     for zombie_id in spray_timers_to_remove:
@@ -968,7 +922,7 @@ def update_cucumber_effects(game, sounds=None):
             # 在移除僵尸前检查是否处于冰冻状态
             was_frozen = hasattr(zombie, 'is_frozen') and zombie.is_frozen
 
-            game["zombies"].remove(zombie)
+            remove_zombie_from_game(game, zombie)
 
             # 更新击杀计数器（只在非波次模式下计算）
             if not game.get("wave_mode", False):
@@ -985,7 +939,7 @@ def update_cucumber_effects(game, sounds=None):
                 level_mgr = game.get("level_manager")
                 if level_mgr and level_mgr.has_special_feature("random_sun_drop"):
                     # 随机掉落5或10阳光
-                    sun_amount = random.choice([5, 10])
+                    sun_amount = get_rng("loot").choice([5, 10])
                     game["sun"] = add_sun_safely(game["sun"], sun_amount)
                 else:
                     # 默认掉落20阳光
@@ -995,7 +949,7 @@ def update_cucumber_effects(game, sounds=None):
                 game['_game_manager']._handle_coin_drop()
             else:
                 # 如果无法访问game_manager，直接在这里实现金币掉落逻辑
-                coin_drop_chance = random.random()
+                coin_drop_chance = get_rng("loot").random()
                 coins_to_add = 0
                 if coin_drop_chance < 0.01:  # 1%概率掉落10￥
                     coins_to_add = 10
@@ -1019,9 +973,14 @@ def update_cucumber_effects(game, sounds=None):
 
 def update_freeze_effects(game):
     """更新所有僵尸的冰冻效果 """
-    current_time = pygame.time.get_ticks()
+    current_time = get_ticks()
     freeze_duration = 5000  # 5秒 = 5000毫秒
 
+    # 启用数组存储时一次性处理所有僵尸
+    if game.get("zombie_store") is not None:
+        game["zombie_store"].expire_freezes(current_time, freeze_duration)
+        return
+
     for zombie in game["zombies"]:
         if hasattr(zombie, 'is_frozen') and zombie.is_frozen:
             # 检查冰冻是否过期
@@ -1053,7 +1012,7 @@ def is_zombie_stunned(game, zombie):
     if "zombie_stun_timers" not in game:
         return False
 
-    zombie_id = id(zombie)
+    zombie_id = zombie.entity_id
     return zombie_id in game["zombie_stun_timers"] and game["zombie_stun_timers"][zombie_id] > 0
 
 
@@ -1071,7 +1030,7 @@ def is_zombie_spraying(game, zombie):
     if "cucumber_spray_timers" not in game:
         return False
 
-    zombie_id = id(zombie)
+    zombie_id = zombie.entity_id
     return zombie_id in game["cucumber_spray_timers"] and game["cucumber_spray_timers"][zombie_id] > 0
 
 def add_sun_safely(current_sun, amount):
@@ -1083,63 +1042,63 @@ def add_sun_safely(current_sun, amount):
     return new_sun
 
 
-def has_zombie_in_row_ahead_with_portal(plant, zombies, portal_manager):
+def has_zombie_in_row_ahead_with_portal(plant, zombie_grid, portal_manager):
     """检测植物前方是否有僵尸，考虑传送门穿越逻辑"""
     if not portal_manager:
-        return _has_zombie_in_row_ahead_normal(plant, zombies)
+        return _has_zombie_in_row_ahead_normal(plant, zombie_grid)
 
     plant_row_portals = _get_portals_in_row(portal_manager, plant.row)
 
     if not plant_row_portals:
-        return _has_zombie_in_row_ahead_normal(plant, zombies)
+        return _has_zombie_in_row_ahead_normal(plant, zombie_grid)
 
     nearest_portal = _find_nearest_portal_to_right(plant, plant_row_portals)
 
     if not nearest_portal:
-        return _has_zombie_in_row_ahead_normal(plant, zombies)
+        return _has_zombie_in_row_ahead_normal(plant, zombie_grid)
 
     # 检查传送门左侧是否有僵尸
     has_zombie_before_portal = _has_zombie_between_positions(
-        zombies, plant.row, plant.col, nearest_portal.col
+        zombie_grid, plant.row, plant.col, nearest_portal.col
     )
 
     if has_zombie_before_portal:
         return True
 
     # 检查其他传送门出口是否有僵尸
-    return _has_zombie_at_portal_exits(zombies, portal_manager, nearest_portal)
+    return _has_zombie_at_portal_exits(zombie_grid, portal_manager, nearest_portal)
 
 
-def find_nearest_zombie_with_portal(plant, zombies, portal_manager):
+def find_nearest_zombie_with_portal(plant, zombie_grid, portal_manager):
     """寻找最近的僵尸，考虑传送门穿越逻辑"""
     if not portal_manager:
-        return _find_nearest_zombie_normal(plant, zombies)
+        return _find_nearest_zombie_normal(plant, zombie_grid)
 
     plant_row_portals = _get_portals_in_row(portal_manager, plant.row)
 
     if not plant_row_portals:
-        return _find_nearest_zombie_normal(plant, zombies)
+        return _find_nearest_zombie_normal(plant, zombie_grid)
 
     nearest_portal = _find_nearest_portal_to_right(plant, plant_row_portals)
 
     if not nearest_portal:
-        return _find_nearest_zombie_normal(plant, zombies)
+        return _find_nearest_zombie_normal(plant, zombie_grid)
 
     # 优先攻击传送门左侧的僵尸
     nearest_before_portal = _find_nearest_zombie_between_positions(
-        zombies, plant.row, plant.col, nearest_portal.col
+        zombie_grid, plant.row, plant.col, nearest_portal.col
     )
 
     if nearest_before_portal:
         return nearest_before_portal
 
     # 寻找其他传送门出口的僵尸
-    return _find_nearest_zombie_at_portal_exits(zombies, portal_manager, nearest_portal)
+    return _find_nearest_zombie_at_portal_exits(zombie_grid, portal_manager, nearest_portal)
 
 
-def get_bullet_target_col_with_portal(plant, zombies, portal_manager):
+def get_bullet_target_col_with_portal(plant, zombie_grid, portal_manager):
     """获取子弹目标列位置，考虑传送门穿越"""
-    target_zombie = find_nearest_zombie_with_portal(plant, zombies, portal_manager)
+    target_zombie = find_nearest_zombie_with_portal(plant, zombie_grid, portal_manager)
 
     if target_zombie:
         if _is_zombie_at_portal_exit(target_zombie, plant, portal_manager):
@@ -1178,21 +1137,21 @@ def _find_nearest_portal_to_right(plant, portals):
     return nearest_portal
 
 
-def _has_zombie_in_row_ahead_normal(plant, zombies):
+def _has_zombie_in_row_ahead_normal(plant, zombie_grid):
     """普通的前方僵尸检测逻辑"""
-    for zombie in zombies:
-        if zombie.row == plant.row and zombie.col > plant.col:
+    for zombie in zombie_grid.get_zombies_in_row(plant.row):
+        if zombie.col > plant.col:
             return True
     return False
 
 
-def _find_nearest_zombie_normal(plant, zombies):
+def _find_nearest_zombie_normal(plant, zombie_grid):
     """普通的最近僵尸寻找逻辑"""
     nearest_zombie = None
     min_distance = float('inf')
 
-    for zombie in zombies:
-        if zombie.row == plant.row and zombie.col > plant.col:
+    for zombie in zombie_grid.get_zombies_in_row(plant.row):
+        if zombie.col > plant.col:
             distance = zombie.col - plant.col
             if distance < min_distance:
                 min_distance = distance
@@ -1201,21 +1160,21 @@ def _find_nearest_zombie_normal(plant, zombies):
     return nearest_zombie
 
 
-def _has_zombie_between_positions(zombies, row, start_col, end_col):
+def _has_zombie_between_positions(zombie_grid, row, start_col, end_col):
     """检查指定位置范围内是否有僵尸"""
-    for zombie in zombies:
-        if (zombie.row == row and start_col < zombie.col < end_col):
+    for zombie in zombie_grid.get_zombies_in_row(row):
+        if start_col < zombie.col < end_col:
             return True
     return False
 
 
-def _find_nearest_zombie_between_positions(zombies, row, start_col, end_col):
+def _find_nearest_zombie_between_positions(zombie_grid, row, start_col, end_col):
     """寻找指定位置范围内最近的僵尸"""
     nearest_zombie = None
     min_distance = float('inf')
 
-    for zombie in zombies:
-        if (zombie.row == row and start_col < zombie.col < end_col):
+    for zombie in zombie_grid.get_zombies_in_row(row):
+        if start_col < zombie.col < end_col:
             distance = zombie.col - start_col
             if distance < min_distance:
                 min_distance = distance
@@ -1224,7 +1183,7 @@ def _find_nearest_zombie_between_positions(zombies, row, start_col, end_col):
     return nearest_zombie
 
 
-def _has_zombie_at_portal_exits(zombies, portal_manager, source_portal):
+def _has_zombie_at_portal_exits(zombie_grid, portal_manager, source_portal):
     """检查其他传送门出口是否有僵尸"""
     if not portal_manager or not hasattr(portal_manager, 'portals'):
         return False
@@ -1233,14 +1192,14 @@ def _has_zombie_at_portal_exits(zombies, portal_manager, source_portal):
                     if (portal.is_active and portal != source_portal)]
 
     for exit_portal in exit_portals:
-        for zombie in zombies:
-            if (zombie.row == exit_portal.row and zombie.col > exit_portal.col):
+        for zombie in zombie_grid.get_zombies_in_row(exit_portal.row):
+            if zombie.col > exit_portal.col:
                 return True
 
     return False
 
 
-def _find_nearest_zombie_at_portal_exits(zombies, portal_manager, source_portal):
+def _find_nearest_zombie_at_portal_exits(zombie_grid, portal_manager, source_portal):
     """寻找其他传送门出口最近的僵尸"""
     if not portal_manager or not hasattr(portal_manager, 'portals'):
         return None
@@ -1252,8 +1211,8 @@ def _find_nearest_zombie_at_portal_exits(zombies, portal_manager, source_portal)
     min_total_distance = float('inf')
 
     for exit_portal in exit_portals:
-        for zombie in zombies:
-            if (zombie.row == exit_portal.row and zombie.col > exit_portal.col):
+        for zombie in zombie_grid.get_zombies_in_row(exit_portal.row):
+            if zombie.col > exit_portal.col:
                 distance_from_exit = zombie.col - exit_portal.col
                 if distance_from_exit < min_total_distance:
                     min_total_distance = distance_from_exit
@@ -1,9 +1,14 @@
 """
 游戏状态管理模块 - 负责游戏状态的切换和管理（添加详细图鉴状态支持）
 """
-import pygame
 from .constants import *
 from .level_manager import LevelManager
+from performance import SpatialGrid, PlantGrid
+from entity_registry import EntityRegistry
+from entity_list import EntityList
+from zombies import create_zombie_store
+from sim_clock import get_ticks, reset_simulation
+from particle_system import particle_system
 
 
 class GameStateManager:
@@ -53,6 +58,9 @@ class GameStateManager:
             'y': 0
         }
 
+        # 是否使用NumPy数组存储僵尸（大规模波次时向量化更新）
+        self.use_zombie_store = False
+
     def set_hover_level(self, level_num, mouse_pos=None):
         """设置当前悬停的关卡"""
         self.hover_level = level_num
@@ -98,11 +106,17 @@ class GameStateManager:
         """获取植物预览状态"""
         return self.plant_preview.copy() if self.plant_preview['enabled'] else None
 
-    def reset_game(self, keep_level=None):
+    def reset_game(self, keep_level=None, seed=None):
         """
         重置游戏状态，修改为使用新的配置系统和特性管理器
         更新：完全集成特性管理系统，修复传送门系统重置问题
+        seed: 随机数种子，相同种子的关卡运行结果完全一致；为None时随机生成
         """
+        # 重置虚拟时钟并重新播种随机数流
+        rng_seed = reset_simulation(seed)
+        # 清空上一局残留的粒子
+        particle_system.clear()
+
         # 创建关卡管理器（现在从配置文件加载）
         level_manager = LevelManager("database/levels.json")  # 指定配置文件路径
         level_manager.enable_hot_reload(True)  # 默认启用热重载
@@ -115,7 +129,11 @@ class GameStateManager:
         initial_sun = level_manager.get_initial_sun()
 
         new_game = {
-            "plants": [], "zombies": [], "bullets": [],
+            "plants": EntityList(), "zombies": EntityList(), "bullets": EntityList(),
+            "entities": EntityRegistry(),
+            "zombie_grid": SpatialGrid(GRID_WIDTH, GRID_HEIGHT),
+            "plant_grid": PlantGrid(GRID_WIDTH, GRID_HEIGHT),
+            "zombie_store": create_zombie_store(GRID_WIDTH, self.use_zombie_store),
             "zombie_timer": 0, "sun": initial_sun, "game_over": False, "selected": None,
             "wave_mode": False,
             "wave_timer": 0,
@@ -129,7 +147,8 @@ class GameStateManager:
             "fade_timer": 0,
             "fade_duration": 190,
             "card_cooldowns": {},
-            "last_update_time": pygame.time.get_ticks(),
+            "last_update_time": get_ticks(),
+            "rng_seed": rng_seed,
             "last_save_time": 0,
             # 修复：添加缺少的字段
             "portal_manager": None,
@@ -137,9 +156,11 @@ class GameStateManager:
             "zombie_stun_timers": {},
             "cucumber_spray_timers": {},
             "cucumber_plant_healing": {},
-            "dandelion_seeds": [],
+            "dandelion_seeds": EntityList(),
             "_pending_coins": 0
         }
+        # 僵尸移出游戏时自动清理它的眩晕和喷射计时器
+        new_game["entities"].track(new_game["zombie_stun_timers"], new_game["cucumber_spray_timers"])
 
         return new_game
 
@@ -278,11 +299,15 @@ class GameStateManager:
         """获取过渡动画的透明度"""
         return self.transition_alpha
 
-    def update_game_state_music(self, music_manager):
-        """更新游戏状态对应的音乐"""
+    def update_game_state_music(self, music_manager, upcoming_state=None):
+        """更新游戏状态对应的音乐，并预读即将进入的状态（upcoming_state 或关卡转场的目标）的音乐"""
         if self.game_state != self.previous_game_state:
             music_manager.change_music_for_state(self.game_state)
             self.previous_game_state = self.game_state
+        if upcoming_state is None and self.transition_state == "level_to_game_fade_out":
+            upcoming_state = "playing"
+        if upcoming_state is not None:
+            music_manager.prefetch_music_for_state(upcoming_state)
 
     def show_insufficient_coins_dialog_for_item(self, item):
         """显示金币不足对话框"""
@@ -1,17 +1,32 @@
 """
 数据库模块 - 统一管理游戏数据的保存和加载
+
+存档的保存和恢复（save_manager）依赖植物、僵尸和游戏逻辑模块，第一次访问时才导入
 """
+import importlib
 
 from .game_database import GameDatabase
-from .save_manager import (
-    auto_save_game_progress,
-    restore_game_from_save,
-    check_level_has_save
-)
+
+# 导出名 -> 所在子模块（第一次访问时导入）
+_LAZY_EXPORTS = {
+    'auto_save_game_progress': '.save_manager',
+    'restore_game_from_save': '.save_manager',
+    'check_level_has_save': '.save_manager',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'GameDatabase',
     'auto_save_game_progress',
     'restore_game_from_save',
     'check_level_has_save'
-]
\ No newline at end of file
+]
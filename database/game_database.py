@@ -1,11 +1,12 @@
 import json
 import os
-import pygame
+from sim_clock import game_clock, get_ticks
 
 
 class GameDatabase:
-    def __init__(self, filename="database/game_progress.json"):
+    def __init__(self, filename="database/game_progress.json", persist=True):
         self.filename = filename
+        self.persist = persist  # False时只在内存中修改数据，不写回文件（无头模拟使用）
         self.data = self.load_data()
 
     def load_data(self):
@@ -43,6 +44,8 @@ class GameDatabase:
 
     def save_data(self):
         """保存游戏进度数据"""
+        if not self.persist:
+            return
         try:
             with open(self.filename, 'w', encoding='utf-8') as f:
                 json.dump(self.data, f, ensure_ascii=False, indent=2)
@@ -196,11 +199,11 @@ class GameDatabase:
             for zombie in game_state.get("zombies", []):
                 if hasattr(zombie, 'is_frozen') and zombie.is_frozen:
                     frozen_zombie_data = {
-                        "zombie_id": id(zombie),
+                        "zombie_id": zombie.entity_id,
                         "freeze_start_time": getattr(zombie, 'freeze_start_time', 0),
                         "original_speed": getattr(zombie, 'original_speed', zombie.base_speed),
                         "freeze_duration_remaining": 5000 - (
-                                pygame.time.get_ticks() - getattr(zombie, 'freeze_start_time', 0))
+                                get_ticks() - getattr(zombie, 'freeze_start_time', 0))
                     }
                     frozen_zombies.append(frozen_zombie_data)
             freeze_effects_data["frozen_zombies"] = frozen_zombies
@@ -311,6 +314,10 @@ class GameDatabase:
                 "first_wave_spawned": game_state["first_wave_spawned"],
                 "card_cooldowns": game_state.get("card_cooldowns", {}),
                 "hammer_cooldown": game_state.get("hammer_cooldown", 0),
+                # 虚拟时钟帧数，恢复后冰冻等计时继续有效
+                "sim_tick": game_clock.tick,
+                # 下一个实体ID，恢复后新僵尸的ID不会与已有僵尸重复
+                "next_entity_id": game_state["entities"].next_id,
                 # 传送门状态
                 "portal_manager_data": portal_manager_data,
                 # 关卡管理器状态
@@ -346,6 +353,7 @@ class GameDatabase:
                 # 僵尸信息
                 "zombies": [
                     {
+                        "entity_id": zombie.entity_id,
                         "row": zombie.row,
                         "col": zombie.col,
                         "health": zombie.health,
@@ -1,7 +1,6 @@
 """
 保存管理器 - 处理游戏进度的保存和恢复逻辑
 """
-import pygame
 import random
 import sys
 import os
@@ -15,15 +14,20 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from core.constants import get_constants
+from performance import SpatialGrid, PlantGrid
+from entity_registry import EntityRegistry
+from entity_list import EntityList
 from plants import Plant
-from zombies import Zombie
+from zombies import Zombie, create_zombie_store
+from core.game_logic import add_zombie_to_game, add_plant_to_game
 # 统一使用 import bullets 方式
 import bullets
+from sim_clock import get_ticks, reset_simulation
 
 
 def auto_save_game_progress(game_db, game_state, music_manager, game_manager=None, save_interval=100):
     """自动保存游戏进度"""
-    current_time = pygame.time.get_ticks()
+    current_time = get_ticks()
     last_save_time = game_state.get("last_save_time", 0)
 
     # 每save_interval帧（默认5秒）保存一次
@@ -39,9 +43,20 @@ def auto_save_game_progress(game_db, game_state, music_manager, game_manager=Non
 def restore_game_from_save(saved_data, level_manager, game_manager=None):
     """从保存的数据恢复游戏状态，修复樱桃炸弹等爆炸植物的恢复问题"""
     try:
+        # 恢复虚拟时钟，保存的冰冻开始时间等都基于这个时钟
+        rng_seed = reset_simulation(tick=saved_data.get("sim_tick", 0))
+
         # 创建基础游戏状态
+        constants = get_constants()
+        cucumber_effects = saved_data.get("cucumber_effects", {})
         game = {
-            "plants": [], "zombies": [], "bullets": [],
+            "plants": EntityList(), "zombies": EntityList(), "bullets": EntityList(),
+            "entities": EntityRegistry(saved_data.get("next_entity_id", 1)),
+            "zombie_grid": SpatialGrid(constants["GRID_WIDTH"], constants["GRID_HEIGHT"]),
+            "plant_grid": PlantGrid(constants["GRID_WIDTH"], constants["GRID_HEIGHT"]),
+            "zombie_store": create_zombie_store(
+                constants["GRID_WIDTH"],
+                game_manager is not None and game_manager.state_manager.use_zombie_store),
             "zombie_timer": saved_data.get("zombie_timer", 0),
             "sun": saved_data["sun"],
             "game_over": False,
@@ -58,13 +73,17 @@ def restore_game_from_save(saved_data, level_manager, game_manager=None):
             "fade_timer": 0,
             "fade_duration": 190,
             "card_cooldowns": saved_data.get("card_cooldowns", {}),
-            "last_update_time": pygame.time.get_ticks(),
+            "last_update_time": get_ticks(),
+            "rng_seed": rng_seed,
             "last_save_time": 0,
             "hammer_cooldown": saved_data.get("hammer_cooldown", 0),
             # 黄瓜效果状态
-            "zombie_stun_timers": saved_data.get("cucumber_effects", {}).get("zombie_stun_timers", {}),
-            "cucumber_spray_timers": saved_data.get("cucumber_effects", {}).get("cucumber_spray_timers", {}),
-            "cucumber_plant_healing": saved_data.get("cucumber_effects", {}).get("cucumber_plant_healing", {}),
+            # JSON 把字典键存成了字符串，恢复为整数实体ID
+            "zombie_stun_timers": {int(zombie_id): timer for zombie_id, timer
+                                   in cucumber_effects.get("zombie_stun_timers", {}).items()},
+            "cucumber_spray_timers": {int(zombie_id): timer for zombie_id, timer
+                                      in cucumber_effects.get("cucumber_spray_timers", {}).items()},
+            "cucumber_plant_healing": cucumber_effects.get("cucumber_plant_healing", {}),
             # 新增：爆炸效果列表
             "explosion_effects": []
         }
@@ -115,7 +134,7 @@ def restore_game_from_save(saved_data, level_manager, game_manager=None):
                     print(f"跳过正在爆炸的植物: {plant.plant_type} at ({plant.row}, {plant.col})")
                     continue
 
-            game["plants"].append(plant)
+            add_plant_to_game(game, plant)
 
         # 恢复爆炸效果（如果有）
         if "explosion_effects" in saved_data:
@@ -125,7 +144,7 @@ def restore_game_from_save(saved_data, level_manager, game_manager=None):
                 print(f"跳过爆炸效果恢复: {effect_data.get('effect_type', 'unknown')}")
 
         # 恢复僵尸 - 保持原有逻辑
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         for zombie_data in saved_data.get("zombies", []):
             zombie_type = zombie_data.get("zombie_type", "normal")
 
@@ -175,7 +194,10 @@ def restore_game_from_save(saved_data, level_manager, game_manager=None):
             zombie.is_spraying = zombie_data.get("is_spraying", False)
             zombie.stun_visual_timer = zombie_data.get("stun_visual_timer", 0)
 
-            game["zombies"].append(zombie)
+            add_zombie_to_game(game, zombie, zombie_data.get("entity_id"))
+
+        # 计时器在僵尸恢复后再登记，旧存档中找不到僵尸的计时器会被丢弃
+        game["entities"].track(game["zombie_stun_timers"], game["cucumber_spray_timers"])
 
         # 恢复子弹状态 - 使用 bullets.create_bullet
         for bullet_data in saved_data.get("bullets", []):
@@ -234,7 +256,7 @@ def restore_game_from_save(saved_data, level_manager, game_manager=None):
                 game_manager.cart_manager.load_save_data(cart_data)
 
         # 恢复蒲公英种子
-        game["dandelion_seeds"] = []
+        game["dandelion_seeds"] = EntityList()
         if "dandelion_seeds" in saved_data:
             for seed_data in saved_data["dandelion_seeds"]:
                 seed = bullets.DandelionSeed(
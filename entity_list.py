@@ -0,0 +1,56 @@
+"""
+实体列表 - 支持遍历中删除的游戏实体容器
+
+植物、僵尸、子弹、蒲公英种子和粒子都保存在 EntityList 中。
+通过 iterate() 遍历时调用 remove() 只做标记，遍历结束后一次性压缩列表，
+代替"复制整个列表再逐个 list.remove"的写法：遍历不需要复制，删除是 O(1)，
+每次遍历最多做一次 O(n) 的压缩。剩余实体保持原有顺序，绘制顺序不受影响。
+"""
+
+
+class EntityList(list):
+    """可在遍历中安全删除元素的列表"""
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self._iterating = 0  # 正在进行的 iterate() 层数
+        self._removed = set()  # 遍历中已删除、等待压缩的实体id
+
+    def iterate(self):
+        """
+        按顺序遍历当前所有实体
+
+        遍历中删除的实体会被跳过；遍历中新增的实体不在本次遍历范围内。
+        遍历结束（包括 break 提前退出）后自动压缩列表。
+        """
+        self._iterating += 1
+        try:
+            removed = self._removed
+            for index in range(len(self)):
+                entity = list.__getitem__(self, index)
+                if removed and id(entity) in removed:
+                    continue
+                yield entity
+        finally:
+            self._iterating -= 1
+            if not self._iterating:
+                self.compact()
+
+    def remove(self, entity):
+        """删除实体；在 iterate() 遍历中只做标记，遍历结束后统一压缩"""
+        if self._iterating:
+            self._removed.add(id(entity))
+        else:
+            super().remove(entity)
+
+    def compact(self):
+        """一次性移除所有已标记删除的实体"""
+        if self._removed:
+            removed = self._removed
+            self[:] = [entity for entity in self if id(entity) not in removed]
+            removed.clear()
+
+    def __contains__(self, entity):
+        if self._removed and id(entity) in self._removed:
+            return False
+        return super().__contains__(entity)
@@ -0,0 +1,65 @@
+"""
+实体注册表 - 为游戏中的僵尸分配稳定的实体ID
+
+实体ID在一局游戏内单调递增、不会复用，并随存档一起保存，读档后
+眩晕/喷射计时器等以实体ID为键的数据依然指向同一个僵尸。
+注册表提供 O(1) 的 ID -> 实体查找；实体移出游戏时，
+登记过的以实体ID为键的字典会自动删除对应条目。
+"""
+
+
+class EntityRegistry:
+    """实体注册表，每局游戏一个，保存在 game["entities"] 中"""
+
+    def __init__(self, next_id=1):
+        self.next_id = next_id
+        self.entities = {}  # 实体ID -> 实体
+        self.keyed_maps = []  # 以实体ID为键、需要随实体自动清理的字典
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __contains__(self, entity_id):
+        return entity_id in self.entities
+
+    def register(self, entity, entity_id=None):
+        """
+        登记实体并设置 entity.entity_id
+
+        Args:
+            entity: 实体对象
+            entity_id: 读档时沿用的实体ID，为None时分配新ID
+
+        Returns:
+            int: 实体ID
+        """
+        if entity_id is None:
+            entity_id = self.next_id
+        self.next_id = max(self.next_id, entity_id + 1)
+
+        entity.entity_id = entity_id
+        self.entities[entity_id] = entity
+        return entity_id
+
+    def unregister(self, entity):
+        """注销实体，并清理所有登记字典中属于它的条目"""
+        entity_id = entity.entity_id
+        if self.entities.pop(entity_id, None) is None:
+            return
+        for mapping in self.keyed_maps:
+            mapping.pop(entity_id, None)
+
+    def get(self, entity_id):
+        """根据实体ID获取实体，已移出游戏时返回None"""
+        return self.entities.get(entity_id)
+
+    def track(self, *mappings):
+        """
+        登记以实体ID为键的字典，实体注销时自动删除对应条目
+
+        登记时会删除不属于任何已注册实体的条目（例如旧存档中的失效键）。
+        """
+        for mapping in mappings:
+            for entity_id in [key for key in mapping if key not in self.entities]:
+                del mapping[entity_id]
+            self.keyed_maps.append(mapping)
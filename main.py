@@ -2,39 +2,72 @@
 主程序文件 - 植物大战僵尸贴图版
 重构版本 - 更新导入路径到rsc_mng文件夹
 """
-import math
+import time
+
+# 启动计时起点：--profile-startup 报告的导入耗时和首帧时间都从这里算起
+STARTUP_TIME = time.perf_counter()
+
+import argparse
+import json
 import pygame
-import random
 import sys
 import os
-from animation import AnimationManager, PlantFlyingAnimation, Trophy
+from animation import AnimationManager
 from core.constants import *
-from rsc_mng.audio_manager import BackgroundMusicManager, initialize_sounds, play_sound_with_music_pause, set_sounds_volume
-from performance import PerformanceMonitor
-from rsc_mng.resource_loader import load_all_images, preload_scaled_images, initialize_fonts, get_images
-from database import GameDatabase, auto_save_game_progress, restore_game_from_save, check_level_has_save
-from core.game_logic import (
-    create_zombie_for_level, update_bullets, update_plant_shooting,
-    update_dandelion_seeds, update_hammer_cooldown, handle_plant_placement,
-    spawn_zombie_wave_fixed, update_card_cooldowns,
-    handle_cucumber_fullscreen_explosion, update_cucumber_effects,
-    update_freeze_effects, is_zombie_stunned, is_zombie_spraying,
-    add_sun_safely,initialize_portal_system, update_portal_system, update_zombie_portal_interaction
+from rsc_mng.audio_manager import (
+    BackgroundMusicManager, initialize_sounds, play_sound_with_music_pause, set_sounds_volume, audio_loader
 )
+from performance import PerformanceMonitor, DEFAULT_TIMING_REPORT
+from sim_clock import get_rng, game_clock
+from particle_system import particle_system
+from rsc_mng.resource_loader import load_all_images, preload_scaled_images, initialize_fonts, get_images
+from rsc_mng.asset_registry import asset_registry
+from rsc_mng.disk_cache import DEFAULT_CACHE_DIR
+from database import GameDatabase
 from core.level_manager import LevelManager
-from core.cards_manager import get_plant_select_grid_new, cards_manager, get_available_cards_new
+from core.cards_manager import get_available_cards_new
 from shop import ShopManager, CartManager
 from core.game_state_manager import GameStateManager
 from core.event_handler import EventHandler
-from ui import PlantSelectionManager,RendererManager,PortalManager
-
-
+from ui import PlantSelectionManager, RendererManager
+from ui.presentation import FullscreenPresenter, DEFAULT_PRESENTATION, PRESENTATION_MODES
+# 游戏逻辑、存档恢复以及植物、僵尸、子弹模块只在进入关卡后才用到，
+# 由 _bind_gameplay_modules 在第一次进入关卡时导入并绑定为模块全局名称，主菜单启动时不加载
+
+# --profile-startup 输出的报告行前缀
+STARTUP_PROFILE_PREFIX = "startup_profile: "
+
+
+def _bind_gameplay_modules():
+    """导入关卡用到的游戏逻辑函数并绑定为模块全局名称，每帧更新时不再经过导入机制"""
+    global update_card_cooldowns, update_plant_shooting, update_bullets, update_dandelion_seeds
+    global add_sun_safely, update_cucumber_effects, initialize_portal_system, update_portal_system
+    global update_zombie_portal_interaction, handle_cucumber_fullscreen_explosion, remove_plant_from_game
+    global spawn_zombie_wave_fixed, create_zombie_for_level, add_zombie_to_game, is_zombie_stunned
+    global is_zombie_spraying, remove_zombie_from_game, add_plant_to_game
+    global auto_save_game_progress, restore_game_from_save, Plant
+    from core.game_logic import (
+        update_card_cooldowns, update_plant_shooting, update_bullets, update_dandelion_seeds,
+        add_sun_safely, update_cucumber_effects, initialize_portal_system, update_portal_system,
+        update_zombie_portal_interaction, handle_cucumber_fullscreen_explosion, remove_plant_from_game,
+        spawn_zombie_wave_fixed, create_zombie_for_level, add_zombie_to_game, is_zombie_stunned,
+        is_zombie_spraying, remove_zombie_from_game, add_plant_to_game
+    )
+    from database import auto_save_game_progress, restore_game_from_save
+    from plants import Plant
 
 
 class GameManager:
     """简化后的游戏管理器 - 协调各种专职管理器 levels"""
 
-    def __init__(self):
+    def __init__(self, headless=False, zombie_store=False, timing_report=None, dirty_rects=False,
+                 presentation=DEFAULT_PRESENTATION, asset_cache=DEFAULT_CACHE_DIR):
+        # 无头模式：使用SDL虚拟驱动，不弹出窗口也不输出声音
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
         # 初始化Pygame
 
         pygame.init()
@@ -50,23 +83,37 @@ class GameManager:
         self.screen_offset_x = 0
         self.screen_offset_y = 0
         self.screen_scale = 1.0
+        # 全屏输出器：缩放方式见 ui/presentation.py
+        self.presenter = FullscreenPresenter(presentation)
 
         # 热重载相关设置
         self.hot_reload_enabled = True  # 默认启用热重载
 
         # 初始化资源
+        # 音频在后台线程加载，主菜单不用等待解码（无头模式同步加载，避免后台线程干扰计时）
+        self.music_manager = BackgroundMusicManager(background=not headless)
+        self.music_manager.prefetch_music_for_state("main_menu")
+        self.sounds = initialize_sounds(background=not headless)
+        # 缩放后的图片缓存在磁盘上（asset_cache 为 None 时每次都解码 PNG）
+        asset_registry.enable_disk_cache(asset_cache)
         self.fonts = initialize_fonts()
         self.font_small, self.font_medium, self.font_large, self.font_tiny = self.fonts
         self.images = load_all_images()
         self.scaled_images = preload_scaled_images()
-        self.sounds = initialize_sounds()
+        # 爆炸植物的蓄力动画帧在第一次进入关卡时生成（见 _prepare_gameplay）
+        self.gameplay_prepared = False
 
         # 初始化各种管理器
-        self.music_manager = BackgroundMusicManager()
         self.performance_monitor = PerformanceMonitor()
-        self.game_db = GameDatabase()
+        # 可选：分系统计时，退出时把各阶段耗时的百分位写入 timing_report
+        if timing_report:
+            self.performance_monitor.enable_scopes(timing_report)
+        # 无头模拟不写回存档文件，避免污染玩家进度和金币
+        self.game_db = GameDatabase(persist=not headless)
         # 为状态管理器设置数据库引用
         self.state_manager = GameStateManager()
+        # 可选：用NumPy数组存储僵尸，大规模波次时向量化更新
+        self.state_manager.use_zombie_store = zombie_store
         self.state_manager.game_db = self.game_db  # 传递数据库引用
         self.plant_selection_manager = PlantSelectionManager()
         self.plant_selection_manager.game_manager = self
@@ -78,9 +125,15 @@ class GameManager:
 
         self.event_handler = EventHandler(self)
         self.renderer_manager = RendererManager(self)
+        # 可选：脏矩形输出，窗口模式的游戏界面只把绘制过的区域提交到显示
+        if dirty_rects:
+            self.renderer_manager.enable_dirty_rects()
 
         # 游戏状态和设置
         self.level_settings = self.game_db.get_level_settings()
+        # get_available_cards_for_current_state 的缓存
+        self._available_cards = None
+        self._available_cards_key = None
         self.game = self.state_manager.reset_game()
 
         # 音量设置
@@ -120,6 +173,15 @@ class GameManager:
 
 
 
+    def _prepare_gameplay(self):
+        """第一次进入关卡时加载游戏逻辑和植物模块，并预生成爆炸植物的蓄力动画帧"""
+        if self.gameplay_prepared:
+            return
+        _bind_gameplay_modules()
+        from plants import preload_effect_frames
+        preload_effect_frames(self.images, get_constants())
+        self.gameplay_prepared = True
+
     def reset_carts(self):
         """重置小推车系统"""
         self.cart_manager.reset_all_carts()
@@ -131,7 +193,7 @@ class GameManager:
 
     def _handle_coin_drop(self):
         """处理僵尸死亡时的金币掉落"""
-        coin_drop_chance = random.random()
+        coin_drop_chance = get_rng("loot").random()
         if coin_drop_chance < 0.01:  # 1%概率掉落10￥
             self.add_coins(10)
         elif coin_drop_chance < 0.06:  # 5%概率掉落5￥（累计概率6%，所以是5%）
@@ -150,32 +212,25 @@ class GameManager:
     def toggle_fullscreen(self):
         """切换全屏模式"""
         if not self.fullscreen:
-            # 切换到全屏
-            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+            # 切换到全屏，输出器计算保持宽高比的缩放比例和居中偏移量
+            self.screen = self.presenter.set_fullscreen_mode()
             self.fullscreen = True
         else:
             # 切换到窗口模式
             self.screen = pygame.display.set_mode((BASE_WIDTH, BASE_HEIGHT))
             self.fullscreen = False
 
-        # 更新屏幕尺寸
-        screen_width, screen_height = self.screen.get_size()
-
-        # 计算缩放比例和偏移量，以保持游戏内容居中
         if self.fullscreen:
-            # 计算保持宽高比的缩放
-            scale_x = screen_width / BASE_WIDTH
-            scale_y = screen_height / BASE_HEIGHT
-            self.screen_scale = min(scale_x, scale_y)
-
-            # 计算偏移量以使内容居中
-            self.screen_offset_x = (screen_width - BASE_WIDTH * self.screen_scale) / 2
-            self.screen_offset_y = (screen_height - BASE_HEIGHT * self.screen_scale) / 2
+            self.screen_scale = self.presenter.scale
+            self.screen_offset_x, self.screen_offset_y = self.presenter.offset
         else:
             self.screen_scale = 1.0
             self.screen_offset_x = 0
             self.screen_offset_y = 0
 
+        # 显示模式改变后重新合成静态背景层
+        self.renderer_manager.invalidate_static_layers()
+
     def transform_mouse_pos(self, pos):
         """转换鼠标位置到游戏坐标"""
         x, y = pos
@@ -226,6 +281,7 @@ class GameManager:
                 not self.state_manager.should_pause_game_logic() and
                 not self.plant_selection_manager.show_plant_select):  # 植物选择界面显示时暂停游戏逻辑
 
+
             # 检查配置文件是否更新
             if self.hot_reload_enabled and self.game["level_manager"].check_hot_reload():
                 self.animation_manager.show_config_reload_notification()
@@ -235,7 +291,8 @@ class GameManager:
 
             # 自动保存游戏进度（每5秒保存一次）
             if not self.game.get("level_completed", False):
-                auto_save_game_progress(self.game_db, self.game, self.music_manager, self, save_interval=100)
+                with self.performance_monitor.scope("logic.auto_save"):
+                    auto_save_game_progress(self.game_db, self.game, self.music_manager, self, save_interval=100)
 
             # 设置图片引用
             self._set_object_references()
@@ -285,30 +342,38 @@ class GameManager:
             zombie.health = max(0, zombie.health)
 
     def _update_main_game_logic(self):
-        """更新主要游戏逻辑"""
-        # 1. 更新植物（向日葵产阳光）- 只调用一次
-        update_plant_shooting(self.game, self.game["level_manager"], sounds=self.sounds)
+        """更新主要游戏逻辑（每个阶段包在命名计时作用域中，--timing 开启时统计耗时）"""
+        timing = self.performance_monitor.scope
 
-        # 检查樱桃炸弹音效触发（直接检查植物状态）
-        for plant in self.game["plants"]:
-            if plant.plant_type == "cherry_bomb":
-                # 检查是否需要播放爆炸音效
-                if plant.should_play_explosion_sound():
-                    if self.sounds.get("cherry_explosion"):
-                        self.sounds["cherry_explosion"].play()
-                    plant.mark_sound_played()
-            elif plant.plant_type == "cucumber":
-                # 检查黄瓜是否需要播放爆炸音效
-                if plant.should_play_explosion_sound():
-                    if self.sounds.get("cherry_explosion"):
-                        self.sounds["cherry_explosion"].play()
-                    plant.mark_sound_played()
+        # 推进虚拟时钟，本帧内所有计时都基于同一个游戏时间
+        game_clock.advance()
+
+        # 1. 更新植物（向日葵产阳光）- 只调用一次
+        with timing("logic.plants"):
+            update_plant_shooting(self.game, self.game["level_manager"], sounds=self.sounds)
+
+            # 检查樱桃炸弹音效触发（直接检查植物状态）
+            for plant in self.game["plants"]:
+                if plant.plant_type == "cherry_bomb":
+                    # 检查是否需要播放爆炸音效
+                    if plant.should_play_explosion_sound():
+                        if self.sounds.get("cherry_explosion"):
+                            self.sounds["cherry_explosion"].play()
+                        plant.mark_sound_played()
+                elif plant.plant_type == "cucumber":
+                    # 检查黄瓜是否需要播放爆炸音效
+                    if plant.should_play_explosion_sound():
+                        if self.sounds.get("cherry_explosion"):
+                            self.sounds["cherry_explosion"].play()
+                        plant.mark_sound_played()
 
         # 2. 更新僵尸（移动/攻击）- 这里僵尸可能会攻击植物
-        self._update_zombies()
+        with timing("logic.zombies"):
+            self._update_zombies()
 
         # 3. 检查所有植物的状态，特别处理樱桃炸弹和黄瓜
-        self._handle_plant_deaths_and_explosions()
+        with timing("logic.plant_deaths"):
+            self._handle_plant_deaths_and_explosions()
 
         # 4. 计算进入波次模式需要的击杀数量
         level_mgr = self.game["level_manager"]
@@ -321,39 +386,53 @@ class GameManager:
             self.game["wave_timer"] = 0
 
         # 6. 僵尸生成逻辑
-        if self.game["wave_mode"]:
-            self._update_wave_mode_spawning()
-        else:
-            self._update_normal_mode_spawning()
+        with timing("logic.spawning"):
+            if self.game["wave_mode"]:
+                self._update_wave_mode_spawning()
+            else:
+                self._update_normal_mode_spawning()
 
         # 7. 检查是否所有波次完成
-        self._check_level_completion()
+        with timing("logic.level_completion"):
+            self._check_level_completion()
 
         # 8. 更新奖杯
-        self._update_trophy()
+        with timing("logic.trophy"):
+            self._update_trophy()
 
         # 9. 处理淡入淡出效果
-        self._update_fade_effects()
+        with timing("logic.fade"):
+            self._update_fade_effects()
 
         # 10. 更新子弹（移动/碰撞）- 移除重复调用
-        update_bullets(self.game, self.game["level_manager"], self.level_settings, self.sounds)
+        with timing("logic.bullets"):
+            update_bullets(self.game, self.game["level_manager"], self.level_settings, self.sounds)
         # 更新蒲公英种子
-        update_dandelion_seeds(self.game, self.game["level_manager"], self.level_settings, self.sounds)
+        with timing("logic.dandelion_seeds"):
+            update_dandelion_seeds(self.game, self.game["level_manager"], self.level_settings, self.sounds)
 
         # 11. 随机增加阳光（每帧0.9%概率+5）- 添加阳光上限检查
-        if random.random() < 0.01:
+        if get_rng("loot").random() < 0.01:
             self.game["sun"] = add_sun_safely(self.game["sun"], 5)
 
         # 12. 更新黄瓜效果状态
-        update_cucumber_effects(self.game, self.sounds)
+        with timing("logic.cucumber"):
+            update_cucumber_effects(self.game, self.sounds)
 
         # 13. 更新锤子冷却时间
-        self._update_hammer_cooldown()
+        with timing("logic.hammer"):
+            self._update_hammer_cooldown()
 
         # 14. 更新小推车系统
-        self._update_cart_system()
+        with timing("logic.carts"):
+            self._update_cart_system()
         # 15. 更新传送门系统
-        self._update_portal_system()
+        with timing("logic.portals"):
+            self._update_portal_system()
+        # 16. 推进全局粒子系统（粒子上限随性能等级调整）
+        with timing("logic.particles"):
+            particle_system.set_performance_level(self.performance_monitor.performance_level)
+            particle_system.update()
 
     def _update_hammer_cooldown(self):
         """更新锤子冷却时间"""
@@ -384,11 +463,13 @@ class GameManager:
 
     def _update_cart_system(self):
         """更新小推车系统"""
+        zombie_store = self.game.get("zombie_store")
+
         # 检查僵尸是否触发小推车
-        self.cart_manager.check_zombie_trigger(self.game["zombies"])
+        self.cart_manager.check_zombie_trigger(self.game["zombie_grid"], zombie_store)
 
         # 更新小推车状态并处理碰撞
-        hit_zombies = self.cart_manager.update_carts(self.game["zombies"])
+        hit_zombies = self.cart_manager.update_carts(self.game["zombie_grid"], zombie_store)
 
         # 处理被小推车撞击的僵尸
         for zombie in hit_zombies:
@@ -401,9 +482,7 @@ class GameManager:
         处理植物死亡和樱桃炸弹、黄瓜爆炸逻辑
         新增方法：确保樱桃炸弹和黄瓜在被啃咬死亡时也能正确爆炸
         """
-        plants_to_remove = []
-
-        for plant in self.game["plants"]:
+        for plant in self.game["plants"].iterate():
             if plant.plant_type in ["cherry_bomb", "cucumber"]:
                 # 特殊处理爆炸植物
                 if plant.health <= 0 and not plant.has_exploded:
@@ -435,17 +514,11 @@ class GameManager:
 
                 # 检查爆炸植物是否应该被移除（爆炸动画完成）
                 if plant.should_be_removed:
-                    plants_to_remove.append(plant)
+                    remove_plant_from_game(self.game, plant)
 
-            else:
-                # 处理其他植物的死亡
-                if plant.health <= 0:
-                    plants_to_remove.append(plant)
-
-        # 移除已死亡的植物（爆炸植物等爆炸完成后移除）
-        for plant in plants_to_remove:
-            if plant in self.game["plants"]:
-                self.game["plants"].remove(plant)
+            # 处理其他植物的死亡（包括被僵尸吃掉的植物，遍历结束后统一移出列表）
+            elif plant.health <= 0:
+                remove_plant_from_game(self.game, plant)
                 # 如果是向日葵死亡，更新计数
                 if plant.plant_type == "sunflower":
                     self.game["level_manager"].remove_sunflower()
@@ -458,7 +531,7 @@ class GameManager:
 
         self.game["wave_timer"] += 1
         if self.game["wave_timer"] >= WAVE_INTERVAL and level_mgr.current_wave < level_mgr.max_waves:
-            zombies_per_row = [random.randint(3, 4) for _ in range(GRID_HEIGHT)]
+            zombies_per_row = [get_rng("spawn").randint(3, 4) for _ in range(GRID_HEIGHT)]
             total_zombie_count = sum(zombies_per_row)
 
             #  修复：先正式开始波次
@@ -476,138 +549,212 @@ class GameManager:
                 len(self.game["zombies"]) < 10 and
                 self.game["zombies_spawned"] < MAX_NORMAL_ZOMBIES):
             zombie = create_zombie_for_level(
-                random.randint(0, GRID_HEIGHT - 1),
+                get_rng("spawn").randint(0, GRID_HEIGHT - 1),
                 self.game["level_manager"],
                 False,
                 self.level_settings
             )
             zombie.images = self.images
             zombie.sounds = self.sounds
-            self.game["zombies"].append(zombie)
+            add_zombie_to_game(self.game, zombie)
             self.game["zombies_spawned"] += 1
             self.game["zombie_timer"] = 0
 
     def _update_zombies(self):
         """更新僵尸状态（添加阳光上限检查）"""
+        zombie_store = self.game.get("zombie_store")
+        if zombie_store is not None:
+            self._update_zombies_with_store(zombie_store)
+            return
 
-        for zombie in self.game["zombies"][:]:
+        zombie_grid = self.game["zombie_grid"]
+
+        for zombie in self.game["zombies"].iterate():
             # 如果僵尸处于死亡动画状态，只更新死亡动画
             if zombie.is_dying:
-                zombie.update(self.game["plants"])
+                zombie.update(self.game["plant_grid"])
+                zombie_grid.update_zombie(zombie)
                 # 检查死亡动画是否结束
                 if zombie.death_animation_timer <= 0:
-                    self.game["zombies"].remove(zombie)
-
-                    # 更新击杀计数器（只在非波次模式下计算）
-                    if not self.game["wave_mode"]:
-                        self.game["zombies_killed"] += 1
-
-                    should_drop_sun = True
-
-                    if self.game["wave_mode"]:
-                        # 使用特性管理系统检查是否掉落阳光
-                        level_mgr = self.game["level_manager"]
-                        if level_mgr.no_sun_drop_in_wave_mode():
-                            should_drop_sun = False
-
-                    if should_drop_sun:
-                        # 修改：使用特性管理系统检查随机阳光掉落，并添加阳光上限检查
-                        level_mgr = self.game["level_manager"]
-                        if level_mgr.has_special_feature("random_sun_drop"):
-                            # 随机掉落5或10阳光
-                            sun_amount = random.choice([5, 10])
-                            self.game["sun"] = add_sun_safely(self.game["sun"], sun_amount)
-                        else:
-                            # 默认掉落20阳光
-                            self.game["sun"] = add_sun_safely(self.game["sun"], 20)
-                    self._handle_coin_drop()
-                    if self.game["wave_mode"]:
-                        self.game["level_manager"].zombie_defeated()
+                    self._remove_dead_zombie(zombie)
                 continue
             # 检查僵尸是否被眩晕，眩晕状态下不更新
             if not is_zombie_stunned(self.game, zombie):
-                zombie.update(self.game["plants"])
+                zombie.update(self.game["plant_grid"])
+                zombie_grid.update_zombie(zombie)
 
             # 检查僵尸是否正在喷射，如果是则创建喷射粒子
-            # 修改：降低粒子创建频率，每10帧创建一次，而不是每帧都创建
             if is_zombie_spraying(self.game, zombie):
-                # 添加一个计数器，每10帧创建一次粒子
-                if not hasattr(zombie, 'spray_particle_timer'):
-                    zombie.spray_particle_timer = 0
-
-                zombie.spray_particle_timer += 1
-
-                # 每10帧创建一次粒子，而且数量固定为1-2个
-                if zombie.spray_particle_timer >= 10:
-                    zombie.spray_particle_timer = 0
-
-                    # 为僵尸的当前位置创建喷射粒子
-                    zombie_x = (BATTLEFIELD_LEFT +
-                                zombie.col * (GRID_SIZE + GRID_GAP) +
-                                GRID_SIZE // 2)
-                    zombie_y = (BATTLEFIELD_TOP +
-                                zombie.row * (GRID_SIZE + GRID_GAP) +
-                                GRID_SIZE // 2)
-
-                    # 查找黄瓜植物来创建喷射粒子
-                    for plant in self.game["plants"]:
-                        if plant.plant_type == "cucumber" and hasattr(plant, 'create_spray_particles_at_position'):
-                            # 僵尸面向左侧（direction=-1）
-                            plant.create_spray_particles_at_position(zombie_x, zombie_y, direction=-1)
-                            break
+                self._update_zombie_spray_particles(zombie)
 
             # 修改：使用僵尸中心点检查边界碰撞，而不是僵尸图片边缘
             zombie_center_col = zombie.col + 0.3  # 僵尸中心点位置（假设僵尸宽度为0.6格）
 
             # 当僵尸中心点到达战场左边界时触发游戏结束
             if zombie_center_col < 0:
-                # 检查该行是否有可用的小推车
-                if self.cart_manager.has_cart_in_row(zombie.row):
-                    # 触发小推车，但不立即游戏结束
-                    self.cart_manager.trigger_cart_in_row(zombie.row)
-                else:
-                    # 没有小推车，游戏结束
-                    self.game["game_over"] = True
-                    if not self.game["game_over_sound_played"] and self.sounds.get("game_over"):
-                        play_sound_with_music_pause(self.sounds["game_over"], music_manager=self.music_manager)
-                        self.game["game_over_sound_played"] = True
+                self._handle_zombie_reached_house(zombie)
 
             if zombie.health <= 0 and not zombie.is_dying:
-                # 开始死亡动画，而不是立即移除
-                zombie.start_death_animation()
+                self._handle_zombie_killed(zombie)
+
+    def _update_zombies_with_store(self, zombie_store):
+        """
+        使用数组存储更新僵尸：移动、死亡动画和边界检测都是整组数组运算，
+        只有植物碰撞、眩晕视觉和喷射粒子逐个处理
+        """
+        # 死亡动画结束的僵尸直接移除
+        for zombie in zombie_store.update_death_animations():
+            self._remove_dead_zombie(zombie)
+
+        # 被黄瓜眩晕计时器定住的僵尸本帧不更新
+        active = zombie_store.get_active_mask(self.game.get("zombie_stun_timers"))
+        zombie_store.update_speeds(active)
+        zombie_store.move(active, before_attack=True)
+
+        # 眩晕视觉计时和喷射粒子只需处理眩晕中或带有喷射粒子的僵尸
+        stunned = zombie_store.get_field("is_stunned")
+        for zombie in zombie_store.get_zombies(active):
+            if zombie.spray_particle_life > 0:
+                zombie._update_status_effects()
+        for zombie in zombie_store.get_zombies(active & stunned):
+            if zombie.spray_particle_life <= 0:
+                zombie._update_status_effects()
+
+        # 只有接触植物或上一帧正在攻击的僵尸需要逐个检测碰撞
+        colliding = (active & ~stunned &
+                     (zombie_store.get_plant_contacts(self.game["plants"]) |
+                      zombie_store.get_field("is_attacking")))
+        plant_grid = self.game["plant_grid"]
+        for zombie in zombie_store.get_zombies(colliding):
+            zombie._update_plant_collision(plant_grid)
+        zombie_store.move(active, before_attack=False)
+
+        # 只同步跨越了格子边界的僵尸
+        zombie_grid = self.game["zombie_grid"]
+        for zombie in zombie_store.get_cell_changes():
+            zombie_grid.update_zombie(zombie)
+
+        # 喷射粒子只处理还在喷射计时中的僵尸
+        for zombie_id, timer in self.game.get("cucumber_spray_timers", {}).items():
+            zombie = zombie_store.get_zombie(zombie_id)
+            if timer > 0 and zombie is not None and not zombie.is_dying:
+                self._update_zombie_spray_particles(zombie)
+
+        # 僵尸中心点（col + 0.3）到达战场左边界
+        for zombie in zombie_store.get_zombies_past(0, offset=0.3):
+            self._handle_zombie_reached_house(zombie)
+
+        for zombie in zombie_store.get_unhandled_deaths():
+            self._handle_zombie_killed(zombie)
+
+    def _remove_dead_zombie(self, zombie):
+        """死亡动画结束后移除僵尸并结算奖励"""
+        remove_zombie_from_game(self.game, zombie)
+
+        # 更新击杀计数器（只在非波次模式下计算）
+        if not self.game["wave_mode"]:
+            self.game["zombies_killed"] += 1
+
+        should_drop_sun = True
+
+        if self.game["wave_mode"]:
+            # 使用特性管理系统检查是否掉落阳光
+            level_mgr = self.game["level_manager"]
+            if level_mgr.no_sun_drop_in_wave_mode():
+                should_drop_sun = False
+
+        if should_drop_sun:
+            # 修改：使用特性管理系统检查随机阳光掉落，并添加阳光上限检查
+            level_mgr = self.game["level_manager"]
+            if level_mgr.has_special_feature("random_sun_drop"):
+                # 随机掉落5或10阳光
+                sun_amount = get_rng("loot").choice([5, 10])
+                self.game["sun"] = add_sun_safely(self.game["sun"], sun_amount)
+            else:
+                # 默认掉落20阳光
+                self.game["sun"] = add_sun_safely(self.game["sun"], 20)
+        self._handle_coin_drop()
+        if self.game["wave_mode"]:
+            self.game["level_manager"].zombie_defeated()
+
+    def _update_zombie_spray_particles(self, zombie):
+        """为正在喷射的僵尸创建喷射粒子"""
+        # 修改：降低粒子创建频率，每10帧创建一次，而不是每帧都创建
+        # 添加一个计数器，每10帧创建一次粒子
+        if not hasattr(zombie, 'spray_particle_timer'):
+            zombie.spray_particle_timer = 0
+
+        zombie.spray_particle_timer += 1
+
+        # 每10帧创建一次粒子，而且数量固定为1-2个
+        if zombie.spray_particle_timer >= 10:
+            zombie.spray_particle_timer = 0
+
+            # 为僵尸的当前位置创建喷射粒子
+            zombie_x = (BATTLEFIELD_LEFT +
+                        zombie.col * (GRID_SIZE + GRID_GAP) +
+                        GRID_SIZE // 2)
+            zombie_y = (BATTLEFIELD_TOP +
+                        zombie.row * (GRID_SIZE + GRID_GAP) +
+                        GRID_SIZE // 2)
+
+            # 查找黄瓜植物来创建喷射粒子
+            for plant in self.game["plants"]:
+                if plant.plant_type == "cucumber" and hasattr(plant, 'create_spray_particles_at_position'):
+                    # 僵尸面向左侧（direction=-1）
+                    plant.create_spray_particles_at_position(zombie_x, zombie_y, direction=-1)
+                    break
+
+    def _handle_zombie_reached_house(self, zombie):
+        """僵尸到达战场左边界：触发小推车或游戏结束"""
+        # 检查该行是否有可用的小推车
+        if self.cart_manager.has_cart_in_row(zombie.row):
+            # 触发小推车，但不立即游戏结束
+            self.cart_manager.trigger_cart_in_row(zombie.row)
+        else:
+            # 没有小推车，游戏结束
+            self.game["game_over"] = True
+            if not self.game["game_over_sound_played"] and self.sounds.get("game_over"):
+                play_sound_with_music_pause(self.sounds["game_over"], music_manager=self.music_manager)
+                self.game["game_over_sound_played"] = True
+
+    def _handle_zombie_killed(self, zombie):
+        """僵尸血量归零：开始死亡动画并结算奖励"""
+        # 开始死亡动画，而不是立即移除
+        zombie.start_death_animation()
+
+        # 更新击杀计数器（只在非波次模式下计算）
+        if not self.game["wave_mode"]:
+            self.game["zombies_killed"] += 1
+
+        should_drop_sun = True
+        if self.game["wave_mode"]:
+            # 使用特性管理系统检查是否掉落阳光
+            level_mgr = self.game["level_manager"]
+            if level_mgr.no_sun_drop_in_wave_mode():
+                should_drop_sun = False
+
+        if should_drop_sun:
+            # 修改：使用特性管理系统检查随机阳光掉落，并添加阳光上限检查
+            level_mgr = self.game["level_manager"]
+            if level_mgr.has_special_feature("random_sun_drop"):
+                # 随机掉落5或10阳光
+                sun_amount = get_rng("loot").choice([5, 10])
+                self.game["sun"] = add_sun_safely(self.game["sun"], sun_amount)
+            else:
+                # 默认掉落20阳光
+                self.game["sun"] = add_sun_safely(self.game["sun"], 20)
+        self._handle_coin_drop()
 
-                # 更新击杀计数器（只在非波次模式下计算）
-                if not self.game["wave_mode"]:
-                    self.game["zombies_killed"] += 1
-
-                should_drop_sun = True
-                if self.game["wave_mode"]:
-                    # 使用特性管理系统检查是否掉落阳光
-                    level_mgr = self.game["level_manager"]
-                    if level_mgr.no_sun_drop_in_wave_mode():
-                        should_drop_sun = False
-
-                if should_drop_sun:
-                    # 修改：使用特性管理系统检查随机阳光掉落，并添加阳光上限检查
-                    level_mgr = self.game["level_manager"]
-                    if level_mgr.has_special_feature("random_sun_drop"):
-                        # 随机掉落5或10阳光
-                        sun_amount = random.choice([5, 10])
-                        self.game["sun"] = add_sun_safely(self.game["sun"], sun_amount)
-                    else:
-                        # 默认掉落20阳光
-                        self.game["sun"] = add_sun_safely(self.game["sun"], 20)
-                self._handle_coin_drop()
-
-                if self.game["wave_mode"]:
-                    self.game["level_manager"].zombie_defeated()
-                coin_drop_chance = random.random()
-                if coin_drop_chance < 0.01:  # 1%概率掉落10￥
-                    self.add_coins(10)
-                elif coin_drop_chance < 0.06:  # 5%概率掉落5￥（累计概率6%，所以是5%）
-                    self.add_coins(5)
-                elif coin_drop_chance < 0.16:  # 10%概率掉落1￥（累计概率16%，所以是10%）
-                    self.add_coins(1)
+        if self.game["wave_mode"]:
+            self.game["level_manager"].zombie_defeated()
+        coin_drop_chance = get_rng("loot").random()
+        if coin_drop_chance < 0.01:  # 1%概率掉落10￥
+            self.add_coins(10)
+        elif coin_drop_chance < 0.06:  # 5%概率掉落5￥（累计概率6%，所以是5%）
+            self.add_coins(5)
+        elif coin_drop_chance < 0.16:  # 10%概率掉落1￥（累计概率16%，所以是10%）
+            self.add_coins(1)
 
     def _check_level_completion(self):
         """检查关卡是否完成"""
@@ -653,7 +800,23 @@ class GameManager:
                     self.game["fade_alpha"] = 0
 
     def get_available_cards_for_current_state(self):
-        """获取当前状态下的可用卡片 - 修复：支持第七卡槽，解决空选择状态bug"""
+        """
+        获取当前状态下的可用卡片 - 修复：支持第七卡槽，解决空选择状态bug
+
+        渲染和鼠标悬浮每帧都会调用，结果按植物选择状态、关卡特性和第七卡槽缓存，返回的列表不要修改
+        """
+        level_manager = self.game["level_manager"]
+        cards_key = (self.plant_selection_manager.show_plant_select, level_manager,
+                     level_manager.current_level, id(level_manager.level_features),
+                     tuple(self.plant_selection_manager.selected_plants_for_game),
+                     hasattr(self, 'shop_manager') and self.shop_manager.has_7th_card_slot())
+        if self._available_cards is None or cards_key != self._available_cards_key:
+            self._available_cards = self._build_available_cards()
+            self._available_cards_key = cards_key
+        return self._available_cards
+
+    def _build_available_cards(self):
+        """按当前状态重新生成可用卡片列表"""
         if self.plant_selection_manager.show_plant_select:
             # 植物选择期间：只显示已完成选择的植物卡片（不包含飞行中的）
             return self.plant_selection_manager.get_selected_plant_cards()
@@ -728,6 +891,8 @@ class GameManager:
         加载待处理的游戏数据
         修复：改进植物选择状态的恢复逻辑
         """
+        self._prepare_gameplay()
+
         pending_data, pending_level = self.state_manager.get_pending_game_data()
 
         if pending_data:
@@ -886,6 +1051,7 @@ class GameManager:
         重置游戏并重新初始化所有系统（传送门、小推车等）
         修复重新开始按钮传送门消失的问题
         """
+        self._prepare_gameplay()
         # 使用状态管理器重置游戏
         self.game = self.state_manager.reset_game(keep_level)
 
@@ -965,11 +1131,88 @@ class GameManager:
             return True
         return False
 
+    def setup_headless_level(self, level_num=1, plants=None, seed=None):
+        """
+        为无头模拟构建关卡状态
+
+        Args:
+            level_num: 关卡编号
+            plants: 预先种植的植物列表，元素为 (row, col, plant_type)
+            seed: 随机数种子，为None时随机生成
+        """
+        self._prepare_gameplay()
+
+        # reset_game 内部通过 LevelManager.start_level 加载关卡配置
+        self.game = self.state_manager.reset_game(level_num, seed)
+        level_manager = self.game["level_manager"]
+        level_manager.enable_hot_reload(False)
+
+        for row, col, plant_type in plants or []:
+            if plant_type == "sunflower":
+                level_manager.plant_sunflower()
+            add_plant_to_game(self.game, Plant(row, col, plant_type, get_constants(), self.images, level_manager))
+
+        initialize_portal_system(self.game, level_manager)
+        self.reset_carts()
+        self.plant_selection_manager.hide_plant_selection()
+        self.state_manager.switch_to_game_state()
+        self.state_manager.game_paused = False
+        self._set_object_references()
+        return self.game
+
+    def run_headless(self, ticks, level_num=1, plants=None, seed=None):
+        """
+        无窗口、不限帧率地运行关卡模拟
+
+        不调用渲染和 clock.tick，只推进 _update_main_game_logic，
+        在游戏失败、关卡完成或达到指定帧数时停止。
+        相同的种子和植物布局得到完全相同的模拟结果。
+
+        Returns:
+            dict: 模拟统计信息
+        """
+        self.setup_headless_level(level_num, plants, seed)
+        level_manager = self.game["level_manager"]
+
+        ticks_run = 0
+        peak_zombies = 0
+        start_time = time.perf_counter()
+        while ticks_run < ticks:
+            if self.game["game_over"] or self.game.get("level_completed", False):
+                break
+            self._update_main_game_logic()
+            ticks_run += 1
+            peak_zombies = max(peak_zombies, len(self.game["zombies"]))
+        elapsed = time.perf_counter() - start_time
+
+        return {
+            "level": level_num,
+            "seed": self.game["rng_seed"],
+            "ticks": ticks_run,
+            "elapsed_seconds": elapsed,
+            "ticks_per_second": ticks_run / elapsed if elapsed > 0 else 0.0,
+            "game_time_seconds": ticks_run / 60,
+            "game_over": self.game["game_over"],
+            "level_completed": self.game.get("level_completed", False),
+            "wave_mode": self.game["wave_mode"],
+            "current_wave": level_manager.current_wave,
+            "max_waves": level_manager.max_waves,
+            "zombies_spawned": self.game["zombies_spawned"],
+            "zombies_killed": self.game["zombies_killed"],
+            "zombies_alive": len(self.game["zombies"]),
+            "peak_zombies": peak_zombies,
+            "plants_alive": len(self.game["plants"]),
+            "bullets": len(self.game["bullets"]),
+            "sun": self.game["sun"],
+            "coins": self.coins,
+        }
+
     def run(self):
         running = True
         while running:
             # 检查游戏状态是否改变，如果改变则切换音乐
-            self.state_manager.update_game_state_music(self.music_manager)
+            self.state_manager.update_game_state_music(self.music_manager,
+                                                       self.animation_manager.pending_next_state)
 
             # 更新背景音乐管理器
             self.music_manager.update()
@@ -996,14 +1239,109 @@ class GameManager:
         if self.state_manager.game_state == "playing" and not self.game["game_over"]:
             self.game_db.save_game_progress(self.game, self.music_manager, self)
 
+        self.dump_timing_report()
         pygame.mixer.music.stop()
+        # 等待后台音频任务结束，避免 pygame.quit() 之后还在解码
+        audio_loader.shutdown()
         pygame.quit()
         sys.exit()
 
+    def dump_timing_report(self):
+        """写出分系统计时报告（未开启 --timing 时什么也不做）"""
+        report_path = self.performance_monitor.dump_scope_report()
+        if report_path:
+            print(f"计时报告已写入: {report_path}")
+
+
+def run_headless_simulation(ticks, level_num=1, plants=None, seed=None, zombie_store=False,
+                            timing_report=None):
+    """无头模拟入口：创建不带窗口的游戏管理器并运行指定帧数，返回统计信息"""
+    game_manager = GameManager(headless=True, zombie_store=zombie_store, timing_report=timing_report)
+    try:
+        return game_manager.run_headless(ticks, level_num, plants, seed)
+    finally:
+        game_manager.dump_timing_report()
+        pygame.quit()
+
 
-def main():
-    """主函数"""
-    game_manager = GameManager()
+def profile_startup(**options):
+    """
+    --profile-startup：创建游戏管理器并画出主菜单的第一帧后退出，返回启动各阶段耗时（毫秒）
+
+    import_ms 从 main.py 开始执行算起，包含 pygame 和所有模块的导入；
+    time_to_first_frame_ms 是从同一起点到第一帧提交到显示的时间
+    """
+    imports_done = time.perf_counter()
+    game_manager = GameManager(**options)
+    init_done = time.perf_counter()
+    game_manager.state_manager.update_game_state_music(game_manager.music_manager)
+    game_manager.update_game_logic()
+    game_manager.renderer_manager.render_game()
+    first_frame_done = time.perf_counter()
+    audio_loader.shutdown()
+    pygame.quit()
+    return {
+        "import_ms": (imports_done - STARTUP_TIME) * 1000,
+        "init_ms": (init_done - imports_done) * 1000,
+        "first_frame_ms": (first_frame_done - init_done) * 1000,
+        "time_to_first_frame_ms": (first_frame_done - STARTUP_TIME) * 1000,
+    }
+
+
+def build_parser():
+    """命令行参数解析器"""
+    # 关闭前缀缩写，拼错的参数（如 --headles）直接报错而不是被当成缩写
+    parser = argparse.ArgumentParser(prog="python main.py", description="植物大战僵尸贴图版", allow_abbrev=False)
+    parser.add_argument("--headless", nargs="*", type=int, metavar="N",
+                        help="无窗口模拟：[帧数=3600] [关卡=1] [种子]，结束后输出统计信息")
+    parser.add_argument("--zombie-store", action="store_true", help="使用NumPy数组存储僵尸")
+    parser.add_argument("--timing", nargs="?", const=DEFAULT_TIMING_REPORT, metavar="路径",
+                        help="统计各逻辑/渲染阶段耗时，退出时写出报告（.jsonl 结尾写JSON行，否则写CSV）")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="窗口模式的游戏界面只恢复和更新对象绘制过的区域")
+    parser.add_argument("--present", choices=PRESENTATION_MODES, default=DEFAULT_PRESENTATION,
+                        help="全屏输出方式")
+    parser.add_argument("--no-asset-cache", action="store_true", help="不使用磁盘上的图片缓存，每次启动都解码 PNG")
+    parser.add_argument("--profile-startup", action="store_true", help="画出主菜单第一帧后退出并输出启动耗时")
+    return parser
+
+
+def main(argv=None):
+    """
+    主函数
+
+    用法: python main.py [--zombie-store] [--timing[=路径]] [--dirty-rects]
+                         [--present=letterbox|scaled|transform] [--no-asset-cache]
+          python main.py --headless [帧数] [关卡] [种子] [--zombie-store] [--timing[=路径]]
+          python main.py --profile-startup（benchmarks.startup --profile 会配合 -X importtime 调用）
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # --timing= 与 --timing 相同，使用默认报告路径
+    timing_report = None if args.timing is None else args.timing or DEFAULT_TIMING_REPORT
+    asset_cache = None if args.no_asset_cache else DEFAULT_CACHE_DIR
+
+    if args.profile_startup:
+        report = profile_startup(presentation=args.present, asset_cache=asset_cache)
+        print(STARTUP_PROFILE_PREFIX + json.dumps(report))
+        return
+
+    if args.headless is not None:
+        if len(args.headless) > 3:
+            parser.error("--headless 最多接受 帧数 关卡 种子 三个参数")
+        if any(value <= 0 for value in args.headless[:2]):
+            parser.error("--headless 的帧数和关卡必须为正数")
+        ticks = args.headless[0] if len(args.headless) > 0 else 3600
+        level_num = args.headless[1] if len(args.headless) > 1 else 1
+        seed = args.headless[2] if len(args.headless) > 2 else None
+        stats = run_headless_simulation(ticks, level_num, seed=seed, zombie_store=args.zombie_store,
+                                        timing_report=timing_report)
+        for key, value in stats.items():
+            print(f"{key}: {value}")
+        return
+
+    game_manager = GameManager(zombie_store=args.zombie_store, timing_report=timing_report,
+                               dirty_rects=args.dirty_rects, presentation=args.present, asset_cache=asset_cache)
     game_manager.run()
 
 
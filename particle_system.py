@@ -0,0 +1,824 @@
+"""
+粒子系统 - 所有粒子效果共用的数组化粒子池
+
+每种发射器（樱桃爆炸、黄瓜爆炸、黄瓜喷射、西瓜溅射、传送门、奖杯）对应一个
+ParticlePool，粒子的位置、速度、重力、阻力、旋转和生命值存放在 NumPy 数组中，
+每帧用整组数组运算推进，生命结束的粒子在更新时压缩移除。
+绘制时粒子精灵按 (大小, 颜色, ...) 预先绘制并缓存，透明度在绘制时应用。
+
+粒子只用于显示：发射函数返回本批粒子的最长生命，发射者（樱桃炸弹等）
+自己倒计时决定何时移除，因此粒子预算裁掉的粒子不会影响游戏逻辑。
+全局粒子预算随 PerformanceMonitor.performance_level 变化，超出预算的新粒子直接丢弃。
+
+NumPy 是可选依赖，未安装时粒子池改用列表存储，逐个粒子更新和绘制，效果相同但更慢。
+"""
+import math
+import random
+
+import pygame
+
+from sim_clock import get_rng
+from rsc_mng.transform_cache import get_rotated, get_sprite, blit_with_alpha
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 各性能等级下同时存在的粒子上限
+PARTICLE_BUDGETS = {0: 300, 1: 600, 2: 1200, 3: 2000, 4: 3000}
+
+# 爆炸粒子高光方向的量化步数（高光绕圆心旋转）
+HIGHLIGHT_ANGLE_STEPS = 16
+
+# 喷射粒子透明度的量化步长
+SPRAY_ALPHA_STEP = 4
+
+# 调色板
+CHERRY_COLORS = (
+    (255, 80, 80),
+    (255, 120, 40),
+    (255, 160, 0),
+    (255, 200, 0),
+    (255, 255, 100),
+    (255, 200, 200),
+    (255, 100, 0),
+)
+CUCUMBER_COLORS = (
+    (144, 238, 144),
+    (152, 251, 152),
+    (173, 255, 47),
+    (127, 255, 0),
+    (124, 252, 0),
+    (50, 205, 50),
+    (34, 139, 34),
+)
+SPRAY_COLORS = (
+    (255, 255, 240),  # 象牙白
+    (250, 250, 210),  # 淡黄白
+    (255, 250, 240),  # 花白
+    (248, 248, 255),  # 幽灵白
+    (240, 248, 255),  # 爱丽丝蓝白
+)
+MELON_COLORS = (
+    (255, 100, 100),  # 红色果肉
+    (255, 150, 150),  # 浅红色果肉
+    (30, 30, 30),  # 黑色西瓜籽
+    (100, 200, 100),  # 绿色西瓜皮
+    (255, 200, 200),  # 粉红色果肉
+)
+PORTAL_COLORS = ((0, 255, 255), (0, 200, 255), (100, 255, 255))
+TROPHY_SPARK_COLORS = (
+    (255, 215, 0),  # 金色
+    (255, 255, 0),  # 黄色
+    (255, 165, 0),  # 橙色
+    (255, 255, 255),  # 白色
+    (255, 100, 100),  # 粉红色
+    (100, 255, 100),  # 绿色
+)
+TROPHY_GLOW_COLORS = (
+    (255, 255, 100),  # 金黄色
+    (255, 200, 50),  # 橙黄色
+    (255, 255, 255),  # 白色
+    (255, 150, 0),  # 橙色
+)
+
+
+class ParticlePool:
+    """
+    一种粒子的数组存储
+
+    每个字段是一个 float64 数组，前 count 个元素是存活的粒子；没有 NumPy 时每个字段是
+    恰好 count 个元素的列表，更新和绘制逐个粒子计算，结果与数组运算相同。
+    更新顺序由 move_first 决定：False 为 先加重力和阻力再移动，True 为 先移动再加重力和阻力。
+    """
+
+    FIELDS = ("x", "y", "vx", "vy", "gravity", "friction", "life", "max_life",
+              "rotation", "rotation_speed", "size", "pulse_speed", "color")
+    DEFAULTS = {"friction": 1.0}
+
+    # 先移动再加速（西瓜溅射、奖杯爆炸）还是先加速再移动
+    move_first = False
+    # 是否由 ParticleSystem.update 每个逻辑帧推进（奖杯发光粒子随绘制推进）
+    updates_with_logic = True
+    # 粒子绘制范围：以 (x, y) 为中心、半径不超过 size * extent_scale + extent_margin
+    extent_scale = 1.0
+    extent_margin = 3
+
+    def __init__(self, palette, capacity=256):
+        self.palette = palette
+        self.count = 0
+        self.capacity = capacity
+        if np is None:
+            self.data = {field: [] for field in self.FIELDS}
+        else:
+            self.data = {field: np.zeros(capacity) for field in self.FIELDS}
+
+    def __len__(self):
+        return self.count
+
+    def _reserve(self, size):
+        """容量不足时按倍数扩容"""
+        if size <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < size:
+            capacity *= 2
+        for field, array in self.data.items():
+            grown = np.zeros(capacity)
+            grown[:self.count] = array[:self.count]
+            self.data[field] = grown
+        self.capacity = capacity
+
+    def emit(self, columns, limit=None):
+        """追加一批粒子，columns 为 字段 -> 数值列表；limit 限制最多追加的数量"""
+        emitted = len(columns["x"])
+        if limit is not None:
+            emitted = min(emitted, limit)
+        if emitted <= 0:
+            return 0
+        if np is None:
+            for field, values in self.data.items():
+                column = columns.get(field)
+                if column is None:
+                    values.extend([float(self.DEFAULTS.get(field, 0.0))] * emitted)
+                else:
+                    values.extend(float(value) for value in column[:emitted])
+            self.count += emitted
+            return emitted
+        start = self.count
+        end = start + emitted
+        self._reserve(end)
+        for field, array in self.data.items():
+            values = columns.get(field)
+            if values is None:
+                array[start:end] = self.DEFAULTS.get(field, 0.0)
+            else:
+                array[start:end] = values[:emitted]
+        self.count = end
+        return emitted
+
+    def view(self, field):
+        """存活粒子的字段视图（没有 NumPy 时为字段列表本身）"""
+        if np is None:
+            return self.data[field]
+        return self.data[field][:self.count]
+
+    def column(self, field):
+        """存活粒子的字段值列表（绘制时逐个粒子遍历用）"""
+        if np is None:
+            return self.data[field]
+        return self.view(field).tolist()
+
+    def int_column(self, field):
+        """存活粒子的字段值取整后的列表（颜色序号、大小）"""
+        if np is None:
+            return [int(value) for value in self.data[field]]
+        return self.view(field).astype(int).tolist()
+
+    def update(self):
+        """推进一帧：整组更新速度、位置、旋转和生命，移除生命结束的粒子"""
+        if not self.count:
+            return
+        if np is None:
+            self._update_python()
+            return
+        x, y = self.view("x"), self.view("y")
+        vx, vy = self.view("vx"), self.view("vy")
+        gravity, friction = self.view("gravity"), self.view("friction")
+
+        if self.move_first:
+            x += vx
+            y += vy
+            vy += gravity
+            vx *= friction
+            vy *= friction
+        else:
+            vy += gravity
+            vx *= friction
+            vy *= friction
+            x += vx
+            y += vy
+
+        rotation = self.view("rotation")
+        rotation += self.view("rotation_speed")
+        life = self.view("life")
+        life -= 1
+
+        alive = life > 0
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            for array in self.data.values():
+                array[:len(keep)] = array[keep]
+            self.count = len(keep)
+
+    def _update_python(self):
+        """没有 NumPy 时逐个粒子执行与 update 相同的运算"""
+        data = self.data
+        x, y, vx, vy = data["x"], data["y"], data["vx"], data["vy"]
+        gravity, friction = data["gravity"], data["friction"]
+        rotation, rotation_speed, life = data["rotation"], data["rotation_speed"], data["life"]
+        move_first = self.move_first
+        for i in range(self.count):
+            if move_first:
+                x[i] += vx[i]
+                y[i] += vy[i]
+                vy[i] += gravity[i]
+                vx[i] *= friction[i]
+                vy[i] *= friction[i]
+            else:
+                vy[i] += gravity[i]
+                vx[i] *= friction[i]
+                vy[i] *= friction[i]
+                x[i] += vx[i]
+                y[i] += vy[i]
+            rotation[i] += rotation_speed[i]
+            life[i] -= 1
+
+        keep = [i for i, remaining in enumerate(life) if remaining > 0]
+        if len(keep) < self.count:
+            for field, values in data.items():
+                data[field] = [values[i] for i in keep]
+            self.count = len(keep)
+
+    def clear(self):
+        self.count = 0
+        if np is None:
+            for values in self.data.values():
+                values.clear()
+
+    def _min_max(self, field):
+        values = self.view(field)
+        if np is None:
+            return min(values), max(values)
+        return float(values.min()), float(values.max())
+
+    def get_bounds(self):
+        """存活粒子可能绘制到的区域（脏矩形输出用），没有粒子时为空矩形"""
+        if not self.count:
+            return pygame.Rect(0, 0, 0, 0)
+        min_x, max_x = self._min_max("x")
+        min_y, max_y = self._min_max("y")
+        extent = self._min_max("size")[1] * self.extent_scale + self.extent_margin
+        left = math.floor(min_x - extent)
+        top = math.floor(min_y - extent)
+        return pygame.Rect(left, top, math.ceil(max_x + extent) - left + 1,
+                           math.ceil(max_y + extent) - top + 1)
+
+    def get_alphas(self):
+        """透明度随生命线性减小（生命比例乘255取整）"""
+        if np is None:
+            return [int(255 * (life / max_life)) for life, max_life in zip(self.data["life"], self.data["max_life"])]
+        return (255 * (self.view("life") / self.view("max_life"))).astype(int).tolist()
+
+    def draw(self, surface):
+        """子类实现：把存活的粒子绘制到 surface"""
+        raise NotImplementedError("子类必须实现draw方法")
+
+
+class BurstPool(ParticlePool):
+    """爆炸粒子：先膨胀、再脉动、最后缩小消失的圆形粒子，带偏心高光"""
+
+    def __init__(self, palette, expansion, plateau, pulse_amount, shrink_below, fade_below, highlight_cap):
+        super().__init__(palette)
+        self.expansion = expansion  # 膨胀阶段每单位生命比例的放大量
+        self.plateau = plateau  # 脉动阶段的基础缩放
+        self.pulse_amount = pulse_amount  # 脉动幅度
+        self.shrink_below = shrink_below  # 生命比例低于该值开始缩小
+        self.fade_below = fade_below  # 生命比例低于该值开始变透明
+        self.highlight_cap = highlight_cap  # 高光透明度上限
+        self.extent_scale = max(1.0 + 0.2 * expansion, plateau * (1.0 + pulse_amount))
+
+    def get_styles(self):
+        """每个粒子的 (半径列表, 透明度列表, 高光方向列表)"""
+        if np is None:
+            radii, alphas, angles = [], [], []
+            for life, max_life, pulse_speed, size, rotation in zip(
+                    self.data["life"], self.data["max_life"], self.data["pulse_speed"],
+                    self.data["size"], self.data["rotation"]):
+                ratio = life / max_life
+                if ratio > 0.8:
+                    scale = 1.0 + (1 - ratio) * self.expansion
+                elif ratio > self.shrink_below:
+                    scale = self.plateau * (1.0 + math.sin(life * pulse_speed) * self.pulse_amount)
+                else:
+                    scale = ratio * self.plateau
+                radii.append(max(1, int(size * scale)))
+                alphas.append(255 if ratio > self.fade_below else int(255 * (ratio / self.fade_below)))
+                angles.append(round(rotation * HIGHLIGHT_ANGLE_STEPS / 360) % HIGHLIGHT_ANGLE_STEPS)
+            return radii, alphas, angles
+
+        life = self.view("life")
+        ratio = life / self.view("max_life")
+        scale = np.where(ratio > 0.8, 1.0 + (1 - ratio) * self.expansion,
+                         np.where(ratio > self.shrink_below,
+                                  self.plateau * (1.0 + np.sin(life * self.view("pulse_speed")) * self.pulse_amount),
+                                  ratio * self.plateau))
+        radii = np.maximum(1, (self.view("size") * scale).astype(int))
+        alphas = np.where(ratio > self.fade_below, 255, (255 * (ratio / self.fade_below)).astype(int))
+        angles = (np.round(self.view("rotation") * HIGHLIGHT_ANGLE_STEPS / 360).astype(int) %
+                  HIGHLIGHT_ANGLE_STEPS)
+        return radii.tolist(), alphas.tolist(), angles.tolist()
+
+    def draw(self, surface):
+        if not self.count:
+            return
+        radii, alphas, angles = self.get_styles()
+        for x, y, radius, alpha, color, angle in zip(self.column("x"), self.column("y"), radii, alphas,
+                                                     self.int_column("color"), angles):
+            if alpha <= 0:
+                continue
+            rgb = self.palette[color]
+            sprite = get_sprite(("burst", radius, rgb, angle, self.highlight_cap),
+                                lambda: self._build_sprite(radius, rgb, angle))
+            blit_with_alpha(surface, sprite, (x - radius, y - radius), alpha)
+
+    def _build_sprite(self, radius, color, angle_index):
+        """圆形粒子精灵；高光在左上方，随粒子旋转绕圆心转动"""
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        if radius > 4:
+            highlight_radius = max(1, radius // 3)
+            offset = max(1, radius // 4)
+            # 与 pygame.transform.rotate 相同的逆时针方向（屏幕坐标y轴向下）
+            theta = math.radians(angle_index * 360 / HIGHLIGHT_ANGLE_STEPS)
+            dx = -offset * math.cos(theta) - offset * math.sin(theta)
+            dy = offset * math.sin(theta) - offset * math.cos(theta)
+            pygame.draw.circle(sprite, (255, 255, 255, self.highlight_cap),
+                               (round(radius + dx), round(radius + dy)), highlight_radius)
+        return sprite
+
+
+class SprayPool(ParticlePool):
+    """黄瓜喷射粒子：乳白色同心圆，先略微变大、再脉动、最后缩小变透明"""
+
+    extent_scale = 1.4
+
+    def get_styles(self):
+        """每个粒子的 (半径列表, 透明度列表)"""
+        if np is None:
+            radii, alphas = [], []
+            for life, max_life, pulse_speed, size in zip(self.data["life"], self.data["max_life"],
+                                                         self.data["pulse_speed"], self.data["size"]):
+                ratio = life / max_life
+                if ratio > 0.7:
+                    scale, alpha = 1.0 + (1 - ratio) * 0.5, 220
+                elif ratio > 0.3:
+                    scale, alpha = 1.2 * (1.0 + math.sin(life * pulse_speed) * 0.15), int(200 * ratio)
+                else:
+                    scale, alpha = ratio * 1.2, int(150 * ratio)
+                radii.append(max(1, int(size * scale)))
+                alphas.append(alpha - alpha % SPRAY_ALPHA_STEP)
+            return radii, alphas
+
+        life = self.view("life")
+        ratio = life / self.view("max_life")
+        scale = np.where(ratio > 0.7, 1.0 + (1 - ratio) * 0.5,
+                         np.where(ratio > 0.3, 1.2 * (1.0 + np.sin(life * self.view("pulse_speed")) * 0.15),
+                                  ratio * 1.2))
+        alphas = np.where(ratio > 0.7, 220,
+                          np.where(ratio > 0.3, (200 * ratio).astype(int), (150 * ratio).astype(int)))
+        alphas -= alphas % SPRAY_ALPHA_STEP
+        radii = np.maximum(1, (self.view("size") * scale).astype(int))
+        return radii.tolist(), alphas.tolist()
+
+    def draw(self, surface):
+        if not self.count:
+            return
+        radii, alphas = self.get_styles()
+        for x, y, radius, alpha, color in zip(self.column("x"), self.column("y"), radii, alphas,
+                                              self.int_column("color")):
+            if alpha <= 0:
+                continue
+            # 同心圆旋转不改变外观，不需要旋转
+            rgb = self.palette[color]
+            sprite = get_sprite(("cucumber_spray", radius, rgb, alpha),
+                                lambda: _build_spray_sprite(radius, rgb, alpha))
+            surface.blit(sprite, (x - radius, y - radius))
+
+
+class ShardPool(ParticlePool):
+    """西瓜溅射粒子：小的画成圆点，大的画成旋转的小方块，透明度随生命线性减小"""
+
+    move_first = True
+
+    def draw(self, surface):
+        if not self.count:
+            return
+        for x, y, size, alpha, color, rotation in zip(self.column("x"), self.column("y"),
+                                                      self.int_column("size"), self.get_alphas(),
+                                                      self.int_column("color"), self.column("rotation")):
+            rgb = self.palette[color]
+            if size <= 3:
+                sprite = get_sprite(("melon_dot", size, rgb), lambda: _build_dot(size, rgb))
+            else:
+                chunk = get_sprite(("melon_chunk", size, rgb), lambda: _build_chunk(size, rgb))
+                sprite = get_rotated(chunk, rotation)
+            center = (int(x - size) + size, int(y - size) + size)
+            blit_with_alpha(surface, sprite, sprite.get_rect(center=center), alpha)
+
+
+class PortalPool(ParticlePool):
+    """传送门粒子：从环上缓慢向外飘散的小光点，透明度每帧减2"""
+
+    INITIAL_ALPHA = 200
+    extent_scale = 0.0
+
+    def get_alphas(self):
+        if np is None:
+            return [int(max(0, self.INITIAL_ALPHA - 2 * (max_life - life)))
+                    for life, max_life in zip(self.data["life"], self.data["max_life"])]
+        ages = self.view("max_life") - self.view("life")
+        return np.maximum(0, self.INITIAL_ALPHA - 2 * ages).astype(int).tolist()
+
+    def draw(self, surface):
+        if not self.count:
+            return
+        for x, y, alpha, color in zip(self.column("x"), self.column("y"), self.get_alphas(),
+                                      self.int_column("color")):
+            if alpha <= 0:
+                continue
+            rgb = self.palette[color]
+            sprite = get_sprite(("portal_dot", rgb), lambda: _build_dot(2, rgb))
+            blit_with_alpha(surface, sprite, (int(x) - 2, int(y) - 2), alpha)
+
+
+class SparkPool(ParticlePool):
+    """奖杯爆炸火花：受重力下落的圆点，较大的火花带一圈淡淡的尾迹"""
+
+    move_first = True
+
+    def draw(self, surface):
+        if not self.count:
+            return
+        for x, y, size, alpha, color in zip(self.column("x"), self.column("y"), self.int_column("size"),
+                                            self.get_alphas(), self.int_column("color")):
+            rgb = self.palette[color]
+            if size > 3:
+                tail = get_sprite(("spark_tail", size, rgb), lambda: _build_ring(size + 2, rgb, 2))
+                blit_with_alpha(surface, tail, (x - size - 2, y - size - 2), alpha // 3)
+            sprite = get_sprite(("spark", size, rgb), lambda: _build_dot(size, rgb))
+            blit_with_alpha(surface, sprite, (x - size, y - size), alpha)
+
+
+class OrbitPool(ParticlePool):
+    """奖杯发光粒子：绕奖杯中心旋转的光点（x, y 为中心，rotation 为角度）"""
+
+    FIELDS = ParticlePool.FIELDS + ("distance",)
+    updates_with_logic = False
+
+    def get_bounds(self):
+        """光点绕中心旋转，位置不在 x, y 上，绘制区域无法确定"""
+        return None if self.count else pygame.Rect(0, 0, 0, 0)
+
+    def get_positions(self):
+        """每个光点的 (x 列表, y 列表)"""
+        if np is None:
+            xs, ys = [], []
+            for x, y, angle, distance in zip(self.data["x"], self.data["y"], self.data["rotation"],
+                                             self.data["distance"]):
+                xs.append(x + math.cos(angle) * distance)
+                ys.append(y + math.sin(angle) * distance)
+            return xs, ys
+        angles = self.view("rotation")
+        distances = self.view("distance")
+        return ((self.view("x") + np.cos(angles) * distances).tolist(),
+                (self.view("y") + np.sin(angles) * distances).tolist())
+
+    def draw(self, surface):
+        if not self.count:
+            return
+        xs, ys = self.get_positions()
+        # 发光粒子的生命和最大生命分别随机，比例可能大于1
+        alphas = [min(255, alpha) for alpha in self.get_alphas()]
+        for x, y, size, alpha, color in zip(xs, ys, self.int_column("size"), alphas, self.int_column("color")):
+            rgb = self.palette[color]
+            sprite = get_sprite(("glow_dot", size, rgb), lambda: _build_dot(size, rgb))
+            blit_with_alpha(surface, sprite, (x - size, y - size), alpha)
+
+
+def _build_dot(radius, color):
+    """不透明的圆点精灵"""
+    dot = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(dot, color, (radius, radius), radius)
+    return dot
+
+
+def _build_ring(radius, color, width):
+    """圆环精灵"""
+    ring = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(ring, color, (radius, radius), radius, width)
+    return ring
+
+
+def _build_chunk(size, color):
+    """方块精灵（未旋转）"""
+    chunk = pygame.Surface((size, size), pygame.SRCALPHA)
+    chunk.fill(color)
+    return chunk
+
+
+def _build_spray_sprite(radius, color, alpha):
+    """喷射粒子精灵：主体圆点加柔和的内部高光"""
+    sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+    if radius > 3:
+        highlight_radius = max(1, radius // 2)
+        highlight_alpha = min(alpha // 2, 100)
+        pygame.draw.circle(sprite, (255, 255, 255, highlight_alpha), (radius, radius), highlight_radius)
+    return sprite
+
+
+class ParticleSystem:
+    """按名称管理所有粒子池，统一推进、绘制并执行全局粒子预算"""
+
+    def __init__(self):
+        self.performance_level = 3
+        self.dropped = 0  # 因超出预算被丢弃的粒子数
+        self.pools = {
+            "cherry_burst": BurstPool(CHERRY_COLORS, expansion=5, plateau=1.3, pulse_amount=0.1,
+                                      shrink_below=0.3, fade_below=0.5, highlight_cap=180),
+            "cucumber_burst": BurstPool(CUCUMBER_COLORS, expansion=4, plateau=1.2, pulse_amount=0.12,
+                                        shrink_below=0.4, fade_below=0.6, highlight_cap=160),
+            "cucumber_spray": SprayPool(SPRAY_COLORS),
+            "melon_shards": ShardPool(MELON_COLORS),
+            "portal": PortalPool(PORTAL_COLORS),
+            "trophy_sparks": SparkPool(TROPHY_SPARK_COLORS),
+            "trophy_glow": OrbitPool(TROPHY_GLOW_COLORS),
+        }
+
+    @property
+    def budget(self):
+        """当前性能等级下的粒子上限"""
+        return PARTICLE_BUDGETS.get(self.performance_level, PARTICLE_BUDGETS[3])
+
+    def set_performance_level(self, level):
+        self.performance_level = level
+
+    def get_count(self, name=None):
+        """存活粒子数量（name 为 None 时为全部粒子池之和）"""
+        if name is not None:
+            pool = self.pools.get(name)
+            return len(pool) if pool is not None else 0
+        return sum(len(pool) for pool in self.pools.values())
+
+    def emit(self, name, columns):
+        """向粒子池追加一批粒子，超出全局预算的部分丢弃"""
+        pool = self.pools.get(name)
+        if pool is None:
+            return
+        requested = len(columns["x"])
+        emitted = pool.emit(columns, max(0, self.budget - self.get_count()))
+        self.dropped += requested - emitted
+
+    def update(self):
+        """推进所有随逻辑帧更新的粒子池"""
+        for pool in self.pools.values():
+            if pool.updates_with_logic:
+                pool.update()
+
+    def update_pool(self, name):
+        """推进单个粒子池（不随逻辑帧更新的粒子池由发射者自己推进）"""
+        pool = self.pools.get(name)
+        if pool is not None:
+            pool.update()
+
+    def draw(self, surface, names):
+        """按顺序绘制指定的粒子池"""
+        for name in names:
+            pool = self.pools.get(name)
+            if pool is not None:
+                pool.draw(surface)
+
+    def get_bounds(self, names):
+        """
+        指定粒子池可能绘制到的区域列表（脏矩形输出用）
+
+        Returns:
+            list | None: 每个有粒子的池一个矩形；有粒子池无法确定区域时返回 None
+        """
+        rects = []
+        for name in names:
+            pool = self.pools.get(name)
+            if pool is None:
+                continue
+            bounds = pool.get_bounds()
+            if bounds is None:
+                return None
+            if bounds:
+                rects.append(bounds)
+        return rects
+
+    def clear(self, name=None):
+        """清空指定粒子池（name 为 None 时清空全部，开始新游戏时调用）"""
+        for pool_name, pool in self.pools.items():
+            if name is None or pool_name == name:
+                pool.clear()
+
+    def get_stats(self):
+        """获取粒子统计信息"""
+        return {
+            "particles": self.get_count(),
+            "budget": self.budget,
+            "dropped": self.dropped,
+            "pools": {name: len(pool) for name, pool in self.pools.items()},
+        }
+
+
+# 全局粒子系统实例
+particle_system = ParticleSystem()
+
+# 战场上的粒子池（在游戏对象之上绘制）
+BATTLEFIELD_POOLS = ("cherry_burst", "cucumber_burst", "melon_shards", "cucumber_spray")
+
+
+def _new_columns(*fields):
+    return {field: [] for field in fields}
+
+
+def _max_life(columns):
+    return int(max(columns["life"])) if columns["life"] else 0
+
+
+def emit_burst(name, center_x, center_y, count_range, spread, radius_range, speed_range,
+               palette, life_range, friction, rotation_range, pulse_range):
+    """
+    发射一次爆炸（樱桃炸弹、黄瓜）
+
+    随机数的抽取顺序与逐个创建粒子对象时一致：先抽数量，
+    然后每个粒子依次抽 偏移x、偏移y、半径、角度、速度、颜色、生命、旋转速度、脉动速度。
+
+    Returns:
+        int: 本批粒子的最长生命（帧）
+    """
+    rng = get_rng("particles")
+    columns = _new_columns("x", "y", "vx", "vy", "friction", "life", "max_life",
+                           "rotation_speed", "size", "pulse_speed", "color")
+    for _ in range(rng.randint(*count_range)):
+        offset_x = rng.randint(-spread, spread)
+        offset_y = rng.randint(-spread, spread)
+        radius = rng.randint(*radius_range)
+        angle = rng.uniform(0, 2 * math.pi)
+        speed = rng.uniform(*speed_range)
+        color = rng.choice(palette)
+        life = rng.randint(*life_range)
+        columns["rotation_speed"].append(rng.uniform(-rotation_range, rotation_range))
+        columns["pulse_speed"].append(rng.uniform(*pulse_range))
+        columns["x"].append(center_x + offset_x)
+        columns["y"].append(center_y + offset_y)
+        columns["vx"].append(math.cos(angle) * speed)
+        columns["vy"].append(math.sin(angle) * speed)
+        columns["friction"].append(friction)
+        columns["life"].append(life)
+        columns["max_life"].append(life)
+        columns["size"].append(radius)
+        columns["color"].append(palette.index(color))
+    particle_system.emit(name, columns)
+    return _max_life(columns)
+
+
+def emit_cherry_explosion(center_x, center_y):
+    """樱桃炸弹爆炸：30-50个红橙色粒子向四周扩散，无重力"""
+    return emit_burst("cherry_burst", center_x, center_y, (30, 50), 20, (8, 18), (2, 8),
+                      CHERRY_COLORS, (30, 60), 0.98, 8, (0.05, 0.15))
+
+
+def emit_cucumber_explosion(center_x, center_y):
+    """黄瓜爆炸：40-60个绿色粒子向四周扩散"""
+    return emit_burst("cucumber_burst", center_x, center_y, (40, 60), 30, (6, 15), (2, 5),
+                      CUCUMBER_COLORS, (35, 70), 0.97, 6, (0.08, 0.18))
+
+
+def emit_cucumber_spray(x, y, count, direction, speed_range, spread, life_range, jitter=None):
+    """
+    发射黄瓜喷射粒子
+
+    Args:
+        x, y: 喷射位置
+        count: 粒子数量
+        direction: 1向右，-1向左
+        speed_range: 向前速度范围
+        spread: 垂直散射速度范围 (-spread, spread)
+        life_range: 生命范围（帧）
+        jitter: 每个粒子位置的随机偏移范围 (水平, 垂直)，None 表示不偏移
+
+    Returns:
+        int: 本批粒子的最长生命（帧）
+    """
+    rng = get_rng("particles")
+    columns = _new_columns("x", "y", "vx", "vy", "gravity", "friction", "life", "max_life",
+                           "rotation_speed", "size", "pulse_speed", "color")
+    for _ in range(count):
+        offset_x = offset_y = 0
+        if jitter:
+            offset_x = rng.randint(-jitter[0], jitter[0])
+            offset_y = rng.randint(-jitter[1], jitter[1])
+        radius = rng.randint(3, 8)
+        forward_speed = rng.uniform(*speed_range)
+        vertical_spread = rng.uniform(-spread, spread)
+        color = rng.choice(SPRAY_COLORS)
+        life = rng.randint(*life_range)
+        columns["rotation_speed"].append(rng.uniform(-5, 5))
+        columns["pulse_speed"].append(rng.uniform(0.1, 0.2))
+        columns["x"].append(x + offset_x)
+        columns["y"].append(y + offset_y)
+        columns["vx"].append(forward_speed * direction)
+        columns["vy"].append(vertical_spread)
+        columns["gravity"].append(0.1)
+        columns["friction"].append(0.98)
+        columns["life"].append(life)
+        columns["max_life"].append(life)
+        columns["size"].append(radius)
+        columns["color"].append(SPRAY_COLORS.index(color))
+    particle_system.emit("cucumber_spray", columns)
+    return _max_life(columns)
+
+
+def emit_melon_splash(x, y, count):
+    """西瓜溅射：count 个果肉、瓜籽和瓜皮碎片，受重力和空气阻力影响"""
+    rng = get_rng("particles")
+    columns = _new_columns("x", "y", "vx", "vy", "gravity", "friction", "life", "max_life",
+                           "rotation", "rotation_speed", "size", "color")
+    for _ in range(count):
+        angle = rng.uniform(0, math.pi * 2)
+        speed = rng.uniform(1, 2)
+        size = rng.randint(2, 6)
+        life = rng.randint(20, 60)
+        color = rng.choice(MELON_COLORS)
+        columns["gravity"].append(rng.uniform(0.15, 0.25))
+        columns["friction"].append(rng.uniform(0.92, 0.98))
+        columns["vy"].append(math.sin(angle) * speed - rng.uniform(0.5, 1.5))
+        columns["rotation"].append(rng.uniform(0, 360))
+        columns["rotation_speed"].append(rng.uniform(-10, 10))
+        columns["x"].append(x)
+        columns["y"].append(y)
+        columns["vx"].append(math.cos(angle) * speed)
+        columns["life"].append(life)
+        columns["max_life"].append(life)
+        columns["size"].append(size)
+        columns["color"].append(MELON_COLORS.index(color))
+    particle_system.emit("melon_shards", columns)
+    return _max_life(columns)
+
+
+def emit_portal_particle(center_x, center_y):
+    """传送门：在环上随机位置产生一个向外缓慢飘散的光点"""
+    rng = get_rng("particles")
+    angle = rng.uniform(0, 2 * math.pi)
+    radius = rng.uniform(15, 25)
+    color = rng.choice(PORTAL_COLORS)
+    particle_system.emit("portal", {
+        "x": [center_x + math.cos(angle) * radius],
+        "y": [center_y + math.sin(angle) * radius],
+        "vx": [math.cos(angle) * 0.3],
+        "vy": [math.sin(angle) * 0.3],
+        "life": [45],
+        "max_life": [45],
+        "color": [PORTAL_COLORS.index(color)],
+    })
+
+
+def emit_trophy_sparks(x, y, count=150):
+    """奖杯爆炸：count 个受重力下落的火花（奖杯使用全局 random，与游戏随机数流无关）"""
+    columns = _new_columns("x", "y", "vx", "vy", "gravity", "life", "max_life", "size", "color")
+    for _ in range(count):
+        angle = random.uniform(0, math.pi * 2)
+        speed = random.uniform(3, 12)
+        size = random.randint(2, 8)
+        life = random.randint(40, 120)
+        color = random.choice(TROPHY_SPARK_COLORS)
+        columns["x"].append(x)
+        columns["y"].append(y)
+        columns["vx"].append(math.cos(angle) * speed)
+        columns["vy"].append(math.sin(angle) * speed)
+        columns["gravity"].append(0.15)
+        columns["life"].append(life)
+        columns["max_life"].append(life)
+        columns["size"].append(size)
+        columns["color"].append(TROPHY_SPARK_COLORS.index(color))
+    particle_system.emit("trophy_sparks", columns)
+    return _max_life(columns)
+
+
+def emit_trophy_glow(center_x, center_y):
+    """奖杯发光：30%概率产生一个绕奖杯旋转的光点"""
+    if random.random() >= 0.3:
+        return
+    angle = random.uniform(0, math.pi * 2)
+    distance = random.uniform(35, 60)
+    life = random.randint(60, 120)
+    max_life = random.randint(60, 120)
+    size = random.randint(2, 5)
+    color = random.choice(TROPHY_GLOW_COLORS)
+    particle_system.emit("trophy_glow", {
+        "x": [center_x],
+        "y": [center_y],
+        "rotation": [angle],
+        "rotation_speed": [0.03],
+        "distance": [distance],
+        "life": [life],
+        "max_life": [max_life],
+        "size": [size],
+        "color": [TROPHY_GLOW_COLORS.index(color)],
+    })
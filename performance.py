@@ -3,10 +3,63 @@
 """
 import pygame
 import time
+import math
+import csv
+import json
+from bisect import bisect_left, bisect_right
 from collections import deque
 import gc
 
 
+# 每个计时作用域保留的最近样本数（60帧/秒下约10秒）
+SCOPE_WINDOW = 600
+
+# 计时报告中的百分位
+SCOPE_PERCENTILES = (50, 95, 99)
+
+# --timing 未指定路径时的默认报告文件
+DEFAULT_TIMING_REPORT = "timing_report.csv"
+
+
+class TimingScope:
+    """命名计时作用域：with 语句退出时把耗时（秒）追加到滚动样本中"""
+
+    __slots__ = ("samples", "start")
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.samples.append(time.perf_counter() - self.start)
+        return False
+
+
+class _NullScope:
+    """计时关闭时使用的空作用域，不做任何事"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+def percentile(sorted_samples, percent):
+    """最近秩法计算百分位"""
+    index = max(0, math.ceil(percent / 100 * len(sorted_samples)) - 1)
+    return sorted_samples[min(index, len(sorted_samples) - 1)]
+
+
 class PerformanceMonitor:
     """高级性能监控器，提供多级性能调整和智能优化"""
 
@@ -47,6 +100,89 @@ class PerformanceMonitor:
             'critical': 15
         }
 
+        # 分系统计时（默认关闭，关闭时 scope() 返回共享的空作用域）
+        self.scopes_enabled = False
+        self.scope_report_path = None  # 退出时写出报告的路径
+        self.scope_samples = {}  # 作用域名称 -> 最近的耗时样本（秒）
+        self._scopes = {}  # 作用域名称 -> TimingScope，重复使用避免每帧创建对象
+
+    def enable_scopes(self, report_path=None):
+        """
+        开启分系统计时
+
+        Args:
+            report_path: 退出时写出报告的路径，.jsonl 结尾写JSON行，其他写CSV
+        """
+        self.scopes_enabled = True
+        self.scope_report_path = report_path
+
+    def reset_scopes(self):
+        """清空所有计时作用域的样本"""
+        self.scope_samples.clear()
+        self._scopes.clear()
+
+    def scope(self, name):
+        """
+        获取命名计时作用域，用法：with monitor.scope("logic.bullets"): ...
+
+        计时关闭时返回空作用域，开销只有一次方法调用。
+        """
+        if not self.scopes_enabled:
+            return _NULL_SCOPE
+        timing_scope = self._scopes.get(name)
+        if timing_scope is None:
+            samples = deque(maxlen=SCOPE_WINDOW)
+            self.scope_samples[name] = samples
+            timing_scope = TimingScope(samples)
+            self._scopes[name] = timing_scope
+        return timing_scope
+
+    def get_scope_stats(self):
+        """
+        获取各计时作用域最近样本的统计（毫秒）
+
+        Returns:
+            dict: 作用域名称 -> {"samples", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}
+        """
+        stats = {}
+        for name, samples in sorted(self.scope_samples.items()):
+            if not samples:
+                continue
+            sorted_samples = sorted(samples)
+            scope_stats = {
+                "samples": len(sorted_samples),
+                "mean_ms": sum(sorted_samples) / len(sorted_samples) * 1000,
+            }
+            for percent in SCOPE_PERCENTILES:
+                scope_stats[f"p{percent}_ms"] = percentile(sorted_samples, percent) * 1000
+            scope_stats["max_ms"] = sorted_samples[-1] * 1000
+            stats[name] = scope_stats
+        return stats
+
+    def dump_scope_report(self, path=None):
+        """
+        把计时统计写入文件，返回写入的路径；没有开启计时或没有样本时返回None
+
+        Args:
+            path: 报告路径，默认使用 enable_scopes 时指定的路径；.jsonl 结尾写JSON行，其他写CSV
+        """
+        path = path or self.scope_report_path
+        stats = self.get_scope_stats()
+        if not path or not stats:
+            return None
+
+        with open(path, "w", encoding="utf-8", newline="") as report_file:
+            if path.endswith(".jsonl"):
+                for name, scope_stats in stats.items():
+                    report_file.write(json.dumps({"scope": name, **scope_stats}, ensure_ascii=False) + "\n")
+            else:
+                fieldnames = ["scope"] + list(next(iter(stats.values())))
+                writer = csv.DictWriter(report_file, fieldnames=fieldnames)
+                writer.writeheader()
+                for name, scope_stats in stats.items():
+                    writer.writerow({"scope": name, **scope_stats})
+        return path
+
     def should_reduce_zombie_death_effects(self):
         """是否应该减少僵尸死亡效果"""
         return self.performance_level <= 2 or self.is_lagging()
@@ -168,126 +304,173 @@ class PerformanceMonitor:
 
 
 class SpatialGrid:
-    """高性能空间分区系统"""
+    """
+    常驻的僵尸空间索引
+
+    由游戏状态持有（game["zombie_grid"]），整局只创建一次。只有在僵尸生成、
+    移除、跨越格子边界或被传送时才更新，不再每帧重建。
+    每行维护一个按格子列号排序的僵尸列表，行查询直接返回该列表。
+    """
 
     def __init__(self, grid_width, grid_height):
         self.grid_width = grid_width
         self.grid_height = grid_height
 
-        # 预分配内存，避免动态分配
-        self.cells = []
-        self.zombie_positions = {}  # 缓存僵尸位置
-        self.dirty_rows = set()  # 标记需要更新的行
-
-        # 对象池
-        self.list_pool = deque(maxlen=50)  # 重用列表对象
+        self.rows = []  # 每行的僵尸列表，按格子列号升序
+        self.row_cols = []  # 与 rows 平行的格子列号列表，用于二分查找
+        self.zombie_positions = {}  # 僵尸实体ID -> (行, 列)
         self.reset()
 
     def reset(self):
-        """高效重置网格"""
-        # 回收旧的列表到对象池
-        for row in self.cells:
-            for cell_list in row:
-                if cell_list:
-                    cell_list.clear()
-                    if len(self.list_pool) < self.list_pool.maxlen:
-                        self.list_pool.append(cell_list)
-
-        # 重新初始化网格
-        self.cells = [[self._get_list() for _ in range(self.grid_width)]
-                      for _ in range(self.grid_height)]
+        """清空网格"""
+        self.rows = [[] for _ in range(self.grid_height)]
+        self.row_cols = [[] for _ in range(self.grid_height)]
         self.zombie_positions.clear()
-        self.dirty_rows.clear()
 
-    def _get_list(self):
-        """从对象池获取列表或创建新列表"""
-        if self.list_pool:
-            return self.list_pool.popleft()
-        return []
+    def rebuild(self, zombies):
+        """根据僵尸列表重建网格（仅用于读档等整体替换僵尸列表的场合）"""
+        self.reset()
+        for zombie in zombies:
+            self.add_zombie(zombie)
 
-    def add_zombie(self, zombie):
-        """高效添加僵尸到网格"""
-        zombie_id = id(zombie)
-
-        # 检查僵尸是否已经在网格中
-        if zombie_id in self.zombie_positions:
-            old_row, old_col = self.zombie_positions[zombie_id]
-            # 如果位置没变，直接返回
-            new_row = int(zombie.row)
-            new_col = int(min(max(zombie.col, 0), self.grid_width - 1))
-            if old_row == new_row and old_col == new_col:
+    def _get_cell(self, zombie):
+        """计算僵尸所在格子"""
+        row = int(zombie.row)
+        col = int(min(max(zombie.col, 0), self.grid_width - 1))
+        return row, col
+
+    def _insert(self, zombie, row, col):
+        """按列号插入到行列表中，同一格子内保持加入顺序"""
+        cols = self.row_cols[row]
+        index = bisect_right(cols, col)
+        cols.insert(index, col)
+        self.rows[row].insert(index, zombie)
+
+    def _remove(self, zombie, row, col):
+        """从行列表中移除僵尸"""
+        cols = self.row_cols[row]
+        zombies = self.rows[row]
+        for index in range(bisect_left(cols, col), bisect_right(cols, col)):
+            if zombies[index] is zombie:
+                del cols[index]
+                del zombies[index]
                 return
 
-            # 从旧位置移除
-            if (0 <= old_row < self.grid_height and
-                    0 <= old_col < self.grid_width):
-                try:
-                    self.cells[old_row][old_col].remove(zombie)
-                except ValueError:
-                    pass  # 僵尸可能已经被移除
+    def add_zombie(self, zombie):
+        """添加僵尸到网格，已存在时等同于 update_zombie"""
+        if zombie.entity_id in self.zombie_positions:
+            self.update_zombie(zombie)
+            return
 
-        # 添加到新位置
-        row = int(zombie.row)
-        col = int(min(max(zombie.col, 0), self.grid_width - 1))
+        row, col = self._get_cell(zombie)
+        if 0 <= row < self.grid_height:
+            self._insert(zombie, row, col)
+            self.zombie_positions[zombie.entity_id] = (row, col)
 
+    def update_zombie(self, zombie):
+        """僵尸移动后调用，只有跨越格子边界时才调整网格，返回是否发生了调整"""
+        old_position = self.zombie_positions.get(zombie.entity_id)
+        if old_position is None:
+            return False
+
+        new_position = self._get_cell(zombie)
+        if new_position == old_position:
+            return False
+
+        self._remove(zombie, *old_position)
+        row, col = new_position
         if 0 <= row < self.grid_height:
-            self.cells[row][col].append(zombie)
-            self.zombie_positions[zombie_id] = (row, col)
-            self.dirty_rows.add(row)
+            self._insert(zombie, row, col)
+            self.zombie_positions[zombie.entity_id] = new_position
+        else:
+            del self.zombie_positions[zombie.entity_id]
+        return True
 
     def remove_zombie(self, zombie):
         """从网格中移除僵尸"""
-        zombie_id = id(zombie)
-        if zombie_id in self.zombie_positions:
-            row, col = self.zombie_positions[zombie_id]
-            if (0 <= row < self.grid_height and
-                    0 <= col < self.grid_width):
-                try:
-                    self.cells[row][col].remove(zombie)
-                    self.dirty_rows.add(row)
-                except ValueError:
-                    pass
-            del self.zombie_positions[zombie_id]
+        position = self.zombie_positions.pop(zombie.entity_id, None)
+        if position is not None:
+            self._remove(zombie, *position)
 
     def get_zombies_in_row(self, row):
-        """高效获取指定行的僵尸"""
-        if not (0 <= row < self.grid_height):
-            return []
+        """
+        获取指定行的僵尸，按格子列号升序
 
-        # 使用生成器表达式减少内存分配
-        zombies = []
-        for col in range(self.grid_width):
-            zombies.extend(self.cells[row][col])
-        return zombies
+        直接返回网格内部的列表，不做复制，调用方不能修改它；
+        遍历过程中也不能增删僵尸。
+        """
+        if not (0 <= row < self.grid_height):
+            return ()
+        return self.rows[row]
 
     def get_zombies_in_area(self, start_row, end_row, start_col, end_col):
         """获取指定区域的僵尸"""
         zombies = []
         for row in range(max(0, start_row), min(self.grid_height, end_row + 1)):
-            for col in range(max(0, start_col), min(self.grid_width, end_col + 1)):
-                zombies.extend(self.cells[row][col])
+            cols = self.row_cols[row]
+            first = bisect_left(cols, start_col)
+            last = bisect_right(cols, end_col)
+            zombies.extend(self.rows[row][first:last])
         return zombies
 
     def get_zombie_count(self):
         """获取总僵尸数量"""
         return len(self.zombie_positions)
 
-    def cleanup_dead_zombies(self, alive_zombies):
-        """清理已死亡的僵尸引用"""
-        alive_ids = {id(zombie) for zombie in alive_zombies}
-        dead_ids = set(self.zombie_positions.keys()) - alive_ids
-
-        for zombie_id in dead_ids:
-            if zombie_id in self.zombie_positions:
-                row, col = self.zombie_positions[zombie_id]
-                # 从网格中查找并移除死亡僵尸
-                if (0 <= row < self.grid_height and
-                        0 <= col < self.grid_width):
-                    cell = self.cells[row][col]
-                    self.cells[row][col] = [z for z in cell if id(z) in alive_ids]
-                    if len(self.cells[row][col]) != len(cell):
-                        self.dirty_rows.add(row)
-                del self.zombie_positions[zombie_id]
+
+class PlantGrid:
+    """
+    常驻的植物占用网格
+
+    由游戏状态持有（game["plant_grid"]），GRID_HEIGHT x GRID_WIDTH 个格子，
+    每格最多一株植物。种植、铲除和植物死亡时更新，
+    僵尸啃咬、种植检查和黄瓜治疗都直接按格子查询，不再遍历植物列表。
+    """
+
+    def __init__(self, grid_width, grid_height):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cells = []  # cells[行][列] -> 植物或None
+        self.reset()
+
+    def reset(self):
+        """清空网格"""
+        self.cells = [[None] * self.grid_width for _ in range(self.grid_height)]
+
+    def rebuild(self, plants):
+        """根据植物列表重建网格"""
+        self.reset()
+        for plant in plants:
+            self.add_plant(plant)
+
+    def add_plant(self, plant):
+        """登记植物占用的格子"""
+        if 0 <= plant.row < self.grid_height and 0 <= plant.col < self.grid_width:
+            self.cells[plant.row][plant.col] = plant
+
+    def remove_plant(self, plant):
+        """释放植物占用的格子（格子已被其他植物占用时不做处理）"""
+        if self.get_plant(plant.row, plant.col) is plant:
+            self.cells[plant.row][plant.col] = None
+
+    def get_plant(self, row, col):
+        """获取格子中的植物，没有植物或越界时返回None"""
+        if 0 <= row < self.grid_height and 0 <= col < self.grid_width:
+            return self.cells[row][col]
+        return None
+
+    def get_plants_in_range(self, row, start_col, end_col):
+        """
+        获取指定行中列号落在 [start_col, end_col] 附近的植物，按列号升序
+
+        边界向外取整，只会多选不会漏选，精确的距离判断由调用方完成。
+        """
+        if not 0 <= row < self.grid_height:
+            return []
+        cells = self.cells[row]
+        first = max(math.floor(start_col), 0)
+        last = min(math.ceil(end_col), self.grid_width - 1)
+        return [cells[col] for col in range(first, last + 1) if cells[col] is not None]
 
 
 class ObjectPool:
@@ -6,13 +6,6 @@
 from .base_plant import BasePlant
 from .shooter_base import ShooterPlant
 
-# 导入粒子效果
-from .particles import (
-    ExplosionParticle,
-    CucumberExplosionParticle,
-    CucumberSprayParticle
-)
-
 # 导入所有植物类
 from .sunflower import Sunflower
 from .shooter import Shooter
@@ -57,17 +50,18 @@ def Plant(row, col, plant_type=None, constants=None, images=None, level_manager=
         return BasePlant(row, col, plant_type, constants, images, level_manager)
 
 
+def preload_effect_frames(images, constants):
+    """加载图片后预先生成爆炸植物蓄力动画的帧（发光和缩放合成后的表面）"""
+    for plant_class in (CherryBomb, Cucumber):
+        plant_class.preload_charge_frames(images, constants)
+
+
 # 导出所有需要的类和函数
 __all__ = [
     # 基础类
     'BasePlant',
     'ShooterPlant',
 
-    # 粒子效果
-    'ExplosionParticle',
-    'CucumberExplosionParticle',
-    'CucumberSprayParticle',
-
     # 植物类
     'Sunflower',
     'Shooter',
@@ -82,4 +76,5 @@ __all__ = [
 
     # 工厂函数
     'Plant',
+    'preload_effect_frames',
 ]
\ No newline at end of file
@@ -3,15 +3,21 @@
 """
 import random
 import pygame
+from render_queue import LAYER_PLANTS, LAYER_PLANT_OVERLAYS
 
 
 class BasePlant:
     """基础植物类，包含所有植物共享的属性和方法"""
 
+    # 只绘制一张图片加血条的植物在子类中设置图片键，渲染队列直接批量提交该图片；
+    # 为None时 queue_sprites 退回到 draw(surface)
+    sprite_image_key = None
+
     def __init__(self, row, col, plant_type=None, constants=None, images=None, level_manager=None):
         self.row = row
         self.col = col
         self.plant_type = plant_type
+        self.entity_id = None  # 加入游戏时由实体注册表分配
 
         # 根据植物类型设置血量和最大血量
         if plant_type == "wall_nut":
@@ -65,6 +71,45 @@ class BasePlant:
         # 绘制血条
         self._draw_health_bar(surface, x, y)
 
+    def get_screen_position(self):
+        """获取植物左上角的像素坐标（按行列缓存）"""
+        cell = (self.row, self.col)
+        if self.__dict__.get('_screen_cell') != cell:
+            cell_size = self.constants['GRID_SIZE'] + self.constants['GRID_GAP']
+            self._screen_position = (self.constants['BATTLEFIELD_LEFT'] + self.col * cell_size,
+                                     self.constants['BATTLEFIELD_TOP'] + self.row * cell_size)
+            self._screen_cell = cell
+        return self._screen_position
+
+    def get_draw_bounds(self):
+        """draw 可能绘制到的区域：格子（或更大的植物图片）和下方的血条"""
+        if not self.constants:
+            return pygame.Rect(0, 0, 0, 0)
+        x, y = self.get_screen_position()
+        grid_size = self.constants['GRID_SIZE']
+        image = self.images.get(self.sprite_image_key) if self.sprite_image_key and self.images else None
+        width, height = image.get_size() if image is not None else (0, 0)
+        # 血条在格子下方2像素处，高6像素
+        return pygame.Rect(x, y, max(grid_size, width), max(grid_size + 8, height))
+
+    def queue_sprites(self, render_queue):
+        """把植物图片和血条提交到渲染队列"""
+        image = self.images.get(self.sprite_image_key) if self.sprite_image_key and self.images else None
+        if image is None or not self.constants:
+            render_queue.submit_draw(LAYER_PLANTS, self.draw, self.get_draw_bounds())
+            return
+
+        x, y = self.get_screen_position()
+        render_queue.submit(LAYER_PLANTS, image, (x, y))
+
+        health_bar = self._get_health_bar(x, y)
+        if health_bar:
+            bar_rect, health_rect, health_color = health_bar
+            render_queue.submit_fill(LAYER_PLANT_OVERLAYS, self.constants['RED'], bar_rect)
+            if health_rect:
+                render_queue.submit_fill(LAYER_PLANT_OVERLAYS, health_color, health_rect)
+            render_queue.submit_outline(LAYER_PLANT_OVERLAYS, (0, 0, 0), bar_rect)
+
     def can_shoot(self):
         """检查是否可以射击 - 基类默认返回False"""
         return False
@@ -81,37 +126,53 @@ class BasePlant:
         """寻找最近的僵尸 - 基类默认返回None"""
         return None
 
-    def _draw_health_bar(self, surface, x, y):
-        """绘制植物血条"""
+    def _get_health_bar(self, x, y):
+        """
+        计算血条的矩形和颜色
+
+        Returns:
+            tuple | None: (血条背景矩形, 当前血量矩形或None, 血量颜色)，满血或不显示血条时返回None
+        """
         should_show_health_bar = (self.health < self.max_health and
                                   self.plant_type not in ["cherry_bomb", "cucumber"])
+        if not should_show_health_bar:
+            return None
+
+        health_bar_width = self.constants['GRID_SIZE']
+        health_bar_height = 6
+        health_bar_x = x
+        health_bar_y = y + self.constants['GRID_SIZE'] + 2
+        bar_rect = (health_bar_x, health_bar_y, health_bar_width, health_bar_height)
+
+        # 当前血量条
+        health_percentage = self.health / self.max_health
+        current_health_width = int(health_percentage * health_bar_width)
+
+        # 根据血量百分比选择颜色
+        if health_percentage > 0.6:
+            health_color = self.constants['GREEN']
+        elif health_percentage > 0.3:
+            health_color = (255, 255, 0)  # 黄色
+        else:
+            health_color = (255, 165, 0)  # 橙色
 
-        if should_show_health_bar:
-            health_bar_width = self.constants['GRID_SIZE']
-            health_bar_height = 6
-            health_bar_x = x
-            health_bar_y = y + self.constants['GRID_SIZE'] + 2
+        health_rect = None
+        if current_health_width > 0:
+            health_rect = (health_bar_x, health_bar_y, current_health_width, health_bar_height)
+        return bar_rect, health_rect, health_color
+
+    def _draw_health_bar(self, surface, x, y):
+        """绘制植物血条"""
+        health_bar = self._get_health_bar(x, y)
+        if health_bar:
+            bar_rect, health_rect, health_color = health_bar
 
             # 血条背景（红色）
-            pygame.draw.rect(surface, self.constants['RED'],
-                             (health_bar_x, health_bar_y, health_bar_width, health_bar_height))
+            pygame.draw.rect(surface, self.constants['RED'], bar_rect)
 
             # 当前血量条
-            health_percentage = self.health / self.max_health
-            current_health_width = int(health_percentage * health_bar_width)
-
-            # 根据血量百分比选择颜色
-            if health_percentage > 0.6:
-                health_color = self.constants['GREEN']
-            elif health_percentage > 0.3:
-                health_color = (255, 255, 0)  # 黄色
-            else:
-                health_color = (255, 165, 0)  # 橙色
-
-            if current_health_width > 0:
-                pygame.draw.rect(surface, health_color,
-                                 (health_bar_x, health_bar_y, current_health_width, health_bar_height))
+            if health_rect:
+                pygame.draw.rect(surface, health_color, health_rect)
 
             # 血条边框
-            pygame.draw.rect(surface, (0, 0, 0),
-                             (health_bar_x, health_bar_y, health_bar_width, health_bar_height), 1)
\ No newline at end of file
+            pygame.draw.rect(surface, (0, 0, 0), bar_rect, 1)
\ No newline at end of file
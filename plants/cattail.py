@@ -8,6 +8,8 @@ from .shooter_base import ShooterPlant
 class Cattail(ShooterPlant):
     """猫尾草：全地图追踪攻击"""
 
+    sprite_image_key = 'cattail_img'
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "cattail", constants, images, level_manager, base_shoot_delay=45)
 
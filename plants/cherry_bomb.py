@@ -2,10 +2,15 @@
 樱桃炸弹植物类
 """
 import pygame
-import random
+from rsc_mng.transform_cache import get_scaled, get_glow_frame
+from particle_system import emit_cherry_explosion
 import math
 from .base_plant import BasePlant
-from .particles import ExplosionParticle
+
+
+# 快爆炸时的红色发光
+GLOW_COLOR = (255, 100, 100)
+GLOW_PADDING = 10
 
 
 class CherryBomb(BasePlant):
@@ -40,8 +45,8 @@ class CherryBomb(BasePlant):
         # 爆炸相关
         self.explosion_started = False
 
-        # 爆炸粒子
-        self.explosion_particles = []
+        # 爆炸粒子（粒子由全局粒子系统绘制，这里只记录最长粒子的剩余生命）
+        self.explosion_particle_life = 0
         self.particles_created = False
 
         # 爆炸属性
@@ -86,12 +91,12 @@ class CherryBomb(BasePlant):
             if should_explode:
                 self.explode()
 
-        # 更新爆炸粒子
-        if self.explosion_particles:
-            self.explosion_particles = [p for p in self.explosion_particles if p.update()]
+        # 更新爆炸粒子剩余生命
+        if self.explosion_particle_life > 0:
+            self.explosion_particle_life -= 1
 
             # 如果粒子全部消失，标记为可移除
-            if not self.explosion_particles and self.explosion_started:
+            if self.explosion_particle_life <= 0 and self.explosion_started:
                 self.should_be_removed = True
 
         return 0
@@ -126,12 +131,7 @@ class CherryBomb(BasePlant):
                     self.constants['GRID_SIZE'] // 2)
 
         # 创建红色粒子
-        particle_count = random.randint(30, 50)
-        for _ in range(particle_count):
-            offset_x = random.randint(-20, 20)
-            offset_y = random.randint(-20, 20)
-            particle = ExplosionParticle(center_x + offset_x, center_y + offset_y)
-            self.explosion_particles.append(particle)
+        self.explosion_particle_life = emit_cherry_explosion(center_x, center_y)
 
         self.particles_created = True
 
@@ -195,7 +195,7 @@ class CherryBomb(BasePlant):
             'health': self.health,
             'explode_timer': self.explode_timer,
             'explode_delay': self.explode_delay,
-            'explosion_particle_count': len(self.explosion_particles) if self.explosion_particles else 0
+            'explosion_particle_life': self.explosion_particle_life
         }
 
     def draw(self, surface):
@@ -203,9 +203,8 @@ class CherryBomb(BasePlant):
         if not self.constants:
             return
 
-        # 如果已开始爆炸，只绘制粒子
+        # 如果已开始爆炸，爆炸粒子由粒子系统绘制
         if self.explosion_started:
-            self.draw_explosion_particles(surface)
             return
 
         x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
@@ -220,8 +219,28 @@ class CherryBomb(BasePlant):
                                 y + self.constants['GRID_SIZE'] // 2),
                                self.constants['GRID_SIZE'] // 3)
 
+    def get_draw_bounds(self):
+        """draw 绘制的区域：当前蓄力帧（爆炸开始后不绘制）"""
+        if not self.constants or self.explosion_started:
+            return pygame.Rect(0, 0, 0, 0)
+        x, y = self.get_screen_position()
+        img = self.images.get('cherry_bomb_img') if self.images else None
+        if img is None:
+            return pygame.Rect(x, y, self.constants['GRID_SIZE'], self.constants['GRID_SIZE'])
+        frame, (offset_x, offset_y) = self.get_charge_frame(img)
+        return frame.get_rect(topleft=(x + offset_x, y + offset_y))
+
     def draw_cherry_bomb(self, surface, img, x, y):
-        """绘制樱桃炸弹（带缩放和脉冲效果）"""
+        """绘制樱桃炸弹（带缩放和脉冲效果），发光和缩放后的图片已合成为一帧"""
+        frame, (offset_x, offset_y) = self.get_charge_frame(img)
+        surface.blit(frame, (x + offset_x, y + offset_y))
+
+    def get_charge_frame(self, img):
+        """
+        获取当前蓄力动画帧及其相对格子左上角的偏移
+
+        帧按 (缩放后尺寸, 发光强度) 缓存，同一阶段的所有樱桃炸弹共享
+        """
         # 计算当前缩放
         current_scale = self.scale
 
@@ -241,30 +260,29 @@ class CherryBomb(BasePlant):
 
         # 缩放图片
         if abs(current_scale - 1.0) > 0.01:
-            scaled_img = pygame.transform.scale(img, (scaled_width, scaled_height))
+            scaled_img = get_scaled(img, (scaled_width, scaled_height))
         else:
             scaled_img = img
 
-        # 计算居中绘制位置
-        center_x = x + self.constants['GRID_SIZE'] // 2
-        center_y = y + self.constants['GRID_SIZE'] // 2
-        draw_x = center_x - scaled_img.get_width() // 2
-        draw_y = center_y - scaled_img.get_height() // 2
+        # 计算居中绘制位置（相对格子左上角）
+        offset_x = self.constants['GRID_SIZE'] // 2 - scaled_img.get_width() // 2
+        offset_y = self.constants['GRID_SIZE'] // 2 - scaled_img.get_height() // 2
 
         # 添加红色发光效果（快爆炸时）
         if self.explode_timer > 60:
             glow_intensity = int(100 * ((self.explode_timer - 60) / 60))
-            glow_surface = pygame.Surface((scaled_width + 20, scaled_height + 20), pygame.SRCALPHA)
-            glow_color = (255, 100, 100, glow_intensity)
-            pygame.draw.circle(glow_surface, glow_color,
-                               (glow_surface.get_width() // 2, glow_surface.get_height() // 2),
-                               max(scaled_width, scaled_height) // 2 + 10)
-            surface.blit(glow_surface, (draw_x - 10, draw_y - 10))
-
-        # 绘制樱桃炸弹
-        surface.blit(scaled_img, (draw_x, draw_y))
-
-    def draw_explosion_particles(self, surface):
-        """绘制爆炸粒子"""
-        for particle in self.explosion_particles:
-            particle.draw(surface)
\ No newline at end of file
+            frame = get_glow_frame(scaled_img, GLOW_COLOR, glow_intensity, GLOW_PADDING)
+            return frame, (offset_x - GLOW_PADDING, offset_y - GLOW_PADDING)
+        return scaled_img, (offset_x, offset_y)
+
+    @classmethod
+    def preload_charge_frames(cls, images, constants):
+        """加载图片后按蓄力时间线预先生成所有动画帧，游戏中绘制樱桃炸弹只需一次 blit"""
+        img = images.get('cherry_bomb_img') if images else None
+        if img is None:
+            return
+        plant = cls(0, 0, constants, images, None)
+        for timer in range(plant.explode_delay + 1):
+            plant.explode_timer = plant.pulse_timer = timer
+            plant.scale = min(1.0 + plant.scale_step * (timer // plant.scale_interval), plant.max_scale)
+            plant.get_charge_frame(img)
@@ -2,10 +2,17 @@
 黄瓜植物类
 """
 import pygame
-import random
+from sim_clock import get_rng
+from rsc_mng.transform_cache import get_scaled, get_glow_frame
+from particle_system import emit_cucumber_explosion, emit_cucumber_spray
 import math
 from .base_plant import BasePlant
-from .particles import CucumberExplosionParticle, CucumberSprayParticle
+
+
+# 蓄力时逐渐增强的淡绿色发光
+GLOW_COLOR = (144, 238, 144)
+GLOW_PADDING = 15
+MAX_GLOW_ALPHA = 120
 
 
 class Cucumber(BasePlant):
@@ -39,7 +46,7 @@ class Cucumber(BasePlant):
 
         # 爆炸相关
         self.explosion_started = False
-        self.explosion_particles = []
+        self.explosion_particle_life = 0  # 爆炸粒子剩余帧数（粒子本身由全局粒子系统管理）
         self.particles_created = False
 
         # 黄瓜特殊属性
@@ -49,7 +56,7 @@ class Cucumber(BasePlant):
         self.death_probability = 0.5  # 50%死亡概率
 
         # 喷射粒子
-        self.spray_particles = []
+        self.spray_particle_life = 0  # 喷射粒子剩余帧数
         self.spray_created = False
 
         # 视觉效果
@@ -99,18 +106,18 @@ class Cucumber(BasePlant):
             if should_explode:
                 self.explode_cucumber()
 
-        # 更新爆炸粒子
-        if self.explosion_particles:
-            self.explosion_particles = [p for p in self.explosion_particles if p.update()]
+        # 爆炸粒子倒计时
+        if self.explosion_particle_life > 0:
+            self.explosion_particle_life -= 1
 
-        # 更新喷射粒子
-        if self.spray_particles:
-            self.spray_particles = [p for p in self.spray_particles if p.update()]
+        # 喷射粒子倒计时
+        if self.spray_particle_life > 0:
+            self.spray_particle_life -= 1
 
         # 如果所有粒子都消失，标记为可移除
         if (self.explosion_started and
-                not self.explosion_particles and
-                not self.spray_particles):
+                self.explosion_particle_life <= 0 and
+                self.spray_particle_life <= 0):
             self.should_be_removed = True
 
         return 0
@@ -155,24 +162,16 @@ class Cucumber(BasePlant):
                     self.constants['GRID_SIZE'] // 2)
 
         # 创建绿色爆炸粒子
-        particle_count = random.randint(40, 60)
-        for _ in range(particle_count):
-            offset_x = random.randint(-30, 30)
-            offset_y = random.randint(-30, 30)
-            particle = CucumberExplosionParticle(center_x + offset_x, center_y + offset_y)
-            self.explosion_particles.append(particle)
+        self.explosion_particle_life = emit_cucumber_explosion(center_x, center_y)
 
         self.particles_created = True
 
     def create_spray_particles_at_position(self, x, y, direction=1):
         """在指定位置创建喷射粒子（供外部调用）"""
-        particle_count = random.randint(1, 2)
-        for _ in range(particle_count):
-            # 在位置周围稍微分散
-            offset_x = random.randint(-15, 15)
-            offset_y = random.randint(-10, 10)
-            particle = CucumberSprayParticle(x + offset_x, y + offset_y, direction)
-            self.spray_particles.append(particle)
+        particle_count = get_rng("particles").randint(1, 2)
+        # 在位置周围稍微分散
+        life = emit_cucumber_spray(x, y, particle_count, direction, (3, 6), 1, (100, 140), jitter=(15, 10))
+        self.spray_particle_life = max(self.spray_particle_life, life)
 
     def get_fullscreen_explosion_data(self):
         """获取全屏爆炸数据（供外部系统使用）"""
@@ -236,8 +235,8 @@ class Cucumber(BasePlant):
             'health': self.health,
             'explode_timer': self.explode_timer,
             'explode_delay': self.explode_delay,
-            'explosion_particle_count': len(self.explosion_particles) if self.explosion_particles else 0,
-            'spray_particle_count': len(self.spray_particles) if self.spray_particles else 0
+            'explosion_particle_life': self.explosion_particle_life,
+            'spray_particle_life': self.spray_particle_life
         }
 
     def draw(self, surface):
@@ -245,10 +244,8 @@ class Cucumber(BasePlant):
         if not self.constants:
             return
 
-        # 如果已开始爆炸，只绘制粒子
+        # 如果已开始爆炸，粒子由全局粒子系统绘制
         if self.explosion_started:
-            self.draw_explosion_particles(surface)
-            self.draw_spray_particles(surface)
             return
 
         x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
@@ -263,8 +260,28 @@ class Cucumber(BasePlant):
                                 y + self.constants['GRID_SIZE'] // 2),
                                self.constants['GRID_SIZE'] // 3)
 
+    def get_draw_bounds(self):
+        """draw 绘制的区域：当前蓄力帧（爆炸开始后不绘制）"""
+        if not self.constants or self.explosion_started:
+            return pygame.Rect(0, 0, 0, 0)
+        x, y = self.get_screen_position()
+        img = self.images.get('cucumber_img') if self.images else None
+        if img is None:
+            return pygame.Rect(x, y, self.constants['GRID_SIZE'], self.constants['GRID_SIZE'])
+        frame, (offset_x, offset_y) = self.get_charge_frame(img)
+        return frame.get_rect(topleft=(x + offset_x, y + offset_y))
+
     def draw_cucumber(self, surface, img, x, y):
-        """绘制黄瓜（带缩放和绿色发光效果）"""
+        """绘制黄瓜（带缩放和绿色发光效果），发光和缩放后的图片已合成为一帧"""
+        frame, (offset_x, offset_y) = self.get_charge_frame(img)
+        surface.blit(frame, (x + offset_x, y + offset_y))
+
+    def get_charge_frame(self, img):
+        """
+        获取当前蓄力动画帧及其相对格子左上角的偏移
+
+        帧按 (缩放后尺寸, 发光强度) 缓存，同一阶段的所有黄瓜共享
+        """
         # 计算当前缩放
         current_scale = self.scale
 
@@ -284,34 +301,29 @@ class Cucumber(BasePlant):
 
         # 缩放图片
         if abs(current_scale - 1.0) > 0.01:
-            scaled_img = pygame.transform.scale(img, (scaled_width, scaled_height))
+            scaled_img = get_scaled(img, (scaled_width, scaled_height))
         else:
             scaled_img = img
 
-        # 计算居中绘制位置
-        center_x = x + self.constants['GRID_SIZE'] // 2
-        center_y = y + self.constants['GRID_SIZE'] // 2
-        draw_x = center_x - scaled_img.get_width() // 2
-        draw_y = center_y - scaled_img.get_height() // 2
+        # 计算居中绘制位置（相对格子左上角）
+        offset_x = self.constants['GRID_SIZE'] // 2 - scaled_img.get_width() // 2
+        offset_y = self.constants['GRID_SIZE'] // 2 - scaled_img.get_height() // 2
 
         # 添加绿色发光效果（逐渐增强）
         if self.glow_intensity > 0:
-            glow_surface = pygame.Surface((scaled_width + 30, scaled_height + 30), pygame.SRCALPHA)
-            glow_color = (144, 238, 144, min(self.glow_intensity, 120))  # 淡绿色发光
-            pygame.draw.circle(glow_surface, glow_color,
-                               (glow_surface.get_width() // 2, glow_surface.get_height() // 2),
-                               max(scaled_width, scaled_height) // 2 + 15)
-            surface.blit(glow_surface, (draw_x - 15, draw_y - 15))
-
-        # 绘制黄瓜
-        surface.blit(scaled_img, (draw_x, draw_y))
-
-    def draw_explosion_particles(self, surface):
-        """绘制爆炸粒子"""
-        for particle in self.explosion_particles:
-            particle.draw(surface)
-
-    def draw_spray_particles(self, surface):
-        """绘制喷射粒子"""
-        for particle in self.spray_particles:
-            particle.draw(surface)
\ No newline at end of file
+            frame = get_glow_frame(scaled_img, GLOW_COLOR, min(self.glow_intensity, MAX_GLOW_ALPHA), GLOW_PADDING)
+            return frame, (offset_x - GLOW_PADDING, offset_y - GLOW_PADDING)
+        return scaled_img, (offset_x, offset_y)
+
+    @classmethod
+    def preload_charge_frames(cls, images, constants):
+        """加载图片后按蓄力时间线预先生成所有动画帧，游戏中绘制黄瓜只需一次 blit"""
+        img = images.get('cucumber_img') if images else None
+        if img is None:
+            return
+        plant = cls(0, 0, constants, images, None)
+        for timer in range(plant.explode_delay + 1):
+            plant.explode_timer = plant.pulse_timer = timer
+            plant.scale = min(1.0 + plant.scale_step * (timer // plant.scale_interval), plant.max_scale)
+            plant.glow_intensity = int(timer / plant.explode_delay * 150)
+            plant.get_charge_frame(img)
\ No newline at end of file
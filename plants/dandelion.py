@@ -2,13 +2,15 @@
 蒲公英植物类
 """
 import pygame
-import random
+from sim_clock import get_rng
 from .shooter_base import ShooterPlant
 
 
 class Dandelion(ShooterPlant):
     """蒲公英：释放5颗飘散种子"""
 
+    sprite_image_key = 'dandelion_img'
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "dandelion", constants, images, level_manager, base_shoot_delay=120)
 
@@ -44,11 +46,11 @@ class Dandelion(ShooterPlant):
 
         for i in range(self.seeds_per_shot):
             # 随机选择目标僵尸
-            target_zombie = random.choice(available_zombies)
+            target_zombie = get_rng("plants").choice(available_zombies)
 
             # 为每颗种子添加随机发射偏移
-            offset_x = random.uniform(-0.2, 0.2)
-            offset_y = random.uniform(-0.2, 0.2)
+            offset_x = get_rng("plants").uniform(-0.2, 0.2)
+            offset_y = get_rng("plants").uniform(-0.2, 0.2)
 
             # 导入蒲公英种子类
             from bullets import DandelionSeed
@@ -8,6 +8,8 @@ from .shooter_base import ShooterPlant
 class IceCactus(ShooterPlant):
     """寒冰仙人掌：发射穿透冰弹，冻结僵尸"""
 
+    sprite_image_key = 'ice_cactus_img'
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "ice_cactus", constants, images, level_manager, base_shoot_delay=90)
 
@@ -2,11 +2,18 @@
 闪电花植物类
 """
 import pygame
-import random
+from sim_clock import get_rng
+from rsc_mng.transform_cache import get_glow_frame
 import math
 from .shooter_base import ShooterPlant
 
 
+# 放电时的半透明黄色发光
+GLOW_COLOR = (255, 255, 0)
+GLOW_ALPHA = 100
+GLOW_PADDING = 10
+
+
 class LightningFlower(ShooterPlant):
     """闪电花：链式闪电攻击"""
 
@@ -174,8 +181,8 @@ class LightningFlower(ShooterPlant):
 
             # 添加随机偏移创建锯齿效果
             if i > 0 and i < num_segments:
-                offset_row = random.uniform(-0.3, 0.3)
-                offset_col = random.uniform(-0.2, 0.2)
+                offset_row = get_rng("plants").uniform(-0.3, 0.3)
+                offset_col = get_rng("plants").uniform(-0.2, 0.2)
                 base_row += offset_row
                 base_col += offset_col
 
@@ -195,7 +202,7 @@ class LightningFlower(ShooterPlant):
             effect['flicker_timer'] += 1
             # 闪烁效果
             if effect['flicker_timer'] % 4 == 0:
-                effect['intensity'] = random.randint(200, 255)
+                effect['intensity'] = get_rng("particles").randint(200, 255)
 
             # 逐渐消失
             fade_progress = self.lightning_timer / self.lightning_duration
@@ -215,19 +222,14 @@ class LightningFlower(ShooterPlant):
         x = self.constants['BATTLEFIELD_LEFT'] + self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
         y = self.constants['BATTLEFIELD_TOP'] + self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP'])
 
-        # 闪电花可能有充电效果
-        if self.show_lightning:
-            # 绘制发光效果
-            glow_surface = pygame.Surface((self.constants['GRID_SIZE'] + 20,
-                                           self.constants['GRID_SIZE'] + 20), pygame.SRCALPHA)
-            glow_color = (255, 255, 0, 100)  # 半透明黄色发光
-            pygame.draw.circle(glow_surface, glow_color,
-                               (glow_surface.get_width() // 2, glow_surface.get_height() // 2),
-                               self.constants['GRID_SIZE'] // 2 + 10)
-            surface.blit(glow_surface, (x - 10, y - 10))
-
         if self.images and self.images.get('lightning_flower_img'):
-            surface.blit(self.images['lightning_flower_img'], (x, y))
+            img = self.images['lightning_flower_img']
+            # 闪电花可能有充电效果：半透明黄色发光和图片合成为一帧
+            if self.show_lightning:
+                surface.blit(get_glow_frame(img, GLOW_COLOR, GLOW_ALPHA, GLOW_PADDING),
+                             (x - GLOW_PADDING, y - GLOW_PADDING))
+            else:
+                surface.blit(img, (x, y))
         else:
             # 默认黄色圆形
             pygame.draw.circle(surface, (255, 255, 0),
@@ -241,6 +243,22 @@ class LightningFlower(ShooterPlant):
         # 绘制血条
         self._draw_health_bar(surface, x, y)
 
+    def get_draw_bounds(self):
+        """draw 可能绘制到的区域：格子（放电时含发光边距）、血条和闪电路径"""
+        bounds = super().get_draw_bounds()
+        if not self.constants or not self.show_lightning:
+            return bounds
+        bounds = bounds.inflate(GLOW_PADDING * 2, GLOW_PADDING * 2)
+        cell_size = self.constants['GRID_SIZE'] + self.constants['GRID_GAP']
+        half_grid = self.constants['GRID_SIZE'] // 2
+        for effect in self.lightning_effects:
+            for row, col in effect['segments']:
+                # 闪电线宽3像素，四周各留2像素
+                point_x = int(self.constants['BATTLEFIELD_LEFT'] + col * cell_size + half_grid)
+                point_y = int(self.constants['BATTLEFIELD_TOP'] + row * cell_size + half_grid)
+                bounds.union_ip((point_x - 2, point_y - 2, 5, 5))
+        return bounds
+
     def draw_lightning_effects(self, surface):
         """绘制闪电效果"""
         if not self.show_lightning or not self.constants:
@@ -8,6 +8,8 @@ from .shooter_base import ShooterPlant
 class MelonPult(ShooterPlant):
     """西瓜投手：发射西瓜，造成溅射伤害"""
 
+    sprite_image_key = 'watermelon_img'
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "melon_pult", constants, images, level_manager, base_shoot_delay=100)
 
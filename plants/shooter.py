@@ -8,6 +8,8 @@ from .shooter_base import ShooterPlant
 class Shooter(ShooterPlant):
     """豌豆射手：发射豌豆子弹"""
 
+    sprite_image_key = 'pea_shooter_img'
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "shooter", constants, images, level_manager, base_shoot_delay=60)
 
@@ -1,7 +1,7 @@
 """
 射击型植物基类
 """
-import random
+from sim_clock import get_rng
 from .base_plant import BasePlant
 
 
@@ -18,7 +18,7 @@ class ShooterPlant(BasePlant):
         self.current_shoot_delay = self._calculate_random_delay()
 
         # 设置随机初始值，避免所有植物同时攻击
-        self.shoot_timer = random.randint(0, self.current_shoot_delay)
+        self.shoot_timer = get_rng("plants").randint(0, self.current_shoot_delay)
 
         # 用于检测新僵尸波次的变量
         self.had_target_last_frame = False
@@ -40,7 +40,7 @@ class ShooterPlant(BasePlant):
         variation_percent = self._get_variation_percent()
         variation = int(adjusted_delay * variation_percent)
 
-        return adjusted_delay + random.randint(-variation, variation)
+        return adjusted_delay + get_rng("plants").randint(-variation, variation)
 
     def _get_variation_percent(self):
         """获取射击间隔的波动百分比"""
@@ -70,7 +70,7 @@ class ShooterPlant(BasePlant):
 
             # 添加0-15%的随机延时
             max_delay = int(current_base_delay * 0.15)
-            extra_delay = random.randint(0, max_delay)
+            extra_delay = get_rng("plants").randint(0, max_delay)
 
             if self.shoot_timer >= self.current_shoot_delay:
                 self.shoot_timer = self.current_shoot_delay - extra_delay
@@ -8,6 +8,8 @@ from .base_plant import BasePlant
 class Sunflower(BasePlant):
     """向日葵：产生阳光"""
 
+    sprite_image_key = 'sunflower_img'
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "sunflower", constants, images, level_manager)
 
@@ -8,6 +8,8 @@ from .base_plant import BasePlant
 class WallNut(BasePlant):
     """坚果墙：高血量防御植物"""
 
+    sprite_image_key = 'wall_nut_img'
+
     def __init__(self, row, col, constants, images, level_manager):
         super().__init__(row, col, "wall_nut", constants, images, level_manager)
         # 基类已经设置了血量为1500
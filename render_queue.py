@@ -0,0 +1,124 @@
+"""
+渲染队列 - 按图层收集游戏对象的绘制请求，统一批量提交
+
+植物、僵尸、子弹不再各自调用 surface.blit，而是通过 queue_sprites(render_queue)
+把 (图片, 位置) 提交到所属图层；血条等纯色矩形单独提交到覆盖层。
+flush 时按图层顺序输出：连续的图片用一次 Surface.blits() 提交，
+纯色矩形用 Surface.fill 绘制，特殊效果（死亡动画、冰冻、粒子等）仍以
+draw(surface) 回调的形式按提交顺序插入，保证同一图层内的先后顺序不变。
+
+脏矩形输出时打开 track_bounds，flush 会把每次绘制覆盖的矩形记录到 drawn_rects：
+图片和纯色矩形直接取 blit/fill 的返回值，draw 回调使用提交时给出的 bounds，
+并以 bounds 为裁剪区域调用，保证回调不会画到报告的区域之外。
+没有给出 bounds 的回调会把 unbounded 置为 True，调用方据此整帧重绘。
+"""
+
+# 图层（按数值从小到大绘制）
+LAYER_PLANTS = 0
+LAYER_PLANT_OVERLAYS = 1  # 植物血条
+LAYER_ZOMBIES = 2
+LAYER_ZOMBIE_OVERLAYS = 3  # 僵尸血条
+LAYER_BULLETS = 4
+LAYER_PARTICLES = 5  # 全局粒子系统的战场粒子
+LAYER_SEEDS = 6
+LAYER_COUNT = 7
+
+# 图层内的片段类型
+_BLITS = 0
+_FILLS = 1
+_DRAW = 2
+
+
+class RenderQueue:
+    """分图层的绘制队列，每帧提交后调用 flush 输出并清空"""
+
+    def __init__(self, layer_count=LAYER_COUNT):
+        # 每个图层是片段列表，片段为 (类型, 内容)；相邻的同类请求合并到同一片段
+        self.layers = [[] for _ in range(layer_count)]
+        # 脏矩形输出：记录每次绘制覆盖的区域
+        self.track_bounds = False
+        self.drawn_rects = []
+        self.unbounded = False  # 本帧有未给出绘制区域的回调
+
+    def _get_batch(self, layer, kind):
+        """获取图层末尾指定类型的批次，末尾不是该类型时新建"""
+        segments = self.layers[layer]
+        if segments and segments[-1][0] == kind:
+            return segments[-1][1]
+        batch = []
+        segments.append((kind, batch))
+        return batch
+
+    def submit(self, layer, image, position):
+        """提交一张图片"""
+        self._get_batch(layer, _BLITS).append((image, position))
+
+    def submit_fill(self, layer, color, rect):
+        """提交一个纯色矩形"""
+        self._get_batch(layer, _FILLS).append((color, rect))
+
+    def submit_outline(self, layer, color, rect):
+        """提交一个1像素宽的矩形边框（与 pygame.draw.rect(..., 1) 相同的像素）"""
+        x, y, width, height = rect
+        batch = self._get_batch(layer, _FILLS)
+        batch.append((color, (x, y, width, 1)))
+        batch.append((color, (x, y + height - 1, width, 1)))
+        batch.append((color, (x, y, 1, height)))
+        batch.append((color, (x + width - 1, y, 1, height)))
+
+    def submit_draw(self, layer, draw, bounds=None):
+        """
+        提交一个 draw(surface) 回调，用于无法拆成图片的特殊绘制
+
+        bounds 是回调可能绘制到的区域（pygame.Rect），None 表示无法确定
+        """
+        if bounds is None:
+            self.unbounded = True
+        self.layers[layer].append((_DRAW, (draw, bounds)))
+
+    def flush(self, surface):
+        """按图层顺序输出所有请求并清空队列"""
+        if self.track_bounds:
+            self._flush_tracked(surface)
+            return
+        for segments in self.layers:
+            for kind, content in segments:
+                if kind == _BLITS:
+                    surface.blits(content, False)
+                elif kind == _FILLS:
+                    fill = surface.fill
+                    for color, rect in content:
+                        fill(color, rect)
+                else:
+                    content[0](surface)
+            segments.clear()
+        self.unbounded = False
+
+    def _flush_tracked(self, surface):
+        """输出所有请求，同时把每次绘制覆盖的矩形记录到 drawn_rects"""
+        drawn_rects = self.drawn_rects = []
+        append = drawn_rects.append
+        for segments in self.layers:
+            for kind, content in segments:
+                if kind == _BLITS:
+                    drawn_rects.extend(surface.blits(content))
+                elif kind == _FILLS:
+                    # 血条的前景和边框都在背景条之内，只记录不被上一个矩形包含的区域
+                    fill = surface.fill
+                    last = None
+                    for color, rect in content:
+                        filled = fill(color, rect)
+                        if last is None or not last.contains(filled):
+                            append(filled)
+                            last = filled
+                else:
+                    draw, bounds = content
+                    if bounds is None:
+                        draw(surface)
+                        continue
+                    surface.set_clip(bounds)
+                    draw(surface)
+                    surface.set_clip(None)
+                    append(bounds)
+            segments.clear()
+        self.unbounded = False
@@ -0,0 +1,202 @@
+"""
+资源注册表 - 每个图片文件最多解码一次，缩放、灰化等派生图片在第一次请求时生成
+
+load_all_images、preload_scaled_images 和 get_images 都从全局注册表取图，
+重复调用只返回已经生成的表面，不会再次读取和解码 PNG。
+每个资源记录解码和派生所用的时间以及像素内存，便于查看启动时间和内存花在哪里。
+启用磁盘缓存（enable_disk_cache）后，派生图片优先从 rsc_mng/disk_cache.py 的缓存读取，
+缓存全部命中时完全不需要解码 PNG。
+返回的表面会被多处共享，调用方不能修改；需要修改时先 copy()。
+"""
+import time
+
+import pygame
+
+from core.constants import GRID_SIZE
+from rsc_mng.disk_cache import DiskAssetCache, DEFAULT_CACHE_DIR, blob_name
+
+
+# 图片资源目录
+IMAGE_DIR = "rsc_mng/images"
+
+# 加载失败时占位符的颜色（半透明洋红色）
+PLACEHOLDER_COLOR = (255, 0, 255, 128)
+
+# 灰化派生图片的乘色（用于冷却状态）
+GRAY_TINT = (128, 128, 128)
+
+
+def _surface_bytes(surface):
+    """表面像素占用的字节数"""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class AssetStats:
+    """单个资源的加载统计"""
+
+    __slots__ = ("load_ms", "derive_ms", "cache_ms", "source_bytes", "variant_bytes", "variants",
+                 "cache_hits", "requests", "failed")
+
+    def __init__(self):
+        self.load_ms = 0.0  # 读取并解码源文件的耗时
+        self.derive_ms = 0.0  # 生成派生图片的累计耗时
+        self.cache_ms = 0.0  # 从磁盘缓存读取派生图片的累计耗时
+        self.source_bytes = 0
+        self.variant_bytes = 0
+        self.variants = 0
+        self.cache_hits = 0  # 从磁盘缓存读取的派生图片数量
+        self.requests = 0
+        self.failed = False
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class AssetRegistry:
+    """图片资源注册表：源文件只解码一次，派生图片按需生成并缓存"""
+
+    def __init__(self, image_dir=IMAGE_DIR):
+        self.image_dir = image_dir
+        self.sources = {}  # 资源名 -> 解码后的源图片（加载失败为 None）
+        self.variants = {}  # (资源名, 尺寸, 二次缩放尺寸, 是否灰化) -> 派生图片
+        self.stats = {}  # 资源名 -> AssetStats
+        self.disk_cache = None  # 可选的 DiskAssetCache
+
+    def enable_disk_cache(self, cache_dir=DEFAULT_CACHE_DIR):
+        """派生图片优先从磁盘缓存读取，未命中时生成并写入缓存；cache_dir 为 None 时关闭"""
+        self.disk_cache = DiskAssetCache(cache_dir) if cache_dir else None
+
+    def save_disk_cache(self):
+        """把磁盘缓存的清单写回（没有启用或没有新条目时什么也不做）"""
+        if self.disk_cache is not None:
+            self.disk_cache.save()
+
+    def _source_path(self, name):
+        return f"{self.image_dir}/{name}.png"
+
+    def _get_stats(self, name):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = AssetStats()
+        return stats
+
+    def load(self, name):
+        """读取并解码源图片，每个文件只解码一次；加载失败返回 None"""
+        if name in self.sources:
+            return self.sources[name]
+
+        stats = self._get_stats(name)
+        path = self._source_path(name)
+        start = time.perf_counter()
+        try:
+            image = pygame.image.load(path).convert_alpha()
+        except Exception:
+            print(f"无法加载图片: {path}")
+            image = None
+            stats.failed = True
+        stats.load_ms = (time.perf_counter() - start) * 1000
+        if image is not None:
+            stats.source_bytes = _surface_bytes(image)
+        self.sources[name] = image
+        return image
+
+    def get(self, name, size=None, scale_to=None, gray=False):
+        """
+        获取图片或它的派生图片
+
+        Args:
+            name: 资源名（rsc_mng/images 下不含扩展名的文件名）
+            size: 从源图片缩放到的尺寸，None 表示原始尺寸
+            scale_to: 在 size 的结果上再缩放到的尺寸（与旧版预缓存的两次缩放结果一致）
+            gray: 是否返回灰化版本
+
+        Returns:
+            pygame.Surface: 共享的图片；源文件加载失败时返回相应尺寸的占位符
+        """
+        key = (name, size, scale_to, gray)
+        image = self.variants.get(key)
+        if image is not None:
+            self.stats[name].requests += 1
+            return image
+
+        disk_cache = self.disk_cache
+        if disk_cache is not None and (size is not None or scale_to is not None or gray):
+            # 派生图片先查磁盘缓存，命中时不需要解码源文件
+            cache_key = blob_name(name, size, scale_to, gray)
+            start = time.perf_counter()
+            image = disk_cache.load(cache_key, self._source_path(name))
+            if image is not None:
+                stats = self._get_stats(name)
+                stats.cache_ms += (time.perf_counter() - start) * 1000
+                stats.cache_hits += 1
+                stats.requests += 1
+                stats.variants += 1
+                stats.variant_bytes += _surface_bytes(image)
+                self.variants[key] = image
+                return image
+        else:
+            cache_key = None
+
+        if gray:
+            base = self.get(name, size, scale_to)
+        elif scale_to is not None:
+            base = self.get(name, size)
+        else:
+            base = self.load(name)
+        stats = self._get_stats(name)
+        stats.requests += 1
+
+        start = time.perf_counter()
+        if gray:
+            image = base.copy()
+            image.fill(GRAY_TINT, special_flags=pygame.BLEND_MULT)
+        elif scale_to is not None:
+            image = pygame.transform.scale(base, scale_to)
+        elif base is None:
+            # 源文件加载失败：创建一个占位符表面
+            image = pygame.Surface(size if size else (GRID_SIZE, GRID_SIZE), pygame.SRCALPHA)
+            image.fill(PLACEHOLDER_COLOR)
+        elif size is not None:
+            image = pygame.transform.scale(base, size)
+        else:
+            # 原始尺寸直接使用源图片，不计入派生内存
+            self.variants[key] = base
+            return base
+        stats.derive_ms += (time.perf_counter() - start) * 1000
+        stats.variants += 1
+        stats.variant_bytes += _surface_bytes(image)
+        self.variants[key] = image
+        if cache_key is not None and not stats.failed:
+            disk_cache.store(cache_key, self._source_path(name), image)
+        return image
+
+    def clear(self):
+        """丢弃所有已加载的图片和统计（资源文件改变后调用）"""
+        self.sources.clear()
+        self.variants.clear()
+        self.stats.clear()
+
+    def get_asset_stats(self):
+        """获取每个资源的统计，按解码加派生耗时从高到低排列"""
+        rows = [dict(stats.to_dict(), name=name) for name, stats in self.stats.items()]
+        rows.sort(key=lambda row: row["load_ms"] + row["derive_ms"] + row["cache_ms"], reverse=True)
+        return rows
+
+    def get_stats(self):
+        """获取注册表的汇总统计"""
+        stats = self.stats.values()
+        return {
+            "sources": sum(image is not None for image in self.sources.values()),
+            "failed": sum(s.failed for s in stats),
+            "variants": sum(s.variants for s in stats),
+            "load_ms": sum(s.load_ms for s in stats),
+            "derive_ms": sum(s.derive_ms for s in stats),
+            "cache_ms": sum(s.cache_ms for s in stats),
+            "cache_hits": sum(s.cache_hits for s in stats),
+            "source_bytes": sum(s.source_bytes for s in stats),
+            "variant_bytes": sum(s.variant_bytes for s in stats),
+        }
+
+
+# 全局资源注册表实例
+asset_registry = AssetRegistry()
@@ -1,14 +1,96 @@
 """
 音频管理模块 - 添加图鉴音乐支持
 重构版本 - 路径更新到rsc_mng文件夹
+
+音效解码和音乐文件读取可以交给后台线程（audio_loader）：音效解码完成后陆续加入音效字典，
+尚未就绪的音效 get() 返回 None，调用方直接跳过播放；下一个状态的音乐在转场期间预先读入内存，
+切换状态时不用等待磁盘。
 """
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import pygame
 import random
 import os
 
 
-class BackgroundMusicManager:
+# 音效和音乐文件目录
+SOUND_DIR = os.path.join("rsc_mng", "sounds")
+
+# 音效：键 -> 文件名
+SOUND_FILES = {
+    "zombie_hit": "普僵受击.mp3",
+    "plant_place": "种植.mp3",
+    "bite": "啃咬.mp3",
+    "wave_warning": "波次预警.mp3",
+    "armor_hit": "铁器受击.mp3",
+    "game_over": "失败音效.ogg",
+    "victory": "胜利.mp3",
+    "watermelon_hit": "watermelon_hitting.mp3",
+    "cherry_explosion": "樱桃爆炸.mp3",
+    "dandelion_shoot": "蒲公英发射.mp3",
+    "lightning_flower": "lightning.mp3",
+    "冻结": "冻结.mp3",
+}
+
+# 音效的默认音量
+DEFAULT_SOUND_VOLUME = 0.7
+
+# 使用相同音乐的状态组：游戏状态 -> 音乐状态
+STATE_MUSIC_GROUPS = {
+    "main_menu": "main_menu",
+    "level_select": "level_select",
+    "level_settings": "level_select",  # 关卡设置使用与选关页面相同的音乐
+    "shop": "shop",
+    "codex": "codex",  # 图鉴主页
+    "codex_detail": "codex",  # 详细图鉴页面 - 关键修改：使用相同的音乐组
+    "playing": "playing"
+}
+
+# 内存中最多保留的预读音乐文件数量
+MUSIC_CACHE_SIZE = 3
+
+
+class AudioLoader:
+    """后台音频加载器：在一个工作线程中按提交顺序解码音效、读取音乐文件"""
+
     def __init__(self):
+        self.executor = None
+        self.pending = set()  # 尚未完成的任务，退出时取消
+
+    def submit(self, function, *args):
+        """提交后台任务，返回 Future"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio_loader")
+        future = self.executor.submit(function, *args)
+        self.pending.add(future)
+        future.add_done_callback(self.pending.discard)
+        return future
+
+    def shutdown(self):
+        """取消未开始的任务并等待当前任务结束（在 pygame.quit() 之前调用）"""
+        if self.executor is not None:
+            # shutdown 的 cancel_futures 参数需要 Python 3.9，这里自己取消排队的任务
+            for future in list(self.pending):
+                future.cancel()
+            self.executor.shutdown(wait=True)
+            self.executor = None
+            self.pending.clear()
+
+
+# 全局后台音频加载器实例
+audio_loader = AudioLoader()
+
+
+def _read_file(path):
+    with open(path, "rb") as music_file:
+        return music_file.read()
+
+
+class BackgroundMusicManager:
+    def __init__(self, background=False):
         self.is_paused_for_sound = False
         self.sound_end_time = 0
         self.was_playing = False
@@ -22,6 +104,13 @@ class BackgroundMusicManager:
         self.current_volume = 0.5
         self.is_music_playing = False
 
+        # 后台预读：音乐文件名 -> Future（文件内容），只在 background 为 True 时使用
+        self.background = background
+        self.music_data = OrderedDict()
+        self.music_stream = None  # 正在播放的内存音乐流（播放期间必须保持引用）
+        self.pending_music = None  # (音乐文件, 起始位置)：等待后台读取完成后播放
+        self.next_playing_music = None  # 预读时为下一局选好的游戏内音乐
+
         # 定义不同游戏状态对应的音乐文件
         self.music_files = {
             "main_menu": "Laura Shigihara - Faster.ogg",
@@ -68,6 +157,11 @@ class BackgroundMusicManager:
 
     def update(self):
         """更新背景音乐状态，检查是否需要恢复播放"""
+        if self.pending_music is not None and self.music_data[self.pending_music[0]].done():
+            music_file, start_position = self.pending_music
+            self.pending_music = None
+            self._start_music(music_file, start_position)
+
         if self.is_paused_for_sound:
             current_time = pygame.time.get_ticks()
             if current_time >= self.sound_end_time:
@@ -90,20 +184,9 @@ class BackgroundMusicManager:
     def change_music_for_state(self, new_game_state, start_position=0):
         """根据游戏状态切换背景音乐"""
 
-        # 定义使用相同音乐的状态组
-        state_music_groups = {
-            "main_menu": "main_menu",
-            "level_select": "level_select",
-            "level_settings": "level_select",  # 关卡设置使用与选关页面相同的音乐
-            "shop": "shop",
-            "codex": "codex",  # 图鉴主页
-            "codex_detail": "codex",  # 详细图鉴页面 - 关键修改：使用相同的音乐组
-            "playing": "playing"
-        }
-
         # 获取当前状态和新状态对应的音乐状态
-        current_music_state = state_music_groups.get(self.current_game_state, self.current_game_state)
-        new_music_state = state_music_groups.get(new_game_state, new_game_state)
+        current_music_state = STATE_MUSIC_GROUPS.get(self.current_game_state, self.current_game_state)
+        new_music_state = STATE_MUSIC_GROUPS.get(new_game_state, new_game_state)
 
         # 如果音乐状态没有改变，不需要切换音乐
         if new_music_state == current_music_state and start_position == 0:
@@ -112,35 +195,86 @@ class BackgroundMusicManager:
         # 停止当前音乐
         if pygame.mixer.music.get_busy():
             pygame.mixer.music.stop()
+        self.pending_music = None
 
         # 更新当前游戏状态（这里仍然更新实际的游戏状态）
         self.current_game_state = new_game_state
+        # 后台模式下所有音乐都经过预读，切换状态不会阻塞当前帧
+        self.prefetch_music_for_state(new_game_state)
 
         # 根据新的音乐状态播放对应音乐
         if new_music_state in self.music_files:
             music_to_play = self.music_files[new_music_state]
 
-            # 对于游戏内音乐，随机选择一首
+            # 对于游戏内音乐，随机选择一首（转场时预读过的话使用预读时选好的那首）
             if new_music_state == "playing":
-                music_to_play = random.choice(music_to_play)
+                music_to_play = self.next_playing_music or random.choice(music_to_play)
+                self.next_playing_music = None
+
+            # 后台还在读取：先记下，读取完成后在 update() 中播放，不阻塞当前帧
+            music_data = self.music_data.get(music_to_play)
+            if music_data is not None and not music_data.done():
+                self.pending_music = (music_to_play, start_position)
+                return
+
+            self._start_music(music_to_play, start_position)
+
+    def _start_music(self, music_to_play, start_position=0):
+        """加载并播放新音乐，更新播放时间追踪"""
+        if self._load_and_play_music(music_to_play, start_position):
+            self.current_music_file = music_to_play
+            self.music_start_time = pygame.time.get_ticks() - (start_position * 1000)
+            self.total_paused_time = 0
+            self.is_music_playing = True
+            # 应用当前音量设置
+            pygame.mixer.music.set_volume(self.current_volume)
+        else:
+            print(f"无法加载音乐文件: {music_to_play}")
 
-            # 加载并播放新音乐
-            if self._load_and_play_music(music_to_play, start_position):
-                self.current_music_file = music_to_play
-                self.music_start_time = pygame.time.get_ticks() - (start_position * 1000)
-                self.total_paused_time = 0
-                self.is_music_playing = True
-                # 应用当前音量设置
-                pygame.mixer.music.set_volume(self.current_volume)
-            else:
-                print(f"无法加载音乐文件: {music_to_play}")
+    def prefetch_music_for_state(self, game_state):
+        """在后台把指定状态的音乐文件读入内存（转场期间调用，切换时不用等待磁盘）"""
+        if not self.background or game_state is None:
+            return
+        music_state = STATE_MUSIC_GROUPS.get(game_state, game_state)
+        music_file = self.music_files.get(music_state)
+        if music_file is None:
+            return
+        if music_state == "playing":
+            if self.next_playing_music is None:
+                self.next_playing_music = random.choice(music_file)
+            music_file = self.next_playing_music
+
+        if music_file in self.music_data:
+            self.music_data.move_to_end(music_file)
+            return
+        self.music_data[music_file] = audio_loader.submit(_read_file, os.path.join(SOUND_DIR, music_file))
+        # 淘汰最久未使用的预读文件（等待播放的那首除外）
+        for old_file in list(self.music_data):
+            if len(self.music_data) <= MUSIC_CACHE_SIZE:
+                break
+            if self.pending_music is None or old_file != self.pending_music[0]:
+                del self.music_data[old_file]
+
+    def _get_prefetched_music(self, music_file):
+        """获取已经读入内存的音乐文件内容，没有预读或尚未完成时返回 None"""
+        music_data = self.music_data.get(music_file)
+        if music_data is None or not music_data.done() or music_data.cancelled() or music_data.exception():
+            return None
+        self.music_data.move_to_end(music_file)
+        return music_data.result()
 
     def _load_and_play_music(self, music_file, start_position=0):
         """加载并播放指定的音乐文件"""
         try:
-            # 重构：更新音乐文件路径到rsc_mng/sounds文件夹
-            music_path = os.path.join("rsc_mng", "sounds", music_file)
-            pygame.mixer.music.load(music_path)
+            data = self._get_prefetched_music(music_file)
+            if data is not None:
+                # 从内存播放预读的文件，扩展名作为格式提示
+                self.music_stream = io.BytesIO(data)
+                pygame.mixer.music.load(self.music_stream, os.path.splitext(music_file)[1][1:])
+            else:
+                # 重构：更新音乐文件路径到rsc_mng/sounds文件夹
+                music_path = os.path.join(SOUND_DIR, music_file)
+                pygame.mixer.music.load(music_path)
 
             # 注意：pygame.mixer.music不支持从指定位置开始播放
             # 这里我们先正常播放，然后通过时间追踪来模拟位置
@@ -196,11 +330,49 @@ class BackgroundMusicManager:
             self.change_music_for_state(game_state)
 
 
+class SoundBank(dict):
+    """
+    音效字典：后台解码完成的音效陆续加入
+
+    尚未就绪的音效不在字典中，sounds.get(key) 返回 None，调用方按加载失败的情况跳过播放。
+    音量设置会记下来，之后加入的音效也使用同样的音量。
+    """
+
+    def __init__(self, volume=DEFAULT_SOUND_VOLUME):
+        super().__init__()
+        self.volume = volume
+        self.pending = 0  # 尚未解码完成的音效数量
+        self._lock = threading.Lock()
+
+    def add(self, key, sound):
+        """加入一个音效（加载失败时为 None）并应用当前音量"""
+        with self._lock:
+            if sound:
+                sound.set_volume(self.volume)
+            self[key] = sound
+
+    def set_volume(self, volume):
+        """设置所有音效（包括之后才解码完成的）的音量"""
+        with self._lock:
+            self.volume = volume
+            for sound in self.values():
+                if sound:
+                    sound.set_volume(volume)
+
+    def is_ready(self):
+        """是否所有音效都已解码完成"""
+        return self.pending == 0
+
+    def _load_in_background(self, key, file_name):
+        self.add(key, load_sound(file_name))
+        self.pending -= 1
+
+
 def load_sound(file_name):
     """加载音效"""
     try:
         # 重构：更新音效文件路径到rsc_mng/sounds文件夹
-        sound_path = os.path.join("rsc_mng", "sounds", file_name)
+        sound_path = os.path.join(SOUND_DIR, file_name)
         return pygame.mixer.Sound(sound_path)
     except Exception as e:
         print(f"无法加载音效 {file_name}: {e}")
@@ -226,37 +398,35 @@ def play_sound_with_music_pause(sound, duration=None, music_manager=None):
         sound.play()
 
 
-def initialize_sounds():
-    """初始化所有音效"""
-    try:
-        sounds = {
-            "zombie_hit": load_sound("普僵受击.mp3"),
-            "plant_place": load_sound("种植.mp3"),
-            "bite": load_sound("啃咬.mp3"),
-            "wave_warning": load_sound("波次预警.mp3"),
-            "armor_hit": load_sound("铁器受击.mp3"),
-            "game_over": load_sound("失败音效.ogg"),
-            "victory": load_sound("胜利.mp3"),
-            "watermelon_hit": load_sound("watermelon_hitting.mp3"),
-            "cherry_explosion": load_sound("樱桃爆炸.mp3"),
-            "dandelion_shoot": load_sound("蒲公英发射.mp3"),
-            "lightning_flower": load_sound("lightning.mp3"),
-            "冻结": load_sound("冻结.mp3"),
-        }
+def initialize_sounds(background=False):
+    """
+    初始化所有音效
 
-        # 设置音效音量
-        for sound in sounds.values():
-            if sound:
-                sound.set_volume(0.7)
+    Args:
+        background: 为 True 时在后台线程解码，立即返回空的 SoundBank，音效解码完成后陆续加入
 
-        return sounds
+    Returns:
+        SoundBank: 音效字典
+    """
+    sounds = SoundBank()
+    try:
+        if background:
+            sounds.pending = len(SOUND_FILES)
+            for key, file_name in SOUND_FILES.items():
+                audio_loader.submit(sounds._load_in_background, key, file_name)
+        else:
+            for key, file_name in SOUND_FILES.items():
+                sounds.add(key, load_sound(file_name))
     except Exception as e:
         print(f"加载音效时出错: {e}")
-        return {}
+    return sounds
 
 
 def set_sounds_volume(sounds, volume):
     """设置所有音效的音量"""
+    if isinstance(sounds, SoundBank):
+        sounds.set_volume(volume)
+        return
     for sound in sounds.values():
         if sound:
             sound.set_volume(volume)
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+解码图片磁盘缓存 - 把缩放、灰化后的图片像素保存成 RGBA 原始数据，下次启动直接映射读取
+
+每张派生图片对应缓存目录下的一个 .rgba 文件，manifest.json 记录它来自哪个 PNG
+（修改时间、文件大小、SHA-1）和像素尺寸。启动时 PNG 没有变化就用 mmap 打开 .rgba 文件，
+通过 pygame.image.frombuffer 直接构建表面，跳过 PNG 解码和缩放；
+PNG 修改过（修改时间或大小不同且内容哈希也不同）的条目视为过期，由调用方重新生成后覆盖。
+缓存目录可以随时整个删除，下次启动会自动重建。
+"""
+import hashlib
+import json
+import mmap
+import os
+
+import pygame
+
+
+# 默认缓存目录
+DEFAULT_CACHE_DIR = ".asset_cache"
+
+# 清单格式版本，像素格式或文件命名改变时加一，旧缓存整体失效
+MANIFEST_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+
+# 像素数据格式（frombuffer/tostring 使用）
+PIXEL_FORMAT = "RGBA"
+
+
+def _file_hash(path):
+    """源文件内容的 SHA-1"""
+    with open(path, "rb") as source_file:
+        return hashlib.sha1(source_file.read()).hexdigest()
+
+
+def _size_part(size):
+    return f"{size[0]}x{size[1]}" if size else "orig"
+
+
+def blob_name(name, size=None, scale_to=None, gray=False):
+    """派生图片在缓存目录下的文件名，例如 peashooter_80x80_60x60_gray.rgba"""
+    parts = [name, _size_part(size)]
+    if scale_to is not None:
+        parts.append(_size_part(scale_to))
+    if gray:
+        parts.append("gray")
+    return "_".join(parts) + ".rgba"
+
+
+class DiskAssetCache:
+    """派生图片的磁盘缓存：按源 PNG 的修改时间和哈希判断是否过期"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.entries = {}  # 缓存文件名 -> 清单条目
+        self.dirty = False  # 清单有未写回的修改
+        self._sources = {}  # 源文件路径 -> (修改时间, 大小, 哈希)，本次运行内只计算一次
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.writes = 0
+
+        self._load_manifest()
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.cache_dir, MANIFEST_NAME)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return
+        if manifest.get("version") == MANIFEST_VERSION:
+            self.entries = manifest.get("entries", {})
+
+    def _source_info(self, source_path, expected=None):
+        """
+        源文件的 (修改时间, 大小, 哈希)，源文件不存在时返回 None
+
+        修改时间和大小与 expected 条目一致时直接沿用条目中的哈希，不读取文件内容
+        """
+        info = self._sources.get(source_path)
+        if info is not None:
+            return info
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return None
+        if expected and expected["mtime_ns"] == stat.st_mtime_ns and expected["source_size"] == stat.st_size:
+            source_hash = expected["hash"]
+        else:
+            source_hash = _file_hash(source_path)
+        info = self._sources[source_path] = (stat.st_mtime_ns, stat.st_size, source_hash)
+        return info
+
+    def load(self, key, source_path):
+        """
+        读取缓存的派生图片
+
+        Args:
+            key: blob_name 生成的缓存文件名
+            source_path: 派生图片的源 PNG 路径
+
+        Returns:
+            pygame.Surface: 与显示格式一致的新表面；未缓存、已过期或读取失败时返回 None
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        info = self._source_info(source_path, entry)
+        if info is None or info[2] != entry["hash"]:
+            self.stale += 1
+            return None
+        if info[0] != entry["mtime_ns"]:
+            # 文件被 touch 过但内容没变：更新清单中的修改时间，下次不用再算哈希
+            entry["mtime_ns"] = info[0]
+            self.dirty = True
+
+        width, height = entry["size"]
+        try:
+            with open(os.path.join(self.cache_dir, key), "rb") as blob_file:
+                with mmap.mmap(blob_file.fileno(), 0, access=mmap.ACCESS_READ) as pixels:
+                    if len(pixels) != width * height * 4:
+                        raise ValueError("缓存文件大小与清单不符")
+                    # frombuffer 不复制像素，convert_alpha 在映射关闭前生成独立的表面
+                    image = pygame.image.frombuffer(pixels, (width, height), PIXEL_FORMAT).convert_alpha()
+        except (OSError, ValueError, pygame.error):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return image
+
+    def store(self, key, source_path, image):
+        """把派生图片写入缓存并登记到清单（清单在 save() 时写回）"""
+        info = self._source_info(source_path)
+        if info is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(os.path.join(self.cache_dir, key), "wb") as blob_file:
+                blob_file.write(pygame.image.tostring(image, PIXEL_FORMAT))
+        except OSError as e:
+            print(f"无法写入图片缓存 {key}: {e}")
+            return
+        self.entries[key] = {
+            "source": source_path,
+            "mtime_ns": info[0],
+            "source_size": info[1],
+            "hash": info[2],
+            "size": list(image.get_size()),
+        }
+        self.dirty = True
+        self.writes += 1
+
+    def save(self):
+        """清单有修改时写回磁盘（先写临时文件再替换，中途退出不会留下损坏的清单）"""
+        if not self.dirty:
+            return
+        temp_path = self.manifest_path + ".tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as manifest_file:
+                json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, manifest_file,
+                          ensure_ascii=False, indent=1)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            print(f"无法写入图片缓存清单: {e}")
+            return
+        self.dirty = False
+
+    def get_stats(self):
+        """获取缓存统计信息"""
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "writes": self.writes,
+        }
@@ -2,6 +2,7 @@
 资源加载模块 - 处理图片和其他资源的加载
 重构版本 - 路径更新到rsc_mng文件夹
 """
+import json
 import os
 import sys
 
@@ -9,68 +10,123 @@ import pygame
 
 
 from core.constants import *
+from rsc_mng.asset_registry import asset_registry
+from rsc_mng.disk_cache import DEFAULT_CACHE_DIR
+
+
+# 游戏图片：键 -> (rsc_mng/images 下的文件名, 加载尺寸)
+IMAGE_SPECS = {
+    # 植物图片
+    'pea_shooter_img': ("peashooter", (GRID_SIZE, GRID_SIZE)),
+    'sunflower_img': ("sunflower", (GRID_SIZE, GRID_SIZE)),
+    'watermelon_img': ("watermelon", (GRID_SIZE, GRID_SIZE)),
+    'cattail_img': ("cattail", (GRID_SIZE, GRID_SIZE)),
+    'wall_nut_img': ("wall_nut", (GRID_SIZE, GRID_SIZE)),
+    'cherry_bomb_img': ("cherry_bomb", (GRID_SIZE, GRID_SIZE)),
+    'cucumber_img': ("cucumber", (GRID_SIZE, GRID_SIZE)),
+    'dandelion_img': ("dandelion", (GRID_SIZE, GRID_SIZE)),
+    'lightning_flower_img': ("lightning_flower", (GRID_SIZE, GRID_SIZE)),
+    'ice_cactus_img': ("ice_cactus", (GRID_SIZE, GRID_SIZE)),
+
+    # 僵尸图片
+    'zombie_img': ("zombie", (GRID_SIZE, GRID_SIZE)),
+    'zombie_armor_img': ("zombie_armor", (GRID_SIZE, GRID_SIZE)),
+    'giant_zombie_img': ("giant_zombie", (int(GRID_SIZE * 1.5), int(GRID_SIZE * 1.5))),
+
+    # 子弹图片
+    'pea_img': ("pea", (20, 20)),
+    'watermelon_bullet_img': ("watermelon_bullet", (20, 20)),
+    'spike_img': ("spike", (24, 18)),
+    'dandelion_seed_img': ("dandelion_seed", (24, 24)),
+    'ice_bullet_img': ("ice_bullet", (24, 24)),
+
+    # 防具图片
+    'armor_img': ("armor", (GRID_SIZE - 10, GRID_SIZE - 10)),
+
+    # 背景和UI元素
+    'grid_bg_img': ("grid_bg", (GRID_SIZE, GRID_SIZE)),
+    'card_bg_img': ("card_bg", (CARD_WIDTH, CARD_HEIGHT)),
+    'shovel_img': ("shovel", (SHOVEL_WIDTH, SHOVEL_HEIGHT)),
+    'hammer_img': ("hammer", (SHOVEL_WIDTH, SHOVEL_HEIGHT)),
+    'settings_img': ("settings", (SETTINGS_BUTTON_WIDTH, SETTINGS_BUTTON_HEIGHT)),
+
+    # 主菜单背景
+    'menu_bg_img': ("menu_bg", (BASE_WIDTH, BASE_HEIGHT)),
+    'trophy_img': ("trophy", (60, 60)),
+    #小推车
+    'cart_img': ("cart", (35, 35)),
+}
+
+# 预缓存图片：键 -> (IMAGE_SPECS 中的图片键, 再缩放到的尺寸，None 表示保持加载尺寸)
+# 每张预缓存图片还有一个加 '_gray' 后缀的灰化版本（用于冷却状态）
+SCALED_IMAGE_SPECS = {
+    # 植物卡片图片（60x60）
+    'pea_shooter_60': ('pea_shooter_img', (60, 60)),
+    'sunflower_60': ('sunflower_img', (60, 60)),
+    'watermelon_60': ('watermelon_img', (60, 60)),
+    'cattail_60': ('cattail_img', (60, 60)),
+    'wall_nut_60': ('wall_nut_img', (60, 60)),
+    'cherry_bomb_60': ('cherry_bomb_img', (60, 60)),
+    'cucumber_60': ('cucumber_img', (60, 60)),
+    'dandelion_60': ('dandelion_img', (60, 60)),
+    'lightning_flower_60': ('lightning_flower_img', (60, 60)),
+    'ice_cactus_60': ('ice_cactus_img', (60, 60)),
+
+    # 原始大小的图像（用于图鉴的 large_icon_key）
+    'pea_shooter_img': ('pea_shooter_img', None),
+    'sunflower_img': ('sunflower_img', None),
+    'watermelon_img': ('watermelon_img', None),
+    'cattail_img': ('cattail_img', None),
+    'wall_nut_img': ('wall_nut_img', None),
+    'cherry_bomb_img': ('cherry_bomb_img', None),
+    'cucumber_img': ('cucumber_img', None),
+    'dandelion_img': ('dandelion_img', None),
+    'lightning_flower_img': ('lightning_flower_img', None),
+    'ice_cactus_img': ('ice_cactus_img', None),
+
+    # 僵尸图像（用于僵尸图鉴）
+    'zombie_img': ('zombie_img', None),
+    'zombie_60': ('zombie_img', (60, 60)),
+    'zombie_armor_img': ('zombie_armor_img', None),
+    'cone_zombie_60': ('zombie_armor_img', (60, 60)),
+    'cone_zombie_img': ('zombie_armor_img', None),
+    'giant_zombie_img': ('giant_zombie_img', None),
+    'bucket_zombie_60': ('giant_zombie_img', (60, 60)),
+    'bucket_zombie_img': ('giant_zombie_img', None),
+    'fast_zombie_60': ('giant_zombie_img', (60, 60)),
+    'fast_zombie_img': ('giant_zombie_img', None),
+    'giant_zombie_60': ('giant_zombie_img', (60, 60)),
+    'armored_zombie_60': ('giant_zombie_img', (60, 60)),
+    'armored_zombie_img': ('giant_zombie_img', None),
+
+    # 设置按钮图片
+    'settings_50': ('settings_img', (50, 50)),
+
+    # 子弹图片
+    'watermelon_bullet_40': ('watermelon_bullet_img', (40, 40)),
+    'spike_24': ('spike_img', (24, 24)),
+    'ice_bullet_24': ('ice_bullet_img', (24, 24)),
+    'dandelion_seed_24': ('dandelion_seed_img', (24, 24)),
+
+    'cart_img': ('cart_img', None),  # 保持原始大小35x35
+    'cart_30': ('cart_img', (35, 35)),
+    'hammer_img': ('hammer_img', None),  # 原始大小的锤子图片
+    'hammer_80': ('hammer_img', (80, 80)),
+    'card_bg_img': ('card_bg_img', None),  # 保持原始大小
+    'card_bg_50': ('card_bg_img', (50, 50)),  # 商店图标大小
+}
 
 
 def load_image(name, size=None):
-    """加载图片资源"""
-    try:
-        # 重构：更新图片文件路径到rsc_mng/images文件夹
-        image = pygame.image.load(f"rsc_mng/images/{name}.png").convert_alpha()
-        if size:
-            image = pygame.transform.scale(image, size)
-        return image
-    except:
-        print(f"无法加载图片: rsc_mng/images/{name}.png")
-        # 创建一个占位符表面
-        surf = pygame.Surface(size if size else (GRID_SIZE, GRID_SIZE), pygame.SRCALPHA)
-        surf.fill((255, 0, 255, 128))  # 半透明洋红色作为占位符
-        return surf
+    """加载图片资源（通过资源注册表，同一文件只解码一次，加载失败时返回占位符）"""
+    return asset_registry.get(name, size)
 
 
 def load_all_images():
     """加载所有游戏图片资源"""
     try:
-        images = {
-            # 植物图片
-            'pea_shooter_img': load_image("peashooter", (GRID_SIZE, GRID_SIZE)),
-            'sunflower_img': load_image("sunflower", (GRID_SIZE, GRID_SIZE)),
-            'watermelon_img': load_image("watermelon", (GRID_SIZE, GRID_SIZE)),
-            'cattail_img': load_image("cattail", (GRID_SIZE, GRID_SIZE)),
-            'wall_nut_img': load_image("wall_nut", (GRID_SIZE, GRID_SIZE)),
-            'cherry_bomb_img': load_image("cherry_bomb", (GRID_SIZE, GRID_SIZE)),
-            'cucumber_img': load_image("cucumber", (GRID_SIZE, GRID_SIZE)),
-            'dandelion_img': load_image("dandelion", (GRID_SIZE, GRID_SIZE)),
-            'lightning_flower_img': load_image("lightning_flower", (GRID_SIZE, GRID_SIZE)),
-            'ice_cactus_img': load_image("ice_cactus", (GRID_SIZE, GRID_SIZE)),
-
-            # 僵尸图片
-            'zombie_img': load_image("zombie", (GRID_SIZE, GRID_SIZE)),
-            'zombie_armor_img': load_image("zombie_armor", (GRID_SIZE, GRID_SIZE)),
-            'giant_zombie_img': load_image("giant_zombie", (int(GRID_SIZE * 1.5), int(GRID_SIZE * 1.5))),
-
-            # 子弹图片
-            'pea_img': load_image("pea", (20, 20)),
-            'watermelon_bullet_img': load_image("watermelon_bullet", (20, 20)),
-            'spike_img': load_image("spike", (24, 18)),
-            'dandelion_seed_img': load_image("dandelion_seed", (24, 24)),
-            'ice_bullet_img': load_image("ice_bullet", (24, 24)),
-
-            # 防具图片
-            'armor_img': load_image("armor", (GRID_SIZE - 10, GRID_SIZE - 10)),
-
-            # 背景和UI元素
-            'grid_bg_img': load_image("grid_bg", (GRID_SIZE, GRID_SIZE)),
-            'card_bg_img': load_image("card_bg", (CARD_WIDTH, CARD_HEIGHT)),
-            'shovel_img': load_image("shovel", (SHOVEL_WIDTH, SHOVEL_HEIGHT)),
-            'hammer_img': load_image("hammer", (SHOVEL_WIDTH, SHOVEL_HEIGHT)),
-            'settings_img': load_image("settings", (SETTINGS_BUTTON_WIDTH, SETTINGS_BUTTON_HEIGHT)),
-
-            # 主菜单背景
-            'menu_bg_img': load_image("menu_bg", (BASE_WIDTH, BASE_HEIGHT)),
-            'trophy_img': load_image("trophy", (60, 60)),
-            #小推车
-            'cart_img':load_image("cart",(35,35))
-        }
+        images = {key: load_image(name, size) for key, (name, size) in IMAGE_SPECS.items()}
+        asset_registry.save_disk_cache()
         return images
     except Exception as e:
         print(f"加载图片时出错: {e}")
@@ -104,144 +160,104 @@ def get_images():
 
 
 def preload_scaled_images():
-    """预先加载所有需要缩放的图片，避免运行时缩放"""
+    """预先加载所有需要缩放的图片和灰化版本，避免运行时缩放（与 load_all_images 共享已解码的图片）"""
     scaled_images = {}
-    images = load_all_images()
+    try:
+        for key, (image_key, scale_to) in SCALED_IMAGE_SPECS.items():
+            name, size = IMAGE_SPECS[image_key]
+            scaled_images[key] = asset_registry.get(name, size, scale_to)
+            scaled_images[key + '_gray'] = asset_registry.get(name, size, scale_to, gray=True)
+        asset_registry.save_disk_cache()
+    except Exception as e:
+        print(f"加载图片时出错: {e}")
+    return scaled_images
 
-    # 预缓存植物卡片图片（60x60）
-    if images.get('pea_shooter_img'):
-        scaled_images['pea_shooter_60'] = pygame.transform.scale(images['pea_shooter_img'], (60, 60))
-    if images.get('sunflower_img'):
-        scaled_images['sunflower_60'] = pygame.transform.scale(images['sunflower_img'], (60, 60))
-    if images.get('watermelon_img'):
-        scaled_images['watermelon_60'] = pygame.transform.scale(images['watermelon_img'], (60, 60))
-    if images.get('cattail_img'):
-        scaled_images['cattail_60'] = pygame.transform.scale(images['cattail_img'], (60, 60))
-    if images.get('wall_nut_img'):
-        scaled_images['wall_nut_60'] = pygame.transform.scale(images['wall_nut_img'], (60, 60))
-    if images.get('cherry_bomb_img'):
-        scaled_images['cherry_bomb_60'] = pygame.transform.scale(images['cherry_bomb_img'], (60, 60))
-    if images.get('cucumber_img'):
-        scaled_images['cucumber_60'] = pygame.transform.scale(images['cucumber_img'], (60, 60))
-    if images.get('dandelion_img'):
-        scaled_images['dandelion_60'] = pygame.transform.scale(images['dandelion_img'], (60, 60))
-    if images.get('lightning_flower_img'):
-        scaled_images['lightning_flower_60'] = pygame.transform.scale(images['lightning_flower_img'], (60, 60))
-    if images.get('ice_cactus_img'):
-        scaled_images['ice_cactus_60'] = pygame.transform.scale(images['ice_cactus_img'], (60, 60))
-
-
-    # 添加原始大小的图像（用于图鉴的 large_icon_key）
-    if images.get('pea_shooter_img'):
-        scaled_images['pea_shooter_img'] = images['pea_shooter_img']
-    if images.get('sunflower_img'):
-        scaled_images['sunflower_img'] = images['sunflower_img']
-    if images.get('watermelon_img'):
-        scaled_images['watermelon_img'] = images['watermelon_img']
-    if images.get('cattail_img'):
-        scaled_images['cattail_img'] = images['cattail_img']
-    if images.get('wall_nut_img'):
-        scaled_images['wall_nut_img'] = images['wall_nut_img']
-    if images.get('cherry_bomb_img'):
-        scaled_images['cherry_bomb_img'] = images['cherry_bomb_img']
-    if images.get('cucumber_img'):
-        scaled_images['cucumber_img'] = images['cucumber_img']
-    if images.get('dandelion_img'):
-        scaled_images['dandelion_img'] = images['dandelion_img']
-    if images.get('lightning_flower_img'):
-        scaled_images['lightning_flower_img'] = images['lightning_flower_img']
-    if images.get('ice_cactus_img'):
-        scaled_images['ice_cactus_img'] = images['ice_cactus_img']
-
-    # 添加僵尸图像（用于僵尸图鉴）
-    if images.get('zombie_img'):
-        scaled_images['zombie_img'] = images['zombie_img']
-        scaled_images['zombie_60'] = pygame.transform.scale(images['zombie_img'], (60, 60))
-    if images.get('zombie_armor_img'):
-        scaled_images['zombie_armor_img'] = images['zombie_armor_img']
-        scaled_images['cone_zombie_60'] = pygame.transform.scale(images['zombie_armor_img'], (60, 60))
-        scaled_images['cone_zombie_img'] = images['zombie_armor_img']
-    if images.get('giant_zombie_img'):
-        scaled_images['giant_zombie_img'] = images['giant_zombie_img']
-        scaled_images['bucket_zombie_60'] = pygame.transform.scale(images['giant_zombie_img'], (60, 60))
-        scaled_images['bucket_zombie_img'] = images['giant_zombie_img']
-        scaled_images['fast_zombie_60'] = pygame.transform.scale(images['giant_zombie_img'], (60, 60))
-        scaled_images['fast_zombie_img'] = images['giant_zombie_img']
-        scaled_images['giant_zombie_60'] = pygame.transform.scale(images['giant_zombie_img'], (60, 60))
-        scaled_images['armored_zombie_60'] = pygame.transform.scale(images['giant_zombie_img'], (60, 60))
-        scaled_images['armored_zombie_img'] = images['giant_zombie_img']
-
-
-
-    # 预缓存设置按钮图片
-    if images.get('settings_img'):
-        scaled_images['settings_50'] = pygame.transform.scale(images['settings_img'], (50, 50))
-
-    # 预缓存西瓜子弹图片
-    if images.get('watermelon_bullet_img'):
-        scaled_images['watermelon_bullet_40'] = pygame.transform.scale(images['watermelon_bullet_img'], (40, 40))
-
-    # 预缓存尖刺子弹图片
-    if images.get('spike_img'):
-        scaled_images['spike_24'] = pygame.transform.scale(images['spike_img'], (24, 24))
-    if images.get('ice_bullet_img'):
-        scaled_images['ice_bullet_24'] = pygame.transform.scale(images['ice_bullet_img'], (24, 24))
-    if images.get('dandelion_seed_img'):
-        scaled_images['dandelion_seed_24'] = pygame.transform.scale(images['dandelion_seed_img'], (24, 24))
-    if images.get('cart_img'):
-        scaled_images['cart_img'] = images['cart_img']  # 保持原始大小35x35
-        scaled_images['cart_30'] = pygame.transform.scale(images['cart_img'], (35, 35))
-    if images.get('hammer_img'):
-        scaled_images['hammer_img'] = images['hammer_img']  # 添加原始大小的锤子图片
-        scaled_images['hammer_80'] = pygame.transform.scale(images['hammer_img'], (80, 80))
-
-    if images.get('card_bg_img'):
-        scaled_images['card_bg_img'] = images['card_bg_img']  # 保持原始大小
-        scaled_images['card_bg_50'] = pygame.transform.scale(images['card_bg_img'], (50, 50))  # 商店图标大小
-
-    # 预缓存灰化版本的图片（用于冷却状态）
-    original_keys = list(scaled_images.keys())
-    for key in original_keys:
-        img = scaled_images[key]
-        if not key.endswith('_gray'):
-            gray_surface = img.copy()
-            gray_surface.fill((128, 128, 128), special_flags=pygame.BLEND_MULT)
-            scaled_images[key + '_gray'] = gray_surface
 
-    return scaled_images
+# 中文字体候选（按优先顺序）
+CHINESE_FONT_NAMES = [
+    "Microsoft YaHei",
+    "微软雅黑",
+    "SimHei",
+    "黑体",
+    "Arial Unicode MS",
+    "Noto Sans CJK SC",
+    "DejaVu Sans",
+]
 
+# 解析出的字体文件路径缓存在这里，下次启动直接使用，不再扫描系统字体
+FONT_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, "fonts.json")
 
-def initialize_fonts():
-    """改进的字体初始化函数"""
-    chinese_fonts = [
-        "Microsoft YaHei",
-        "微软雅黑",
-        "SimHei",
-        "黑体",
-        "Arial Unicode MS",
-        "Noto Sans CJK SC",
-        "DejaVu Sans",
-    ]
-
-    for font_name in chinese_fonts:
+# 游戏使用的字号：small, medium, large, tiny（initialize_fonts 按这个顺序返回）
+FONT_SIZES = (24, 32, 48, 18)
+
+
+class LazyFont:
+    """字体代理：第一次使用时才创建 pygame.font.Font，其余属性和方法都转给真正的字体"""
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size_px = size
+        self._font = None
+
+    @property
+    def font(self):
+        if self._font is None:
+            self._font = pygame.font.Font(self.path, self.size_px)
+        return self._font
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            # 特殊方法（copy、pickle 等）不转发，避免在未初始化的实例上递归
+            raise AttributeError(name)
+        return getattr(self.font, name)
+
+
+def _probe_font(font_name):
+    """查找字体文件并试渲染中文，成功时返回文件路径"""
+    path = pygame.font.match_font(font_name)
+    if not path:
+        return None
+    test_surface = pygame.font.Font(path, 24).render("测试", True, (255, 255, 255))
+    return path if test_surface.get_width() > 10 else None  # 渲染成功
+
+
+def resolve_font_path(cache_path=FONT_CACHE_PATH):
+    """
+    获取中文字体文件路径
+
+    优先使用缓存文件中记录的路径；没有缓存或字体文件已经不存在时，按 CHINESE_FONT_NAMES
+    的顺序扫描系统字体并写回缓存。找不到任何中文字体时返回 None（使用 pygame 默认字体）。
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as cache_file:
+            cached = json.load(cache_file)
+        if os.path.isfile(cached["path"]):
+            return cached["path"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    for font_name in CHINESE_FONT_NAMES:
         try:
-            test_font = pygame.font.SysFont(font_name, 24)
-            test_surface = test_font.render("测试", True, (255, 255, 255))
-
-            if test_surface.get_width() > 10:  # 渲染成功
-                font_tiny = pygame.font.SysFont(font_name, 18)
-                font_small = pygame.font.SysFont(font_name, 24)
-                font_medium = pygame.font.SysFont(font_name, 32)
-                font_large = pygame.font.SysFont(font_name, 48)
-                print(f"成功加载中文字体: {font_name}")
-                return font_small, font_medium, font_large, font_tiny
-        except:
+            path = _probe_font(font_name)
+        except Exception:
             continue
+        if path:
+            print(f"成功加载中文字体: {font_name}")
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                with open(cache_path, "w", encoding="utf-8") as cache_file:
+                    json.dump({"name": font_name, "path": path}, cache_file, ensure_ascii=False)
+            except OSError as e:
+                print(f"无法写入字体缓存: {e}")
+            return path
+    return None
 
-    # 字体加载失败的回退
-    print("中文字体加载失败，使用默认字体")
-    font_tiny = pygame.font.Font(None, 18)
-    font_small = pygame.font.Font(None, 24)
-    font_medium = pygame.font.Font(None, 32)
-    font_large = pygame.font.Font(None, 48)
-    return font_small, font_medium, font_large, font_tiny
\ No newline at end of file
+
+def initialize_fonts():
+    """初始化字体：字体文件路径来自缓存（见 resolve_font_path），各字号在第一次使用时才创建"""
+    path = resolve_font_path()
+    if path is None:
+        # 字体加载失败的回退
+        print("中文字体加载失败，使用默认字体")
+    font_small, font_medium, font_large, font_tiny = (LazyFont(path, size) for size in FONT_SIZES)
+    return font_small, font_medium, font_large, font_tiny
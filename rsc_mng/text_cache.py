@@ -0,0 +1,76 @@
+"""
+文字表面缓存 - 缓存 font.render 的结果，避免每帧重复光栅化中文字形
+
+以 (字体, 文字, 抗锯齿, 颜色, 背景色) 为键，容量有限，超出时淘汰最久未使用的条目。
+返回的表面会被多处共享，调用方不能修改它（例如 set_alpha），需要修改时先 copy()。
+"""
+from collections import OrderedDict
+
+
+# 默认最多缓存的文字表面数量
+TEXT_CACHE_SIZE = 512
+
+
+def _color_key(color):
+    """把颜色统一成可哈希的键（元组、列表和 pygame.Color 得到相同的键）"""
+    if color is None or isinstance(color, str):
+        return color
+    return tuple(color)
+
+
+class TextCache:
+    """带LRU淘汰的文字表面缓存"""
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def render(self, font, text, antialias, color, background=None):
+        """与 font.render 参数相同，命中缓存时直接返回已渲染的表面"""
+        key = (font, text, antialias, _color_key(color), _color_key(background))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        if background is None:
+            surface = font.render(text, antialias, color)
+        else:
+            surface = font.render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """清空缓存（字体重新加载后调用）"""
+        self.surfaces.clear()
+
+    def get_stats(self):
+        """获取缓存统计信息"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.surfaces),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# 全局文字缓存实例
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color, background=None):
+    """通过全局文字缓存渲染文字"""
+    return text_cache.render(font, text, antialias, color, background)
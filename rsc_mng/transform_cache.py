@@ -0,0 +1,237 @@
+"""
+变换缓存 - 缓存旋转、缩放后的图片和程序生成的小精灵，避免每帧 transform 分配新表面
+
+旋转：每张图片对应一个旋转图集，角度量化为 ROTATION_STEPS 个方向，
+某个方向第一次用到时才调用 pygame.transform.rotate 生成，之后所有实例共享。
+缩放：按 (图片, 尺寸) 缓存 pygame.transform.scale 的结果。
+精灵：按调用方给出的键缓存程序绘制的小表面（粒子圆点、方块等），只在第一次用到时绘制。
+变体：按 (图片, 着色, 量化透明度) 缓存状态效果用的副本（灰色卡片、眩晕高亮、死亡渐隐等）。
+发光帧：按 (图片, 发光颜色, 量化透明度, 边距) 缓存叠加圆形发光的合成帧（植物蓄力、充能效果）。
+
+四类缓存都有容量上限，超出时淘汰最久未使用的条目。
+返回的表面会被多处共享，调用方不能修改；需要透明度时用 blit_with_alpha 绘制。
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+# 旋转图集的角度分辨率（一圈的方向数）
+ROTATION_STEPS = 64
+
+# 各类缓存的容量上限
+MAX_ROTATION_ATLASES = 256
+MAX_SCALED_IMAGES = 256
+MAX_SPRITES = 4096
+MAX_VARIANTS = 1024
+
+# 变体透明度的量化步长
+ALPHA_STEP = 8
+
+
+def _quantize_alpha(alpha):
+    """把透明度四舍五入到最近的 ALPHA_STEP 倍数并限制在 0~255，255 仍为 255（完全不透明）"""
+    return min(255, max(0, int((alpha + ALPHA_STEP / 2) // ALPHA_STEP) * ALPHA_STEP))
+
+
+class TransformCache:
+    """旋转图集、缩放图片和程序生成精灵的共享缓存"""
+
+    def __init__(self, rotation_steps=ROTATION_STEPS):
+        self.rotation_steps = rotation_steps
+        self.atlases = OrderedDict()  # 键 -> [基础图片, 各方向的旋转结果（未生成时为None）...]
+        self.scaled = OrderedDict()  # (图片, 尺寸) -> 缩放结果
+        self.sprites = OrderedDict()  # 调用方给出的键 -> 表面
+        self.variants = OrderedDict()  # (图片, 着色, 混合模式, 透明度) -> 副本
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, cache, key):
+        """查找条目并更新LRU顺序"""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _store(cache, key, value, max_entries):
+        """写入条目，超出容量时淘汰最久未使用的"""
+        cache[key] = value
+        if len(cache) > max_entries:
+            cache.popitem(last=False)
+
+    def get_angle_index(self, angle):
+        """把角度（度）量化为图集中的方向序号"""
+        return round(angle * self.rotation_steps / 360) % self.rotation_steps
+
+    def rotate(self, image, angle, key=None):
+        """
+        获取图片旋转 angle 度（逆时针，与 pygame.transform.rotate 相同）后的表面
+
+        Args:
+            image: 基础图片
+            angle: 角度，量化到最近的方向；量化为0时直接返回基础图片
+            key: 图集的键，默认使用图片本身
+        """
+        if key is None:
+            key = image
+        atlas = self._lookup(self.atlases, key)
+        if atlas is None:
+            atlas = [image] + [None] * self.rotation_steps
+            self._store(self.atlases, key, atlas, MAX_ROTATION_ATLASES)
+
+        index = self.get_angle_index(angle)
+        if index == 0:
+            return atlas[0]
+        frame = atlas[index + 1]
+        if frame is None:
+            self.misses += 1
+            frame = pygame.transform.rotate(atlas[0], index * 360 / self.rotation_steps)
+            atlas[index + 1] = frame
+        else:
+            self.hits += 1
+        return frame
+
+    def scale(self, image, size):
+        """获取图片缩放到 size 后的表面"""
+        key = (image, size)
+        scaled = self._lookup(self.scaled, key)
+        if scaled is None:
+            self.misses += 1
+            scaled = pygame.transform.scale(image, size)
+            self._store(self.scaled, key, scaled, MAX_SCALED_IMAGES)
+        else:
+            self.hits += 1
+        return scaled
+
+    def sprite(self, key, build):
+        """获取程序生成的精灵，第一次用到该键时调用 build() 绘制"""
+        sprite = self._lookup(self.sprites, key)
+        if sprite is None:
+            self.misses += 1
+            sprite = build()
+            self._store(self.sprites, key, sprite, MAX_SPRITES)
+        else:
+            self.hits += 1
+        return sprite
+
+    def variant(self, image, tint=None, alpha=None, blend=pygame.BLEND_MULT):
+        """
+        获取图片的着色/透明度变体
+
+        Args:
+            image: 基础图片
+            tint: 着色颜色，以 blend 混合模式 fill 到副本上；None 表示不着色
+            alpha: 整体透明度，四舍五入到 ALPHA_STEP；None 或 255 表示保持不透明，直接返回基础图片
+            blend: 着色使用的混合模式（BLEND_MULT 变暗/变灰，BLEND_ADD 高亮）
+        """
+        if alpha is not None:
+            alpha = _quantize_alpha(alpha)
+            if alpha == 255:
+                alpha = None
+        if tint is None and alpha is None:
+            return image
+
+        key = (image, tint, blend, alpha)
+        surface = self._lookup(self.variants, key)
+        if surface is None:
+            self.misses += 1
+            surface = image.copy()
+            if tint is not None:
+                surface.fill(tint, special_flags=blend)
+            if alpha is not None:
+                surface.set_alpha(alpha)
+            self._store(self.variants, key, surface, MAX_VARIANTS)
+        else:
+            self.hits += 1
+        return surface
+
+    def clear(self):
+        """清空所有缓存（图片重新加载后调用）"""
+        self.atlases.clear()
+        self.scaled.clear()
+        self.sprites.clear()
+        self.variants.clear()
+
+    def get_stats(self):
+        """获取缓存统计信息"""
+        lookups = self.hits + self.misses
+        return {
+            "rotation_atlases": len(self.atlases),
+            "rotation_frames": sum(frame is not None for atlas in self.atlases.values() for frame in atlas[1:]),
+            "scaled_images": len(self.scaled),
+            "sprites": len(self.sprites),
+            "variants": len(self.variants),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# 全局变换缓存实例
+transform_cache = TransformCache()
+
+
+def get_rotated(image, angle, key=None):
+    """通过全局缓存获取旋转后的图片"""
+    return transform_cache.rotate(image, angle, key)
+
+
+def get_scaled(image, size):
+    """通过全局缓存获取缩放后的图片"""
+    return transform_cache.scale(image, size)
+
+
+def get_sprite(key, build):
+    """通过全局缓存获取程序生成的精灵"""
+    return transform_cache.sprite(key, build)
+
+
+def get_variant(image, tint=None, alpha=None, blend=pygame.BLEND_MULT):
+    """通过全局缓存获取图片的着色/透明度变体"""
+    return transform_cache.variant(image, tint, alpha, blend)
+
+
+def get_filled(size, color):
+    """通过全局缓存获取纯色表面（color 可带透明度），用于覆盖层和阴影"""
+    return transform_cache.sprite(("filled", size, color), lambda: _build_filled(size, color))
+
+
+def _build_filled(size, color):
+    filled = pygame.Surface(size, pygame.SRCALPHA)
+    filled.fill(color)
+    return filled
+
+
+def get_glow_frame(image, glow_color, glow_alpha, padding):
+    """
+    通过全局缓存获取叠加圆形发光的图片帧，一次 blit 即可画出发光和图片
+
+    发光圆的半径为图片长边的一半加 padding，帧的四周比图片各大 padding 像素，
+    绘制位置为图片位置减去 padding；发光透明度四舍五入到 ALPHA_STEP。
+    """
+    glow_alpha = _quantize_alpha(glow_alpha)
+    return transform_cache.sprite(("glow_frame", image, glow_color, glow_alpha, padding),
+                                  lambda: _build_glow_frame(image, glow_color, glow_alpha, padding))
+
+
+def _build_glow_frame(image, glow_color, glow_alpha, padding):
+    width, height = image.get_size()
+    frame = pygame.Surface((width + padding * 2, height + padding * 2), pygame.SRCALPHA)
+    if glow_alpha > 0:
+        pygame.draw.circle(frame, (*glow_color, glow_alpha),
+                           (frame.get_width() // 2, frame.get_height() // 2),
+                           max(width, height) // 2 + padding)
+    frame.blit(image, (padding, padding))
+    return frame
+
+
+def blit_with_alpha(target, image, position, alpha):
+    """以指定透明度绘制共享表面：临时设置 surface alpha，绘制后恢复原值"""
+    previous_alpha = image.get_alpha()
+    image.set_alpha(alpha)
+    rect = target.blit(image, position)
+    image.set_alpha(previous_alpha)
+    return rect
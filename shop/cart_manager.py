@@ -8,6 +8,7 @@ import os
 
 
 from core.constants import *
+from rsc_mng.transform_cache import get_scaled
 
 
 class Cart:
@@ -43,22 +44,25 @@ class Cart:
                 self.sounds["cart_trigger"].play()
                 self.sound_played = True
 
-    def update(self, zombies):
-        """更新小推车状态"""
+    def update(self, zombies, zombie_store=None):
+        """更新小推车状态，zombies 为本行的僵尸；启用数组存储时直接向量化检测碰撞"""
         if not self.active or self.removed:
             return []
 
         # 向右移动
         self.col += self.speed
 
-        # 检查与僵尸的碰撞
-        hit_zombies = []
-        for zombie in zombies:
-            if zombie.row == self.row and not zombie.is_dying:
-                # 检查碰撞（小推车和僵尸的距离）
-                distance = abs(zombie.col - self.col)
-                if distance < 0.3:  # 碰撞检测阈值
-                    hit_zombies.append(zombie)
+        # 检查与僵尸的碰撞（碰撞检测阈值0.3）
+        if zombie_store is not None:
+            hit_zombies = zombie_store.get_zombies_near(self.row, self.col, 0.3)
+        else:
+            hit_zombies = []
+            for zombie in zombies:
+                if zombie.row == self.row and not zombie.is_dying:
+                    # 检查碰撞（小推车和僵尸的距离）
+                    distance = abs(zombie.col - self.col)
+                    if distance < 0.3:  # 碰撞检测阈值
+                        hit_zombies.append(zombie)
 
         # 如果移出屏幕右侧，标记为可移除
         if self.col > GRID_WIDTH + 2:
@@ -82,21 +86,25 @@ class Cart:
         cart_y = BATTLEFIELD_TOP + self.row * (GRID_SIZE + GRID_GAP) + (GRID_SIZE - 30) // 2
         return pygame.Rect(cart_x, cart_y, 30, 30)
 
+    def get_draw_position(self):
+        """小推车图片的左上角：已触发时在移动位置，否则在战场左侧的初始位置"""
+        if self.triggered:
+            return self.get_screen_position()
+        return BATTLEFIELD_LEFT - 40, BATTLEFIELD_TOP + self.row * (GRID_SIZE + GRID_GAP) + (GRID_SIZE - 30) // 2
+
+    def get_draw_bounds(self):
+        """draw 绘制的区域：左侧的移动轨迹、小推车和右下方2像素的阴影"""
+        if self.removed:
+            return pygame.Rect(0, 0, 0, 0)
+        draw_x, draw_y = self.get_draw_position()
+        return pygame.Rect(int(draw_x) - 11, int(draw_y), 45, 33)
+
     def draw(self, surface):
         """绘制小推车"""
         if self.removed:
             return
 
-        screen_x, screen_y = self.get_screen_position()
-
-        # 如果已触发，绘制在移动位置；否则绘制在初始位置
-        if self.triggered:
-            draw_x = screen_x
-            draw_y = screen_y
-        else:
-            # 未触发时绘制在战场左侧
-            draw_x = BATTLEFIELD_LEFT - 40
-            draw_y = BATTLEFIELD_TOP + self.row * (GRID_SIZE + GRID_GAP) + (GRID_SIZE - 30) // 2
+        draw_x, draw_y = self.get_draw_position()
 
         # 确保不绘制到屏幕外
         if draw_x < -50 or draw_x > BASE_WIDTH + 50:
@@ -104,7 +112,7 @@ class Cart:
 
         # 获取小推车图片
         if self.images and self.images.get('cart_img'):
-            cart_img = pygame.transform.scale(self.images['cart_img'], (30, 30))
+            cart_img = get_scaled(self.images['cart_img'], (30, 30))
         else:
             # 如果没有图片，创建一个简单的矩形表示
             cart_img = pygame.Surface((30, 30))
@@ -162,13 +170,13 @@ class CartManager:
             return True
         return False
 
-    def update_carts(self, zombies):
-        """更新所有小推车状态"""
+    def update_carts(self, zombie_grid, zombie_store=None):
+        """更新所有小推车状态，只检查小推车所在行的僵尸"""
         hit_zombies = []
 
         for cart in self.carts.values():
             if cart.active and not cart.removed:
-                cart_hit_zombies = cart.update(zombies)
+                cart_hit_zombies = cart.update(zombie_grid.get_zombies_in_row(cart.row), zombie_store)
                 hit_zombies.extend(cart_hit_zombies)
 
         return hit_zombies
@@ -181,6 +189,12 @@ class CartManager:
         for cart in self.carts.values():
             cart.draw(surface)
 
+    def get_draw_bounds(self):
+        """draw_carts 绘制的区域列表（脏矩形输出用）"""
+        if not self.shop_manager.has_cart():
+            return []
+        return [cart.get_draw_bounds() for cart in self.carts.values()]
+
     def handle_cart_click(self, x, y):
         """处理小推车点击事件"""
         if not self.shop_manager.has_cart():
@@ -194,18 +208,29 @@ class CartManager:
 
         return False
 
-    def check_zombie_trigger(self, zombies):
-        """检查是否有僵尸触发小推车"""
-        for zombie in zombies:
-            if zombie.is_dying:
+    def check_zombie_trigger(self, zombie_grid, zombie_store=None):
+        """检查是否有僵尸触发小推车，只检查还有小推车的行"""
+        if zombie_store is not None:
+            # 僵尸中心点（col + 0.3）到达 0.2 即触发
+            for row in zombie_store.get_rows_reached(0.2, offset=0.3):
+                self.trigger_cart_in_row(row)
+            return
+
+        for row in self.carts:
+            if not self.has_cart_in_row(row):
                 continue
 
-            # 使用僵尸中心点检查是否到达触发位置
-            zombie_center_col = zombie.col + 0.3  # 僵尸中心点位置
+            for zombie in zombie_grid.get_zombies_in_row(row):
+                if zombie.is_dying:
+                    continue
+
+                # 使用僵尸中心点检查是否到达触发位置
+                zombie_center_col = zombie.col + 0.3  # 僵尸中心点位置
 
-            # 当僵尸中心点到达第一列左侧时触发小推车
-            if zombie_center_col <= 0.2 and self.has_cart_in_row(zombie.row):
-                self.trigger_cart_in_row(zombie.row)
+                # 当僵尸中心点到达第一列左侧时触发小推车
+                if zombie_center_col <= 0.2:
+                    self.trigger_cart_in_row(row)
+                    break
 
     def get_save_data(self):
         """获取保存数据"""
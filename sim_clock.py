@@ -0,0 +1,92 @@
+"""
+模拟时钟模块 - 虚拟游戏时钟和分系统的可复现随机数流
+
+游戏逻辑以固定步长推进：每调用一次 GameManager._update_main_game_logic
+虚拟时钟前进一帧（1/60秒游戏时间），与真实经过的时间无关。
+所有影响模拟结果的随机数都从按子系统划分的随机数流中获取，
+相同种子、相同输入的关卡运行在任何实际帧率下都得到完全一致的结果。
+"""
+import random
+
+
+# 逻辑帧率：一帧对应的游戏时间为 1000 / SIM_TICK_RATE 毫秒
+SIM_TICK_RATE = 60
+
+# 随机数流名称
+RNG_STREAMS = (
+    "spawn",        # 僵尸生成：行、数量、类型、铁甲、快速僵尸
+    "penetration",  # 子弹随机穿透判定
+    "immunity",     # 僵尸免疫判定
+    "particles",    # 粒子和特效的随机参数
+    "plants",       # 植物射击间隔波动、蒲公英/闪电花目标
+    "loot",         # 阳光、金币掉落
+    "effects",      # 黄瓜死亡判定、冻结音效等
+    "portal",       # 传送门位置和传送判定
+)
+
+
+class SimulationClock:
+    """虚拟游戏时钟，每个模拟帧推进一次"""
+
+    def __init__(self, tick_rate=SIM_TICK_RATE):
+        self.tick_rate = tick_rate
+        self.tick = 0
+
+    def reset(self, tick=0):
+        """重置时钟到指定帧"""
+        self.tick = tick
+
+    def advance(self):
+        """推进一个模拟帧"""
+        self.tick += 1
+        return self.tick
+
+    def get_ticks(self):
+        """获取游戏时间（毫秒），用于替代 pygame.time.get_ticks"""
+        return self.tick * 1000 // self.tick_rate
+
+
+class RandomStreams:
+    """按子系统划分的随机数流，每个流都由主种子派生出独立种子"""
+
+    def __init__(self, seed=None):
+        self.seed = None
+        self.streams = {}
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        """用新的主种子重建所有随机数流，seed为None时随机生成"""
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+        self.seed = seed
+        self.streams = {name: random.Random(f"{seed}:{name}") for name in RNG_STREAMS}
+        return seed
+
+    def get(self, name):
+        """获取指定子系统的随机数流"""
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = random.Random(f"{self.seed}:{name}")
+            self.streams[name] = stream
+        return stream
+
+
+# 全局实例，与 features_manager / cards_manager 一样在整个游戏中共享
+game_clock = SimulationClock()
+random_streams = RandomStreams()
+
+
+def get_ticks():
+    """获取当前游戏时间（毫秒）"""
+    return game_clock.get_ticks()
+
+
+def get_rng(name):
+    """获取指定子系统的随机数流"""
+    return random_streams.get(name)
+
+
+def reset_simulation(seed=None, tick=0):
+    """开始新的模拟：重置虚拟时钟并重新播种所有随机数流，返回使用的种子"""
+    game_clock.reset(tick)
+    return random_streams.reseed(seed)
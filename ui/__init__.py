@@ -1,17 +1,33 @@
 """
 UI模块 - 包含植物选择、渲染和UI管理相关功能
+
+导出的类和函数在第一次访问时才导入所在的子模块（例如传送门管理器只在有传送门的关卡加载）
 """
+import importlib
+
+# 导出名 -> 所在子模块（第一次访问时导入）
+_LAZY_EXPORTS = {
+    'PlantSelectionManager': '.plant_selection_manager',
+    'PortalManager': '.portal_manager',
+    'RendererManager': '.renderer_manager',
+}
+_LAZY_EXPORTS.update(dict.fromkeys((
+    'draw_grid', 'draw_ui', 'show_game_over', 'show_settings_menu_with_hotreload',
+    'draw_main_menu', 'draw_level_select', 'draw_continue_dialog',
+    'draw_plant_select_grid', 'draw_codex_page', 'draw_codex_detail_page',
+    'draw_shop_page', 'draw_insufficient_coins_dialog', 'get_button_color',
+    'get_plants_codex_data', 'get_zombies_codex_data', 'wrap_text_chinese'
+), '.ui_manager'))
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-from .plant_selection_manager import PlantSelectionManager
-from .portal_manager import PortalManager
-from .renderer_manager import RendererManager
-from .ui_manager import (
-    draw_grid, draw_ui, show_game_over, show_settings_menu_with_hotreload,
-    draw_main_menu, draw_level_select, draw_continue_dialog,
-    draw_plant_select_grid, draw_codex_page, draw_codex_detail_page,
-    draw_shop_page, draw_insufficient_coins_dialog, get_button_color,
-    get_plants_codex_data, get_zombies_codex_data, wrap_text_chinese
-)
 
 __all__ = [
     'PlantSelectionManager',
@@ -33,4 +49,4 @@ __all__ = [
     'get_plants_codex_data',
     'get_zombies_codex_data',
     'wrap_text_chinese'
-]
\ No newline at end of file
+]
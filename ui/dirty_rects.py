@@ -0,0 +1,94 @@
+"""
+脏矩形输出 - 只恢复和输出本帧绘制过的区域
+
+游戏界面的背景（静态背景层加HUD控件）保存在HUD层上，植物、僵尸、子弹、粒子、
+小推车、传送门和锤子光标在绘制时报告各自覆盖的矩形。下一帧开始时只在这些旧矩形下
+用HUD层恢复背景，再绘制全部动态内容，最后把新旧矩形复制到屏幕，
+通过 pygame.display.update(rects) 提交。
+
+有无法确定绘制区域的内容（覆盖层、对话框、淡入淡出等）时由调用方整帧重绘，
+下一帧整屏恢复背景；矩形总面积超过阈值时同样退回整屏恢复和整屏 flip。
+"""
+import pygame
+
+
+# 矩形总面积超过画面面积的该比例时直接整屏恢复/flip
+FULL_FLIP_THRESHOLD = 0.5
+
+
+class DirtyRectTracker:
+    """记录上一帧绘制过的矩形，负责恢复背景和输出变化区域"""
+
+    def __init__(self, size, full_flip_threshold=FULL_FLIP_THRESHOLD):
+        self.bounds = pygame.Rect((0, 0), size)
+        self.max_area = full_flip_threshold * size[0] * size[1]
+        self.previous_rects = None  # 上一帧绘制过的矩形（None 表示未知，下一帧必须整屏恢复）
+
+        # 统计信息
+        self.full_flips = 0
+        self.partial_updates = 0
+        self.skipped_frames = 0
+
+    def invalidate(self):
+        """丢弃上一帧记录的矩形（整帧重绘、显示模式改变等），下一帧整屏恢复并输出"""
+        self.previous_rects = None
+
+    def _too_large(self, rects):
+        return sum(rect.w * rect.h for rect in rects) > self.max_area
+
+    def restore(self, surface, background, rects=()):
+        """
+        用背景覆盖上一帧绘制过的区域和 rects（背景本身变化的区域）
+
+        Returns:
+            list | None: 已恢复的矩形；rects 为 None、上一帧未知或面积过大时整屏恢复并返回 None
+        """
+        previous = self.previous_rects
+        if previous is None or rects is None:
+            surface.blit(background, (0, 0))
+            return None
+        restored = previous + rects
+        if self._too_large(restored):
+            surface.blit(background, (0, 0))
+            return None
+        surface.blits([(background, rect, rect) for rect in restored], False)
+        return restored
+
+    def present(self, surface, screen, restored, drawn):
+        """
+        把画面输出到屏幕并记录本帧绘制的矩形
+
+        Args:
+            restored: restore 的返回值
+            drawn: 本帧绘制的矩形列表，None 表示无法确定（下一帧整屏恢复）
+        """
+        if drawn is not None:
+            # 只保留画面内的部分（画面外的僵尸等会报告空矩形）
+            clip = self.bounds.clip
+            drawn = [rect for rect in map(clip, drawn) if rect]
+        self.previous_rects = drawn
+        rects = None
+        if restored is not None and drawn is not None:
+            # 静止的对象前后两帧的矩形相同，只输出一次
+            rects = list({tuple(rect): rect for rect in restored + drawn}.values())
+            if self._too_large(rects):
+                rects = None
+        if rects is None:
+            screen.blit(surface, (0, 0))
+            pygame.display.flip()
+            self.full_flips += 1
+            return
+
+        if rects:
+            screen.blits([(surface, rect, rect) for rect in rects], False)
+            pygame.display.update(rects)
+            self.partial_updates += 1
+        else:
+            self.skipped_frames += 1
+
+
+def create_dirty_rect_tracker(size, enabled=True):
+    """创建脏矩形输出器，未启用时返回 None"""
+    if not enabled:
+        return None
+    return DirtyRectTracker(size)
@@ -0,0 +1,188 @@
+"""
+保留模式HUD - 阳光计数、关卡信息、进度条、铲子、锤子、卡槽和设置按钮
+
+每个控件负责顶部或底部UI背景条上的一块固定区域，绘制结果保存在一张与画面同尺寸的HUD层上。
+控件每帧只计算一个描述输入的 key（阳光数值、冷却秒数、选中状态、阳光是否足够等），
+key 与上次相同时直接复用HUD层上的像素，变化时才在自己的区域内恢复背景并重绘；
+区域有重叠的相邻控件按原绘制顺序一起重绘，保证结果与整帧重绘一致。
+每帧的开销是每个控件一次 blit，升起后浮动的波次旗帜仍每帧绘制。
+"""
+import pygame
+
+from core.constants import *
+from . import ui_manager
+
+
+class HudWidget:
+    """HUD控件：region 是控件可能绘制到的区域，key 相同时不重绘"""
+
+    def __init__(self, name, region, paint):
+        self.name = name
+        self.region = pygame.Rect(region)
+        self.paint = paint  # paint(surface, key) 在 surface 上按绝对坐标绘制控件
+        self.key = None
+        self.valid = False
+
+
+class Hud:
+    """游戏界面的保留模式HUD，由 RendererManager 持有"""
+
+    def __init__(self):
+        self._layer = None
+        self._background = None
+        self._resources = None
+        self._fonts = (None, None)
+        self._images = None
+        self._scaled_images = None
+        self.flag_raised = False
+
+        bottom_top = BATTLEFIELD_TOP + total_battlefield_height
+        bottom_height = BASE_HEIGHT - bottom_top
+        progress_left = ui_manager.PROGRESS_BAR_X - 10
+        # 按原 draw_ui 的绘制顺序排列
+        self.sun_counter = HudWidget("sun_counter", (0, 0, CARD_START_X, BATTLEFIELD_TOP),
+                                     self._paint_sun_counter)
+        self.level_info = HudWidget("level_info", (0, bottom_top, progress_left, bottom_height),
+                                    self._paint_level_info)
+        self.progress_bar = HudWidget("progress_bar",
+                                      (progress_left, bottom_top,
+                                       SETTINGS_BUTTON_X - progress_left, bottom_height),
+                                      self._paint_progress_bar)
+        self.shovel = HudWidget("shovel", (SHOVEL_X, SHOVEL_Y, SHOVEL_WIDTH, SHOVEL_HEIGHT),
+                                self._paint_shovel)
+        self.hammer = HudWidget("hammer", (HAMMER_X, HAMMER_Y, SHOVEL_WIDTH, SHOVEL_HEIGHT),
+                                self._paint_hammer)
+        # 卡片多于可用宽度时会画到锤子和铲子上，卡槽区域延伸到画面右边缘
+        self.card_bar = HudWidget("card_bar", (CARD_START_X, CARD_Y, BASE_WIDTH - CARD_START_X, CARD_HEIGHT),
+                                  self._paint_card_bar)
+        self.settings_button = HudWidget("settings_button",
+                                         (SETTINGS_BUTTON_X, SETTINGS_BUTTON_Y,
+                                          SETTINGS_BUTTON_WIDTH, SETTINGS_BUTTON_HEIGHT),
+                                         self._paint_settings_button)
+        self.widgets = [self.sun_counter, self.level_info, self.progress_bar, self.shovel,
+                        self.hammer, self.card_bar, self.settings_button]
+        # 每帧输出的区域：跳过完全包含在其他控件区域内的控件
+        self._blit_regions = [widget.region for widget in self.widgets
+                              if not any(other is not widget and other.region.contains(widget.region)
+                                         for other in self.widgets)]
+
+    def invalidate(self):
+        """丢弃HUD层，下一帧全部控件重绘"""
+        self._layer = None
+
+    def update(self, background, sun, cards, selected, level_manager, wave_mode=False,
+               game_state=None, level_settings=None, scaled_images=None, font_small=None,
+               font_medium=None, images=None, game_manager=None):
+        """
+        按本帧的输入在HUD层上重绘变化的控件，参数与 draw 相同（不需要目标表面）
+
+        Returns:
+            list | None: 本帧重绘的区域；HUD层重新生成（整个背景都变了）时返回 None
+        """
+        resources = (background, font_small, font_medium, images, scaled_images)
+        rebuilt = self._layer is None or any(a is not b for a, b in zip(resources, self._resources))
+        if rebuilt:
+            self._layer = background.copy()
+            self._background = background
+            self._fonts = (font_small, font_medium)
+            self._images = images
+            self._scaled_images = scaled_images
+            self._resources = resources
+            for widget in self.widgets:
+                widget.valid = False
+
+        coins = game_manager.coins if hasattr(game_manager, 'coins') else None
+        self.flag_raised = ui_manager.is_progress_flag_raised(level_manager, wave_mode)
+        keys = (
+            (int(sun), coins),
+            ui_manager.get_level_info(level_manager),
+            (ui_manager.get_progress_width(level_manager, game_state, wave_mode), self.flag_raised),
+            selected == "shovel",
+            ui_manager.get_hammer_state(game_state, selected, game_manager),
+            ui_manager.get_card_slot_states(cards, sun, selected, level_manager, game_state,
+                                            level_settings, game_manager),
+            None,
+        )
+
+        dirty = []
+        for widget, key in zip(self.widgets, keys):
+            if not widget.valid or key != widget.key:
+                widget.key = key
+                widget.valid = True
+                dirty.append(widget)
+        for widget in dirty:
+            self._repaint(widget.region)
+        return None if rebuilt else [widget.region for widget in dirty]
+
+    @property
+    def layer(self):
+        """静态背景层加上全部控件的当前画面（脏矩形输出时用来恢复旧区域的背景）"""
+        return self._layer
+
+    @property
+    def flag_region(self):
+        """升起的旗帜每帧重绘的区域（在进度条控件区域内浮动）"""
+        return self.progress_bar.region
+
+    def draw_flag(self, surface):
+        """绘制升起后随时间浮动的波次旗帜（不缓存，每帧调用）"""
+        if self.flag_raised:
+            ui_manager.draw_progress_flag(surface, True)
+
+    def draw(self, surface, background, sun, cards, selected, level_manager, wave_mode=False,
+             game_state=None, level_settings=None, scaled_images=None, font_small=None,
+             font_medium=None, images=None, game_manager=None):
+        """
+        绘制HUD，参数与 ui_manager.draw_ui 相同
+
+        background 是本帧已绘制到 surface 上的静态背景层（含UI背景条），控件重绘时用它恢复背景。
+
+        Returns:
+            pygame.Rect: 设置按钮区域
+        """
+        self.update(background, sun, cards, selected, level_manager, wave_mode, game_state,
+                    level_settings, scaled_images, font_small, font_medium, images, game_manager)
+
+        layer = self._layer
+        for region in self._blit_regions:
+            surface.blit(layer, region, region)
+
+        # 升起的旗帜随时间浮动，不缓存
+        self.draw_flag(surface)
+
+        return pygame.Rect(self.settings_button.region)
+
+    def _repaint(self, region):
+        """在HUD层上恢复 region 的背景，按顺序重绘与其相交的控件"""
+        layer = self._layer
+        layer.set_clip(region)
+        layer.blit(self._background, region, region)
+        for widget in self.widgets:
+            if widget.region.colliderect(region):
+                widget.paint(layer, widget.key)
+        layer.set_clip(None)
+
+    def _paint_sun_counter(self, surface, key):
+        sun, coins = key
+        ui_manager.draw_sun_counter(surface, sun, coins, self._fonts[1])
+
+    def _paint_level_info(self, surface, key):
+        ui_manager.draw_level_info(surface, key, *self._fonts)
+
+    def _paint_progress_bar(self, surface, key):
+        progress_width, flag_raised = key
+        ui_manager.draw_progress_bar_track(surface, progress_width, self._fonts[0])
+        if not flag_raised:
+            ui_manager.draw_progress_flag(surface, False)
+
+    def _paint_shovel(self, surface, key):
+        ui_manager.draw_shovel(surface, "shovel" if key else None, self._images)
+
+    def _paint_hammer(self, surface, key):
+        ui_manager.draw_hammer(surface, key, self._images, self._fonts[1])
+
+    def _paint_card_bar(self, surface, key):
+        ui_manager.draw_card_slots(surface, key, self._images, self._scaled_images, self._fonts[1])
+
+    def _paint_settings_button(self, surface, key):
+        ui_manager.draw_settings_button(surface, self._scaled_images)
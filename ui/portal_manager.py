@@ -2,10 +2,11 @@
 传送门管理器模块 - 管理传送门的生成、移动和动画效果
 """
 import pygame
-import random
+from sim_clock import get_rng
 import math
 from typing import List, Tuple, Optional
 from core.constants import *
+from particle_system import particle_system, emit_portal_particle
 
 
 class Portal:
@@ -30,8 +31,7 @@ class Portal:
         # 视觉效果
         self.rotation_angle = 0
 
-        # 粒子效果
-        self.particles = []
+        # 粒子效果（粒子由全局粒子系统管理）
         self.particle_timer = 0
 
     def update(self):
@@ -66,36 +66,13 @@ class Portal:
         if self.particle_timer % 8 == 0 and self.is_active:
             self.create_particle()
 
-        # 更新现有粒子
-        for particle in self.particles[:]:
-            particle['life'] -= 1
-            particle['x'] += particle['vel_x']
-            particle['y'] += particle['vel_y']
-            particle['alpha'] = max(0, particle['alpha'] - 2)  # 减慢透明度衰减
-
-            if particle['life'] <= 0 or particle['alpha'] <= 0:
-                self.particles.remove(particle)
-
     def create_particle(self):
         """创建科技感粒子 - 减少数量"""
         center_x = BATTLEFIELD_LEFT + self.col * (GRID_SIZE + GRID_GAP) + GRID_SIZE // 2
         center_y = BATTLEFIELD_TOP + self.row * (GRID_SIZE + GRID_GAP) + GRID_SIZE // 2
 
         # 创建环形粒子 - 减少半径范围
-        angle = random.uniform(0, 2 * math.pi)
-        radius = random.uniform(15, 25)  # 缩小半径范围
-
-        particle = {
-            'x': center_x + math.cos(angle) * radius,
-            'y': center_y + math.sin(angle) * radius,
-            'vel_x': math.cos(angle) * 0.3,  # 降低速度
-            'vel_y': math.sin(angle) * 0.3,
-            'life': 45,  # 减少生命周期
-            'alpha': 200,  # 降低初始透明度，减少透明感
-            'color': random.choice([(0, 255, 255), (0, 200, 255), (100, 255, 255)])
-        }
-
-        self.particles.append(particle)
+        emit_portal_particle(center_x, center_y)
 
     def start_despawn(self):
         """开始消失动画"""
@@ -114,6 +91,11 @@ class Portal:
         x, y = self.get_screen_pos()
         return x + GRID_SIZE // 2, y + GRID_SIZE // 2
 
+    def get_draw_bounds(self):
+        """draw 可能绘制到的区域：半径35像素的外环（出现和消失动画中只会更小）"""
+        center_x, center_y = self.get_center_pos()
+        return pygame.Rect(center_x - 35, center_y - 35, 71, 71)
+
     def draw(self, surface):
         """绘制传送门"""
         center_x, center_y = self.get_center_pos()
@@ -182,18 +164,6 @@ class Portal:
             surface.blit(ellipse_surface,
                          (center_x - ellipse_width // 2, center_y - ellipse_height // 2))
 
-        # 绘制粒子效果
-        self.draw_particles(surface)
-
-    def draw_particles(self, surface):
-        """绘制粒子效果"""
-        for particle in self.particles:
-            if particle['alpha'] > 0:
-                particle_surface = pygame.Surface((4, 4), pygame.SRCALPHA)
-                color = (*particle['color'], int(particle['alpha']))
-                pygame.draw.circle(particle_surface, color, (2, 2), 2)
-                surface.blit(particle_surface, (int(particle['x']) - 2, int(particle['y']) - 2))
-
 
 class PortalManager:
     """传送门管理器 - 修复版本"""
@@ -229,11 +199,11 @@ class PortalManager:
 
         # 随机选择两个不同的行
         available_rows = list(range(GRID_HEIGHT))
-        selected_rows = random.sample(available_rows, 2)
+        selected_rows = get_rng("portal").sample(available_rows, 2)
 
         # 为每个行随机选择列
         for row in selected_rows:
-            col = random.choice(self.right_cols)
+            col = get_rng("portal").choice(self.right_cols)
             portal = Portal(row, col, self.next_portal_id)
             self.portals.append(portal)
             self.next_portal_id += 1
@@ -300,7 +270,7 @@ class PortalManager:
         if not active_portals:
             return
 
-        portal_to_switch = random.choice(active_portals)
+        portal_to_switch = get_rng("portal").choice(active_portals)
 
         # 获取当前占用的行
         occupied_rows = [p.row for p in self.portals if p != portal_to_switch]
@@ -310,8 +280,8 @@ class PortalManager:
         if not available_rows:
             return
 
-        new_row = random.choice(available_rows)
-        new_col = random.choice(self.right_cols)
+        new_row = get_rng("portal").choice(available_rows)
+        new_col = get_rng("portal").choice(self.right_cols)
 
         # 开始旧传送门的消失动画
         portal_to_switch.start_despawn()
@@ -337,6 +307,13 @@ class PortalManager:
         """绘制所有传送门"""
         for portal in self.portals:
             portal.draw(surface)
+        particle_system.draw(surface, ("portal",))
+
+    def get_draw_bounds(self):
+        """draw_portals 可能绘制到的区域列表（脏矩形输出用）"""
+        rects = [portal.get_draw_bounds() for portal in self.portals]
+        rects.extend(particle_system.get_bounds(("portal",)))
+        return rects
 
     def teleport_zombie(self, zombie):
         """传送僵尸到另一个传送门"""
@@ -360,7 +337,7 @@ class PortalManager:
         if not other_portals:
             return False
 
-        target_portal = random.choice(other_portals)
+        target_portal = get_rng("portal").choice(other_portals)
 
         # 传送僵尸
         zombie.row = target_portal.row
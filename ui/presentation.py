@@ -0,0 +1,92 @@
+"""
+全屏输出 - 把固定分辨率（BASE_WIDTH x BASE_HEIGHT）的 game_surface 等比缩放到全屏
+
+三种输出方式：
+    letterbox: 缩放结果直接写入屏幕中央的子表面，子表面在切换显示模式时创建一次，
+               黑边也只在那时填充，每帧不分配新表面、不重复填充整屏（默认）
+    scaled: 使用 pygame.SCALED 显示模式，画面按原始分辨率输出，缩放和黑边由 SDL 渲染器完成；
+            驱动不支持时退回 letterbox
+    transform: 旧的输出方式，每帧 pygame.transform.scale 生成新表面，填黑后再绘制到屏幕，
+               保留用于基准测试对比
+"""
+import pygame
+
+from core.constants import BASE_WIDTH, BASE_HEIGHT
+
+
+PRESENTATION_MODES = ("letterbox", "scaled", "transform")
+DEFAULT_PRESENTATION = "letterbox"
+
+# 黑边颜色
+LETTERBOX_COLOR = (0, 0, 0)
+
+
+class FullscreenPresenter:
+    """全屏输出器：切换显示模式时计算缩放比例和偏移量，每帧把画面输出到屏幕"""
+
+    def __init__(self, mode=DEFAULT_PRESENTATION, base_size=(BASE_WIDTH, BASE_HEIGHT)):
+        if mode not in PRESENTATION_MODES:
+            print(f"警告：未知的全屏输出方式 {mode}，使用 {DEFAULT_PRESENTATION}")
+            mode = DEFAULT_PRESENTATION
+        self.mode = mode
+        self.base_width, self.base_height = base_size
+
+        # 由 configure 根据屏幕尺寸计算
+        self.scale = 1.0
+        self.offset = (0, 0)
+        self.size = base_size
+        self._screen = None
+        self._target = None  # letterbox 模式下屏幕中央的子表面
+        self._buffer = None  # 画面与屏幕像素格式不同时使用的缩放缓冲
+
+    def set_fullscreen_mode(self):
+        """切换到全屏显示模式并配置输出，返回新的屏幕表面"""
+        screen = None
+        if self.mode == "scaled":
+            try:
+                screen = pygame.display.set_mode((self.base_width, self.base_height),
+                                                 pygame.FULLSCREEN | pygame.SCALED)
+            except pygame.error as e:
+                print(f"警告：SCALED 显示模式不可用（{e}），改用 letterbox 输出")
+                self.mode = "letterbox"
+        if screen is None:
+            screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        self.configure(screen)
+        return screen
+
+    def configure(self, screen):
+        """显示模式改变后根据屏幕尺寸计算保持宽高比的缩放比例和居中偏移量"""
+        screen_width, screen_height = screen.get_size()
+        self.scale = min(screen_width / self.base_width, screen_height / self.base_height)
+        width = int(self.base_width * self.scale)
+        height = int(self.base_height * self.scale)
+        self.size = (width, height)
+        self.offset = ((screen_width - width) // 2, (screen_height - height) // 2)
+
+        self._screen = screen
+        self._buffer = None
+        screen.fill(LETTERBOX_COLOR)
+        # 尺寸与画面相同（SCALED 模式或屏幕恰好等大）时直接 blit，不需要子表面
+        if self.mode == "letterbox" and self.size != (self.base_width, self.base_height):
+            self._target = screen.subsurface(pygame.Rect(self.offset, self.size))
+        else:
+            self._target = None
+
+    def present(self, surface):
+        """把画面输出到屏幕（不调用 flip）"""
+        if self._target is not None:
+            try:
+                pygame.transform.scale(surface, self.size, self._target)
+                return
+            except ValueError:
+                # 像素格式与屏幕不同时不能直接缩放进屏幕，改为缩放进预先分配的同格式缓冲再 blit
+                self._target = None
+                self._buffer = pygame.Surface(self.size, 0, surface)
+        if self._buffer is not None:
+            pygame.transform.scale(surface, self.size, self._buffer)
+            self._screen.blit(self._buffer, self.offset)
+        elif self.mode == "transform" and self.size != surface.get_size():
+            self._screen.fill(LETTERBOX_COLOR)
+            self._screen.blit(pygame.transform.scale(surface, self.size), self.offset)
+        else:
+            self._screen.blit(surface, self.offset)
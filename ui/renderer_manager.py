@@ -12,6 +12,12 @@ from core.constants import *
 # 使用相对导入引用同一文件夹下的ui_manager
 from . import ui_manager
 from core.cards_manager import get_available_cards_new
+from rsc_mng.text_cache import render_text
+from rsc_mng.transform_cache import get_scaled, get_filled
+from render_queue import RenderQueue, LAYER_PARTICLES, LAYER_SEEDS
+from particle_system import particle_system, BATTLEFIELD_POOLS
+from .dirty_rects import create_dirty_rect_tracker
+from .hud_widgets import Hud
 
 
 class RendererManager:
@@ -20,34 +26,62 @@ class RendererManager:
     def __init__(self, game_manager):
         self.game_manager = game_manager
         self.finish_btn = None  # 新增：存储开始战斗按钮
+        # 游戏界面的静态背景层（背景色+网格+UI背景条），关卡、网格图片或画面尺寸变化时重建
+        self._battlefield_layer = None
+        self._battlefield_layer_key = None
+        # 可选：脏矩形输出（窗口模式下只恢复和更新绘制过的区域）
+        self.dirty_rect_tracker = None
+        self._dirty_frame = None  # 本帧按区域渲染时为 (恢复的矩形, 绘制的矩形)
+        # 游戏对象的分图层渲染队列，每帧复用
+        self.render_queue = RenderQueue()
+        # 淡入淡出用的全屏黑色覆盖层，每帧只修改 surface alpha
+        self._fade_overlay = None
+        # 游戏界面的保留模式HUD（阳光、卡槽、进度条等），输入不变时直接复用上次的绘制结果
+        self.hud = Hud()
+
+    def enable_dirty_rects(self):
+        """开启脏矩形输出（只对游戏界面生效，其他界面和覆盖层仍整屏刷新）"""
+        self.dirty_rect_tracker = create_dirty_rect_tracker((BASE_WIDTH, BASE_HEIGHT))
 
     def render_game(self):
-        """渲染游戏画面"""
-
-        self.game_manager.game_surface.fill((0, 120, 0))
-
-        if self.game_manager.state_manager.game_state == "main_menu":
-            self._render_main_menu()
-        elif self.game_manager.state_manager.game_state == "level_select":
-            self._render_level_select()
-        elif self.game_manager.state_manager.game_state == "playing":
-            self._render_playing()
-        elif self.game_manager.state_manager.game_state == "shop":
-            self._render_shop()
-        elif self.game_manager.state_manager.game_state == "codex":
-            self._render_codex()
-        elif self.game_manager.state_manager.game_state == "codex_detail":
-            self._render_codex_detail()
+        """渲染游戏画面（每个阶段包在命名计时作用域中，--timing 开启时统计耗时）"""
+        timing = self.game_manager.performance_monitor.scope
+
+        game_state = self.game_manager.state_manager.game_state
+        self._dirty_frame = None
+        # 游戏界面由不透明的静态背景层覆盖整个画面，不需要先填充
+        if game_state != "playing":
+            self.game_manager.game_surface.fill((0, 120, 0))
+
+        with timing("render." + game_state):
+            if game_state == "main_menu":
+                self._render_main_menu()
+            elif game_state == "level_select":
+                self._render_level_select()
+            elif game_state == "playing":
+                if self._can_render_partial():
+                    self._render_playing_partial()
+                else:
+                    self._render_playing()
+            elif game_state == "shop":
+                self._render_shop()
+            elif game_state == "codex":
+                self._render_codex()
+            elif game_state == "codex_detail":
+                self._render_codex_detail()
 
         # 渲染通用UI元素（适用于所有状态）
-        self._render_common_ui()
+        with timing("render.common_ui"):
+            self._render_common_ui()
 
         # 渲染过渡动画（适用于所有状态）
         if self.game_manager.state_manager.is_in_transition():
-            self._render_transition_mask()
+            with timing("render.transition"):
+                self._render_transition_mask()
 
         # 最终屏幕绘制（适用于所有状态）
-        self._blit_to_screen()
+        with timing("render.blit_to_screen"):
+            self._blit_to_screen()
 
     def _render_codex_detail(self):
         """渲染详细图鉴页面"""
@@ -122,61 +156,141 @@ class RendererManager:
 
     def _render_playing(self):
         """渲染游戏界面"""
-        # 1. 先绘制整个战场区域的背景（深绿色）
-        battlefield_rect = pygame.Rect(BATTLEFIELD_LEFT, BATTLEFIELD_TOP,
-                                       total_battlefield_width, total_battlefield_height)
-        pygame.draw.rect(self.game_manager.game_surface, (0, 120, 0), battlefield_rect)
+        timing = self.game_manager.performance_monitor.scope
 
-        # 2. 绘制战场网格（在战场背景之上）
-        ui_manager.draw_grid(self.game_manager.game_surface, self.game_manager.images.get('grid_bg_img'))
+        # 1-2. 绘制静态背景层（战场背景、网格和UI背景条，一次整块绘制）
+        with timing("render.battlefield"):
+            battlefield_layer = self._get_battlefield_layer()
+            self.game_manager.game_surface.blit(battlefield_layer, (0, 0))
 
         # 3. 绘制小推车（在网格之后，游戏对象之前）
-        self._render_carts()
+        with timing("render.carts"):
+            self._render_carts()
 
         # 获取可用卡片
         cards = self.game_manager.get_available_cards_for_current_state()
 
-        # 绘制UI
-        settings_rect = ui_manager.draw_ui(
-            self.game_manager.game_surface,
-            self.game_manager.game["sun"],
-            cards,
-            self.game_manager.shovel,
-            self.game_manager.game["selected"],
-            self.game_manager.game["level_manager"],
-            self.game_manager.game["wave_mode"],
-            self.game_manager.game["wave_timer"],
-            WAVE_INTERVAL,
-            self.game_manager.state_manager.show_settings,
-            self.game_manager.game,
-            self.game_manager.level_settings,
-            self.game_manager.scaled_images,
-            self.game_manager.font_small,
-            self.game_manager.font_medium,
-            self.game_manager.images,
-            game_manager=self.game_manager
-        )
+        # 绘制UI（保留模式，只重绘输入变化的控件）
+        with timing("render.ui"):
+            self.hud.draw(self.game_manager.game_surface, *self._get_hud_inputs(battlefield_layer, cards),
+                          game_manager=self.game_manager)
 
         # 如果显示植物选择，在战场区域绘制选择网格
         if self.game_manager.plant_selection_manager.show_plant_select:
-            self._render_plant_selection()
+            with timing("render.plant_selection"):
+                self._render_plant_selection()
         else:
-            self._render_game_objects()
+            with timing("render.game_objects"):
+                self._render_game_objects()
 
         # 绘制植物预览（在游戏对象之后）
         if not self.game_manager.plant_selection_manager.show_plant_select:
-            self._render_plant_preview()
-        self._render_portals()
-        self._render_hammer_cursor()
+            with timing("render.plant_preview"):
+                self._render_plant_preview()
+        with timing("render.portals"):
+            self._render_portals()
+        with timing("render.hammer_cursor"):
+            self._render_hammer_cursor()
 
         # 绘制奖杯
-        self._render_trophy()
+        with timing("render.trophy"):
+            self._render_trophy()
 
         # 绘制淡入淡出效果
-        self._render_fade_effect()
+        with timing("render.fade"):
+            self._render_fade_effect()
+
+    def _get_hud_inputs(self, battlefield_layer, cards):
+        """Hud.draw/update 除目标表面外的位置参数"""
+        game = self.game_manager.game
+        return (battlefield_layer, game["sun"], cards, game["selected"], game["level_manager"],
+                game["wave_mode"], game, self.game_manager.level_settings, self.game_manager.scaled_images,
+                self.game_manager.font_small, self.game_manager.font_medium, self.game_manager.images)
+
+    def _can_render_partial(self):
+        """本帧能否按区域渲染：开启了脏矩形输出、窗口模式，且没有整屏的覆盖层、动画或对话框"""
+        game_manager = self.game_manager
+        state_manager = game_manager.state_manager
+        game = game_manager.game
+        return (self.dirty_rect_tracker is not None
+                and not game_manager.fullscreen
+                and not game_manager.plant_selection_manager.show_plant_select
+                and game["fade_state"] == "none"
+                and not game["game_over"]
+                and not game["level_manager"].trophy
+                and not state_manager.show_settings
+                and not state_manager.show_reset_confirm
+                and not state_manager.show_continue_dialog
+                and not state_manager.is_in_transition()
+                and not game_manager.animation_manager.show_config_reload_message)
+
+    def _render_playing_partial(self):
+        """
+        脏矩形输出时渲染游戏界面
+
+        只在上一帧绘制过的区域和变化的HUD控件区域用HUD层恢复背景，再绘制全部动态内容并
+        记录各自的区域，由 _blit_to_screen 只输出这些区域。绘制顺序与 _render_playing 相同。
+        """
+        timing = self.game_manager.performance_monitor.scope
+        surface = self.game_manager.game_surface
+        hud = self.hud
+
+        # 更新HUD层（静态背景层加控件），再用它恢复上一帧绘制过的区域
+        with timing("render.ui"):
+            cards = self.game_manager.get_available_cards_for_current_state()
+            hud_rects = hud.update(*self._get_hud_inputs(self._get_battlefield_layer(), cards),
+                                   game_manager=self.game_manager)
+        with timing("render.battlefield"):
+            restored = self.dirty_rect_tracker.restore(surface, hud.layer, hud_rects)
+
+        drawn = []
+        with timing("render.carts"):
+            self._render_carts()
+            drawn.extend(self.game_manager.cart_manager.get_draw_bounds())
+        if hud.flag_raised:
+            hud.draw_flag(surface)
+            drawn.append(pygame.Rect(hud.flag_region))
+
+        with timing("render.game_objects"):
+            object_rects = self._render_game_objects(track_bounds=True)
+        with timing("render.plant_preview"):
+            preview_rect = self._render_plant_preview()
+        with timing("render.portals"):
+            portal_rects = self._render_portals()
+        with timing("render.hammer_cursor"):
+            hammer_rect = self._render_hammer_cursor()
+
+        if object_rects is None:
+            drawn = None
+        else:
+            drawn.extend(object_rects)
+            drawn.extend(portal_rects)
+            if preview_rect is not None:
+                drawn.append(preview_rect)
+            if hammer_rect is not None:
+                drawn.append(hammer_rect)
+        self._dirty_frame = (restored, drawn)
+
+    def _get_battlefield_layer(self):
+        """获取静态背景层，关卡、网格图片或画面尺寸变化时重新合成"""
+        game_surface = self.game_manager.game_surface
+        grid_bg_img = self.game_manager.images.get('grid_bg_img')
+        layer_key = (self.game_manager.game["level_manager"].current_level,
+                     id(grid_bg_img), game_surface.get_size())
+        if self._battlefield_layer is None or layer_key != self._battlefield_layer_key:
+            self._battlefield_layer = ui_manager.build_battlefield_layer(game_surface, grid_bg_img)
+            self._battlefield_layer_key = layer_key
+        return self._battlefield_layer
+
+    def invalidate_static_layers(self):
+        """丢弃缓存的静态背景层，下一帧重新合成并整屏输出"""
+        self._battlefield_layer = None
+        self.hud.invalidate()
+        if self.dirty_rect_tracker:
+            self.dirty_rect_tracker.invalidate()
 
     def _render_portals(self):
-        """渲染传送门"""
+        """渲染传送门，返回绘制区域列表"""
         # 检查关卡管理器是否有传送门系统特性
         if hasattr(self.game_manager.game.get("level_manager"), 'has_special_feature'):
             level_manager = self.game_manager.game.get("level_manager")
@@ -185,6 +299,8 @@ class RendererManager:
                 if "portal_manager" in self.game_manager.game:
                     portal_manager = self.game_manager.game["portal_manager"]
                     portal_manager.draw_portals(self.game_manager.game_surface)
+                    return portal_manager.get_draw_bounds()
+        return []
 
     def _render_carts(self):
         """渲染小推车"""
@@ -192,7 +308,7 @@ class RendererManager:
         self.game_manager.cart_manager.draw_carts(self.game_manager.game_surface)
 
     def _render_hammer_cursor(self):
-        """渲染跟随鼠标的锤子"""
+        """渲染跟随鼠标的锤子，返回绘制区域（未绘制时返回 None）"""
         # 检查锤子是否被选中并跟随鼠标
         if (self.game_manager.game["selected"] == "hammer" and
                 self.game_manager.state_manager.is_hammer_cursor_enabled()):
@@ -219,12 +335,11 @@ class RendererManager:
                             self.game_manager.images.get('hammer_img')):
                         # 使用锤子图像
                         hammer_img = self.game_manager.images['hammer_img']
-                        hammer_scaled = pygame.transform.scale(hammer_img, (hammer_size, hammer_size))
+                        hammer_scaled = get_scaled(hammer_img, (hammer_size, hammer_size))
 
                         # 添加轻微的阴影效果
                         shadow_offset = 2
-                        shadow_surface = pygame.Surface((hammer_size, hammer_size), pygame.SRCALPHA)
-                        shadow_surface.fill((0, 0, 0, 100))  # 半透明黑色阴影
+                        shadow_surface = get_filled((hammer_size, hammer_size), (0, 0, 0, 100))
                         self.game_manager.game_surface.blit(shadow_surface,
                                                             (hammer_x + shadow_offset, hammer_y + shadow_offset))
 
@@ -241,8 +356,7 @@ class RendererManager:
 
                         # 绘制阴影
                         shadow_rect = pygame.Rect(hammer_x + 2, hammer_y + 2, hammer_size, hammer_size)
-                        shadow_surface = pygame.Surface((hammer_size, hammer_size), pygame.SRCALPHA)
-                        shadow_surface.fill((0, 0, 0, 100))
+                        shadow_surface = get_filled((hammer_size, hammer_size), (0, 0, 0, 100))
                         self.game_manager.game_surface.blit(shadow_surface, shadow_rect.topleft)
 
                         # 绘制锤子矩形
@@ -261,12 +375,16 @@ class RendererManager:
                         pygame.draw.line(self.game_manager.game_surface, (255, 255, 255),
                                          (hammer_x + 5, center_y), (hammer_x + hammer_size - 5, center_y), 3)
 
+                    # 锤子加上右下方偏移2像素的阴影
+                    return pygame.Rect(hammer_x, hammer_y, hammer_size + 2, hammer_size + 2)
+        return None
+
     def _render_plant_preview(self):
-        """渲染植物种植预览"""
+        """渲染植物种植预览，返回预览所在的格子区域（没有预览时返回 None）"""
 
         preview = self.game_manager.state_manager.get_plant_preview()
         if not preview:
-            return
+            return None
 
         # 导入预览绘制函数
         try:
@@ -282,7 +400,10 @@ class RendererManager:
             )
         except ImportError:
             # 如果导入失败，跳过植物预览绘制
-            pass
+            return None
+        return pygame.Rect(BATTLEFIELD_LEFT + preview['target_col'] * (GRID_SIZE + GRID_GAP),
+                           BATTLEFIELD_TOP + preview['target_row'] * (GRID_SIZE + GRID_GAP),
+                           GRID_SIZE, GRID_SIZE)
 
     def _render_plant_selection(self):
         """渲染植物选择界面"""
@@ -312,18 +433,46 @@ class RendererManager:
                 self.game_manager.scaled_images
             )
 
-    def _render_game_objects(self):
-        """渲染游戏对象（植物、僵尸、子弹）"""
-        # 正常游戏时绘制游戏对象
+    def _render_game_objects(self, track_bounds=False):
+        """
+        渲染游戏对象（植物、僵尸、子弹、粒子）：先提交到渲染队列，再按图层批量绘制
+
+        track_bounds 为 True 时返回绘制过的矩形列表，有无法确定区域的内容时返回 None
+        """
+        render_queue = self.render_queue
         for p in self.game_manager.game["plants"]:
-            p.draw(self.game_manager.game_surface)
+            p.queue_sprites(render_queue)
         for z in self.game_manager.game["zombies"]:
-            z.draw(self.game_manager.game_surface)
+            z.queue_sprites(render_queue)
         for b in self.game_manager.game["bullets"]:
-            b.draw(self.game_manager.game_surface)
+            b.queue_sprites(render_queue)
+        particle_bounds = self._get_battlefield_particle_bounds() if track_bounds else None
+        render_queue.submit_draw(LAYER_PARTICLES, self._draw_battlefield_particles, particle_bounds)
         if "dandelion_seeds" in self.game_manager.game:
             for seed in self.game_manager.game["dandelion_seeds"]:
-                seed.draw(self.game_manager.game_surface)
+                render_queue.submit_draw(LAYER_SEEDS, seed.draw, seed.get_draw_bounds())
+
+        render_queue.track_bounds = track_bounds
+        unbounded = render_queue.unbounded
+        render_queue.flush(self.game_manager.game_surface)
+        if track_bounds:
+            return None if unbounded else render_queue.drawn_rects
+        return None
+
+    @staticmethod
+    def _draw_battlefield_particles(surface):
+        """绘制全局粒子系统中的战场粒子（樱桃、黄瓜、西瓜等）"""
+        particle_system.draw(surface, BATTLEFIELD_POOLS)
+
+    @staticmethod
+    def _get_battlefield_particle_bounds():
+        """战场粒子可能绘制到的区域（各粒子池区域的并集），无法确定时返回 None"""
+        rects = particle_system.get_bounds(BATTLEFIELD_POOLS)
+        if rects is None:
+            return None
+        if not rects:
+            return pygame.Rect(0, 0, 0, 0)
+        return rects[0].unionall(rects[1:])
 
     def _render_trophy(self):
         """渲染奖杯"""
@@ -335,9 +484,10 @@ class RendererManager:
     def _render_fade_effect(self):
         """渲染淡入淡出效果"""
         if self.game_manager.game["fade_state"] != "none":
-            fade_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT), pygame.SRCALPHA)
-            fade_surface.fill((0, 0, 0, self.game_manager.game["fade_alpha"]))
-            self.game_manager.game_surface.blit(fade_surface, (0, 0))
+            if self._fade_overlay is None:
+                self._fade_overlay = pygame.Surface((BASE_WIDTH, BASE_HEIGHT))
+            self._fade_overlay.set_alpha(self.game_manager.game["fade_alpha"])
+            self.game_manager.game_surface.blit(self._fade_overlay, (0, 0))
 
     def _render_common_ui(self):
         """渲染通用UI元素"""
@@ -396,7 +546,7 @@ class RendererManager:
         pygame.draw.rect(self.game_manager.game_surface, RED, confirm_popup, 3)
 
         # 文字
-        confirm_text = self.game_manager.font_medium.render("确定重置所有进度？", True, WHITE)
+        confirm_text = render_text(self.game_manager.font_medium, "确定重置所有进度？", True, WHITE)
         self.game_manager.game_surface.blit(confirm_text,
                                             confirm_text.get_rect(
                                                 center=(confirm_popup.centerx, confirm_popup.centery - 20)))
@@ -408,8 +558,8 @@ class RendererManager:
         pygame.draw.rect(self.game_manager.game_surface, (150, 0, 0), yes_btn)
         pygame.draw.rect(self.game_manager.game_surface, (0, 150, 0), no_btn)
 
-        yes_text = self.game_manager.font_small.render("确定", True, WHITE)
-        no_text = self.game_manager.font_small.render("取消", True, WHITE)
+        yes_text = render_text(self.game_manager.font_small, "确定", True, WHITE)
+        no_text = render_text(self.game_manager.font_small, "取消", True, WHITE)
         self.game_manager.game_surface.blit(yes_text, yes_text.get_rect(center=yes_btn.center))
         self.game_manager.game_surface.blit(no_text, no_text.get_rect(center=no_btn.center))
 
@@ -450,7 +600,7 @@ class RendererManager:
         if alpha > 0:
             # 创建消息表面
             message = "配置已重新加载"
-            text_surface = self.game_manager.font_medium.render(message, True, (255, 255, 255))
+            text_surface = render_text(self.game_manager.font_medium, message, True, (255, 255, 255))
 
             # 添加半透明背景
             bg_width = text_surface.get_width() + 20
@@ -465,7 +615,8 @@ class RendererManager:
             # 绘制到游戏表面
             self.game_manager.game_surface.blit(bg_surface, (x, y))
 
-            # 设置文字透明度
+            # 设置文字透明度（缓存的文字表面是共享的，先复制再修改）
+            text_surface = text_surface.copy()
             text_surface.set_alpha(alpha)
             text_x = x + 10
             text_y = y + 5
@@ -474,25 +625,21 @@ class RendererManager:
     def _blit_to_screen(self):
         """将游戏表面绘制到屏幕"""
         if self.game_manager.fullscreen:
-            # 先将整个屏幕填充为黑色（确保letterbox区域为黑色）
-            self.game_manager.screen.fill((0, 0, 0))  # 明确使用黑色元组
-
-            # 缩放游戏表面
-            scaled_surface = pygame.transform.scale(
-                self.game_manager.game_surface,
-                (int(BASE_WIDTH * self.game_manager.screen_scale),
-                 int(BASE_HEIGHT * self.game_manager.screen_scale))
-            )
-
-            # 将缩放后的游戏表面居中绘制到屏幕上
-            self.game_manager.screen.blit(
-                scaled_surface,
-                (self.game_manager.screen_offset_x, self.game_manager.screen_offset_y)
-            )
+            # 全屏：由输出器等比缩放并居中（黑边在切换显示模式时已填充）
+            self.game_manager.presenter.present(self.game_manager.game_surface)
+        elif self._dirty_frame is not None:
+            # 窗口模式脏矩形输出：只复制和更新本帧恢复和绘制过的区域
+            self.dirty_rect_tracker.present(self.game_manager.game_surface, self.game_manager.screen,
+                                            *self._dirty_frame)
+            return
         else:
             # 窗口模式直接绘制
             self.game_manager.screen.blit(self.game_manager.game_surface, (0, 0))
 
+        # 整帧重绘后不知道下一帧要恢复哪些区域
+        if self.dirty_rect_tracker:
+            self.dirty_rect_tracker.invalidate()
+
         pygame.display.flip()
 
     def get_plant_selection_rects(self):
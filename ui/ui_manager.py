@@ -11,6 +11,8 @@ import os
 
 from core.constants import *
 from animation.effects import AnimationEffects
+from rsc_mng.text_cache import render_text
+from rsc_mng.transform_cache import get_scaled, get_variant, get_filled, blit_with_alpha
 
 def draw_grid(surface, grid_bg_img=None):
     """绘制战场网格（使用背景图片或棕色边框）"""
@@ -25,28 +27,86 @@ def draw_grid(surface, grid_bg_img=None):
                 pygame.draw.rect(surface, BROWN, (x, y, GRID_SIZE, GRID_SIZE), 1)
 
 
-def draw_progress_bar(surface, level_manager, game_state, wave_mode, font_small):
-    """
-    重新设计的进度条绘制逻辑
-    - 普通模式：每击杀一个僵尸进度增加，达到预定数目时进度条满
-    - 波次模式：只在进度条末端显示一个旗帜，第一波开始时旗帜升起
-    - 位置：设置按钮左边
-    """
-    import math
-    import pygame
+def draw_ui_chrome(surface):
+    """绘制顶部和底部的深灰色UI背景条"""
+    pygame.draw.rect(surface, GRAY_DARK, (0, 0, BASE_WIDTH, BATTLEFIELD_TOP))
+    bottom_height = BASE_HEIGHT - (BATTLEFIELD_TOP + total_battlefield_height)
+    pygame.draw.rect(surface, GRAY_DARK,
+                     (0, BATTLEFIELD_TOP + total_battlefield_height, BASE_WIDTH, bottom_height))
 
-    # 进度条位置和尺寸 - 移动到设置按钮左边
-    bar_width = 200
-    bar_height = 15
-    bar_x = SETTINGS_BUTTON_X - bar_width - 20  # 设置按钮左边，留20像素间距
-    bar_y = SETTINGS_BUTTON_Y + (SETTINGS_BUTTON_HEIGHT - bar_height) // 2  # 与设置按钮垂直居中对齐
 
-    # 绘制进度条背景
-    bar_bg_rect = pygame.Rect(bar_x, bar_y, bar_width, bar_height)
-    pygame.draw.rect(surface, (50, 50, 50), bar_bg_rect)
-    pygame.draw.rect(surface, WHITE, bar_bg_rect, 2)
+def build_battlefield_layer(target_surface, grid_bg_img=None, background_color=(0, 120, 0)):
+    """
+    预先合成关卡内不会变化的背景层：背景色、战场网格、顶部和底部UI背景条
+
+    Args:
+        target_surface: 背景层最终绘制到的表面，新表面使用相同的尺寸和像素格式
+        grid_bg_img: 网格背景图片
 
-    # 计算进度
+    Returns:
+        pygame.Surface: 不透明的背景层，每帧整块绘制一次即可
+    """
+    layer = pygame.Surface(target_surface.get_size(), 0, target_surface)
+    layer.fill(background_color)
+    draw_grid(layer, grid_bg_img)
+    draw_ui_chrome(layer)
+    return layer
+
+
+# 卡片图标在 scaled_images 中的键名
+CARD_ICON_KEYS = {
+    "shooter": 'pea_shooter_60',
+    "sunflower": 'sunflower_60',
+    "melon_pult": 'watermelon_60',
+    "cattail": 'cattail_60',
+    "wall_nut": 'wall_nut_60',
+    "cherry_bomb": 'cherry_bomb_60',
+    "cucumber": 'cucumber_60',
+    "dandelion": 'dandelion_60',
+    "lightning_flower": 'lightning_flower_60',
+    "ice_cactus": 'ice_cactus_60',
+}
+
+# 进度条位置和尺寸 - 设置按钮左边，留20像素间距，与设置按钮垂直居中对齐
+PROGRESS_BAR_WIDTH = 200
+PROGRESS_BAR_HEIGHT = 15
+PROGRESS_BAR_X = SETTINGS_BUTTON_X - PROGRESS_BAR_WIDTH - 20
+PROGRESS_BAR_Y = SETTINGS_BUTTON_Y + (SETTINGS_BUTTON_HEIGHT - PROGRESS_BAR_HEIGHT) // 2
+PROGRESS_FLAG_SIZE = 8
+
+# 冷却覆盖层颜色（半透明黑色）
+COOLDOWN_OVERLAY_COLOR = (0, 0, 0, 150)
+
+# 卡槽价格专用字体，首次使用时创建
+_price_font = None
+# 主菜单小按钮的默认小字体（调用方未传入 font_tiny 时使用），首次使用时创建
+_tiny_font = None
+# 旗帜发光圈，首次使用时创建
+_flag_glow = None
+
+
+def get_price_font():
+    """获取卡槽价格专用字体（24号默认字体），只创建一次"""
+    global _price_font
+    if _price_font is None:
+        _price_font = pygame.font.Font(None, 24)
+    return _price_font
+
+
+def get_tiny_font():
+    """获取默认小字体（20号默认字体），只创建一次"""
+    global _tiny_font
+    if _tiny_font is None:
+        _tiny_font = pygame.font.Font(None, 20)
+    return _tiny_font
+
+
+def get_progress_width(level_manager, game_state, wave_mode):
+    """
+    计算进度条绿色部分的宽度
+    - 普通模式：每击杀一个僵尸进度增加，达到预定数目时进度条满
+    - 波次模式：进度条保持满状态
+    """
     if not wave_mode:
         # 普通模式：根据击杀数计算进度
         required_kills = level_manager.max_waves * 5  # 进入波次模式需要的击杀数
@@ -57,14 +117,40 @@ def draw_progress_bar(surface, level_manager, game_state, wave_mode, font_small)
         else:
             progress = 0.0
     else:
-        # 波次模式：进度条保持满状态
         progress = 1.0
 
     # 确保进度在合理范围内
     progress = max(0.0, min(progress, 1.0))
+    return int(PROGRESS_BAR_WIDTH * progress)
+
+
+def is_progress_flag_raised(level_manager, wave_mode):
+    """波次模式且已开始第一波时旗帜升起（上下浮动并发光）"""
+    return wave_mode and level_manager.current_wave >= 1
+
+
+def draw_progress_bar(surface, level_manager, game_state, wave_mode, font_small):
+    """
+    重新设计的进度条绘制逻辑
+    - 普通模式：每击杀一个僵尸进度增加，达到预定数目时进度条满
+    - 波次模式：只在进度条末端显示一个旗帜，第一波开始时旗帜升起
+    - 位置：设置按钮左边
+    """
+    draw_progress_bar_track(surface, get_progress_width(level_manager, game_state, wave_mode), font_small)
+    draw_progress_flag(surface, is_progress_flag_raised(level_manager, wave_mode))
+
+
+def draw_progress_bar_track(surface, progress_width, font_small):
+    """绘制进度条本体、进度头箭头和末端的"大波"文字（不含旗帜）"""
+    bar_x, bar_y = PROGRESS_BAR_X, PROGRESS_BAR_Y
+    bar_width, bar_height = PROGRESS_BAR_WIDTH, PROGRESS_BAR_HEIGHT
+
+    # 绘制进度条背景
+    bar_bg_rect = pygame.Rect(bar_x, bar_y, bar_width, bar_height)
+    pygame.draw.rect(surface, (50, 50, 50), bar_bg_rect)
+    pygame.draw.rect(surface, WHITE, bar_bg_rect, 2)
 
     # 绘制绿色进度条
-    progress_width = int(bar_width * progress)
     if progress_width > 0:
         progress_rect = pygame.Rect(bar_x, bar_y, progress_width, bar_height)
         pygame.draw.rect(surface, (0, 200, 0), progress_rect)
@@ -84,12 +170,23 @@ def draw_progress_bar(surface, level_manager, game_state, wave_mode, font_small)
         pygame.draw.polygon(surface, (0, 255, 0), arrow_points)
         pygame.draw.polygon(surface, WHITE, arrow_points, 1)
 
-    # 绘制旗帜（只在进度条末端显示一个）
-    flag_x = bar_x + bar_width  # 旗帜位置固定在进度条末端
+    # 在旗帜下方显示"终点"文字
+    flag_x = bar_x + bar_width
+    end_text = render_text(font_small, "大波", True, WHITE)
+    text_x = flag_x - end_text.get_width() // 2
+    text_y = bar_y + bar_height + 5  # 进度条下方5像素
+    surface.blit(end_text, (text_x - 5, text_y))
+
+
+def draw_progress_flag(surface, raised):
+    """绘制进度条末端的旗帜，raised 为 True（波次模式且已开始第一波）时升起并随时间上下浮动"""
+    global _flag_glow
+    bar_y = PROGRESS_BAR_Y
+    flag_x = PROGRESS_BAR_X + PROGRESS_BAR_WIDTH  # 旗帜位置固定在进度条末端
     base_y = bar_y - 25  # 基础Y位置（进度条上方25像素）
 
     # 确定旗帜状态
-    if wave_mode and level_manager.current_wave >= 1:
+    if raised:
         # 波次模式且已开始第一波：旗帜升起（突出显示）
         flag_y = base_y - 5  # 上移5像素
 
@@ -113,7 +210,7 @@ def draw_progress_bar(surface, level_manager, game_state, wave_mode, font_small)
     pygame.draw.line(surface, pole_color, (flag_x, flag_y), (flag_x, pole_bottom_y), 2)
 
     # 绘制小红旗（三角形）
-    flag_size = 8
+    flag_size = PROGRESS_FLAG_SIZE
     flag_points = [
         (flag_x, flag_y),  # 旗杆顶端
         (flag_x + flag_size, flag_y + flag_size // 2),  # 旗帜右端
@@ -124,63 +221,53 @@ def draw_progress_bar(surface, level_manager, game_state, wave_mode, font_small)
 
     # 为激活状态的旗帜添加发光效果
     if show_glow:
-        # 绘制半透明的发光圈
-        glow_surface = pygame.Surface((flag_size * 3, flag_size * 3), pygame.SRCALPHA)
-        glow_center = (flag_size * 1.5, flag_size * 1.5)
-        glow_color = (255, 255, 100, 50)  # 半透明黄色
-        pygame.draw.circle(glow_surface, glow_color, glow_center, flag_size + 3)
-        surface.blit(glow_surface, (flag_x - flag_size * 1.5, flag_y - flag_size // 2))
-
-    # 在旗帜下方显示"终点"文字
-    end_text = font_small.render("大波", True, WHITE)
-    text_x = flag_x - end_text.get_width() // 2
-    text_y = bar_y + bar_height + 5  # 进度条下方5像素
-    surface.blit(end_text, (text_x - 5, text_y))
+        # 半透明的黄色发光圈只绘制一次
+        if _flag_glow is None:
+            _flag_glow = pygame.Surface((flag_size * 3, flag_size * 3), pygame.SRCALPHA)
+            pygame.draw.circle(_flag_glow, (255, 255, 100, 50), (flag_size * 1.5, flag_size * 1.5),
+                               flag_size + 3)
+        surface.blit(_flag_glow, (flag_x - flag_size * 1.5, flag_y - flag_size // 2))
 
 
-def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=False,
-            wave_timer=0, wave_interval=360, show_settings=False, game_state=None,
-            level_settings=None, scaled_images=None, font_small=None, font_medium=None, images=None, game_manager=None):
-    """绘制UI：阳光+铲子+卡槽+波次信息+卡片冷却+阳光不足灰化"""
-    # 1. 绘制顶部UI背景（深灰）
-    pygame.draw.rect(surface, GRAY_DARK, (0, 0, BASE_WIDTH, BATTLEFIELD_TOP))
-    # 2. 绘制底部UI背景（深灰）
-    bottom_height = BASE_HEIGHT - (BATTLEFIELD_TOP + total_battlefield_height)
-    pygame.draw.rect(surface, GRAY_DARK,
-                     (0, BATTLEFIELD_TOP + total_battlefield_height, BASE_WIDTH, bottom_height))
-
-    # 3. 显示阳光数量（左上）
-    sun_text = font_medium.render(f"阳光: {int(sun)}", True, YELLOW)
+def draw_sun_counter(surface, sun, coins, font_medium):
+    """显示阳光数量（左上），coins 不为 None 时在下方显示金币"""
+    sun_text = render_text(font_medium, f"阳光: {int(sun)}", True, YELLOW)
     surface.blit(sun_text, (20, 20))
-    if hasattr(game_manager, 'coins'):
-        coins_text = font_medium.render(f"金币: {game_manager.coins}", True, (255, 215, 0))  # 金色
+    if coins is not None:
+        coins_text = render_text(font_medium, f"金币: {coins}", True, (255, 215, 0))  # 金色
         surface.blit(coins_text, (20, 55))
 
-    # 4. 显示关卡信息（移动到左下角原来进度条的位置）
-    level_name = level_manager.get_level_name()
+
+def get_level_info(level_manager):
+    """关卡信息面板的显示内容：(关卡名称, 向日葵限制文本, 能否种植向日葵)"""
+    return (level_manager.get_level_name(), level_manager.get_sunflower_status_text(),
+            level_manager.can_plant_sunflower())
+
+
+def draw_level_info(surface, level_info, font_small, font_medium):
+    """在左下角显示关卡名称和向日葵种植限制"""
+    level_name, sunflower_status, can_plant_sunflower = level_info
 
     # 在左下角显示关卡标题
     title_x = 20
     title_y = BASE_HEIGHT - 65  # 比原来进度条位置稍微上一点
 
     # 使用较大的字体绘制关卡名称
-    name_text = font_medium.render(level_name, True, WHITE)
+    name_text = render_text(font_medium, level_name, True, WHITE)
     surface.blit(name_text, (title_x, title_y))
 
     # 在关卡名称下方显示向日葵种植限制
-    sunflower_status = level_manager.get_sunflower_status_text()
     if sunflower_status:
-        status_text = font_small.render(sunflower_status, True, ORANGE)
+        status_text = render_text(font_small, sunflower_status, True, ORANGE)
         surface.blit(status_text, (title_x, title_y + 35))  # 关卡名称下方25像素
 
-        if not level_manager.can_plant_sunflower():
-            warning_text = font_small.render("", True, RED)
+        if not can_plant_sunflower:
+            warning_text = render_text(font_small, "", True, RED)
             surface.blit(warning_text, (title_x, title_y + 45))
 
-    # 5. 绘制进度条（移动到设置按钮左边）
-    draw_progress_bar(surface, level_manager, game_state, wave_mode, font_small)
 
-    # 6. 绘制铲子（卡片左侧）
+def draw_shovel(surface, selected, images):
+    """绘制铲子（卡片右侧），选中时画白色边框"""
     shovel_rect = pygame.Rect(SHOVEL_X, SHOVEL_Y, SHOVEL_WIDTH, SHOVEL_HEIGHT)
     if images and images.get('shovel_img'):
         surface.blit(images['shovel_img'], (SHOVEL_X, SHOVEL_Y))
@@ -191,81 +278,86 @@ def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=Fals
     if selected == "shovel":
         pygame.draw.rect(surface, WHITE, shovel_rect, 3)
 
-    # 6.5. 绘制锤子（铲子左侧）
-    if hasattr(game_manager, 'shop_manager') and game_manager.shop_manager.has_hammer():
-        # 检查锤子是否在冷却中
-        hammer_cooldown = game_state.get("hammer_cooldown", 0) if game_state else 0
-        is_hammer_ready = hammer_cooldown <= 0
-
-        # 修改：使用和铲子一样的尺寸
-        hammer_rect = pygame.Rect(HAMMER_X, HAMMER_Y, SHOVEL_WIDTH, SHOVEL_HEIGHT)
-
-        # 检查锤子是否被选中（跟随鼠标）
-        hammer_selected = (selected == "hammer")
-
-        # 绘制锤子背景和图标
-        if images and images.get('hammer_img') and is_hammer_ready:
-            # 锤子可用时显示正常图像，完全填充按钮
-            hammer_img_scaled = pygame.transform.scale(images['hammer_img'], (SHOVEL_WIDTH, SHOVEL_HEIGHT))
-
-            if hammer_selected:
-                # 锤子被选中时，原位置显示半透明图像
-                hammer_img_alpha = hammer_img_scaled.copy()
-                hammer_img_alpha.set_alpha(80)  # 设置为半透明
-                surface.blit(hammer_img_alpha, (HAMMER_X, HAMMER_Y))
-
-                # 绘制空槽边框，表示锤子已被拿起
-                pygame.draw.rect(surface, (100, 100, 100), hammer_rect, 2)
-            else:
-                # 锤子未被选中时，正常显示
-                surface.blit(hammer_img_scaled, (HAMMER_X, HAMMER_Y))
-
-        elif images and images.get('hammer_img'):
-            # 锤子冷却中显示灰色图像，完全填充按钮
-            hammer_img_scaled = pygame.transform.scale(images['hammer_img'], (SHOVEL_WIDTH, SHOVEL_HEIGHT))
-            hammer_img_gray = hammer_img_scaled.copy()
-            hammer_img_gray.fill((128, 128, 128), special_flags=pygame.BLEND_MULT)
-            surface.blit(hammer_img_gray, (HAMMER_X, HAMMER_Y))
+
+def get_hammer_state(game_state, selected, game_manager):
+    """
+    锤子按钮的显示状态：(是否可用, 是否被拿起, 冷却剩余秒数)
+
+    没有购买锤子时返回 None
+    """
+    if not (hasattr(game_manager, 'shop_manager') and game_manager.shop_manager.has_hammer()):
+        return None
+    hammer_cooldown = game_state.get("hammer_cooldown", 0) if game_state else 0
+    # 转换为秒，向上取整
+    cooldown_seconds = int(hammer_cooldown / 60) + 1 if hammer_cooldown > 0 else 0
+    return hammer_cooldown <= 0, selected == "hammer", cooldown_seconds
+
+
+def draw_hammer(surface, hammer_state, images, font_medium):
+    """绘制锤子（铲子左侧）和冷却倒计时"""
+    if hammer_state is None:
+        return
+    is_hammer_ready, hammer_selected, cooldown_seconds = hammer_state
+
+    # 修改：使用和铲子一样的尺寸
+    hammer_rect = pygame.Rect(HAMMER_X, HAMMER_Y, SHOVEL_WIDTH, SHOVEL_HEIGHT)
+
+    # 绘制锤子背景和图标
+    if images and images.get('hammer_img') and is_hammer_ready:
+        # 锤子可用时显示正常图像，完全填充按钮
+        hammer_img_scaled = get_scaled(images['hammer_img'], (SHOVEL_WIDTH, SHOVEL_HEIGHT))
+
+        if hammer_selected:
+            # 锤子被选中时，原位置显示半透明图像
+            blit_with_alpha(surface, hammer_img_scaled, (HAMMER_X, HAMMER_Y), 80)
+
+            # 绘制空槽边框，表示锤子已被拿起
+            pygame.draw.rect(surface, (100, 100, 100), hammer_rect, 2)
         else:
-            # 没有图像时绘制简单矩形，使用和铲子一样的尺寸
-            if hammer_selected:
-                # 锤子被选中时，原位置显示半透明矩形
-                color = (*HAMMER_COLOR[:3], 80) if is_hammer_ready else (100, 100, 100, 80)
-                # 创建半透明表面
-                alpha_surface = pygame.Surface((SHOVEL_WIDTH, SHOVEL_HEIGHT), pygame.SRCALPHA)
-                alpha_surface.fill(color)
-                surface.blit(alpha_surface, (HAMMER_X, HAMMER_Y))
-                # 绘制空槽边框
-                pygame.draw.rect(surface, (100, 100, 100), hammer_rect, 2)
-            else:
-                # 锤子未被选中时，正常显示
-                color = HAMMER_COLOR if is_hammer_ready else (100, 100, 100)
-                pygame.draw.rect(surface, color, hammer_rect)
-
-        # 选中锤子时不在原位置画白色边框（因为锤子已经跟随鼠标）
-        if selected == "hammer" and is_hammer_ready:
-            pass  # 不在原位置绘制选中边框
-        elif selected != "hammer":
-            # 未选中时可以绘制悬浮效果等
-            pass
-
-        # 显示冷却倒计时
-        if hammer_cooldown > 0:
-            # 绘制冷却覆盖层
-            cooldown_surface = pygame.Surface((SHOVEL_WIDTH, SHOVEL_HEIGHT), pygame.SRCALPHA)
-            cooldown_surface.fill((0, 0, 0, 150))  # 半透明黑色
-            surface.blit(cooldown_surface, (HAMMER_X, HAMMER_Y))
+            # 锤子未被选中时，正常显示
+            surface.blit(hammer_img_scaled, (HAMMER_X, HAMMER_Y))
+
+    elif images and images.get('hammer_img'):
+        # 锤子冷却中显示灰色图像，完全填充按钮
+        hammer_img_scaled = get_scaled(images['hammer_img'], (SHOVEL_WIDTH, SHOVEL_HEIGHT))
+        hammer_img_gray = get_variant(hammer_img_scaled, (128, 128, 128))
+        surface.blit(hammer_img_gray, (HAMMER_X, HAMMER_Y))
+    else:
+        # 没有图像时绘制简单矩形，使用和铲子一样的尺寸
+        if hammer_selected:
+            # 锤子被选中时，原位置显示半透明矩形
+            color = (*HAMMER_COLOR[:3], 80) if is_hammer_ready else (100, 100, 100, 80)
+            surface.blit(get_filled((SHOVEL_WIDTH, SHOVEL_HEIGHT), color), (HAMMER_X, HAMMER_Y))
+            # 绘制空槽边框
+            pygame.draw.rect(surface, (100, 100, 100), hammer_rect, 2)
+        else:
+            # 锤子未被选中时，正常显示
+            color = HAMMER_COLOR if is_hammer_ready else (100, 100, 100)
+            pygame.draw.rect(surface, color, hammer_rect)
 
-            # 绘制冷却倒计时
-            cooldown_seconds = int(hammer_cooldown / 60) + 1  # 转换为秒，向上取整
-            cooldown_text = font_medium.render(str(cooldown_seconds), True, WHITE)
-            text_rect = cooldown_text.get_rect(center=(HAMMER_X + SHOVEL_WIDTH // 2, HAMMER_Y + SHOVEL_HEIGHT // 2))
-            surface.blit(cooldown_text, text_rect)
+    # 选中锤子时不在原位置画白色边框（因为锤子已经跟随鼠标）
 
-    # 创建卡槽价格专用字体
-    price_font = pygame.font.Font(None, 24)
+    # 显示冷却倒计时
+    if cooldown_seconds > 0:
+        # 绘制冷却覆盖层
+        surface.blit(get_filled((SHOVEL_WIDTH, SHOVEL_HEIGHT), COOLDOWN_OVERLAY_COLOR), (HAMMER_X, HAMMER_Y))
 
-    # 7. 绘制植物卡槽（包含冷却效果和阳光不足灰化）
+        # 绘制冷却倒计时
+        cooldown_text = render_text(font_medium, str(cooldown_seconds), True, WHITE)
+        text_rect = cooldown_text.get_rect(center=(HAMMER_X + SHOVEL_WIDTH // 2, HAMMER_Y + SHOVEL_HEIGHT // 2))
+        surface.blit(cooldown_text, text_rect)
+
+
+def get_card_slot_states(cards, sun, selected, level_manager, game_state=None, level_settings=None,
+                         game_manager=None):
+    """
+    计算卡槽中每个槽位的显示状态
+
+    Returns:
+        tuple: 每个槽位一项，空槽位为 None，有卡片的槽位为
+               (类型, 成本, 颜色, 向日葵限制下是否可用, 冷却剩余秒数, 阳光是否足够, 是否选中)；
+               结果只包含影响绘制的输入，可以直接用来判断卡槽是否需要重绘
+    """
     card_cooldowns = game_state.get("card_cooldowns", {}) if game_state else {}
 
     # 检查是否购买了第七卡槽
@@ -275,124 +367,103 @@ def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=Fals
 
     max_cards = max(base_max_cards, len(cards))  # 至少显示基础数量的卡槽，如果卡片更多则显示更多
 
-    # 导入卡牌管理器
-    import core.cards_manager
+    # 检查是否需要冷却（第八关强制启用）
+    needs_cooldown = (level_manager.has_card_cooldown() or
+                      (level_settings and level_settings.get("all_card_cooldown", False)) or
+                      level_manager.current_level == 8)
+
+    # 向日葵限制
+    sunflower_available = (level_manager.can_plant_sunflower() and
+                           level_manager.get_sunflower_limit() != 0)
+
+    slots = []
     for i in range(max_cards):
+        if i >= len(cards):
+            slots.append(None)
+            continue
+        card = cards[i]
+        card_type = card["type"]
+        card_available = sunflower_available if card_type == "sunflower" else True
+
+        # 冷却剩余秒数（向上取整），不在冷却中为 0
+        cooldown_seconds = 0
+        if needs_cooldown and card_type in card_cooldowns:
+            cooldown_remaining = card_cooldowns[card_type]
+            if cooldown_remaining > 0:
+                cooldown_seconds = int(cooldown_remaining / 60) + 1
+
+        slots.append((card_type, card["cost"], card["color"], card_available, cooldown_seconds,
+                      sun >= card["cost"], selected == card_type))
+    return tuple(slots)
+
+
+def draw_card_slots(surface, slots, images, scaled_images, font_medium):
+    """绘制植物卡槽（包含冷却效果和阳光不足灰化），slots 来自 get_card_slot_states"""
+    price_font = get_price_font()
+    card_bg_img = images.get('card_bg_img') if images else None
+
+    for i, slot in enumerate(slots):
         card_x = CARD_START_X + i * CARD_WIDTH
         card_rect = pygame.Rect(card_x, CARD_Y, CARD_WIDTH, CARD_HEIGHT)
 
-        if images and images.get('card_bg_img'):
-            surface.blit(images['card_bg_img'], (card_x, CARD_Y))
+        if card_bg_img:
+            surface.blit(card_bg_img, (card_x, CARD_Y))
         else:
             pygame.draw.rect(surface, (100, 100, 100), card_rect)
 
-        if i < len(cards):
-            # 有卡片的槽位 - 使用统一的卡牌冷却管理
-            card = cards[i]
-
-            # 检查向日葵是否可用
-            card_available = True
-            if card["type"] == "sunflower" and not level_manager.can_plant_sunflower():
-                card_available = False
-            if card["type"] == "sunflower" and level_manager.get_sunflower_limit() == 0:
-                card_available = False
-
-            # 检查卡片是否在冷却中 - 使用统一的冷却管理
-            is_cooling = False
-            cooldown_remaining = 0
-
-            # 检查是否需要冷却（第八关强制启用）
-            needs_cooldown = (level_manager.has_card_cooldown() or
-                              (level_settings and level_settings.get("all_card_cooldown", False)) or
-                              level_manager.current_level == 8)
-
-            if needs_cooldown:
-                if card["type"] in card_cooldowns:
-                    cooldown_remaining = card_cooldowns[card["type"]]
-                    is_cooling = cooldown_remaining > 0
-
-            # 检查阳光是否足够
-            sun_sufficient = sun >= card["cost"]
-
-            # 综合判断卡片是否完全可用（考虑所有条件）
-            card_fully_available = card_available and not is_cooling and sun_sufficient
-
-            # 绘制卡片背景
-            if images and images.get('card_bg_img'):
-                if card_fully_available:
-                    surface.blit(images['card_bg_img'], (card_x, CARD_Y))
-                else:
-                    gray_surface = images['card_bg_img'].copy()
-                    gray_surface.fill((128, 128, 128), special_flags=pygame.BLEND_MULT)
-                    surface.blit(gray_surface, (card_x, CARD_Y))
+        if slot is None:
+            continue
+
+        card_type, cost, color, card_available, cooldown_seconds, sun_sufficient, is_selected = slot
+        is_cooling = cooldown_seconds > 0
+
+        # 综合判断卡片是否完全可用（考虑所有条件）
+        card_fully_available = card_available and not is_cooling and sun_sufficient
+
+        # 绘制卡片背景
+        if card_bg_img:
+            if card_fully_available:
+                surface.blit(card_bg_img, (card_x, CARD_Y))
             else:
-                color = card["color"] if card_fully_available else (100, 100, 100)
-                pygame.draw.rect(surface, color, card_rect)
-
-            # 使用预缓存的植物图标
-            if scaled_images:
-                plant_img_key = None
-                if card["type"] == "shooter":
-                    plant_img_key = 'pea_shooter_60'
-                elif card["type"] == "sunflower":
-                    plant_img_key = 'sunflower_60'
-                elif card["type"] == "melon_pult":
-                    plant_img_key = 'watermelon_60'
-                elif card["type"] == "cattail":
-                    plant_img_key = 'cattail_60'
-                elif card["type"] == "wall_nut":
-                    plant_img_key = 'wall_nut_60'
-                elif card["type"] == "cherry_bomb":
-                    plant_img_key = 'cherry_bomb_60'
-                elif card["type"] == "cucumber":
-                    plant_img_key = 'cucumber_60'
-                elif card["type"] == "dandelion":
-                    plant_img_key = 'dandelion_60'
-                elif card["type"] == "lightning_flower":
-                    plant_img_key = 'lightning_flower_60'
-                elif card["type"] == "ice_cactus":
-                    plant_img_key = 'ice_cactus_60'
-
-                if plant_img_key:
-                    if card_fully_available:
-                        if plant_img_key in scaled_images:
-                            surface.blit(scaled_images[plant_img_key], (card_x + 10, CARD_Y + 10))
-                    else:
-                        # 使用预缓存的灰化图片
-                        gray_key = plant_img_key + '_gray'
-                        if gray_key in scaled_images:
-                            surface.blit(scaled_images[gray_key], (card_x + 10, CARD_Y + 10))
-
-            # 选中卡片时画白色边框（但冷却中或阳光不足的不能选中）
-            if selected == card["type"] and card_fully_available:
-                pygame.draw.rect(surface, WHITE, card_rect, 3)
-
-            # 绘制卡片成本（右下）- 使用24号字体
-            cost_color = WHITE if sun_sufficient else RED  # 阳光不足时成本显示为红色
-            cost_text = price_font.render(f"{card['cost']}", True, cost_color)
-            surface.blit(cost_text, (card_rect.right - 55, card_rect.bottom - 25))
-
-            # 如果卡片不可用（向日葵限制），显示禁用标识
-            if not card_available:
-                pygame.draw.line(surface, RED, card_rect.topleft, card_rect.bottomright, 3)
-                pygame.draw.line(surface, RED, card_rect.topright, card_rect.bottomleft, 3)
-
-            # 绘制冷却效果
-            if is_cooling:
-                # 绘制冷却覆盖层
-                cooldown_surface = pygame.Surface((CARD_WIDTH, CARD_HEIGHT), pygame.SRCALPHA)
-                cooldown_surface.fill((0, 0, 0, 150))  # 半透明黑色
-                surface.blit(cooldown_surface, (card_x, CARD_Y))
-
-                # 绘制冷却倒计时
-                cooldown_seconds = int(cooldown_remaining / 60) + 1  # 转换为秒，向上取整
-                cooldown_text = font_medium.render(str(cooldown_seconds), True, WHITE)
-                text_rect = cooldown_text.get_rect(center=(card_x + CARD_WIDTH // 2, CARD_Y + CARD_HEIGHT // 2))
-                surface.blit(cooldown_text, text_rect)
+                surface.blit(get_variant(card_bg_img, (128, 128, 128)), (card_x, CARD_Y))
         else:
-            pass
+            pygame.draw.rect(surface, color if card_fully_available else (100, 100, 100), card_rect)
+
+        # 使用预缓存的植物图标，不可用时使用预缓存的灰化图片
+        plant_img_key = CARD_ICON_KEYS.get(card_type)
+        if scaled_images and plant_img_key:
+            if not card_fully_available:
+                plant_img_key += '_gray'
+            if plant_img_key in scaled_images:
+                surface.blit(scaled_images[plant_img_key], (card_x + 10, CARD_Y + 10))
+
+        # 选中卡片时画白色边框（但冷却中或阳光不足的不能选中）
+        if is_selected and card_fully_available:
+            pygame.draw.rect(surface, WHITE, card_rect, 3)
+
+        # 绘制卡片成本（右下）- 使用24号字体
+        cost_color = WHITE if sun_sufficient else RED  # 阳光不足时成本显示为红色
+        cost_text = render_text(price_font, f"{cost}", True, cost_color)
+        surface.blit(cost_text, (card_rect.right - 55, card_rect.bottom - 25))
+
+        # 如果卡片不可用（向日葵限制），显示禁用标识
+        if not card_available:
+            pygame.draw.line(surface, RED, card_rect.topleft, card_rect.bottomright, 3)
+            pygame.draw.line(surface, RED, card_rect.topright, card_rect.bottomleft, 3)
+
+        # 绘制冷却效果
+        if is_cooling:
+            # 绘制冷却覆盖层
+            surface.blit(get_filled((CARD_WIDTH, CARD_HEIGHT), COOLDOWN_OVERLAY_COLOR), (card_x, CARD_Y))
 
-    # 8. 绘制设置按钮（右下角）
+            # 绘制冷却倒计时
+            cooldown_text = render_text(font_medium, str(cooldown_seconds), True, WHITE)
+            text_rect = cooldown_text.get_rect(center=(card_x + CARD_WIDTH // 2, CARD_Y + CARD_HEIGHT // 2))
+            surface.blit(cooldown_text, text_rect)
+
+
+def draw_settings_button(surface, scaled_images):
+    """绘制设置按钮（右下角），返回按钮矩形"""
     settings_rect = pygame.Rect(SETTINGS_BUTTON_X, SETTINGS_BUTTON_Y,
                                 SETTINGS_BUTTON_WIDTH, SETTINGS_BUTTON_HEIGHT)
     if scaled_images and 'settings_50' in scaled_images:
@@ -407,10 +478,47 @@ def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=Fals
             x = settings_rect.centerx + math.cos(rad) * 20
             y = settings_rect.centery + math.sin(rad) * 20
             pygame.draw.line(surface, WHITE, settings_rect.center, (x, y), 2)
-
     return settings_rect
 
 
+def draw_ui(surface, sun, cards, shovel, selected, level_manager, wave_mode=False,
+            wave_timer=0, wave_interval=360, show_settings=False, game_state=None,
+            level_settings=None, scaled_images=None, font_small=None, font_medium=None, images=None, game_manager=None,
+            draw_chrome=True):
+    """
+    绘制UI：阳光+铲子+卡槽+波次信息+卡片冷却+阳光不足灰化
+
+    每次调用都完整重绘；游戏界面每帧使用 hud_widgets.Hud，只在输入变化时重绘对应控件。
+    draw_chrome 为 False 时不绘制顶部/底部背景条（已包含在 build_battlefield_layer 的背景层中）
+    """
+    # 1-2. 绘制顶部和底部UI背景（深灰）
+    if draw_chrome:
+        draw_ui_chrome(surface)
+
+    # 3. 显示阳光数量（左上）
+    coins = game_manager.coins if hasattr(game_manager, 'coins') else None
+    draw_sun_counter(surface, sun, coins, font_medium)
+
+    # 4. 显示关卡信息（移动到左下角原来进度条的位置）
+    draw_level_info(surface, get_level_info(level_manager), font_small, font_medium)
+
+    # 5. 绘制进度条（移动到设置按钮左边）
+    draw_progress_bar(surface, level_manager, game_state, wave_mode, font_small)
+
+    # 6. 绘制铲子（卡片右侧）
+    draw_shovel(surface, selected, images)
+
+    # 6.5. 绘制锤子（铲子左侧）
+    draw_hammer(surface, get_hammer_state(game_state, selected, game_manager), images, font_medium)
+
+    # 7. 绘制植物卡槽（包含冷却效果和阳光不足灰化）
+    slots = get_card_slot_states(cards, sun, selected, level_manager, game_state, level_settings, game_manager)
+    draw_card_slots(surface, slots, images, scaled_images, font_medium)
+
+    # 8. 绘制设置按钮（右下角）
+    return draw_settings_button(surface, scaled_images)
+
+
 def show_game_over(surface, game_over_sound_played, font_large, font_medium):
     """显示游戏结束弹窗"""
     # 半透明黑底
@@ -424,8 +532,8 @@ def show_game_over(surface, game_over_sound_played, font_large, font_medium):
     pygame.draw.rect(surface, RED, popup, 4)
 
     # 弹窗文字
-    title = font_large.render("游戏结束!", True, RED)
-    msg = font_medium.render("僵尸吃掉了你的脑子!", True, WHITE)
+    title = render_text(font_large, "游戏结束!", True, RED)
+    msg = render_text(font_medium, "僵尸吃掉了你的脑子!", True, WHITE)
     surface.blit(title, title.get_rect(centerx=popup.centerx, top=popup.top + 30))
     surface.blit(msg, msg.get_rect(centerx=popup.centerx, top=popup.top + 90))
 
@@ -435,8 +543,8 @@ def show_game_over(surface, game_over_sound_played, font_large, font_medium):
     pygame.draw.rect(surface, (0, 150, 0), retry_btn)
     pygame.draw.rect(surface, (150, 0, 0), quit_btn)
     # 按钮文字
-    retry_text = font_medium.render("再次尝试", True, WHITE)
-    quit_text = font_medium.render("返回主页", True, WHITE)
+    retry_text = render_text(font_medium, "再次尝试", True, WHITE)
+    quit_text = render_text(font_medium, "返回主页", True, WHITE)
     surface.blit(retry_text, retry_text.get_rect(center=retry_btn.center))
     surface.blit(quit_text, quit_text.get_rect(center=quit_btn.center))
 
@@ -457,7 +565,7 @@ def show_settings_menu_with_hotreload(surface, volume, in_game=True, hot_reload_
     pygame.draw.rect(surface, (100, 150, 255), popup, 4)  # 更亮的蓝色边框
 
     # 弹窗标题（更亮的白色）
-    title = font_large.render("设置", True, (255, 255, 255))
+    title = render_text(font_large, "设置", True, (255, 255, 255))
     surface.blit(title, title.get_rect(centerx=popup.centerx, top=popup.top + 20))
 
     # 重新计算垂直布局 - 所有元素居中分布
@@ -466,7 +574,7 @@ def show_settings_menu_with_hotreload(surface, volume, in_game=True, hot_reload_
 
     # 音量调节区域
     volume_y = content_start_y + 10
-    volume_text = font_medium.render("音量:", True, (255, 255, 255))
+    volume_text = render_text(font_medium, "音量:", True, (255, 255, 255))
     surface.blit(volume_text, (popup.left + 30, volume_y))
 
     # 音量滑块背景（更亮）
@@ -479,7 +587,7 @@ def show_settings_menu_with_hotreload(surface, volume, in_game=True, hot_reload_
     pygame.draw.rect(surface, (100, 150, 255), slider)
 
     # 音量百分比
-    volume_percent = font_small.render(f"{int(volume * 100)}%", True, (255, 255, 255))
+    volume_percent = render_text(font_small, f"{int(volume * 100)}%", True, (255, 255, 255))
     surface.blit(volume_percent, (popup.right - 60, volume_y + 10))
 
     # 计算按钮区域的起始位置（音量控件下方）
@@ -503,7 +611,7 @@ def show_settings_menu_with_hotreload(surface, volume, in_game=True, hot_reload_
     fullscreen_color = get_button_color((150, 150, 255), is_fullscreen_hovered)
 
     pygame.draw.rect(surface, fullscreen_color, fullscreen_btn)
-    fullscreen_text = font_medium.render("切换全屏", True, (255, 255, 255))
+    fullscreen_text = render_text(font_medium, "切换全屏", True, (255, 255, 255))
     surface.blit(fullscreen_text, fullscreen_text.get_rect(center=fullscreen_btn.center))
 
     current_y += button_height + button_spacing
@@ -516,7 +624,7 @@ def show_settings_menu_with_hotreload(surface, volume, in_game=True, hot_reload_
         reset_color = get_button_color((255, 100, 100), is_reset_hovered)
 
         pygame.draw.rect(surface, reset_color, reset_btn)
-        reset_text = font_medium.render("重置关卡进度", True, (255, 255, 255))
+        reset_text = render_text(font_medium, "重置关卡进度", True, (255, 255, 255))
         surface.blit(reset_text, reset_text.get_rect(center=reset_btn.center))
 
         current_y += button_height + button_spacing
@@ -530,7 +638,7 @@ def show_settings_menu_with_hotreload(surface, volume, in_game=True, hot_reload_
 
         pygame.draw.rect(surface, restart_color, restart_game_btn)
         pygame.draw.rect(surface, (255, 255, 255), restart_game_btn, 2)
-        restart_text = font_medium.render("重新开始关卡", True, (255, 255, 255))
+        restart_text = render_text(font_medium, "重新开始关卡", True, (255, 255, 255))
         surface.blit(restart_text, restart_text.get_rect(center=restart_game_btn.center))
 
         current_y += button_height + button_spacing
@@ -544,7 +652,7 @@ def show_settings_menu_with_hotreload(surface, volume, in_game=True, hot_reload_
 
         pygame.draw.rect(surface, level_select_color, return_to_level_select_btn)
         pygame.draw.rect(surface, (255, 255, 255), return_to_level_select_btn, 2)
-        level_select_text = font_medium.render("返回选关页面", True, (255, 255, 255))
+        level_select_text = render_text(font_medium, "返回选关页面", True, (255, 255, 255))
         surface.blit(level_select_text, level_select_text.get_rect(center=return_to_level_select_btn.center))
 
     # 继续/返回主页按钮 - 放在弹窗底部
@@ -564,8 +672,8 @@ def show_settings_menu_with_hotreload(surface, volume, in_game=True, hot_reload_
     pygame.draw.rect(surface, quit_color, quit_btn)
 
     # 按钮文字
-    continue_text = font_medium.render("继续", True, (255, 255, 255))
-    quit_text = font_medium.render("返回主页" if in_game else "退出", True, (255, 255, 255))
+    continue_text = render_text(font_medium, "继续", True, (255, 255, 255))
+    quit_text = render_text(font_medium, "返回主页" if in_game else "退出", True, (255, 255, 255))
     surface.blit(continue_text, continue_text.get_rect(center=continue_btn.center))
     surface.blit(quit_text, quit_text.get_rect(center=quit_btn.center))
 
@@ -591,7 +699,7 @@ def draw_main_menu(surface, animation_timer, exit_animation=False, has_saved_gam
                    font_medium=None, state_manager=None, font_tiny=None):
     """主菜单绘制函数 - 支持退出动画，添加图鉴按钮"""
     if font_tiny is None:
-        font_tiny = pygame.font.Font(None, 20)
+        font_tiny = get_tiny_font()
         # 1. 先绘制背景
     if menu_bg_img:
         surface.blit(menu_bg_img, (0, 0))
@@ -654,7 +762,7 @@ def draw_main_menu(surface, animation_timer, exit_animation=False, has_saved_gam
                 pygame.draw.rect(button_surface, border_color, (0, 0, menu_width, 50), 3)
 
                 # 绘制按钮文字
-                btn_text = font_medium.render(label, True, WHITE)
+                btn_text = render_text(font_medium, label, True, WHITE)
                 text_surface = pygame.Surface(btn_text.get_size(), pygame.SRCALPHA)
                 text_surface.blit(btn_text, (0, 0))
                 text_surface.set_alpha(alpha)
@@ -702,7 +810,7 @@ def draw_main_menu(surface, animation_timer, exit_animation=False, has_saved_gam
                 pygame.draw.rect(button_surface, border_color, (0, 0, menu_width, 50), 3)
 
                 # 绘制按钮文字
-                btn_text = font_medium.render(label, True, WHITE)
+                btn_text = render_text(font_medium, label, True, WHITE)
                 text_surface = pygame.Surface(btn_text.get_size(), pygame.SRCALPHA)
                 text_surface.blit(btn_text, (0, 0))
                 text_surface.set_alpha(alpha)
@@ -773,7 +881,7 @@ def draw_main_menu(surface, animation_timer, exit_animation=False, has_saved_gam
                              (icon_x + 20, line_y), (icon_x + icon_size - 20, line_y), 1)
 
         # 图鉴文字
-        codex_text = font_tiny.render("图鉴", True, (255, 255, 255, codex_alpha))
+        codex_text = render_text(font_tiny, "图鉴", True, (255, 255, 255, codex_alpha))
         text_rect = codex_text.get_rect(center=(codex_button_size // 2, codex_button_size - 15))
         codex_surface.blit(codex_text, text_rect)
 
@@ -839,7 +947,7 @@ def draw_main_menu(surface, animation_timer, exit_animation=False, has_saved_gam
                         (handle_x, handle_y, handle_width, 20), 0, 3.14, 3)
 
         # 商店文字
-        shop_text = font_tiny.render("商店", True, (255, 255, 255, shop_alpha))
+        shop_text = render_text(font_tiny, "商店", True, (255, 255, 255, shop_alpha))
         text_rect = shop_text.get_rect(center=(shop_button_size // 2, shop_button_size - 15))
         shop_surface.blit(shop_text, text_rect)
 
@@ -892,12 +1000,12 @@ def draw_codex_page(surface, animation_timer, animation_complete, exit_animation
     # 绘制返回按钮
     back_btn = pygame.Rect(20, 20, 100, 40)
     pygame.draw.rect(codex_surface, RED, back_btn)
-    back_text = font_medium.render("返回", True, WHITE)
+    back_text = render_text(font_medium, "返回", True, WHITE)
     codex_surface.blit(back_text, (back_btn.centerx - back_text.get_width() // 2,
                                    back_btn.centery - back_text.get_height() // 2))
 
     # 绘制标题
-    title = font_large.render("游戏图鉴", True, (255, 255, 255))
+    title = render_text(font_large, "游戏图鉴", True, (255, 255, 255))
     title_x = (BASE_WIDTH - title.get_width()) // 2
     title_y = 30
     codex_surface.blit(title, (title_x, title_y))
@@ -942,7 +1050,7 @@ def draw_codex_page(surface, animation_timer, animation_complete, exit_animation
     pygame.draw.circle(codex_surface, (255, 255, 100), (center_x, center_y), 25)
 
     # 植物按钮文字
-    plant_title = font_large.render("植物图鉴", True, WHITE)
+    plant_title = render_text(font_large, "植物图鉴", True, WHITE)
     plant_text_y = plant_btn.bottom - 80
     codex_surface.blit(plant_title, (plant_btn.centerx - plant_title.get_width() // 2, plant_text_y))
 
@@ -984,7 +1092,7 @@ def draw_codex_page(surface, animation_timer, animation_complete, exit_animation
     pygame.draw.rect(codex_surface, (0, 0, 0), mouth_rect)
 
     # 僵尸按钮文字
-    zombie_title = font_large.render("僵尸图鉴", True, WHITE)
+    zombie_title = render_text(font_large, "僵尸图鉴", True, WHITE)
     zombie_text_y = zombie_btn.bottom - 80
     codex_surface.blit(zombie_title, (zombie_btn.centerx - zombie_title.get_width() // 2, zombie_text_y))
 
@@ -1038,13 +1146,13 @@ def draw_level_select(surface, game_db, level_settings=None, menu_bg_img=None,
     # 绘制返回按钮
     back_btn = pygame.Rect(20, 20, 100, 40)
     pygame.draw.rect(level_select_surface, RED, back_btn)
-    back_text = font_small.render("返回", True, WHITE)
+    back_text = render_text(font_small, "返回", True, WHITE)
     level_select_surface.blit(back_text, (back_btn.centerx - back_text.get_width() // 2,
                                           back_btn.centery - back_text.get_height() // 2))
 
     # 绘制统计信息
     completed_count = game_db.get_completion_count()
-    stats_text = font_medium.render(f"已通关: {completed_count}/28", True, WHITE)
+    stats_text = render_text(font_medium, f"已通关: {completed_count}/28", True, WHITE)
     level_select_surface.blit(stats_text, (BASE_WIDTH - stats_text.get_width() - 20, 30))
 
     # 获取已通关的关卡列表
@@ -1120,7 +1228,7 @@ def draw_level_select(surface, game_db, level_settings=None, menu_bg_img=None,
 
             # 绘制关卡数字
             text_color = WHITE if not is_locked else (150, 150, 150)  # 锁定状态用灰色文字
-            level_text = font_medium.render(str(level_num), True, text_color)
+            level_text = render_text(font_medium, str(level_num), True, text_color)
             level_select_surface.blit(level_text, (level_rect.centerx - level_text.get_width() // 2,
                                                    level_rect.centery - level_text.get_height() // 2))
 
@@ -1203,7 +1311,7 @@ def draw_level_tooltip(surface, level_num, mouse_pos, font_small, game_db, statu
         text_color = (100, 255, 100) if is_completed else WHITE
 
     # 创建工具提示表面
-    text_surface = font_small.render(tooltip_text, True, text_color)
+    text_surface = render_text(font_small, tooltip_text, True, text_color)
     tooltip_width = text_surface.get_width() + 20
     tooltip_height = text_surface.get_height() + 10
 
@@ -1252,11 +1360,11 @@ def draw_continue_dialog(surface, saved_game_info, level_num, font_large=None, f
     pygame.draw.rect(surface, (100, 150, 255), dialog, 4)
 
     # 标题
-    title = font_large.render(f"第{level_num}关", True, WHITE)
+    title = render_text(font_large, f"第{level_num}关", True, WHITE)
     surface.blit(title, title.get_rect(centerx=dialog.centerx, top=dialog.top + 15))
 
     # 提示文字
-    prompt = font_medium.render("发现保存的游戏进度", True, YELLOW)
+    prompt = render_text(font_medium, "发现保存的游戏进度", True, YELLOW)
     surface.blit(prompt, prompt.get_rect(centerx=dialog.centerx, top=dialog.top + 65))
 
     # 显示保存信息
@@ -1264,16 +1372,16 @@ def draw_continue_dialog(surface, saved_game_info, level_num, font_large=None, f
         info_y = dialog.top + 105
 
         # 保存时间
-        time_text = font_small.render(f"保存时间: {saved_game_info['save_time']}", True, WHITE)
+        time_text = render_text(font_small, f"保存时间: {saved_game_info['save_time']}", True, WHITE)
         surface.blit(time_text, time_text.get_rect(centerx=dialog.centerx, top=info_y))
 
         # 波次信息
         if saved_game_info['wave_mode']:
-            wave_text = font_small.render(f"波次: {saved_game_info['current_wave']}/{saved_game_info['max_waves']}",
+            wave_text = render_text(font_small, f"波次: {saved_game_info['current_wave']}/{saved_game_info['max_waves']}",
                                           True, WHITE)
             surface.blit(wave_text, wave_text.get_rect(centerx=dialog.centerx, top=info_y + 50))
         else:
-            progress_text = font_small.render("普通模式", True, WHITE)
+            progress_text = render_text(font_small, "普通模式", True, WHITE)
             surface.blit(progress_text, progress_text.get_rect(centerx=dialog.centerx, top=info_y + 50))
 
     # 按钮 - 三个按钮横向排列特性:
@@ -1295,9 +1403,9 @@ def draw_continue_dialog(surface, saved_game_info, level_num, font_large=None, f
     pygame.draw.rect(surface, WHITE, back_btn, 2)
 
     # 按钮文字
-    continue_text = font_small.render("继续游戏", True, WHITE)
-    restart_text = font_small.render("重新开始", True, WHITE)
-    back_text = font_small.render("返回", True, WHITE)
+    continue_text = render_text(font_small, "继续游戏", True, WHITE)
+    restart_text = render_text(font_small, "重新开始", True, WHITE)
+    back_text = render_text(font_small, "返回", True, WHITE)
 
     surface.blit(continue_text, continue_text.get_rect(center=continue_btn.center))
     surface.blit(restart_text, restart_text.get_rect(center=restart_btn.center))
@@ -1387,7 +1495,7 @@ def draw_plant_select_grid(surface, plant_grid, animation_timer, animation_compl
             surface.blit(clear_surface, (overlap_x, overlap_y))
 
     # 绘制标题
-    title = font_medium.render("选择你的植物", True, (255, 255, 255))
+    title = render_text(font_medium, "选择你的植物", True, (255, 255, 255))
     title_x = start_x + (total_width - title.get_width()) // 2
     title_y = start_y - 50
     surface.blit(title, (title_x, title_y))
@@ -1418,7 +1526,7 @@ def draw_plant_select_grid(surface, plant_grid, animation_timer, animation_compl
     }
 
     # 创建小字体用于价格显示
-    price_font = pygame.font.Font(None, 24)
+    price_font = get_price_font()
 
     # 绘制网格
     plant_rects = []
@@ -1487,16 +1595,14 @@ def draw_plant_select_grid(surface, plant_grid, animation_timer, animation_compl
                         img_key = 'ice_cactus_60'
 
                     if img_key and img_key in scaled_images:
-                        img = scaled_images[img_key].copy()
+                        img = scaled_images[img_key]
 
                         # 修复：如果植物已被选中，应用灰度效果
                         if is_selected:
-                            # 创建灰度版本
-                            img = img.copy()
-                            img.fill((128, 128, 128), special_flags=pygame.BLEND_MULT)
+                            img = get_variant(img, (128, 128, 128))
 
                         # 缩放图标以适应格子
-                        scaled_img = pygame.transform.scale(img, (cell_width - 16, cell_height - 30))
+                        scaled_img = get_scaled(img, (cell_width - 16, cell_height - 30))
                         img_x = cell_x + 8
                         img_y = cell_y + 4
                         surface.blit(scaled_img, (img_x, img_y))
@@ -1504,7 +1610,7 @@ def draw_plant_select_grid(surface, plant_grid, animation_timer, animation_compl
                         # 绘制植物价格（在卡槽下部）
                         plant_price = plant_prices.get(plant_type, 0)
                         if plant_price > 0:
-                            price_text = price_font.render(str(plant_price), True, (255, 255, 255))
+                            price_text = render_text(price_font, str(plant_price), True, (255, 255, 255))
                             # 计算价格文本位置（卡槽内下部居中）
                             price_x = cell_x + (cell_width - price_text.get_width()) // 2
                             price_y = cell_y + cell_height - price_text.get_height() - 3  # 距离底部3像素
@@ -1571,7 +1677,7 @@ def draw_plant_select_grid(surface, plant_grid, animation_timer, animation_compl
     surface.blit(border_surface, (finish_btn_x, finish_btn_y))
 
     # 完成按钮文字
-    finish_text = font_small.render("开始战斗!", True, WHITE)
+    finish_text = render_text(font_small, "开始战斗!", True, WHITE)
     text_x = finish_btn_x + (finish_btn_width - finish_text.get_width()) // 2
     text_y = finish_btn_y + (finish_btn_height - finish_text.get_height()) // 2
     surface.blit(finish_text, (text_x, text_y))
@@ -1622,13 +1728,13 @@ def draw_shop_page(surface, animation_timer, animation_complete, exit_animation,
     # 绘制返回按钮
     back_btn = pygame.Rect(20, 20, 100, 40)
     pygame.draw.rect(shop_surface, RED, back_btn)
-    back_text = font_medium.render("返回", True, WHITE)
+    back_text = render_text(font_medium, "返回", True, WHITE)
     shop_surface.blit(back_text, (back_btn.centerx - back_text.get_width() // 2,
                                   back_btn.centery - back_text.get_height() // 2))
 
     # 改进的金币显示 - 动态调整宽度
     if hasattr(game_manager, 'coins'):
-        coins_text = font_medium.render(f"金币: {game_manager.coins}", True, (255, 255, 255))
+        coins_text = render_text(font_medium, f"金币: {game_manager.coins}", True, (255, 255, 255))
         text_width = coins_text.get_width()
         text_height = coins_text.get_height()
 
@@ -1740,13 +1846,13 @@ def draw_shop_page(surface, animation_timer, animation_complete, exit_animation,
                              (icon_rect.centerx - 20, icon_rect.centery - 20, 40, 40))
 
         # 绘制商品名称
-        name_text = font_tiny.render(item['name'], True, WHITE)
+        name_text = render_text(font_tiny, item['name'], True, WHITE)
         name_x = item_x + (item_width - name_text.get_width()) // 2
         name_y = item_y + 75
         shop_surface.blit(name_text, (name_x, name_y))
 
         # 绘制价格
-        price_text = font_tiny.render(f"{item['price']}金币", True, YELLOW)
+        price_text = render_text(font_tiny, f"{item['price']}金币", True, YELLOW)
         price_x = item_x + (item_width - price_text.get_width()) // 2
         price_y = item_y + 95
         shop_surface.blit(price_text, (price_x, price_y))
@@ -1768,7 +1874,7 @@ def draw_shop_page(surface, animation_timer, animation_complete, exit_animation,
         pygame.draw.rect(shop_surface, btn_color, buy_btn)
         pygame.draw.rect(shop_surface, WHITE, buy_btn, 1)
 
-        buy_text = font_tiny.render(btn_text, True, btn_text_color)
+        buy_text = render_text(font_tiny, btn_text, True, btn_text_color)
         buy_text_x = buy_btn.centerx - buy_text.get_width() // 2
         buy_text_y = buy_btn.centery - buy_text.get_height() // 2
         shop_surface.blit(buy_text, (buy_text_x, buy_text_y))
@@ -1787,13 +1893,13 @@ def draw_shop_page(surface, animation_timer, animation_complete, exit_animation,
     pygame.draw.rect(shop_surface, prev_color, prev_btn)
     pygame.draw.rect(shop_surface, WHITE, prev_btn, 2)
 
-    prev_text = font_small.render("上一页", True, WHITE if prev_enabled else (150, 150, 150))
+    prev_text = render_text(font_small, "上一页", True, WHITE if prev_enabled else (150, 150, 150))
     prev_text_x = prev_btn.centerx - prev_text.get_width() // 2
     prev_text_y = prev_btn.centery - prev_text.get_height() // 2
     shop_surface.blit(prev_text, (prev_text_x, prev_text_y))
 
     # 页数显示
-    page_info = font_small.render(f"{shop_manager.current_page + 1}/{shop_manager.total_pages}", True, WHITE)
+    page_info = render_text(font_small, f"{shop_manager.current_page + 1}/{shop_manager.total_pages}", True, WHITE)
     page_info_x = BASE_WIDTH // 2 - page_info.get_width() // 2
     shop_surface.blit(page_info, (page_info_x, page_y + 10))
 
@@ -1804,7 +1910,7 @@ def draw_shop_page(surface, animation_timer, animation_complete, exit_animation,
     pygame.draw.rect(shop_surface, next_color, next_btn)
     pygame.draw.rect(shop_surface, WHITE, next_btn, 2)
 
-    next_text = font_small.render("下一页", True, WHITE if next_enabled else (150, 150, 150))
+    next_text = render_text(font_small, "下一页", True, WHITE if next_enabled else (150, 150, 150))
     next_text_x = next_btn.centerx - next_text.get_width() // 2
     next_text_y = next_btn.centery - next_text.get_height() // 2
     shop_surface.blit(next_text, (next_text_x, next_text_y))
@@ -1847,7 +1953,7 @@ def draw_insufficient_coins_dialog(surface, item_info, current_coins, font_large
     pygame.draw.rect(surface, (255, 100, 100), dialog, 4)  # 红色边框表示警告dan
 
     # 标题
-    title = font_large.render("金币不足", True, (255, 100, 100))
+    title = render_text(font_large, "金币不足", True, (255, 100, 100))
     surface.blit(title, title.get_rect(centerx=dialog.centerx, top=dialog.top + 20))
 
     # 商品信息
@@ -1855,11 +1961,11 @@ def draw_insufficient_coins_dialog(surface, item_info, current_coins, font_large
     item_price = item_info.get('price', 0)
 
     # 商品名称
-    name_text = font_medium.render(f"商品: {item_name}", True, WHITE)
+    name_text = render_text(font_medium, f"商品: {item_name}", True, WHITE)
     surface.blit(name_text, name_text.get_rect(centerx=dialog.centerx, top=dialog.top + 77))
 
     # 当前金币
-    current_text = font_medium.render(f"当前: {current_coins} 金币", True, WHITE)
+    current_text = render_text(font_medium, f"当前: {current_coins} 金币", True, WHITE)
     surface.blit(current_text, current_text.get_rect(centerx=dialog.centerx, top=dialog.top + 110))
 
     # 确认按钮
@@ -1867,7 +1973,7 @@ def draw_insufficient_coins_dialog(surface, item_info, current_coins, font_large
     pygame.draw.rect(surface, (100, 100, 100), confirm_btn)
     pygame.draw.rect(surface, WHITE, confirm_btn, 2)
 
-    confirm_text = font_medium.render("确认", True, WHITE)
+    confirm_text = render_text(font_medium, "确认", True, WHITE)
     surface.blit(confirm_text, confirm_text.get_rect(center=confirm_btn.center))
 
     return confirm_btn
@@ -1934,13 +2040,13 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
     # 绘制返回按钮
     back_btn = pygame.Rect(20, 20, 100, 40)
     pygame.draw.rect(surface, RED, back_btn)
-    back_text = font_medium.render("返回", True, WHITE)
+    back_text = render_text(font_medium, "返回", True, WHITE)
     surface.blit(back_text, (back_btn.centerx - back_text.get_width() // 2,
                              back_btn.centery - back_text.get_height() // 2))
 
     # 绘制标题
     title_text = "植物图鉴" if detail_type == "plants" else "僵尸图鉴"
-    title = font_large.render(title_text, True, WHITE)
+    title = render_text(font_large, title_text, True, WHITE)
     title_x = (BASE_WIDTH - title.get_width()) // 2
     title_y = 30
     surface.blit(title, (title_x, title_y))
@@ -2019,7 +2125,7 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
                 # 在默认图标中绘制名称首字母
                 if item_data.get('name'):
                     first_char = item_data['name'][0]
-                    char_text = font_medium.render(first_char, True, WHITE)
+                    char_text = render_text(font_medium, first_char, True, WHITE)
                     char_x = icon_rect.centerx - char_text.get_width() // 2
                     char_y = icon_rect.centery - char_text.get_height() // 2
                     surface.blit(char_text, (char_x, char_y))
@@ -2042,7 +2148,7 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
         selected_item = codex_data[selected_index]
 
         # 绘制项目名称 - 使用较小字体，位置向上移动
-        name_text = font_medium.render(selected_item.get('name', '未知'), True, WHITE)
+        name_text = render_text(font_medium, selected_item.get('name', '未知'), True, WHITE)
         name_x = display_start_x + (display_width - name_text.get_width()) // 2
         name_y = display_start_y + 10  # 修改：从20改为10，向上移动
         surface.blit(name_text, (name_x, name_y))
@@ -2080,7 +2186,7 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
             # 绘制大号名称首字母
             if selected_item.get('name'):
                 first_char = selected_item['name'][0]
-                char_text = font_large.render(first_char, True, WHITE)
+                char_text = render_text(font_large, first_char, True, WHITE)
                 char_x = default_large_rect.centerx - char_text.get_width() // 2
                 char_y = default_large_rect.centery - char_text.get_height() // 2
                 surface.blit(char_text, (char_x, char_y))
@@ -2093,7 +2199,7 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
         pygame.draw.rect(surface, (80, 80, 120), desc_rect, 2)
 
         # 绘制描述文字标题 - 使用小字体
-        desc_title = font_small.render("描述:", True, WHITE)
+        desc_title = render_text(font_small, "描述:", True, WHITE)
         surface.blit(desc_title, (desc_rect.x + 15, desc_rect.y + 15))
 
         # 绘制描述内容 - 使用按字符数换行（关键修改）
@@ -2113,17 +2219,17 @@ def draw_codex_detail_page(surface, detail_type, selected_index, font_large, fon
             if line_y + line_height > desc_rect.bottom - 15:
                 # 如果超出了，显示省略号
                 if i > 0:  # 至少显示了一行
-                    ellipsis = font_tiny.render("...", True, (200, 200, 200))
+                    ellipsis = render_text(font_tiny, "...", True, (200, 200, 200))
                     prev_line_y = text_start_y + (i - 1) * line_height
                     # 在上一行末尾添加省略号
                     prev_line_text = wrapped_lines[i - 1]
-                    prev_line_surface = font_tiny.render(prev_line_text, True, (200, 200, 200))
+                    prev_line_surface = render_text(font_tiny, prev_line_text, True, (200, 200, 200))
                     ellipsis_x = desc_rect.x + 15 + prev_line_surface.get_width() + 5
                     surface.blit(ellipsis, (ellipsis_x, prev_line_y))
                 break
 
             # 渲染当前行
-            line_surface = font_tiny.render(line, True, (200, 200, 200))
+            line_surface = render_text(font_tiny, line, True, (200, 200, 200))
             surface.blit(line_surface, (desc_rect.x + 15, line_y))
 
     return back_btn, grid_rects
@@ -4,6 +4,7 @@
 import pygame
 import math
 from core.constants import *
+from rsc_mng.text_cache import render_text
 
 
 def clamp(value, min_value, max_value):
@@ -70,7 +71,7 @@ def format_time(seconds):
 
 def create_text_surface(text, font, color, background_color=None):
     """创建文本表面，可选背景色"""
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(font, text, True, color)
     if background_color:
         bg_surface = pygame.Surface(text_surface.get_size())
         bg_surface.fill(background_color)
@@ -84,14 +85,14 @@ def draw_outlined_text(surface, text, font, pos, text_color, outline_color, outl
     x, y = pos
 
     # 绘制轮廓
+    outline_surface = render_text(font, text, True, outline_color)
     for dx in range(-outline_width, outline_width + 1):
         for dy in range(-outline_width, outline_width + 1):
             if dx != 0 or dy != 0:
-                outline_surface = font.render(text, True, outline_color)
                 surface.blit(outline_surface, (x + dx, y + dy))
 
     # 绘制主文字
-    text_surface = font.render(text, True, text_color)
+    text_surface = render_text(font, text, True, text_color)
     surface.blit(text_surface, (x, y))
 
 
@@ -203,7 +204,7 @@ def draw_multiline_text(surface, text, font, pos, color, line_spacing=5, max_wid
         lines = text.split('\n')
 
     for i, line in enumerate(lines):
-        line_surface = font.render(line, True, color)
+        line_surface = render_text(font, line, True, color)
         surface.blit(line_surface, (x, y + i * (font.get_height() + line_spacing)))
 
 
@@ -216,7 +217,7 @@ def create_button_surface(width, height, text, font,
     if border_color:
         pygame.draw.rect(surface, border_color, surface.get_rect(), border_width)
 
-    text_surface = font.render(text, True, text_color)
+    text_surface = render_text(font, text, True, text_color)
     text_rect = text_surface.get_rect(center=(width // 2, height // 2))
     surface.blit(text_surface, text_rect)
 
@@ -313,12 +314,12 @@ def can_place_plant_at_position(game, plant_type, row, col, level_manager):
         bool: 是否可以种植
     """
     # 检查该位置是否已有植物
-    for plant in game["plants"]:
-        if plant.row == row and plant.col == col:
-            # 如果是坚果墙且血量不满，可以修复
-            if plant_type == "wall_nut" and plant.plant_type == "wall_nut":
-                return plant.health < plant.max_health
-            return False
+    plant = game["plant_grid"].get_plant(row, col)
+    if plant is not None:
+        # 如果是坚果墙且血量不满，可以修复
+        if plant_type == "wall_nut" and plant.plant_type == "wall_nut":
+            return plant.health < plant.max_health
+        return False
 
     # 检查向日葵种植限制
     if plant_type == "sunflower":
@@ -414,11 +415,7 @@ def should_show_plant_preview(game, selected_plant_type, target_row, target_col)
         tuple: (是否显示预览, 是否可以放置)
     """
     # 检查目标位置是否有植物
-    target_plant = None
-    for plant in game["plants"]:
-        if plant.row == target_row and plant.col == target_col:
-            target_plant = plant
-            break
+    target_plant = game["plant_grid"].get_plant(target_row, target_col)
 
     # 如果目标位置没有植物，正常显示预览
     if target_plant is None:
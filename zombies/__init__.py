@@ -1,15 +1,34 @@
 """
 僵尸模块初始化文件
+
+导出的类和函数在第一次访问时才导入所在的子模块：
+主菜单只需要 create_zombie_store，僵尸类在进入关卡时才加载
 """
+import importlib
+
+# 导出名 -> (所在子模块, 子模块中的名称)
+_LAZY_EXPORTS = {
+    'BaseZombie': ('.base_zombie', 'BaseZombie'),
+    'NormalZombie': ('.normal_zombie', 'NormalZombie'),
+    'GiantZombie': ('.giant_zombie', 'GiantZombie'),
+    'ZombieFactory': ('.zombie_factory', 'ZombieFactory'),
+    'create_zombie': ('.zombie_factory', 'create_zombie'),
+    # 为了保持向后兼容，导出Zombie类
+    'Zombie': ('.zombie_factory', 'ZombieFactory'),
+    'ZombieStore': ('.zombie_store', 'ZombieStore'),
+    'create_zombie_store': ('.zombie_store', 'create_zombie_store'),
+}
+
 
-from .base_zombie import BaseZombie
-from .normal_zombie import NormalZombie
-from .giant_zombie import GiantZombie
-from .zombie_factory import ZombieFactory, create_zombie
-from .effects import CucumberSprayParticle
+def __getattr__(name):
+    export = _LAZY_EXPORTS.get(name)
+    if export is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = export
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
 
-# 为了保持向后兼容，导出Zombie类
-Zombie = ZombieFactory
 
 __all__ = [
     'BaseZombie',
@@ -18,5 +37,6 @@ __all__ = [
     'ZombieFactory',
     'create_zombie',
     'Zombie',
-    'CucumberSprayParticle'
-]
\ No newline at end of file
+    'ZombieStore',
+    'create_zombie_store'
+]
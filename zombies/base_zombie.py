@@ -2,13 +2,23 @@
 僵尸基类
 """
 import pygame
-import random
+from sim_clock import get_rng, get_ticks
+from render_queue import LAYER_ZOMBIES
+from rsc_mng.transform_cache import get_scaled, get_sprite, get_variant, get_filled
+from particle_system import emit_cucumber_spray
 import math
 
 
+# 冰晶旋转动画在一个120度周期内的帧数
+ICE_CRYSTAL_FRAMES = 24
+
+
 class BaseZombie:
     """所有僵尸的基类，包含通用属性和方法"""
 
+    # 是否在检测植物碰撞之前移动（普通僵尸先移动再啃咬，巨人僵尸先判断砸击再移动）
+    moves_before_attack = True
+
     def __init__(self, row, has_armor_prob=0.3, is_fast=False, wave_mode=False,
                  fast_multiplier=2.5, constants=None, sounds=None, images=None,
                  level_settings=None, zombie_type="normal"):
@@ -16,6 +26,7 @@ class BaseZombie:
         self.row = row
         self.col = constants['GRID_WIDTH'] if constants else 9  # 从最右侧生成
         self.zombie_type = zombie_type
+        self.entity_id = None  # 加入游戏时由实体注册表分配
 
         # 存储引用
         self.constants = constants
@@ -29,14 +40,14 @@ class BaseZombie:
         self.bite_timer = 0
 
         # 防具属性
-        self.has_armor = random.random() < has_armor_prob
+        self.has_armor = get_rng("spawn").random() < has_armor_prob
 
         # 效果相关属性
         self.immunity_chance = 0.0
         self.is_stunned = False  # 是否被眩晕
         self.is_spraying = False  # 是否正在喷射
         self.stun_visual_timer = 0  # 眩晕视觉效果计时器
-        self.spray_particles = []  # 喷射粒子列表
+        self.spray_particle_life = 0  # 喷射粒子剩余帧数（粒子本身由全局粒子系统管理）
 
         # 死亡动画属性
         self.is_dying = False
@@ -84,8 +95,8 @@ class BaseZombie:
         if self.death_animation_timer <= 0:
             self.health = 0
 
-    def update(self, plants):
-        """更新僵尸状态（移动/攻击）- 基础实现"""
+    def update(self, plant_grid):
+        """更新僵尸状态（移动/攻击）- 基础实现，plant_grid 为植物占用网格"""
         if not self.constants:
             return
 
@@ -94,16 +105,8 @@ class BaseZombie:
             self._update_death_animation()
             return
 
-        # 更新眩晕视觉效果计时器
-        if self.is_stunned:
-            self.stun_visual_timer += 1
-
-        # 更新喷射粒子
-        if self.spray_particles:
-            self.spray_particles = [p for p in self.spray_particles if p.update()]
-
-        # 如果被眩晕，停止所有行动
-        if self.is_stunned:
+        # 更新眩晕和喷射效果，如果被眩晕，停止所有行动
+        if not self._update_status_effects():
             return
 
         # 正确处理速度更新，考虑冰冻状态
@@ -115,12 +118,32 @@ class BaseZombie:
             self.speed = self.base_speed * (2.5 if (self.wave_mode and self.is_fast) else 1)
 
         # 调用子类的具体攻击逻辑
-        self._update_attack_logic(plants)
+        self._update_attack_logic(plant_grid)
+
+    def _update_status_effects(self):
+        """更新眩晕视觉计时器和喷射粒子，返回本帧能否行动"""
+        # 更新眩晕视觉效果计时器
+        if self.is_stunned:
+            self.stun_visual_timer += 1
+
+        # 喷射粒子倒计时
+        if self.spray_particle_life > 0:
+            self.spray_particle_life -= 1
+
+        return not self.is_stunned
 
-    def _update_attack_logic(self, plants):
-        """子类需要实现的攻击逻辑"""
+    def _update_attack_logic(self, plant_grid):
+        """子类需要实现的攻击逻辑（移动 + 植物碰撞）"""
         raise NotImplementedError("子类必须实现_update_attack_logic方法")
 
+    def _update_plant_collision(self, plant_grid):
+        """子类需要实现的植物碰撞和攻击，不包含移动，返回是否正在攻击"""
+        raise NotImplementedError("子类必须实现_update_plant_collision方法")
+
+    def get_plant_contact_range(self):
+        """同一行中 僵尸列 - 植物列 落在该开区间内时视为接触植物"""
+        return -0.5, 0.5
+
     def set_stun_status(self, stunned: bool):
         """设置眩晕状态"""
         self.is_stunned = stunned
@@ -136,8 +159,6 @@ class BaseZombie:
         if not self.constants:
             return
 
-        from .effects import CucumberSprayParticle
-
         # 计算僵尸的像素位置
         zombie_x = (self.constants['BATTLEFIELD_LEFT'] +
                     self.col * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
@@ -146,10 +167,9 @@ class BaseZombie:
                     self.row * (self.constants['GRID_SIZE'] + self.constants['GRID_GAP']) +
                     self.constants['GRID_SIZE'] // 2)
 
-        # 创建喷射粒子（向前方喷射）
-        for _ in range(particles_count):
-            particle = CucumberSprayParticle(zombie_x, zombie_y, direction=-1)  # 向左喷射
-            self.spray_particles.append(particle)
+        # 创建喷射粒子（向左喷射）
+        life = emit_cucumber_spray(zombie_x, zombie_y, particles_count, -1, (1, 3), 0.5, (80, 120))
+        self.spray_particle_life = max(self.spray_particle_life, life)
 
     def draw(self, surface):
         """绘制僵尸和防具（使用图片）- 基础实现"""
@@ -193,25 +213,43 @@ class BaseZombie:
         # 绘制眩晕指示器
         self._draw_stun_indicator(surface, base_x, base_y, actual_size)
 
-        # 绘制喷射粒子
-        for particle in self.spray_particles:
-            particle.draw(surface)
+    def get_draw_bounds(self):
+        """draw 可能绘制到的区域：本体（含眩晕摇摆和砸击下沉）、上方的防具血条和眩晕星星、下方的生命血条"""
+        if not self.constants:
+            return pygame.Rect(0, 0, 0, 0)
+        grid_size = self.constants['GRID_SIZE']
+        base_x = self.constants['BATTLEFIELD_LEFT'] + int(self.col * (grid_size + self.constants['GRID_GAP']))
+        base_y = self.constants['BATTLEFIELD_TOP'] + self.row * (grid_size + self.constants['GRID_GAP'])
+        actual_size = int(grid_size * self.size_multiplier)
+        x = base_x - int((actual_size - grid_size) / 2)
+        y = base_y - int((actual_size - grid_size) / 2)
+        body = pygame.Rect(x - 2, y, actual_size + 4, actual_size + 3)
+        # 眩晕星星最高到 base_y - 34，生命血条在 base_y + GRID_SIZE 处，高5像素
+        bars = pygame.Rect(base_x, base_y - 34, max(actual_size, grid_size), grid_size + 39)
+        return body.union(bars)
+
+    def queue_sprites(self, render_queue):
+        """把僵尸提交到渲染队列（基类按提交顺序回调 draw，子类可提供批量提交的快速路径）"""
+        render_queue.submit_draw(LAYER_ZOMBIES, self.draw, self.get_draw_bounds())
 
     def _draw_dying_zombie(self, surface, x, y, base_x, base_y, actual_size):
         """绘制死亡动画中的僵尸"""
-        temp_surface = pygame.Surface((actual_size, actual_size), pygame.SRCALPHA)
-
-        # 绘制僵尸本体到临时surface
-        self._draw_zombie_to_surface(temp_surface, 0, 0, actual_size)
-
-        # 应用透明度
-        temp_surface.set_alpha(self.current_alpha)
-        surface.blit(temp_surface, (x, y))
+        # 僵尸本体只合成一次，渐隐的各级透明度取缓存的变体
+        zombie_img = self.images.get('zombie_img') if self.images else None
+        body_surface = get_sprite(("dying_zombie", type(self), actual_size, zombie_img),
+                                  lambda: self._build_body_surface(actual_size))
+        surface.blit(get_variant(body_surface, alpha=self.current_alpha), (x, y))
 
         # 如果有防具且防具未被摧毁，绘制防具（同样应用透明度）
         if self.has_armor and self.armor_health > 0:
             self._draw_dying_armor(surface, x, y, actual_size)
 
+    def _build_body_surface(self, actual_size):
+        """把僵尸本体绘制到独立的透明表面（死亡动画用）"""
+        body_surface = pygame.Surface((actual_size, actual_size), pygame.SRCALPHA)
+        self._draw_zombie_to_surface(body_surface, 0, 0, actual_size)
+        return body_surface
+
     def _draw_zombie_body(self, surface, x, y, base_x, base_y, actual_size):
         """子类需要实现的僵尸本体绘制逻辑"""
         raise NotImplementedError("子类必须实现_draw_zombie_body方法")
@@ -231,16 +269,14 @@ class BaseZombie:
 
                 if self.zombie_type == "giant":
                     original_armor = self.images['armor_img']
-                    scaled_armor = pygame.transform.scale(original_armor, (armor_size, armor_size))
+                    scaled_armor = get_scaled(original_armor, (armor_size, armor_size))
                     surface.blit(scaled_armor, (armor_x, armor_y))
                 else:
                     surface.blit(self.images['armor_img'], (armor_x, armor_y))
 
                 # 如果僵尸被冰冻，在防具上也应用冰冻效果
                 if hasattr(self, 'is_frozen') and self.is_frozen:
-                    ice_overlay = pygame.Surface((armor_size, armor_size), pygame.SRCALPHA)
-                    ice_overlay.fill((70, 130, 180, 80))
-                    surface.blit(ice_overlay, (armor_x, armor_y))
+                    surface.blit(get_filled((armor_size, armor_size), (70, 130, 180, 80)), (armor_x, armor_y))
             else:
                 armor_offset = int(5 * self.size_multiplier)
                 armor_size = actual_size - armor_offset * 2
@@ -262,39 +298,35 @@ class BaseZombie:
             armor_x = x + armor_offset
             armor_y = y + armor_offset
 
-            armor_surface = pygame.Surface((armor_size, armor_size), pygame.SRCALPHA)
+            armor_img = self.images['armor_img']
             if self.zombie_type == "giant":
-                original_armor = self.images['armor_img']
-                scaled_armor = pygame.transform.scale(original_armor, (armor_size, armor_size))
-                armor_surface.blit(scaled_armor, (0, 0))
-            else:
-                armor_surface.blit(self.images['armor_img'], (0, 0))
-
-            armor_surface.set_alpha(self.current_alpha)
-            surface.blit(armor_surface, (armor_x, armor_y))
-
-    def _draw_health_bars(self, surface, base_x, base_y, actual_size):
-        """绘制生命值和防具血条"""
-        # 绘制僵尸血条（下方）
+                armor_img = get_scaled(armor_img, (armor_size, armor_size))
+            armor_surface = get_sprite(("dying_armor", armor_size, armor_img),
+                                       lambda: _build_armor_surface(armor_img, armor_size))
+            surface.blit(get_variant(armor_surface, alpha=self.current_alpha), (armor_x, armor_y))
+
+    def _get_health_bar_rects(self, base_x, base_y, actual_size):
+        """计算生命值和防具血条，返回按绘制顺序排列的 (颜色, 矩形) 列表"""
+        # 僵尸血条（下方）
         health_ratio = self.health / self.max_health if self.max_health > 0 else 0
         health_bar_width = health_ratio * actual_size
         blood_bar_y = base_y + self.constants['GRID_SIZE']
+        bars = [(self.constants['RED'], (base_x, blood_bar_y, actual_size, 5)),
+                (self.constants['BLUE'], (base_x, blood_bar_y, health_bar_width, 5))]
 
-        pygame.draw.rect(surface, self.constants['RED'],
-                         (base_x, blood_bar_y, actual_size, 5))
-        pygame.draw.rect(surface, self.constants['BLUE'],
-                         (base_x, blood_bar_y, health_bar_width, 5))
-
-        # 绘制防具血条（上方）
+        # 防具血条（上方）
         if self.has_armor and self.armor_health > 0 and self.max_armor_health > 0:
             armor_ratio = self.armor_health / self.max_armor_health
             armor_bar_width = armor_ratio * actual_size
             armor_bar_y = base_y - 15
+            bars.append((self.constants['RED'], (base_x, armor_bar_y, actual_size, 5)))
+            bars.append((self.constants['ARMOR_COLOR'], (base_x, armor_bar_y, armor_bar_width, 5)))
+        return bars
 
-            pygame.draw.rect(surface, self.constants['RED'],
-                             (base_x, armor_bar_y, actual_size, 5))
-            pygame.draw.rect(surface, self.constants['ARMOR_COLOR'],
-                             (base_x, armor_bar_y, armor_bar_width, 5))
+    def _draw_health_bars(self, surface, base_x, base_y, actual_size):
+        """绘制生命值和防具血条"""
+        for color, rect in self._get_health_bar_rects(base_x, base_y, actual_size):
+            pygame.draw.rect(surface, color, rect)
 
     def _draw_stun_indicator(self, surface, base_x, base_y, actual_size):
         """绘制眩晕指示器"""
@@ -314,37 +346,49 @@ class BaseZombie:
                 pygame.draw.circle(surface, star_color, (star_x, star_y), star_radius // 2)
 
     def _draw_ice_crystals(self, surface, x, y, actual_size):
-        """绘制冰晶装饰效果"""
-        # 绘制旋转的冰晶效果
-        crystal_surface = pygame.Surface((actual_size, actual_size), pygame.SRCALPHA)
-
-        # 计算旋转角度（基于时间）
-        time_factor = pygame.time.get_ticks() * 0.002
-
-        # 绘制多个小冰晶
-        for i in range(3):
-            angle = i * 120 + time_factor * 30  # 每60度一个冰晶，缓慢旋转
-            distance = actual_size // 4
-
-            crystal_x = actual_size // 2 + int(math.cos(math.radians(angle)) * distance)
-            crystal_y = actual_size // 2 + int(math.sin(math.radians(angle)) * distance)
-
-            # 绘制冰晶（小十字形）
-            crystal_size = 3
-            pygame.draw.circle(crystal_surface, (200, 230, 255, 150),
-                               (crystal_x, crystal_y), crystal_size)
-
-            # 绘制十字形光芒
-            pygame.draw.line(crystal_surface, (255, 255, 255, 100),
-                             (crystal_x - crystal_size, crystal_y),
-                             (crystal_x + crystal_size, crystal_y), 1)
-            pygame.draw.line(crystal_surface, (255, 255, 255, 100),
-                             (crystal_x, crystal_y - crystal_size),
-                             (crystal_x, crystal_y + crystal_size), 1)
-
-        # 中心冰晶
-        center_x, center_y = actual_size // 2, actual_size // 2
-        pygame.draw.circle(crystal_surface, (255, 255, 255, 120),
-                           (center_x, center_y), 4)
-
-        surface.blit(crystal_surface, (x, y))
\ No newline at end of file
+        """绘制冰晶装饰效果（旋转动画帧预先绘制并共享）"""
+        # 三个冰晶相隔120度，旋转角度按 ICE_CRYSTAL_FRAMES 帧量化到一个120度周期内
+        phase = (get_ticks() * 0.002 * 30) % 120
+        frame = int(phase * ICE_CRYSTAL_FRAMES / 120)
+        crystal_surface = get_sprite(("ice_crystals", actual_size, frame),
+                                     lambda: _build_ice_crystals(actual_size, frame * 120 / ICE_CRYSTAL_FRAMES))
+        surface.blit(crystal_surface, (x, y))
+
+
+def _build_armor_surface(armor_img, armor_size):
+    """把防具图片裁剪到防具大小的透明表面（死亡动画用）"""
+    armor_surface = pygame.Surface((armor_size, armor_size), pygame.SRCALPHA)
+    armor_surface.blit(armor_img, (0, 0))
+    return armor_surface
+
+
+def _build_ice_crystals(actual_size, rotation):
+    """绘制一帧冰晶装饰：三个围绕中心旋转的小冰晶和中心冰晶"""
+    crystal_surface = pygame.Surface((actual_size, actual_size), pygame.SRCALPHA)
+
+    # 绘制多个小冰晶
+    for i in range(3):
+        angle = i * 120 + rotation  # 每120度一个冰晶
+        distance = actual_size // 4
+
+        crystal_x = actual_size // 2 + int(math.cos(math.radians(angle)) * distance)
+        crystal_y = actual_size // 2 + int(math.sin(math.radians(angle)) * distance)
+
+        # 绘制冰晶（小十字形）
+        crystal_size = 3
+        pygame.draw.circle(crystal_surface, (200, 230, 255, 150),
+                           (crystal_x, crystal_y), crystal_size)
+
+        # 绘制十字形光芒
+        pygame.draw.line(crystal_surface, (255, 255, 255, 100),
+                         (crystal_x - crystal_size, crystal_y),
+                         (crystal_x + crystal_size, crystal_y), 1)
+        pygame.draw.line(crystal_surface, (255, 255, 255, 100),
+                         (crystal_x, crystal_y - crystal_size),
+                         (crystal_x, crystal_y + crystal_size), 1)
+
+    # 中心冰晶
+    center_x, center_y = actual_size // 2, actual_size // 2
+    pygame.draw.circle(crystal_surface, (255, 255, 255, 120),
+                       (center_x, center_y), 4)
+    return crystal_surface
@@ -2,12 +2,15 @@
 巨人僵尸类
 """
 import pygame
+from rsc_mng.transform_cache import get_scaled, get_variant, get_filled
 from .base_zombie import BaseZombie
 
 
 class GiantZombie(BaseZombie):
     """巨人僵尸实现"""
 
+    moves_before_attack = False
+
     def __init__(self, row, has_armor_prob=0.3, is_fast=False, wave_mode=False,
                  fast_multiplier=2.5, constants=None, sounds=None, images=None,
                  level_settings=None):
@@ -33,28 +36,27 @@ class GiantZombie(BaseZombie):
         self.has_attacked_once = False  # 是否已经进行过首次攻击
         self.attack_target = None  # 攻击目标植物
 
-    def _update_attack_logic(self, plants):
+    def _update_attack_logic(self, plant_grid):
         """巨人僵尸的砸击攻击逻辑"""
-        # 检测是否碰撞植物（更精确的碰撞检测）
-        collision_plant = None
-        for plant in plants:
-            if plant.row == self.row:
-                # 计算实际的碰撞检测范围
-                zombie_actual_size = self.constants['GRID_SIZE'] * self.size_multiplier
-                plant_size = self.constants['GRID_SIZE']
-
-                # 僵尸位置（考虑大小）
-                zombie_left = self.col
-                zombie_right = self.col + (zombie_actual_size / self.constants['GRID_SIZE'])
-
-                # 植物位置
-                plant_left = plant.col
-                plant_right = plant.col + 1
-
-                # 检测重叠
-                if zombie_left < plant_right and zombie_right > plant_left:
-                    collision_plant = plant
-                    break
+        # 没有碰撞，继续移动
+        if not self._update_plant_collision(plant_grid):
+            self.col -= self.speed
+
+    def _update_plant_collision(self, plant_grid):
+        """检测碰撞植物并更新砸击计时，返回是否正在攻击"""
+        # 计算实际的碰撞检测范围
+        zombie_actual_size = self.constants['GRID_SIZE'] * self.size_multiplier
+
+        # 僵尸位置（考虑大小）
+        zombie_left = self.col
+        zombie_right = self.col + (zombie_actual_size / self.constants['GRID_SIZE'])
+
+        # 检测与植物格子 [plant.col, plant.col + 1) 的重叠（更精确的碰撞检测）
+        overlapping = [plant for plant in plant_grid.get_plants_in_range(self.row, zombie_left - 1, zombie_right)
+                       if zombie_left < plant.col + 1 and zombie_right > plant.col]
+
+        # 同时压住多株植物时攻击最早种下的一株
+        collision_plant = min(overlapping, key=lambda plant: plant.entity_id) if overlapping else None
 
         if collision_plant:
             # 发现碰撞，开始攻击状态
@@ -76,12 +78,17 @@ class GiantZombie(BaseZombie):
                     self._perform_smash_attack()
                     self.smash_timer = 0
         else:
-            # 没有碰撞，继续移动
+            # 没有碰撞，重置攻击状态
             self.is_attacking = False
             self.attack_target = None
             self.has_attacked_once = False
             self.smash_timer = 0
-            self.col -= self.speed
+
+        return self.is_attacking
+
+    def get_plant_contact_range(self):
+        """巨人僵尸按体积判断与植物格子的重叠"""
+        return -self.size_multiplier, 1.0
 
     def _perform_smash_attack(self):
         """执行砸击攻击"""
@@ -106,16 +113,12 @@ class GiantZombie(BaseZombie):
         if self.images and self.images.get('zombie_img'):
             giant_img_key = 'giant_zombie_img' if 'giant_zombie_img' in self.images else 'zombie_img'
             original_img = self.images[giant_img_key]
-            scaled_img = pygame.transform.scale(original_img, (actual_size, actual_size))
+            scaled_img = get_scaled(original_img, (actual_size, actual_size))
 
             # 修复：改进冰冻效果 - 使用海蓝色覆盖层
             if hasattr(self, 'is_frozen') and self.is_frozen:
-                # 创建海蓝色冰冻效果
-                freeze_surface = scaled_img.copy()
-
                 # 创建海蓝色覆盖层（更强烈的效果）
-                ice_overlay = pygame.Surface((actual_size, actual_size), pygame.SRCALPHA)
-                ice_overlay.fill((70, 130, 180, 120))  # 海蓝色，半透明
+                ice_overlay = get_filled((actual_size, actual_size), (70, 130, 180, 120))  # 海蓝色，半透明
 
                 # 先绘制原图，再绘制覆盖层
                 surface.blit(scaled_img, (x, y))
@@ -125,8 +128,7 @@ class GiantZombie(BaseZombie):
                 self._draw_ice_crystals(surface, x, y, actual_size)
 
             elif self.is_stunned:
-                stun_surface = scaled_img.copy()
-                stun_surface.fill((255, 255, 0, 100), special_flags=pygame.BLEND_ADD)
+                stun_surface = get_variant(scaled_img, (255, 255, 0, 100), blend=pygame.BLEND_ADD)
                 surface.blit(stun_surface, (x, y))
             else:
                 surface.blit(scaled_img, (x, y))
@@ -147,7 +149,7 @@ class GiantZombie(BaseZombie):
         if self.images and self.images.get('zombie_img'):
             giant_img_key = 'giant_zombie_img' if 'giant_zombie_img' in self.images else 'zombie_img'
             original_img = self.images[giant_img_key]
-            scaled_img = pygame.transform.scale(original_img, (actual_size, actual_size))
+            scaled_img = get_scaled(original_img, (actual_size, actual_size))
             surface.blit(scaled_img, (x, y))
         else:
             color = self.constants.get('GIANT_COLOR', self.constants.get('GRAY', (128, 128, 128)))
@@ -2,6 +2,8 @@
 普通僵尸类
 """
 import pygame
+from render_queue import LAYER_ZOMBIES, LAYER_ZOMBIE_OVERLAYS
+from rsc_mng.transform_cache import get_variant, get_filled
 from .base_zombie import BaseZombie
 
 
@@ -27,33 +29,67 @@ class NormalZombie(BaseZombie):
         self.armor_health = 300 if (self.has_armor and wave_mode and is_fast) else (200 if self.has_armor else 0)
         self.max_armor_health = self.armor_health
 
-    def _update_attack_logic(self, plants):
+    def _update_attack_logic(self, plant_grid):
         """普通僵尸的攻击逻辑（原有逻辑）"""
         # 未攻击时移动
         if not self.is_attacking:
             self.col -= self.speed
 
-        # 检测是否碰撞植物（同列同排）
+        self._update_plant_collision(plant_grid)
+
+    def _update_plant_collision(self, plant_grid):
+        """检测是否碰撞植物（同列同排）并啃咬"""
         self.is_attacking = False
-        for plant in plants:
-            if plant.row == self.row and abs(self.col - plant.col) < 0.5:
-                self.is_attacking = True
-
-                # 修复：使用植物的 take_damage 方法而不是直接修改血量
-                plant.take_damage(self.attack_dmg)
-
-                # 控制啃咬音效播放（每0.5秒一次）
-                bite_interval = self.constants.get('BITE_INTERVAL', 30)
-                self.bite_timer += 1
-                if self.bite_timer >= bite_interval:
-                    if self.sounds and self.sounds.get("bite"):
-                        self.sounds["bite"].play()
-                    self.bite_timer = 0
-
-                # 修复：检查植物是否死亡，使用统一的死亡判断方法
-                if not plant.is_alive():
-                    plants.remove(plant)  # 植物死亡移除
-                break
+        # 列差小于0.5的格子最多只有一个，即离僵尸最近的格子
+        plant = plant_grid.get_plant(self.row, round(self.col))
+        if plant is not None and abs(self.col - plant.col) < 0.5:
+            self.is_attacking = True
+
+            # 修复：使用植物的 take_damage 方法而不是直接修改血量
+            plant.take_damage(self.attack_dmg)
+
+            # 控制啃咬音效播放（每0.5秒一次）
+            bite_interval = self.constants.get('BITE_INTERVAL', 30)
+            self.bite_timer += 1
+            if self.bite_timer >= bite_interval:
+                if self.sounds and self.sounds.get("bite"):
+                    self.sounds["bite"].play()
+                self.bite_timer = 0
+
+            # 修复：检查植物是否死亡，使用统一的死亡判断方法
+            # 植物死亡立即腾出格子，植物列表由主循环在本帧统一移除
+            if not plant.is_alive():
+                plant_grid.remove_plant(plant)
+
+        return self.is_attacking
+
+    def queue_sprites(self, render_queue):
+        """
+        把僵尸提交到渲染队列
+
+        行走/啃咬中的普通僵尸只有本体和防具两张图片，直接批量提交，血条提交到覆盖层；
+        死亡动画、冰冻、眩晕、喷射粒子等特殊状态仍回调 draw。
+        """
+        images = self.images
+        zombie_img = images.get('zombie_img') if images else None
+        armored = self.has_armor and self.armor_health > 0
+        armor_img = images.get('armor_img') if armored and images else None
+        if (zombie_img is None or (armored and armor_img is None) or not self.constants or
+                self.is_dying or self.is_stunned or self.spray_particle_life > 0 or
+                (hasattr(self, 'is_frozen') and self.is_frozen)):
+            render_queue.submit_draw(LAYER_ZOMBIES, self.draw, self.get_draw_bounds())
+            return
+
+        constants = self.constants
+        grid_size = constants['GRID_SIZE']
+        base_x = constants['BATTLEFIELD_LEFT'] + int(self.col * (grid_size + constants['GRID_GAP']))
+        base_y = constants['BATTLEFIELD_TOP'] + self.row * (grid_size + constants['GRID_GAP'])
+
+        render_queue.submit(LAYER_ZOMBIES, zombie_img, (base_x, base_y))
+        if armor_img is not None:
+            render_queue.submit(LAYER_ZOMBIES, armor_img, (base_x + 5, base_y + 5))
+        for color, rect in self._get_health_bar_rects(base_x, base_y, grid_size):
+            render_queue.submit_fill(LAYER_ZOMBIE_OVERLAYS, color, rect)
 
     def _draw_zombie_body(self, surface, x, y, base_x, base_y, actual_size):
         """绘制普通僵尸本体"""
@@ -66,16 +102,14 @@ class NormalZombie(BaseZombie):
                 surface.blit(zombie_img, (base_x, base_y))
 
                 # 创建海蓝色冰冻覆盖层
-                ice_overlay = pygame.Surface((actual_size, actual_size), pygame.SRCALPHA)
-                ice_overlay.fill((70, 130, 180, 120))  # 海蓝色
+                ice_overlay = get_filled((actual_size, actual_size), (70, 130, 180, 120))  # 海蓝色
                 surface.blit(ice_overlay, (x, y))
 
                 # 绘制冰晶效果
                 self._draw_ice_crystals(surface, x, y, actual_size)
 
             elif self.is_stunned:
-                stun_surface = zombie_img.copy()
-                stun_surface.fill((255, 255, 0, 100), special_flags=pygame.BLEND_ADD)
+                stun_surface = get_variant(zombie_img, (255, 255, 0, 100), blend=pygame.BLEND_ADD)
                 surface.blit(stun_surface, (base_x, base_y))
             else:
                 surface.blit(zombie_img, (base_x, base_y))
@@ -0,0 +1,302 @@
+"""
+僵尸结构数组存储 - 用NumPy数组保存所有僵尸的位置、速度、血量和状态标记
+
+启用后，僵尸对象变成指向数组中某一槽位的视图：row、col、speed、health 等属性
+的读写直接落到数组上，绘制、保存和读档代码无需修改。移动、冰冻减速、死亡动画
+以及左边界/小推车检测每帧都以整组数组运算完成，只有与植物的碰撞仍逐个处理。
+
+NumPy 是可选依赖，未安装时 create_zombie_store 返回 None，游戏回到逐个更新的方式。
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 数组字段：名称 -> (数组类型, 读取时转换的Python类型, 是否可缺省)
+# 可缺省字段用 NaN 表示"属性不存在"，保持 hasattr / del 的原有语义
+STORE_FIELDS = {
+    "row": ("int32", int, False),
+    "col": ("float64", float, False),
+    "speed": ("float64", float, False),
+    "base_speed": ("float64", float, False),
+    "health": ("int64", int, False),
+    "armor_health": ("int64", int, False),
+    "is_dying": ("bool", bool, False),
+    "is_attacking": ("bool", bool, False),
+    "is_stunned": ("bool", bool, False),
+    "is_frozen": ("bool", bool, False),
+    "freeze_start_time": ("float64", int, True),
+    "original_speed": ("float64", float, True),
+    "death_animation_timer": ("int32", int, False),
+    "death_animation_duration": ("int32", int, False),
+    "death_speed_reduction": ("float64", float, False),
+    "current_alpha": ("int32", int, False),
+}
+
+# 只在数组中使用、不暴露为僵尸属性的字段
+INTERNAL_FIELDS = {
+    "speed_factor": "float64",  # 波次模式快速僵尸的速度倍数
+    "moves_first": "bool",  # 是否在植物碰撞检测之前移动
+    "cell_col": "int32",  # 空间索引中记录的格子列号
+    "contact_min": "float64",  # 与植物接触的列差范围（开区间）
+    "contact_max": "float64",
+}
+
+# 粗筛植物接触时放宽的边界，保证不会漏掉任何真正接触的僵尸
+CONTACT_EPSILON = 1e-6
+
+
+def _make_field_property(name, convert, optional):
+    """生成把属性读写转发到数组槽位的 property"""
+
+    def getter(self):
+        # item() 直接返回Python标量，避免创建NumPy标量对象
+        value = self._store.arrays[name].item(self._slot)
+        if optional:
+            if value != value:  # NaN 表示属性不存在
+                raise AttributeError(name)
+            return convert(value)
+        return value
+
+    def setter(self, value):
+        self._store.arrays[name][self._slot] = value
+
+    def deleter(self):
+        if not optional:
+            raise AttributeError(f"不能删除属性 {name}")
+        self._store.arrays[name][self._slot] = np.nan
+
+    return property(getter, setter, deleter)
+
+
+_FIELD_PROPERTIES = {name: _make_field_property(name, convert, optional)
+                     for name, (_, convert, optional) in STORE_FIELDS.items()}
+_view_classes = {}
+
+
+def _get_view_class(zombie_class):
+    """获取僵尸类对应的视图子类（按需创建并缓存）"""
+    view_class = _view_classes.get(zombie_class)
+    if view_class is None:
+        view_class = type(zombie_class.__name__ + "View", (zombie_class,), dict(_FIELD_PROPERTIES))
+        _view_classes[zombie_class] = view_class
+    return view_class
+
+
+class ZombieStore:
+    """僵尸结构数组存储，槽位按加入顺序排列，移除时用末尾僵尸填补空位"""
+
+    def __init__(self, grid_width, capacity=64):
+        self.grid_width = grid_width
+        self.count = 0
+        self.zombies = []  # 槽位 -> 僵尸对象
+        self.slots = {}  # 僵尸实体ID -> 槽位
+        self.arrays = {}
+        for name, (dtype, _, _) in STORE_FIELDS.items():
+            self.arrays[name] = np.zeros(capacity, dtype=dtype)
+        for name, dtype in INTERNAL_FIELDS.items():
+            self.arrays[name] = np.zeros(capacity, dtype=dtype)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        """容量翻倍"""
+        for name, array in self.arrays.items():
+            grown = np.zeros(len(array) * 2, dtype=array.dtype)
+            grown[:len(array)] = array
+            self.arrays[name] = grown
+
+    def _view(self, name):
+        """获取字段在有效槽位上的视图"""
+        return self.arrays[name][:self.count]
+
+    def get_field(self, name):
+        """获取字段在有效槽位上的数组（视图，修改会直接写回存储）"""
+        return self._view(name)
+
+    def add(self, zombie):
+        """把僵尸加入存储，之后它的数组字段都通过视图访问"""
+        if zombie.entity_id in self.slots:
+            return
+        if self.count == len(self.arrays["col"]):
+            self._grow()
+
+        slot = self.count
+        arrays = self.arrays
+        for name, (_, _, optional) in STORE_FIELDS.items():
+            if name in zombie.__dict__:
+                arrays[name][slot] = zombie.__dict__.pop(name)
+            elif optional:
+                arrays[name][slot] = np.nan
+            else:
+                arrays[name][slot] = getattr(zombie, name, 0)
+        arrays["speed_factor"][slot] = 2.5 if (zombie.wave_mode and zombie.is_fast) else 1
+        arrays["moves_first"][slot] = zombie.moves_before_attack
+        arrays["contact_min"][slot], arrays["contact_max"][slot] = zombie.get_plant_contact_range()
+        arrays["cell_col"][slot] = int(min(max(arrays["col"][slot], 0), self.grid_width - 1))
+
+        zombie.__class__ = _get_view_class(zombie.__class__)
+        zombie._store = self
+        zombie._slot = slot
+        self.zombies.append(zombie)
+        self.slots[zombie.entity_id] = slot
+        self.count += 1
+
+    def remove(self, zombie):
+        """把僵尸移出存储，字段值写回对象本身"""
+        slot = self.slots.pop(zombie.entity_id, None)
+        if slot is None:
+            return
+
+        arrays = self.arrays
+        for name, (_, convert, optional) in STORE_FIELDS.items():
+            value = arrays[name][slot]
+            if optional and value != value:
+                continue
+            zombie.__dict__[name] = convert(value)
+        zombie.__class__ = zombie.__class__.__bases__[0]
+        del zombie._store
+        del zombie._slot
+
+        # 用最后一个槽位填补空位
+        last = self.count - 1
+        if slot != last:
+            for array in arrays.values():
+                array[slot] = array[last]
+            moved = self.zombies[last]
+            self.zombies[slot] = moved
+            moved._slot = slot
+            self.slots[moved.entity_id] = slot
+        self.zombies.pop()
+        self.count -= 1
+
+    def get_zombie(self, entity_id):
+        """根据实体ID获取仍在存储中的僵尸"""
+        slot = self.slots.get(entity_id)
+        return self.zombies[slot] if slot is not None else None
+
+    def get_zombies(self, mask):
+        """获取掩码选中的僵尸对象"""
+        zombies = self.zombies
+        return [zombies[slot] for slot in np.flatnonzero(mask)]
+
+    def update_death_animations(self):
+        """推进所有死亡动画，返回动画已结束的僵尸"""
+        dying = self._view("is_dying")
+        if not dying.any():
+            return []
+
+        timer = self._view("death_animation_timer")
+        reduction = self._view("death_speed_reduction")
+        timer[dying] -= 1
+        # 逐渐减速
+        reduction[dying] = np.maximum(0, reduction[dying] - 0.02)
+        col = self._view("col")
+        col[dying] -= self._view("speed")[dying] * reduction[dying]
+        # 透明度从255到0线性变化
+        progress = timer[dying] / self._view("death_animation_duration")[dying]
+        self._view("current_alpha")[dying] = (255 * progress).astype("int32")
+
+        finished = dying & (timer <= 0)
+        self._view("health")[finished] = 0
+        return self.get_zombies(finished)
+
+    def get_active_mask(self, stun_timers=None):
+        """本帧需要更新的僵尸：未进入死亡动画，也没有被黄瓜眩晕计时器定住"""
+        active = ~self._view("is_dying")
+        if stun_timers:
+            for entity_id, timer in stun_timers.items():
+                slot = self.slots.get(entity_id)
+                if slot is not None and timer > 0:
+                    active[slot] = False
+        return active
+
+    def update_speeds(self, active):
+        """非冰冻、非眩晕的僵尸按基础速度重新计算速度"""
+        mask = active & ~self._view("is_stunned") & ~self._view("is_frozen")
+        speed = self._view("speed")
+        speed[mask] = self._view("base_speed")[mask] * self._view("speed_factor")[mask]
+
+    def move(self, active, before_attack):
+        """移动所有未攻击、未眩晕的僵尸；before_attack 区分植物碰撞检测前后的移动"""
+        moves_first = self._view("moves_first")
+        mask = (active & ~self._view("is_stunned") & ~self._view("is_attacking") &
+                (moves_first if before_attack else ~moves_first))
+        col = self._view("col")
+        col[mask] -= self._view("speed")[mask]
+
+    def get_plant_contacts(self, plants):
+        """
+        粗筛与任一植物接触的僵尸，返回布尔掩码
+
+        边界略微放宽，只会多选不会漏选；精确的碰撞判断和攻击仍由僵尸对象完成。
+        """
+        if not plants or not self.count:
+            return np.zeros(self.count, dtype=bool)
+
+        plant_rows = np.fromiter((plant.row for plant in plants), dtype="int32", count=len(plants))
+        plant_cols = np.fromiter((plant.col for plant in plants), dtype="float64", count=len(plants))
+        offsets = self._view("col")[:, None] - plant_cols[None, :]
+        same_row = self._view("row")[:, None] == plant_rows[None, :]
+        contact_min = self._view("contact_min")[:, None] - CONTACT_EPSILON
+        contact_max = self._view("contact_max")[:, None] + CONTACT_EPSILON
+        return (same_row & (offsets > contact_min) & (offsets < contact_max)).any(axis=1)
+
+    def get_cell_changes(self):
+        """返回跨越了格子边界的僵尸，供空间索引同步"""
+        cells = np.clip(self._view("col"), 0, self.grid_width - 1).astype("int32")
+        cell_col = self._view("cell_col")
+        changed = cells != cell_col
+        if not changed.any():
+            return []
+        cell_col[changed] = cells[changed]
+        return self.get_zombies(changed)
+
+    def expire_freezes(self, current_time, freeze_duration):
+        """解除冰冻已到期的僵尸，恢复原始速度"""
+        frozen = self._view("is_frozen")
+        if not frozen.any():
+            return
+        start = self._view("freeze_start_time")
+        expired = frozen & (current_time - start >= freeze_duration)
+        if not expired.any():
+            return
+
+        original_speed = self._view("original_speed")
+        restore = expired & ~np.isnan(original_speed)
+        self._view("speed")[restore] = original_speed[restore]
+        frozen[expired] = False
+        original_speed[expired] = np.nan
+        start[expired] = np.nan
+
+    def get_zombies_past(self, col_threshold, offset=0.0):
+        """获取 col + offset 越过指定列（向左，不含）的存活僵尸"""
+        past = (self._view("col") + offset) < col_threshold
+        return self.get_zombies(past & ~self._view("is_dying"))
+
+    def get_rows_reached(self, col_threshold, offset=0.0):
+        """获取有存活僵尸 col + offset 到达指定列（含）的行"""
+        mask = ((self._view("col") + offset) <= col_threshold) & ~self._view("is_dying")
+        return np.unique(self._view("row")[mask]).tolist()
+
+    def get_zombies_near(self, row, col, distance):
+        """获取指定行中与 col 距离小于 distance 的存活僵尸"""
+        mask = ((self._view("row") == row) & ~self._view("is_dying") &
+                (np.abs(self._view("col") - col) < distance))
+        return self.get_zombies(mask)
+
+    def get_unhandled_deaths(self):
+        """获取血量已归零但还没开始死亡动画的僵尸"""
+        return self.get_zombies((self._view("health") <= 0) & ~self._view("is_dying"))
+
+
+def create_zombie_store(grid_width, enabled=True):
+    """创建僵尸结构数组存储，未启用或缺少 NumPy 时返回 None"""
+    if not enabled:
+        return None
+    if np is None:
+        print("警告：未安装 NumPy，僵尸数组存储不可用，使用逐个更新")
+        return None
+    return ZombieStore(grid_width)